@@ -33,6 +33,8 @@ _parser.add_argument('--benchmark', choices=["foreach", "while_loop"], required=
 _parser.add_argument('--warmup_rounds', type=int, default=20)
 _parser.add_argument('--test_rounds', type=int, default=100)
 _parser.add_argument('--gpu', type=bool, default=False)
+_parser.add_argument('--unroll', action='store_true',
+                     help='Unroll the foreach loop into the graph of the hybridized layer.')
 args = _parser.parse_args()
 
 
@@ -43,7 +45,8 @@ class ForeachRNN(gluon.HybridBlock):
         self.cell = cell
 
     def hybrid_forward(self, F, inputs, states):
-        out, states = F.contrib.foreach(self.cell, inputs, states)
+        unroll_length = self.length if args.unroll else None
+        out, states = F.contrib.foreach(self.cell, inputs, states, unroll_length=unroll_length)
         return out
 
 
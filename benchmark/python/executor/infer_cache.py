@@ -0,0 +1,94 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Measures shape and type inference with and without the inference cache.
+
+Binding runs shape and type inference on the whole graph. For each input shape,
+this compares the time of a bind and of infer_shape when the result is in the
+cache (hit), when it is not (miss, which also builds the key), and when the cache
+is disabled with MXNET_EXEC_INFER_CACHE_SIZE=0 (off, run in a child process)::
+
+    python infer_cache.py --model resnet50_v1 --batch-sizes 1,8,32
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import mxnet as mx
+
+parser = argparse.ArgumentParser(description='inference cache benchmark')
+parser.add_argument('--model', type=str, default='resnet50_v1',
+                    help='Model of the gluon model zoo to bind.')
+parser.add_argument('--batch-sizes', type=str, default='1,8,32',
+                    help='Comma separated batch sizes, one input shape each.')
+parser.add_argument('--repeat', type=int, default=20)
+parser.add_argument('--mode', type=str, default='all', choices=['all', 'hit', 'miss', 'off'],
+                    help=argparse.SUPPRESS)
+opt = parser.parse_args()
+
+
+def get_symbol():
+    net = mx.gluon.model_zoo.vision.get_model(opt.model)
+    return net(mx.sym.var('data'))
+
+
+def measure(fn, clear):
+    fn()
+    total = 0.
+    for _ in range(opt.repeat):
+        if clear:
+            mx.executor.clear_infer_cache()
+        tic = time.time()
+        fn()
+        total += time.time() - tic
+    return total / opt.repeat * 1000
+
+
+def run(mode):
+    sym = get_symbol()
+    results = {}
+    for batch_size in [int(b) for b in opt.batch_sizes.split(',')]:
+        shape = (batch_size, 3, 224, 224)
+        clear = mode == 'miss'
+        results[batch_size] = {
+            'bind_ms': measure(lambda: sym.simple_bind(mx.cpu(), grad_req='null', data=shape),
+                               clear),
+            'infer_shape_ms': measure(lambda: sym.infer_shape(data=shape), clear)}
+    return results
+
+
+def main():
+    if opt.mode != 'all':
+        print(json.dumps(run(opt.mode)))
+        return
+    results = {'hit': run('hit'), 'miss': run('miss')}
+    env = dict(os.environ, MXNET_EXEC_INFER_CACHE_SIZE='0')
+    out = subprocess.check_output([sys.executable] + sys.argv + ['--mode', 'off'], env=env)
+    results['off'] = json.loads(out.decode().strip().splitlines()[-1])
+    print('%-12s %-16s %10s %10s %10s' % ('batch size', 'measure', 'hit', 'miss', 'off'))
+    for batch_size in results['hit']:
+        for name in ['bind_ms', 'infer_shape_ms']:
+            print('%-12s %-16s %10.3f %10.3f %10.3f' % (
+                batch_size, name, results['hit'][batch_size][name],
+                results['miss'][batch_size][name], results['off'][str(batch_size)][name]))
+
+
+if __name__ == '__main__':
+    main()
@@ -45,6 +45,8 @@ parser.add_argument('--gpus', type=str, default='',
                     help='GPU IDs to use for this benchmark task. Example: --gpus=0,1,2,3 to use 4 GPUs.'
                          'By default, use CPU only.')
 parser.add_argument('--type', type=str, default='inference', choices=['all', 'training', 'inference'])
+parser.add_argument('--fuse', action='store_true',
+                    help='Fuse chains of elementwise operators with the ELEMWISE_FUSION backend.')
 
 opt = parser.parse_args()
 
@@ -65,6 +67,8 @@ def score(network, batch_size, ctx):
     data = mx.sym.var('data')
     out = net(data)
     softmax = mx.sym.SoftmaxOutput(out, name='softmax')
+    if opt.fuse:
+        softmax = softmax.get_backend_symbol('ELEMWISE_FUSION')
     mod = mx.mod.Module(softmax, context=ctx)
     mod.bind(for_training     = False,
              inputs_need_grad = False,
@@ -93,6 +97,8 @@ def train(network, batch_size, ctx):
     data = mx.sym.var('data')
     out = net(data)
     softmax = mx.sym.SoftmaxOutput(out, name='softmax')
+    if opt.fuse:
+        softmax = softmax.get_backend_symbol('ELEMWISE_FUSION')
     mod = mx.mod.Module(softmax, context=ctx)
     mod.bind(for_training     = True,
              inputs_need_grad = False,
@@ -0,0 +1,342 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+
+"""Throughput benchmark for gluon.data input pipelines.
+
+Runs data pipelines in isolation on synthetic RecordIO data generated locally and
+reports samples/sec, per-batch and per-transform latency percentiles, CPU
+utilization and peak memory, including the DataLoader worker processes when psutil
+is installed. Results can be written as JSON for regression tracking, e.g.::
+
+    python benchmark_gluon_data.py --pipeline all --num-workers 4 --output result.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import tempfile
+import threading
+import time
+
+import numpy as np
+import mxnet as mx
+from mxnet.gluon.data import DataLoader
+from mxnet.gluon.data.vision import ImageRecordDataset, transforms
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logging.basicConfig(level=logging.INFO)
+parser = argparse.ArgumentParser(description='gluon.data pipeline throughput benchmark')
+parser.add_argument('--pipeline', type=str, default='all',
+                    choices=['all', 'decode', 'transforms', 'dataloader', 'recorditer'],
+                    help='Pipeline to benchmark. decode: ImageRecordDataset only, '
+                         'transforms: each transform of the Compose separately, '
+                         'dataloader: full DataLoader pipeline, '
+                         'recorditer: mx.io.ImageRecordIter.')
+parser.add_argument('--num-images', type=int, default=1000,
+                    help='Number of synthetic images to generate.')
+parser.add_argument('--image-size', type=str, default='256,340',
+                    help='Height,width of the synthetic images.')
+parser.add_argument('--data-shape', type=int, default=224,
+                    help='Output crop size of the augmentation pipeline.')
+parser.add_argument('--batch-size', type=int, default=64)
+parser.add_argument('--num-batches', type=int, default=50,
+                    help='Number of batches to time after warm up.')
+parser.add_argument('--warmup', type=int, default=5,
+                    help='Number of batches to skip before timing.')
+parser.add_argument('--num-workers', type=str, default='0,4',
+                    help='Comma separated list of worker counts to benchmark for DataLoader '
+                         'and preprocess threads for ImageRecordIter.')
+parser.add_argument('--thread-pool', type=str, default='0,1',
+                    help='Comma separated list of DataLoader thread_pool settings to try.')
+parser.add_argument('--pin-memory', action='store_true',
+                    help='Use pin_memory=True in DataLoader.')
+parser.add_argument('--prefetch', type=int, default=None,
+                    help='DataLoader prefetch, defaults to 2 * num_workers.')
+parser.add_argument('--rec-prefix', type=str, default='',
+                    help='Reuse an existing .rec/.idx pair instead of generating one.')
+parser.add_argument('--output', type=str, default='',
+                    help='Write results as JSON to this file.')
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def generate_rec(prefix, num_images, height, width):
+    """Generate a RecordIO file of random JPEG images with random labels."""
+    record = mx.recordio.MXIndexedRecordIO(prefix + '.idx', prefix + '.rec', 'w')
+    for i in range(num_images):
+        img = np.random.randint(0, 256, size=(height, width, 3), dtype=np.uint8)
+        header = mx.recordio.IRHeader(0, float(i % 1000), i, 0)
+        record.write_idx(i, mx.recordio.pack_img(header, img, quality=90))
+    record.close()
+
+
+def percentiles(samples):
+    """p50/p90/p99 in milliseconds."""
+    if not samples:
+        return {}
+    arr = np.array(samples) * 1000
+    return {'p50_ms': float(np.percentile(arr, 50)),
+            'p90_ms': float(np.percentile(arr, 90)),
+            'p99_ms': float(np.percentile(arr, 99))}
+
+
+class ResourceMeter(object):
+    """Measure wall time, CPU time and peak RSS of this process and its child processes,
+    e.g. the DataLoader workers. Live children are sampled during the run with psutil,
+    since getrusage only counts the children that have exited. Without psutil, CPU
+    time and peak RSS are not reported when child processes are running."""
+    interval = 0.05
+
+    def __enter__(self):
+        self._wall = time.time()
+        self._baseline = {}
+        self._last = {}
+        self._peak_rss = 0
+        self.cpu = self.peak_rss_mb = None
+        if psutil is not None:
+            self._stop = threading.Event()
+            self._baseline = self._sample()
+            self._sampler = threading.Thread(target=self._run)
+            self._sampler.daemon = True
+            self._sampler.start()
+        else:
+            self._cpu = self._rusage_cpu_time()
+        return self
+
+    def __exit__(self, *args):
+        self.wall = time.time() - self._wall
+        if psutil is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sample()
+            # processes that existed before the run are counted from their time at start
+            self.cpu = sum(cpu - self._baseline.get(pid, 0.)
+                           for pid, cpu in self._last.items())
+            self.peak_rss_mb = self._peak_rss / 1024. / 1024.
+        elif not multiprocessing.active_children():
+            self.cpu = self._rusage_cpu_time() - self._cpu
+            # ru_maxrss is in KB on linux
+            self.peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        """Records the CPU time of every live process and the peak of their summed RSS."""
+        proc = psutil.Process()
+        cpu, rss = {}, 0
+        for p in [proc] + proc.children(recursive=True):
+            try:
+                times = p.cpu_times()
+                mem = p.memory_info()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            cpu[p.pid] = times.user + times.system
+            rss += mem.rss
+        self._last.update(cpu)
+        self._peak_rss = max(self._peak_rss, rss)
+        return cpu
+
+    @staticmethod
+    def _rusage_cpu_time():
+        total = 0.
+        for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+            usage = resource.getrusage(who)
+            total += usage.ru_utime + usage.ru_stime
+        return total
+
+    def stats(self):
+        cpu_util = None
+        if self.cpu is not None:
+            cpu_util = self.cpu / self.wall if self.wall > 0 else 0.
+        return {'wall_s': self.wall, 'cpu_s': self.cpu, 'cpu_util': cpu_util,
+                'peak_rss_mb': self.peak_rss_mb}
+
+
+def _format_stat(value, fmt):
+    return 'n/a' if value is None else fmt % value
+
+
+def get_transform(data_shape):
+    normalize = transforms.Normalize(mean=(0.485, 0.456, 0.406), std=(0.229, 0.224, 0.225))
+    return transforms.Compose([
+        transforms.RandomResizedCrop(data_shape),
+        transforms.RandomFlipLeftRight(),
+        transforms.RandomColorJitter(brightness=0.4, contrast=0.4, saturation=0.4),
+        transforms.ToTensor(),
+        normalize])
+
+
+def time_batches(batch_iter, num_batches, warmup, batch_size):
+    """Time the wait for each batch of an iterator."""
+    waits = []
+    it = iter(batch_iter)
+    for _ in range(warmup):
+        next(it)
+    with ResourceMeter() as meter:
+        tic = time.time()
+        for _ in range(num_batches):
+            try:
+                batch = next(it)
+            except StopIteration:
+                it = iter(batch_iter)
+                batch = next(it)
+            data = batch.data[0] if isinstance(batch, mx.io.DataBatch) else batch[0]
+            data.wait_to_read()
+            toc = time.time()
+            waits.append(toc - tic)
+            tic = toc
+    result = {'samples_per_sec': num_batches * batch_size / meter.wall,
+              'batch_wait': percentiles(waits)}
+    result.update(meter.stats())
+    return result
+
+
+def bench_decode(rec_prefix, num_samples):
+    """ImageRecordDataset read and decode only."""
+    dataset = ImageRecordDataset(rec_prefix + '.rec')
+    latencies = []
+    with ResourceMeter() as meter:
+        for i in range(num_samples):
+            tic = time.time()
+            img, _ = dataset[i % len(dataset)]
+            img.wait_to_read()
+            latencies.append(time.time() - tic)
+    result = {'samples_per_sec': num_samples / meter.wall, 'sample': percentiles(latencies)}
+    result.update(meter.stats())
+    return result
+
+
+def bench_transforms(rec_prefix, num_samples, data_shape):
+    """Per-transform latency of the Compose applied to decoded images."""
+    dataset = ImageRecordDataset(rec_prefix + '.rec')
+    # Compose groups consecutive HybridBlocks, time each of its children
+    stages = [('%d_%s' % (i, stage.__class__.__name__), stage)
+              for i, stage in enumerate(get_transform(data_shape)._children.values())]
+    latencies = {name: [] for name, _ in stages}
+    with ResourceMeter() as meter:
+        for i in range(num_samples):
+            x, _ = dataset[i % len(dataset)]
+            for name, stage in stages:
+                tic = time.time()
+                x = stage(x)
+                x.wait_to_read()
+                latencies[name].append(time.time() - tic)
+    result = {'samples_per_sec': num_samples / meter.wall,
+              'stages': {k: percentiles(v) for k, v in latencies.items()}}
+    result.update(meter.stats())
+    return result
+
+
+def bench_dataloader(rec_prefix, opt, num_workers, thread_pool):
+    """Full DataLoader pipeline."""
+    dataset = ImageRecordDataset(rec_prefix + '.rec').transform_first(
+        get_transform(opt.data_shape))
+    loader = DataLoader(dataset, batch_size=opt.batch_size, shuffle=True, last_batch='discard',
+                        num_workers=num_workers, thread_pool=thread_pool,
+                        pin_memory=opt.pin_memory, prefetch=opt.prefetch)
+    return time_batches(loader, opt.num_batches, opt.warmup, opt.batch_size)
+
+
+def bench_recorditer(rec_prefix, opt, num_threads):
+    """mx.io.ImageRecordIter with comparable augmentation."""
+    data_iter = mx.io.ImageRecordIter(
+        path_imgrec=rec_prefix + '.rec', path_imgidx=rec_prefix + '.idx',
+        data_shape=(3, opt.data_shape, opt.data_shape), batch_size=opt.batch_size,
+        shuffle=True, rand_crop=True, rand_mirror=True, random_resized_crop=True,
+        brightness=0.4, contrast=0.4, saturation=0.4,
+        mean_r=123.68, mean_g=116.28, mean_b=103.53, std_r=58.395, std_g=57.12, std_b=57.375,
+        preprocess_threads=max(1, num_threads))
+    return time_batches(_ResetIter(data_iter), opt.num_batches, opt.warmup, opt.batch_size)
+
+
+class _ResetIter(object):
+    """Make a DataIter restartable with iter()."""
+    def __init__(self, data_iter):
+        self._iter = data_iter
+
+    def __iter__(self):
+        self._iter.reset()
+        return iter(self._iter)
+
+
+def main():
+    opt = parser.parse_args()
+    height, width = _int_list(opt.image_size)
+    pipelines = ['decode', 'transforms', 'dataloader', 'recorditer'] \
+        if opt.pipeline == 'all' else [opt.pipeline]
+    tmpdir = None
+    rec_prefix = opt.rec_prefix
+    if not rec_prefix:
+        tmpdir = tempfile.mkdtemp()
+        rec_prefix = os.path.join(tmpdir, 'synthetic')
+        logging.info('Generating %d synthetic %dx%d images in %s',
+                     opt.num_images, height, width, rec_prefix + '.rec')
+        generate_rec(rec_prefix, opt.num_images, height, width)
+
+    num_samples = opt.num_batches * opt.batch_size
+    results = []
+    try:
+        for pipeline in pipelines:
+            if pipeline == 'decode':
+                configs = [({}, lambda: bench_decode(rec_prefix, num_samples))]
+            elif pipeline == 'transforms':
+                configs = [({}, lambda: bench_transforms(rec_prefix, num_samples,
+                                                         opt.data_shape))]
+            elif pipeline == 'dataloader':
+                configs = [({'num_workers': n, 'thread_pool': bool(t)},
+                            (lambda n=n, t=t: bench_dataloader(rec_prefix, opt, n, bool(t))))
+                           for n in _int_list(opt.num_workers)
+                           for t in _int_list(opt.thread_pool) if n > 0 or not t]
+            else:
+                configs = [({'preprocess_threads': max(1, n)},
+                            (lambda n=n: bench_recorditer(rec_prefix, opt, n)))
+                           for n in _int_list(opt.num_workers)]
+            for config, run in configs:
+                result = run()
+                result.update({'pipeline': pipeline, 'config': config,
+                               'batch_size': opt.batch_size,
+                               'pin_memory': opt.pin_memory, 'prefetch': opt.prefetch})
+                logging.info('%s %s: %.1f samples/sec, cpu util %s, peak rss %s MB',
+                             pipeline, config, result['samples_per_sec'],
+                             _format_stat(result['cpu_util'], '%.2f'),
+                             _format_stat(result['peak_rss_mb'], '%.0f'))
+                results.append(result)
+    finally:
+        if tmpdir is not None:
+            for ext in ('.rec', '.idx'):
+                os.remove(rec_prefix + ext)
+            os.rmdir(tmpdir)
+
+    if opt.output:
+        with open(opt.output, 'w') as f:
+            json.dump({'mxnet_version': mx.__version__, 'results': results}, f, indent=2)
+        logging.info('Results written to %s', opt.output)
+
+
+if __name__ == '__main__':
+    main()
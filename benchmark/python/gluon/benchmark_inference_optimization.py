@@ -0,0 +1,85 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Compares the inference latency of model zoo networks before and after
+mxnet.contrib.graph_optimization.optimize_for_inference."""
+import argparse
+import logging
+import time
+
+import mxnet as mx
+import mxnet.gluon.model_zoo.vision as models
+from mxnet.contrib.graph_optimization import optimize_for_inference
+
+logging.basicConfig(level=logging.INFO)
+parser = argparse.ArgumentParser(description='Inference graph optimization benchmark')
+parser.add_argument('--models', type=str, default='resnet18_v1,resnet50_v1,mobilenet1.0,'
+                                                  'vgg16_bn,densenet121,inceptionv3',
+                    help='Comma separated model zoo networks.')
+parser.add_argument('--batch-sizes', type=str, default='1,32')
+parser.add_argument('--num-batches', type=int, default=20)
+parser.add_argument('--gpu', type=int, default=-1, help='GPU to run on, CPU by default.')
+opt = parser.parse_args()
+
+dry_run = 5
+
+
+def get_symbol(network, ctx):
+    net = models.get_model(network)
+    net.initialize(mx.init.Xavier(magnitude=2.), ctx=ctx)
+    net.hybridize()
+    size = 299 if network == 'inceptionv3' else 224
+    net(mx.nd.zeros((1, 3, size, size), ctx=ctx))
+    sym = net._cached_graph[1]
+    arg_names = set(sym.list_arguments())
+    params = {name: param._reduce() for name, param in net.collect_params().items()}
+    arg_params = {k: v for k, v in params.items() if k in arg_names}
+    aux_params = {k: v for k, v in params.items() if k not in arg_names}
+    return sym, arg_params, aux_params, size
+
+
+def score(sym, arg_params, aux_params, data, ctx):
+    mod = mx.mod.Module(sym, data_names=['data'], label_names=None, context=ctx)
+    mod.bind(for_training=False, data_shapes=[('data', data.shape)])
+    mod.set_params(arg_params, aux_params)
+    batch = mx.io.DataBatch([data], [])
+    for i in range(dry_run + opt.num_batches):
+        if i == dry_run:
+            tic = time.time()
+        mod.forward(batch, is_train=False)
+        for output in mod.get_outputs():
+            output.wait_to_read()
+    latency = (time.time() - tic) / opt.num_batches
+    return latency, mod.get_outputs()[0]
+
+
+if __name__ == '__main__':
+    ctx = mx.gpu(opt.gpu) if opt.gpu >= 0 else mx.cpu()
+    for network in opt.models.split(','):
+        sym, arg_params, aux_params, size = get_symbol(network, ctx)
+        tic = time.time()
+        opt_sym, opt_args, opt_aux = optimize_for_inference(sym, arg_params, aux_params)
+        logging.info('%s: optimized in %.2fs, %d -> %d ops', network, time.time() - tic,
+                     len(sym.get_internals()), len(opt_sym.get_internals()))
+        for batch_size in [int(b) for b in opt.batch_sizes.split(',')]:
+            data = mx.nd.random.uniform(-1, 1, shape=(batch_size, 3, size, size), ctx=ctx)
+            base, base_out = score(sym, arg_params, aux_params, data, ctx)
+            fast, fast_out = score(opt_sym, opt_args, opt_aux, data, ctx)
+            error = mx.nd.abs(base_out - fast_out).max().asscalar()
+            logging.info('%s batch %d: %.2fms -> %.2fms (%+.1f%%), max abs difference %.2e',
+                         network, batch_size, base * 1e3, fast * 1e3,
+                         (fast - base) / base * 100, error)
@@ -0,0 +1,89 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Compares the fused CPU LSTM/GRU layers on variable length batches with the
+unrolled cells, for training and inference."""
+import argparse
+import logging
+import time
+
+import mxnet as mx
+from mxnet import autograd, gluon
+
+logging.basicConfig(level=logging.INFO)
+parser = argparse.ArgumentParser(description='CPU RNN layer benchmark')
+parser.add_argument('--modes', type=str, default='lstm,gru')
+parser.add_argument('--seq-len', type=int, default=50)
+parser.add_argument('--batch-size', type=int, default=64)
+parser.add_argument('--input-size', type=int, default=256)
+parser.add_argument('--hidden-size', type=int, default=256)
+parser.add_argument('--num-layers', type=int, default=2)
+parser.add_argument('--bidirectional', action='store_true')
+parser.add_argument('--min-len', type=int, default=5,
+                    help='Minimum length of the sequences, drawn uniformly up to --seq-len.')
+parser.add_argument('--num-batches', type=int, default=20)
+opt = parser.parse_args()
+
+dry_run = 3
+
+
+def fused(layer, data, valid_length, train):
+    with autograd.record(train_mode=train):
+        out = layer(data, valid_length=valid_length)
+    if train:
+        out.backward()
+    return out
+
+
+def unrolled(cell, data, valid_length, train):
+    with autograd.record(train_mode=train):
+        out, _ = cell.unroll(opt.seq_len, data, layout='TNC', merge_outputs=True,
+                             valid_length=valid_length)
+    if train:
+        out.backward()
+    return out
+
+
+def run(fn, block, data, valid_length, train):
+    for i in range(dry_run + opt.num_batches):
+        if i == dry_run:
+            tic = time.time()
+        fn(block, data, valid_length, train).wait_to_read()
+        if train:
+            data.grad.wait_to_read()
+    return (time.time() - tic) / opt.num_batches
+
+
+if __name__ == '__main__':
+    layers = {'lstm': gluon.rnn.LSTM, 'gru': gluon.rnn.GRU}
+    data = mx.nd.random.uniform(-1, 1, shape=(opt.seq_len, opt.batch_size, opt.input_size))
+    data.attach_grad()
+    valid_length = mx.nd.random.randint(opt.min_len, opt.seq_len + 1,
+                                        shape=(opt.batch_size,)).astype('float32')
+    for mode in opt.modes.split(','):
+        layer = layers[mode](opt.hidden_size, opt.num_layers, bidirectional=opt.bidirectional,
+                             input_size=opt.input_size, use_sequence_length=True)
+        layer.initialize()
+        layer.hybridize(static_alloc=True)
+        cell = layer._unfuse()
+        cell.hybridize()
+        for train in [False, True]:
+            fused_time = run(fused, layer, data, valid_length, train)
+            unrolled_time = run(unrolled, cell, data, valid_length, train)
+            logging.info('%s %s: fused %.2fms, unrolled cells %.2fms, speedup %.2fx',
+                         mode, 'training' if train else 'inference', fused_time * 1e3,
+                         unrolled_time * 1e3, unrolled_time / fused_time)
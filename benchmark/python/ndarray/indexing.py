@@ -0,0 +1,88 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Compares NDArray __getitem__ and __setitem__ with numpy across key types."""
+import argparse
+import time
+
+import numpy as np
+import mxnet as mx
+
+parser = argparse.ArgumentParser(description='NDArray indexing benchmark')
+parser.add_argument('--shape', type=str, default='64,128,256',
+                    help='Comma separated shape of the indexed array.')
+parser.add_argument('--num-indices', type=int, default=32,
+                    help='Number of elements of integer array keys.')
+parser.add_argument('--repeat', type=int, default=100)
+parser.add_argument('--gpu', type=int, default=-1, help='GPU to run on, CPU by default.')
+opt = parser.parse_args()
+
+
+def get_keys(shape):
+    rows = np.random.randint(0, shape[0], size=opt.num_indices)
+    cols = np.random.randint(0, shape[1], size=opt.num_indices)
+    return [
+        ('integer array', rows),
+        ('integer list', rows.tolist()),
+        ('negative integers', rows - shape[0]),
+        ('array on axis 1', (slice(None), cols)),
+        ('ellipsis and array', (Ellipsis, cols % shape[-1])),
+        ('boolean mask', np.random.uniform(size=shape[0]) > 0.5),
+        ('boolean mask on axis 1', (slice(None), np.random.uniform(size=shape[1]) > 0.5)),
+        ('2-D boolean mask', np.random.uniform(size=shape[:2]) > 0.9),
+        ('slices with steps', (slice(None, None, 2), slice(1, None, 3))),
+        ('two arrays', (rows, cols)),
+        ('array and slice', (rows, slice(2, 20), cols % shape[2])),
+    ]
+
+
+def measure(fn, sync):
+    fn()
+    sync()
+    tic = time.time()
+    for _ in range(opt.repeat):
+        fn()
+    sync()
+    return (time.time() - tic) / opt.repeat
+
+
+if __name__ == '__main__':
+    ctx = mx.gpu(opt.gpu) if opt.gpu >= 0 else mx.cpu()
+    shape = tuple(int(s) for s in opt.shape.split(','))
+    np_array = np.random.uniform(size=shape).astype(np.float32)
+    mx_array = mx.nd.array(np_array, ctx=ctx)
+    print('%-24s %12s %12s %12s %12s' % ('key', 'get mxnet', 'get numpy',
+                                         'set mxnet', 'set numpy'))
+    for name, key in get_keys(shape):
+        # NDArray keys stay on the device, as in beam search
+        mx_key = mx.nd.array(key, ctx=ctx, dtype='int32') \
+            if isinstance(key, np.ndarray) and key.dtype != np.bool_ else key
+        value = np_array[key]
+        mx_value = mx.nd.array(value, ctx=ctx)
+        get_mx = measure(lambda: mx_array[mx_key], mx.nd.waitall)
+        get_np = measure(lambda: np_array[key], lambda: None)
+
+        def set_mx():
+            mx_array[mx_key] = mx_value
+
+        def set_np():
+            np_array[key] = value
+
+        set_mx_time = measure(set_mx, mx.nd.waitall)
+        set_np_time = measure(set_np, lambda: None)
+        print('%-24s %10.3fms %10.3fms %10.3fms %10.3fms' % (
+            name, get_mx * 1e3, get_np * 1e3, set_mx_time * 1e3, set_np_time * 1e3))
@@ -0,0 +1,116 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Memory benchmark for exporting and importing large ONNX models.
+
+Exports a synthetic multilayer perceptron with inline weights and with weights
+streamed to an external data file, then imports both models back. Every step runs
+in a fresh process so that its peak resident memory can be reported, e.g.::
+
+    python benchmark_onnx_external_data.py --num-layers 8 --hidden 4096
+"""
+
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+parser = argparse.ArgumentParser(description='ONNX external data export/import benchmark')
+parser.add_argument('--num-layers', type=int, default=8,
+                    help='Number of FullyConnected layers of the synthetic model.')
+parser.add_argument('--hidden', type=int, default=4096,
+                    help='Number of hidden units of each layer.')
+parser.add_argument('--threshold', type=int, default=1024,
+                    help='Minimal size in bytes of the tensors stored externally.')
+
+
+def build_model(num_layers, hidden):
+    """Returns the symbol and parameters of a synthetic multilayer perceptron."""
+    import mxnet as mx
+    net = mx.sym.var('data')
+    params = {}
+    for i in range(num_layers):
+        name = 'fc%d' % i
+        net = mx.sym.FullyConnected(net, num_hidden=hidden, name=name)
+        net = mx.sym.Activation(net, act_type='relu', name='relu%d' % i)
+        params[name + '_weight'] = mx.nd.random.uniform(-0.01, 0.01, (hidden, hidden))
+        params[name + '_bias'] = mx.nd.zeros((hidden,))
+    return net, params
+
+
+def _peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+
+def _export(args, path, external_data, queue):
+    from mxnet.contrib import onnx as onnx_mxnet
+    sym, params = build_model(args.num_layers, args.hidden)
+    base_rss = _peak_rss_mb()
+    tic = time.time()
+    onnx_mxnet.export_model(sym, params, [(1, args.hidden)], np.float32, path,
+                            external_data=external_data,
+                            external_data_threshold=args.threshold)
+    queue.put((time.time() - tic, _peak_rss_mb() - base_rss))
+
+
+def _import(path, queue):
+    from mxnet.contrib import onnx as onnx_mxnet
+    base_rss = _peak_rss_mb()
+    tic = time.time()
+    _, arg_params, aux_params = onnx_mxnet.import_model(path)
+    for arr in list(arg_params.values()) + list(aux_params.values()):
+        arr.wait_to_read()
+    queue.put((time.time() - tic, _peak_rss_mb() - base_rss))
+
+
+def run(target, *args):
+    """Runs target in a new process and returns the (seconds, peak MB) it reports."""
+    queue = mp.Queue()
+    proc = mp.Process(target=target, args=args + (queue,))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def _file_size_mb(path):
+    size = os.path.getsize(path)
+    if os.path.exists(path + '.data'):
+        size += os.path.getsize(path + '.data')
+    return size / 1024. / 1024.
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    param_mb = args.num_layers * (args.hidden + 1) * args.hidden * 4 / 1024. / 1024.
+    logging.info('Model with %d layers, %.1f MB of weights', args.num_layers, param_mb)
+    tmp_dir = tempfile.mkdtemp()
+    for external_data in [False, True]:
+        mode = 'external' if external_data else 'inline'
+        path = os.path.join(tmp_dir, mode + '.onnx')
+        export_time, export_mb = run(_export, args, path, external_data)
+        import_time, import_mb = run(_import, path)
+        logging.info('%-8s file %8.1f MB | export %6.2f s, peak +%8.1f MB | '
+                     'import %6.2f s, peak +%8.1f MB', mode, _file_size_mb(path),
+                     export_time, export_mb, import_time, import_mb)
@@ -446,6 +446,17 @@ MXNET_DLL int MXSetNumOMPThreads(int thread_num);
  */
 MXNET_DLL int MXEngineSetBulkSize(int bulk_size, int* prev_bulk_size);
 
+/*!
+ * \brief record the time at which all pending writes to some NDArrays have completed,
+ *  without waiting for them
+ * \param handles the NDArrays to wait for in the engine
+ * \param num number of NDArrays. When 0, the current time is recorded immediately
+ * \param out memory which receives the time in microseconds of a monotonic clock once
+ *  the writes have completed. It must stay valid until then
+ * \return 0 when success, -1 when failure happens.
+ */
+MXNET_DLL int MXEngineRecordTimestamp(NDArrayHandle* handles, int num, int64_t* out);
+
 /*!
  * \brief Get the number of GPUs.
  * \param pointer to int that will hold the number of GPUs available.
@@ -1652,6 +1663,24 @@ MXNET_DLL int MXExecutorFree(ExecutorHandle handle);
  * \return 0 when success, -1 when failure happens
  */
 MXNET_DLL int MXExecutorPrint(ExecutorHandle handle, const char **out_str);
+/*!
+ * \brief Get the planned memory layout of the executor as a JSON string.
+ * \param handle the executor.
+ * \param out_str pointer to hold the JSON string of the memory plan.
+ * \return 0 when success, -1 when failure happens
+ */
+MXNET_DLL int MXExecutorGetMemoryPlan(ExecutorHandle handle, const char **out_str);
+/*!
+ * \brief Get the statistics of the caches of shape and type inference as a JSON string.
+ * \param out_str pointer to hold the JSON string of the statistics.
+ * \return 0 when success, -1 when failure happens
+ */
+MXNET_DLL int MXExecutorGetInferCacheStats(const char **out_str);
+/*!
+ * \brief Clear the caches of shape and type inference and their statistics.
+ * \return 0 when success, -1 when failure happens
+ */
+MXNET_DLL int MXExecutorClearInferCache();
 /*!
  * \brief Executor forward method
  *
@@ -2027,6 +2056,19 @@ MXNET_DLL int MXKVStoreSetGradientCompression(KVStoreHandle handle,
                                               const char** keys,
                                               const char** vals);
 
+/*!
+ * \brief Get counters of the gradient compression used by a KVStore
+ * \param handle handle to the kvstore
+ * \param original_bytes number of bytes of gradients which were compressed
+ * \param compressed_bytes number of bytes of the compressed gradients
+ * \param residual_norm L2 norm of the accumulated compression error
+ * \return 0 when success, -1 when failure happens
+ */
+MXNET_DLL int MXKVStoreGetGradientCompressionStats(KVStoreHandle handle,
+                                                   int64_t *original_bytes,
+                                                   int64_t *compressed_bytes,
+                                                   float *residual_norm);
+
 /*!
  * \brief Delete a KVStore handle.
  * \param handle handle to the kvstore
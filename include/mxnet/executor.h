@@ -83,6 +83,13 @@ class Executor {
    * \param os the output stream we like to print to.
    */
   virtual void Print(std::ostream &os) const {} // NOLINT(*)
+  /*!
+   * \brief print the planned memory layout of the graph as JSON to output stream.
+   *  The JSON contains per-node and per-entry storage information that can be
+   *  used to inspect storage sharing decisions made by the memory planner.
+   * \param os the output stream we like to print to.
+   */
+  virtual void PrintMemoryPlan(std::ostream &os) const {} // NOLINT(*)
   /*!
    * \brief get array of outputs in the executor.
    * \return array of outputs in the executor.
@@ -86,6 +86,23 @@ class KVStore {
   virtual void SetGradientCompression(const std::vector<std::pair<std::string, std::string> >
                                       & kwargs) = 0;
 
+  /**
+   * \brief Get counters of the gradient compression used by this kvstore
+   * \param original_bytes number of bytes of gradients which were compressed
+   * \param compressed_bytes number of bytes of the compressed gradients
+   * \param residual_norm L2 norm of the accumulated compression error
+   */
+  virtual void GetGradientCompressionStats(int64_t *original_bytes, int64_t *compressed_bytes,
+                                           float *residual_norm) {
+    if (gradient_compression_ != nullptr) {
+      gradient_compression_->GetStats(original_bytes, compressed_bytes, residual_norm);
+    } else {
+      *original_bytes = 0;
+      *compressed_bytes = 0;
+      *residual_norm = 0;
+    }
+  }
+
   /*!
    * \brief Initialize a list of key-value pair to the store.
    *
@@ -33,3 +33,6 @@ from . import io
 from . import quantization
 from . import quantization as quant
 from . import tensorrt
+from . import cost_model
+from . import telemetry
+from . import graph_optimization
@@ -0,0 +1,445 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+# coding: utf-8
+# pylint: disable=too-many-locals, too-many-branches, too-many-statements
+"""Static cost model estimating FLOPs, memory and latency of Symbols and HybridBlocks."""
+from __future__ import absolute_import
+
+import re
+import json
+from collections import defaultdict
+
+from ..base import numeric_types
+from ..symbol import Symbol
+from .. import symbol
+from .. import profiler
+from ..context import cpu
+
+__all__ = ['estimate', 'calibrate', 'print_cost']
+
+_DTYPE_BYTES = {'float16': 2, 'float32': 4, 'float64': 8, 'uint8': 1, 'int8': 1,
+                'int32': 4, 'int64': 8}
+
+# flops per output element of ops without a dedicated formula
+_ELEMWISE_FLOPS = {
+    'elemwise_add': 1, 'elemwise_sub': 1, 'elemwise_mul': 1, 'elemwise_div': 1,
+    'broadcast_add': 1, 'broadcast_sub': 1, 'broadcast_mul': 1, 'broadcast_div': 1,
+    '_plus_scalar': 1, '_minus_scalar': 1, '_mul_scalar': 1, '_div_scalar': 1,
+    '_Plus': 1, '_Minus': 1, '_Mul': 1, '_Div': 1, 'add_n': 1, 'ElementWiseSum': 1,
+    'relu': 1, 'sigmoid': 4, 'tanh': 4, 'exp': 4, 'log': 4, 'sqrt': 2, 'square': 1,
+    'LeakyReLU': 2, 'BatchNorm': 4, 'InstanceNorm': 5, 'LayerNorm': 5, 'L2Normalization': 3,
+    'softmax': 3, 'log_softmax': 4, 'SoftmaxOutput': 3, 'SoftmaxActivation': 3,
+    'Dropout': 1, 'clip': 1, 'LRN': 6,
+}
+
+_ACTIVATION_FLOPS = {'relu': 1, 'sigmoid': 4, 'tanh': 4, 'softrelu': 4, 'softsign': 3}
+
+# ratio of backward to forward flops for ops whose backward computes two products
+_BACKWARD_FACTOR = {'Convolution': 2, 'Deconvolution': 2, 'FullyConnected': 2, 'RNN': 2,
+                    'dot': 2, 'batch_dot': 2}
+
+
+def _str2tuple(string):
+    """Convert a shape attribute string to a tuple of int."""
+    return tuple(int(x) for x in re.findall(r"\d+", string))
+
+
+def _prod(shape):
+    out = 1
+    for x in shape:
+        out *= x
+    return out
+
+
+def _as_symbol(model, shape):
+    """Returns the symbol of `model` and the shapes of its inputs keyed by name."""
+    if isinstance(model, Symbol):
+        if not isinstance(shape, dict):
+            raise TypeError("shape must be a dict of input name to shape for a Symbol")
+        return model, dict(shape)
+    from ..gluon import HybridBlock
+    if not isinstance(model, HybridBlock):
+        raise TypeError("model must be a Symbol or a HybridBlock, got %s" % type(model))
+    if isinstance(shape, tuple) and all(isinstance(x, numeric_types) for x in shape):
+        shape = [shape]
+    if len(shape) == 1:
+        names = ['data']
+    else:
+        names = ['data%d' % i for i in range(len(shape))]
+    out = model(*[symbol.var(name) for name in names])
+    if isinstance(out, (list, tuple)):
+        out = symbol.Group(list(out))
+    return out, dict(zip(names, [tuple(s) for s in shape]))
+
+
+def _node_flops(op, attrs, in_shapes, out_shapes):
+    """Returns (flops, macs) of one forward pass of a node."""
+    out_size = _prod(out_shapes[0]) if out_shapes else 0
+    if op == 'Convolution':
+        num_group = int(attrs.get('num_group', '1'))
+        kernel = _prod(_str2tuple(attrs['kernel']))
+        macs = out_size * in_shapes[0][1] // num_group * kernel
+        bias = 0 if attrs.get('no_bias', 'False') == 'True' else out_size
+        return 2 * macs + bias, macs
+    if op == 'Deconvolution':
+        num_group = int(attrs.get('num_group', '1'))
+        kernel = _prod(_str2tuple(attrs['kernel']))
+        macs = _prod(in_shapes[0]) * int(attrs['num_filter']) // num_group * kernel
+        bias = 0 if attrs.get('no_bias', 'True') == 'True' else out_size
+        return 2 * macs + bias, macs
+    if op == 'FullyConnected':
+        num_hidden = int(attrs['num_hidden'])
+        data = in_shapes[0]
+        if attrs.get('flatten', 'True') == 'True':
+            batch, in_units = data[0], _prod(data[1:])
+        else:
+            batch, in_units = _prod(data[:-1]), data[-1]
+        macs = batch * in_units * num_hidden
+        bias = 0 if attrs.get('no_bias', 'False') == 'True' else batch * num_hidden
+        return 2 * macs + bias, macs
+    if op == 'Pooling':
+        if attrs.get('global_pool', 'False') == 'True':
+            return _prod(in_shapes[0]), 0
+        return out_size * _prod(_str2tuple(attrs['kernel'])), 0
+    if op == 'RNN':
+        seq_len, batch, input_size = in_shapes[0]
+        state_size = int(attrs['state_size'])
+        num_layers = int(attrs['num_layers'])
+        directions = 2 if attrs.get('bidirectional', 'False') == 'True' else 1
+        gates = {'lstm': 4, 'gru': 3}.get(attrs.get('mode', 'lstm'), 1)
+        macs = 0
+        for layer in range(num_layers):
+            layer_input = input_size if layer == 0 else state_size * directions
+            macs += directions * seq_len * batch * gates * state_size * \
+                    (layer_input + state_size)
+        # element-wise gate computations are small next to the projections
+        return 2 * macs + 5 * directions * num_layers * seq_len * batch * gates * state_size, \
+               macs
+    if op in ('dot', 'batch_dot'):
+        lhs = in_shapes[0]
+        if op == 'dot':
+            reduce_dim = lhs[0] if attrs.get('transpose_a', 'False') == 'True' else lhs[-1]
+        else:
+            reduce_dim = lhs[-2] if attrs.get('transpose_a', 'False') == 'True' else lhs[-1]
+        macs = out_size * reduce_dim
+        return 2 * macs, macs
+    if op == 'Activation':
+        return _ACTIVATION_FLOPS.get(attrs.get('act_type', 'relu'), 1) * out_size, 0
+    return _ELEMWISE_FLOPS.get(op, 0) * out_size, 0
+
+
+def _map_outputs(sym):
+    """Returns the graph nodes, for each node the indices of its output entries in
+    ``sym.get_internals()``, and the ids of the nodes producing the outputs of `sym`."""
+    num_outputs = len(sym.list_outputs())
+    # one graph holding both, so that the heads index the same nodes
+    graph = json.loads(symbol.Group([sym, sym.get_internals()]).tojson())
+    nodes = graph['nodes']
+    node_entries = [[] for _ in nodes]
+    for pos, head in enumerate(graph['heads'][num_outputs:]):
+        entries = node_entries[head[0]]
+        entries.extend([None] * (head[1] + 1 - len(entries)))
+        entries[head[1]] = pos
+    heads = set(head[0] for head in graph['heads'][:num_outputs])
+    return nodes, node_entries, heads
+
+
+def estimate(model, shape, dtype=None, is_train=False, calibration=None):
+    """Statically estimates the compute and memory cost of a model.
+
+    The inferred graph is walked once, applying per-op formulas for
+    Convolution, Deconvolution, FullyConnected, Pooling, RNN, dot and
+    batch_dot, and a per-element cost for element-wise ops, activations and
+    normalizations. Peak memory is estimated from the liveness of the
+    outputs in topological order without in-place sharing, so it is an upper
+    bound of what the memory planner allocates. For the allocation of a
+    bound executor use :py:meth:`mxnet.executor.Executor.memory_plan`.
+
+    Parameters
+    ----------
+    model : Symbol or HybridBlock
+        The model. The parameters of a HybridBlock are not required to be initialized.
+    shape : dict of str to tuple, or list of tuple
+        Input shapes keyed by name for a Symbol. For a HybridBlock, the shape of each
+        of its inputs in order.
+    dtype : dict of str to numpy type, optional
+        Input types keyed by name. Defaults to float32.
+    is_train : bool
+        Whether to estimate a training pass, including backward flops, parameter
+        gradients and the activations kept for backward.
+    calibration : dict, optional
+        Seconds per unit of work for each op type as returned by :py:func:`calibrate`,
+        used to predict the latency of each layer and of the whole pass.
+
+    Returns
+    -------
+    dict
+        `layers` is a list with a dict per op node, holding `name`, `op`, `output_shape`,
+        `flops`, `macs`, `activation_bytes`, `param_bytes` and, with calibration,
+        `latency` in seconds. The totals `flops`, `macs`, `activation_bytes`,
+        `param_bytes`, `peak_bytes` and `latency` are summed over the graph.
+
+    Examples
+    --------
+    >>> net = mx.gluon.model_zoo.vision.resnet18_v1()
+    >>> cost = mx.contrib.cost_model.estimate(net, (1, 3, 224, 224))
+    >>> mx.contrib.cost_model.print_cost(cost)
+    """
+    sym, shape_dict = _as_symbol(model, shape)
+    internals = sym.get_internals()
+    _, out_shapes, _ = internals.infer_shape(**shape_dict)
+    if out_shapes is None:
+        raise ValueError("Input shape is incomplete")
+    type_dict = dict(dtype) if dtype is not None else {}
+    _, out_types, _ = internals.infer_type(**type_dict)
+    if out_types is None:
+        out_types = [None] * len(out_shapes)
+    entry_bytes = []
+    for s, t in zip(out_shapes, out_types):
+        name = t.__name__ if t is not None and hasattr(t, '__name__') else 'float32'
+        entry_bytes.append(_prod(s) * _DTYPE_BYTES.get(name, 4))
+
+    nodes, node_entries, heads = _map_outputs(sym)
+    # the last op node consuming each node, to free its outputs after it
+    last_use = {}
+    for nid, node in enumerate(nodes):
+        for inp in node['inputs']:
+            last_use[inp[0]] = nid
+
+    layers = []
+    totals = defaultdict(float)
+    param_bytes = 0
+    input_bytes = 0
+    live = 0
+    peak = 0
+    max_activation = 0
+    for nid, node in enumerate(nodes):
+        op = node['op']
+        if op == 'null':
+            if node['name'] in shape_dict:
+                input_bytes += entry_bytes[node_entries[nid][0]]
+            else:
+                param_bytes += entry_bytes[node_entries[nid][0]]
+            continue
+        attrs = node.get('attrs', {})
+        in_shapes = [out_shapes[node_entries[inp[0]][inp[1]]] for inp in node['inputs']]
+        outs = node_entries[nid]
+        flops, macs = _node_flops(op, attrs, in_shapes, [out_shapes[e] for e in outs])
+        if is_train:
+            flops *= 1 + _BACKWARD_FACTOR.get(op, 1)
+            macs *= 1 + _BACKWARD_FACTOR.get(op, 1)
+        activation = sum(entry_bytes[e] for e in outs)
+        layer_params = sum(entry_bytes[node_entries[inp[0]][inp[1]]] for inp in node['inputs']
+                           if nodes[inp[0]]['op'] == 'null'
+                           and nodes[inp[0]]['name'] not in shape_dict)
+        layer = {'name': node['name'], 'op': op,
+                 'output_shape': out_shapes[outs[0]] if outs else (),
+                 'flops': flops, 'macs': macs,
+                 'activation_bytes': activation, 'param_bytes': layer_params}
+        if calibration is not None:
+            coef = calibration.get(op, calibration.get('__default__', 0.0))
+            layer['latency'] = coef * (flops if flops > 0 else activation)
+            totals['latency'] += layer['latency']
+        layers.append(layer)
+        totals['flops'] += flops
+        totals['macs'] += macs
+        totals['activation_bytes'] += activation
+        max_activation = max(max_activation, activation)
+
+        live += activation
+        peak = max(peak, live)
+        if not is_train:
+            for inp in node['inputs']:
+                if last_use.get(inp[0]) == nid and nodes[inp[0]]['op'] != 'null' \
+                        and inp[0] not in heads:
+                    live -= sum(entry_bytes[e] for e in node_entries[inp[0]])
+
+    if is_train:
+        # forward activations are kept for backward, which additionally needs the
+        # parameter gradients and the gradients of the largest layer in flight
+        peak_bytes = 2 * param_bytes + input_bytes + totals['activation_bytes'] + \
+                     2 * max_activation
+    else:
+        peak_bytes = param_bytes + input_bytes + peak
+    report = {'layers': layers,
+              'flops': int(totals['flops']),
+              'macs': int(totals['macs']),
+              'activation_bytes': int(totals['activation_bytes']),
+              'param_bytes': param_bytes,
+              'peak_bytes': int(peak_bytes)}
+    if calibration is not None:
+        report['latency'] = totals['latency']
+    return report
+
+
+def _parse_aggregate_stats(stats):
+    """Returns total milliseconds and count of each name in a profiler.dumps() table."""
+    pattern = re.compile(r'^(\S+)\s+(\d+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)\s*$')
+    times = {}
+    for line in stats.splitlines():
+        match = pattern.match(line.strip())
+        if match:
+            times[match.group(1)] = (float(match.group(3)), int(match.group(2)))
+    return times
+
+
+def calibrate(model, shape, ctx=None, dtype=None, is_train=False, num_runs=10):
+    """Measures the time per unit of work of each op type of a model on a device.
+
+    The model is run with the profiler collecting aggregate statistics, and the
+    measured time of each op type is divided by its estimated flops, or by its
+    output bytes for ops without arithmetic. The result can be passed to
+    :py:func:`estimate` to predict the latency of this or other models on the same
+    device. Op types that were not measured use the average over all op types.
+
+    Parameters
+    ----------
+    model : Symbol or HybridBlock
+        The model to run. The initialized parameters of a HybridBlock are used,
+        other parameters and the inputs are random.
+    shape : dict of str to tuple, or list of tuple
+        Input shapes, as for :py:func:`estimate`.
+    ctx : Context
+        Device to measure on. Defaults to cpu.
+    dtype : dict of str to numpy type, optional
+        Input types keyed by name.
+    is_train : bool
+        Whether to measure training passes, including backward.
+    num_runs : int
+        Number of measured passes, after one warm up pass.
+
+    Returns
+    -------
+    dict of str to float
+        Seconds per unit of work keyed by op type, and the average under `__default__`.
+
+    Notes
+    -----
+    The profiler can not be running. Its configuration is changed while measuring
+    and the one set by :py:func:`mxnet.profiler.set_config` is restored after.
+    """
+    from .. import ndarray
+    if profiler._state == 'run':
+        raise RuntimeError("calibrate can not run while the profiler is running")
+    ctx = cpu() if ctx is None else ctx
+    sym, shape_dict = _as_symbol(model, shape)
+    params = {} if isinstance(model, Symbol) else model.collect_params()
+    exe = sym.simple_bind(ctx, grad_req='write' if is_train else 'null',
+                          type_dict=dtype, **shape_dict)
+    for name, arr in list(exe.arg_dict.items()) + list(exe.aux_dict.items()):
+        if name in params and params[name]._data is not None:
+            params[name]._data[0].copyto(arr)
+        elif name in exe.aux_dict:
+            arr[:] = 1 if name.endswith('var') else 0
+        else:
+            arr[:] = ndarray.random.uniform(-0.1, 0.1, shape=arr.shape, ctx=ctx)
+
+    def run():
+        exe.forward(is_train=is_train)
+        if is_train:
+            exe.backward([ndarray.ones_like(out) for out in exe.outputs])
+        for out in exe.outputs:
+            out.wait_to_read()
+
+    run()
+    config = profiler._config
+    # no trace file is written while measuring
+    profiler.set_config(profile_symbolic=True, profile_imperative=False, profile_memory=False,
+                        profile_api=False, aggregate_stats=True, continuous_dump=False,
+                        filename='')
+    try:
+        profiler.dumps(reset=True)
+        profiler.set_state('run')
+        for _ in range(num_runs):
+            run()
+        profiler.set_state('stop')
+        measured = _parse_aggregate_stats(profiler.dumps(reset=True))
+    finally:
+        profiler.set_state('stop')
+        if config is not None:
+            profiler.set_config(**config)
+        else:
+            # the configuration of a profiler that was never configured
+            profiler.set_config(profile_imperative=False, continuous_dump=False,
+                                aggregate_stats=False)
+        profiler._config = config
+
+    cost = estimate(sym, shape_dict, dtype=dtype, is_train=is_train)
+    work = defaultdict(float)
+    for layer in cost['layers']:
+        work[layer['op']] += layer['flops'] if layer['flops'] > 0 else layer['activation_bytes']
+    calibration = {}
+    total_time = 0.0
+    total_work = 0.0
+    for op, op_work in work.items():
+        time_ms = 0.0
+        for name in (op, '_backward_' + op):
+            if name in measured:
+                time_ms += measured[name][0]
+        if time_ms > 0 and op_work > 0:
+            seconds = time_ms / 1000.0 / num_runs
+            calibration[op] = seconds / op_work
+            total_time += seconds
+            total_work += op_work
+    calibration['__default__'] = total_time / total_work if total_work > 0 else 0.0
+    return calibration
+
+
+def print_cost(cost, line_length=120, positions=(.40, .60, .72, .84, 1.)):
+    """Prints the per-layer table and the totals of a cost estimate.
+
+    Parameters
+    ----------
+    cost : dict
+        Cost estimate returned by :py:func:`estimate`.
+    line_length : int
+        Total length of printed lines.
+    positions : tuple of float
+        Relative positions of the columns in each line.
+    """
+    positions = [int(line_length * p) for p in positions]
+    has_latency = 'latency' in cost
+
+    def print_row(fields):
+        line = ''
+        for i, field in enumerate(fields):
+            line += str(field)
+            line = line[:positions[i]]
+            line += ' ' * (positions[i] - len(line))
+        print(line)
+
+    print('_' * line_length)
+    print_row(['Layer (type)', 'Output Shape', 'MFLOPs', 'Act. KB',
+               'Latency (ms)' if has_latency else 'Param KB'])
+    print('=' * line_length)
+    for layer in cost['layers']:
+        last = '%.3f' % (layer['latency'] * 1e3) if has_latency \
+               else '%.1f' % (layer['param_bytes'] / 1024.)
+        print_row(['%s(%s)' % (layer['name'], layer['op']),
+                   'x'.join(str(x) for x in layer['output_shape']),
+                   '%.2f' % (layer['flops'] / 1e6),
+                   '%.1f' % (layer['activation_bytes'] / 1024.),
+                   last])
+    print('=' * line_length)
+    print('Total MFLOPs: %.2f, MMACs: %.2f' % (cost['flops'] / 1e6, cost['macs'] / 1e6))
+    print('Parameter MB: %.2f, activation MB: %.2f, peak MB: %.2f' % (
+        cost['param_bytes'] / 1024. ** 2, cost['activation_bytes'] / 1024. ** 2,
+        cost['peak_bytes'] / 1024. ** 2))
+    if has_latency:
+        print('Predicted latency (ms): %.3f' % (cost['latency'] * 1e3))
+    print('_' * line_length)
@@ -0,0 +1,317 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+# coding: utf-8
+# pylint: disable=too-many-locals, too-many-branches
+"""Graph optimizations of Symbols and their parameters for inference."""
+from __future__ import absolute_import
+
+import json
+import logging
+
+from .. import symbol
+from .. import ndarray as nd
+from ..context import cpu
+
+__all__ = ['optimize_for_inference', 'save_optimized']
+
+# ops that return their first input unchanged at inference
+_IDENTITY_OPS = ('_copy', 'identity', 'BlockGrad', 'stop_gradient', 'make_loss',
+                 'MakeLoss', '_CrossDeviceCopy')
+
+# ops whose results are not determined by their inputs
+_NONDETERMINISTIC_PREFIXES = ('_random_', '_sample_', 'random_', 'sample_', '_shuffle',
+                              'Dropout')
+
+_FOLDABLE_BN_INPUTS = ('Convolution', 'FullyConnected')
+
+
+def _attrs(node):
+    return node.get('attrs', node.get('attr', node.get('param', {})))
+
+
+def _is_true(value):
+    return str(value).lower() in ('true', '1')
+
+
+class _Graph(object):
+    """Mutable view of the nodes of a Symbol json."""
+    def __init__(self, sym):
+        graph = json.loads(sym.tojson())
+        self.nodes = graph['nodes']
+        for node in self.nodes:
+            node['attrs'] = _attrs(node)
+            node.pop('attr', None)
+            node.pop('param', None)
+        self.heads = [list(h) for h in graph['heads']]
+        self.graph_attrs = graph.get('attrs', {})
+        self.node_ids = {}
+
+    def consumers(self):
+        """Returns the number of uses of every output entry (node, index)."""
+        uses = {}
+        for node in self.nodes:
+            for entry in node['inputs']:
+                key = (entry[0], entry[1])
+                uses[key] = uses.get(key, 0) + 1
+        for entry in self.heads:
+            key = (entry[0], entry[1])
+            uses[key] = uses.get(key, 0) + 1
+        return uses
+
+    def add_variable(self, name):
+        self.nodes.append({'op': 'null', 'name': name, 'attrs': {}, 'inputs': []})
+        return len(self.nodes) - 1
+
+    def replace_entries(self, mapping):
+        """Redirects the uses of output entries according to mapping."""
+        def resolve(entry):
+            key = (entry[0], entry[1])
+            while key in mapping:
+                key = mapping[key]
+            return [key[0], key[1], 0]
+        for node in self.nodes:
+            node['inputs'] = [resolve(e) for e in node['inputs']]
+        self.heads = [resolve(e) for e in self.heads]
+
+    def to_symbol(self, heads=None):
+        """Returns the Symbol of the nodes reachable from heads, in topological order."""
+        heads = self.heads if heads is None else heads
+        order, visited = [], set()
+        for head in heads:
+            stack = [(head[0], False)]
+            while stack:
+                nid, expanded = stack.pop()
+                if expanded:
+                    order.append(nid)
+                    continue
+                if nid in visited:
+                    continue
+                visited.add(nid)
+                stack.append((nid, True))
+                for entry in reversed(self.nodes[nid]['inputs']):
+                    if entry[0] not in visited:
+                        stack.append((entry[0], False))
+        new_id = {nid: i for i, nid in enumerate(order)}
+        nodes = []
+        for nid in order:
+            node = dict(self.nodes[nid])
+            node['inputs'] = [[new_id[e[0]], e[1], 0] for e in node['inputs']]
+            nodes.append(node)
+        graph = {'nodes': nodes,
+                 'arg_nodes': [i for i, n in enumerate(nodes) if n['op'] == 'null'],
+                 'heads': [[new_id[h[0]], h[1], 0] for h in heads],
+                 'attrs': self.graph_attrs}
+        return symbol.load_json(json.dumps(graph))
+
+
+def _remove_identity(graph):
+    """Bypasses Dropout and identity ops."""
+    mapping = {}
+    for nid, node in enumerate(graph.nodes):
+        op = node['op']
+        if op == 'Dropout' and node['attrs'].get('mode', 'training') != 'always' or \
+                op in _IDENTITY_OPS:
+            entry = node['inputs'][0]
+            mapping[(nid, 0)] = (entry[0], entry[1])
+    graph.replace_entries(mapping)
+    return len(mapping)
+
+
+def _fold_constants(graph, params, ctx):
+    """Evaluates the outputs that only depend on parameters and replaces them by new
+    parameters."""
+    constant = []
+    for node in graph.nodes:
+        op = node['op']
+        if op == 'null':
+            constant.append(node['name'] in params)
+        elif op.startswith(_NONDETERMINISTIC_PREFIXES):
+            constant.append(False)
+        else:
+            constant.append(all(constant[e[0]] for e in node['inputs']))
+    # only the constant outputs used by other ops are evaluated
+    frontier = set()
+    for nid, node in enumerate(graph.nodes):
+        if constant[nid]:
+            continue
+        for e in node['inputs']:
+            if constant[e[0]] and graph.nodes[e[0]]['op'] != 'null':
+                frontier.add((e[0], e[1]))
+    for e in graph.heads:
+        if constant[e[0]] and graph.nodes[e[0]]['op'] != 'null':
+            frontier.add((e[0], e[1]))
+    mapping = {}
+    for nid, index in sorted(frontier):
+        sub = graph.to_symbol([[nid, index, 0]])
+        args = {name: params[name].as_in_context(ctx) for name in sub.list_arguments()}
+        aux = {name: params[name].as_in_context(ctx) for name in sub.list_auxiliary_states()}
+        exe = sub.bind(ctx, args, aux_states=aux, grad_req='null')
+        value = exe.forward(is_train=False)[0]
+        name = graph.nodes[nid]['name'] + ('_folded' if index == 0 else '_folded%d' % index)
+        params[name] = value.copyto(cpu())
+        mapping[(nid, index)] = (graph.add_variable(name), 0)
+    graph.replace_entries(mapping)
+    return len(mapping)
+
+
+def _fold_batchnorm(graph, params):
+    """Folds BatchNorm into the weights and bias of the preceding Convolution or
+    FullyConnected."""
+    uses = graph.consumers()
+    var_uses = {}
+    for node in graph.nodes:
+        for e in node['inputs']:
+            var_uses[e[0]] = var_uses.get(e[0], 0) + 1
+    mapping = {}
+    for bn_id, bn in enumerate(graph.nodes):
+        if bn['op'] != 'BatchNorm':
+            continue
+        attrs = bn['attrs']
+        entry = bn['inputs'][0]
+        layer_id = entry[0]
+        layer = graph.nodes[layer_id]
+        if layer['op'] not in _FOLDABLE_BN_INPUTS or uses.get((layer_id, 0), 0) != 1 or \
+                _is_true(attrs.get('output_mean_var', 'False')) or \
+                int(attrs.get('axis', 1)) != 1:
+            continue
+        layer_attrs = layer['attrs']
+        if layer['op'] == 'FullyConnected' and not _is_true(layer_attrs.get('flatten', 'True')):
+            continue
+        if layer['op'] == 'Convolution' and layer_attrs.get('layout', 'None') not in \
+                ('None', 'NCW', 'NCHW', 'NCDHW'):
+            continue
+        bn_names = [graph.nodes[e[0]]['name'] for e in bn['inputs'][1:]]
+        layer_inputs = layer['inputs']
+        weight_name = graph.nodes[layer_inputs[1][0]]['name']
+        no_bias = _is_true(layer_attrs.get('no_bias', 'False'))
+        names = [weight_name] + bn_names + ([] if no_bias else
+                                            [graph.nodes[layer_inputs[2][0]]['name']])
+        if any(name not in params for name in names):
+            continue
+        gamma, beta, mean, var = [params[name].astype('float32') for name in bn_names]
+        if _is_true(attrs.get('fix_gamma', 'True')):
+            gamma = nd.ones_like(gamma)
+        scale = gamma / nd.sqrt(var + float(attrs.get('eps', 1e-3)))
+        weight = params[weight_name]
+        shape = (-1,) + (1,) * (weight.ndim - 1)
+        new_weight = (weight.astype('float32') * scale.reshape(shape)).astype(weight.dtype)
+        bias = nd.zeros_like(mean) if no_bias else \
+            params[graph.nodes[layer_inputs[2][0]]['name']].astype('float32')
+        new_bias = ((bias - mean) * scale + beta).astype(weight.dtype)
+        # parameters shared with other ops are kept, and the folded ones are renamed
+        new_weight_name = weight_name if var_uses.get(layer_inputs[1][0], 0) == 1 else \
+            layer['name'] + '_bnfolded_weight'
+        new_bias_name = layer['name'] + '_bnfolded_bias'
+        params[new_weight_name] = new_weight
+        params[new_bias_name] = new_bias
+        weight_id = layer_inputs[1][0] if new_weight_name == weight_name else \
+            graph.add_variable(new_weight_name)
+        bias_id = graph.add_variable(new_bias_name)
+        layer['inputs'] = [layer_inputs[0], [weight_id, 0, 0], [bias_id, 0, 0]]
+        layer_attrs['no_bias'] = 'False'
+        mapping[(bn_id, 0)] = (layer_id, 0)
+    graph.replace_entries(mapping)
+    return len(mapping)
+
+
+def optimize_for_inference(sym, arg_params, aux_params, fold_batchnorm=True,
+                           fold_constants=True, remove_identity=True, ctx=None):
+    """Optimizes a Symbol and its parameters for inference.
+
+    The following passes are applied, in order:
+
+    - Dropout, except with `mode='always'`, and identity ops such as BlockGrad are
+      removed.
+    - The outputs of subgraphs that only depend on parameters are evaluated once and
+      stored as new parameters.
+    - BatchNorm following a Convolution or FullyConnected whose output it is the only
+      user of is folded into the weight and bias of that layer.
+
+    Parameters that are no longer used are dropped. The returned Symbol computes the
+    same outputs as `sym` in inference mode, up to floating point rounding.
+
+    Parameters
+    ----------
+    sym : Symbol
+        The Symbol to optimize.
+    arg_params : dict of str to NDArray
+        Argument parameters of the Symbol. Arguments missing from it, such as the data,
+        are treated as inputs.
+    aux_params : dict of str to NDArray
+        Auxiliary states of the Symbol.
+    fold_batchnorm : bool, default True
+        Whether to fold BatchNorm into the preceding layer.
+    fold_constants : bool, default True
+        Whether to evaluate subgraphs that only depend on parameters.
+    remove_identity : bool, default True
+        Whether to remove Dropout and identity ops.
+    ctx : Context, default cpu()
+        Context constant subgraphs are evaluated on.
+
+    Returns
+    -------
+    (Symbol, dict of str to NDArray, dict of str to NDArray)
+        The optimized Symbol, argument parameters and auxiliary states.
+    """
+    graph = _Graph(sym)
+    params = dict(aux_params)
+    params.update(arg_params)
+    stats = {}
+    if remove_identity:
+        stats['removed'] = _remove_identity(graph)
+    if fold_constants:
+        stats['constants'] = _fold_constants(graph, params, ctx if ctx else cpu())
+    if fold_batchnorm:
+        stats['batchnorm'] = _fold_batchnorm(graph, params)
+    out = graph.to_symbol()
+    logging.debug('optimize_for_inference: removed %d ops, folded %d constants and %d '
+                  'BatchNorm', stats.get('removed', 0), stats.get('constants', 0),
+                  stats.get('batchnorm', 0))
+    new_args = {name: params[name] for name in out.list_arguments() if name in params}
+    new_aux = {name: params[name] for name in out.list_auxiliary_states() if name in params}
+    return out, new_args, new_aux
+
+
+def save_optimized(prefix, epoch, sym, arg_params, aux_params, **kwargs):
+    """Optimizes a Symbol and its parameters with :py:func:`optimize_for_inference` and
+    saves them as a checkpoint, `prefix-symbol.json` and `prefix-epoch.params`, that can
+    be loaded by `SymbolBlock.imports` or `mxnet.model.load_checkpoint`.
+
+    Parameters
+    ----------
+    prefix : str
+        Prefix of the checkpoint files.
+    epoch : int
+        Epoch number of the checkpoint.
+    sym, arg_params, aux_params
+        The Symbol and parameters to optimize.
+    **kwargs
+        Passed to :py:func:`optimize_for_inference`.
+
+    Returns
+    -------
+    (Symbol, dict of str to NDArray, dict of str to NDArray)
+        The optimized Symbol, argument parameters and auxiliary states.
+    """
+    sym, arg_params, aux_params = optimize_for_inference(sym, arg_params, aux_params,
+                                                         **kwargs)
+    sym.save('%s-symbol.json' % prefix)
+    save_dict = {('arg:%s' % k): v.as_in_context(cpu()) for k, v in arg_params.items()}
+    save_dict.update({('aux:%s' % k): v.as_in_context(cpu()) for k, v in aux_params.items()})
+    nd.save('%s-%04d.params' % (prefix, epoch), save_dict)
+    return sym, arg_params, aux_params
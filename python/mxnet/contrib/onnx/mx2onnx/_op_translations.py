@@ -167,21 +167,34 @@ def convert_weights_and_inputs(node, **kwargs):
     if kwargs["is_input"] is False:
         weights = kwargs["weights"]
         initializer = kwargs["initializer"]
+        external_data = kwargs.get("external_data")
         np_arr = weights[name]
         data_type = onnx.mapping.NP_TYPE_TO_TENSOR_TYPE[np_arr.dtype]
         dims = np.shape(np_arr)
 
         tensor_node = onnx.helper.make_tensor_value_info(name, data_type, dims)
 
-        initializer.append(
-            onnx.helper.make_tensor(
-                name=name,
-                data_type=data_type,
-                dims=dims,
-                vals=np_arr.flatten().tolist(),
-                raw=False,
+        if external_data is not None and np_arr.nbytes >= external_data.threshold:
+            tensor = onnx.TensorProto()
+            tensor.name = name
+            tensor.data_type = data_type
+            tensor.dims.extend(dims)
+            tensor.data_location = onnx.TensorProto.EXTERNAL
+            for key, value in external_data.write(np_arr):
+                entry = tensor.external_data.add()
+                entry.key = key
+                entry.value = value
+            initializer.append(tensor)
+        else:
+            initializer.append(
+                onnx.helper.make_tensor(
+                    name=name,
+                    data_type=data_type,
+                    dims=dims,
+                    vals=np_arr.tobytes(),
+                    raw=True,
+                )
             )
-        )
 
         return [tensor_node]
     else:
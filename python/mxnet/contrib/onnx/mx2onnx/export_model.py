@@ -24,16 +24,18 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 import logging
+import os
 import numpy as np
 
 from ....base import string_types
 from .... import symbol
-from .export_onnx import MXNetGraph
+from .export_onnx import MXNetGraph, ExternalDataWriter
 from ._export_helper import load_module
 
 
 def export_model(sym, params, input_shape, input_type=np.float32,
-                 onnx_file_path='model.onnx', verbose=False):
+                 onnx_file_path='model.onnx', verbose=False, external_data=False,
+                 external_data_threshold=1024):
     """Exports the MXNet model file, passed as a parameter, into ONNX model.
     Accepts both symbol,parameter objects as well as json and params filepaths as input.
     Operator support and coverage -
@@ -53,6 +55,13 @@ def export_model(sym, params, input_shape, input_type=np.float32,
         Path where to save the generated onnx file
     verbose : Boolean
         If true will print logs of the model conversion
+    external_data : Boolean
+        If true, weights are streamed one at a time to `onnx_file_path` + '.data' and
+        referenced from the model as ONNX external data. This keeps the model below
+        the 2GB protobuf limit and avoids holding a serialized copy of all weights.
+    external_data_threshold : int
+        Weights smaller than this number of bytes are stored in the model even
+        when `external_data` is true.
 
     Returns
     -------
@@ -74,19 +83,29 @@ def export_model(sym, params, input_shape, input_type=np.float32,
     converter = MXNetGraph()
 
     data_format = np.dtype(input_type)
-    # if input parameters are strings(file paths), load files and create symbol parameter objects
-    if isinstance(sym, string_types) and isinstance(params, string_types):
-        logging.info("Converting json and weight file to sym and params")
-        sym_obj, params_obj = load_module(sym, params)
-        onnx_graph = converter.create_onnx_graph_proto(sym_obj, params_obj, input_shape,
-                                                       mapping.NP_TYPE_TO_TENSOR_TYPE[data_format],
-                                                       verbose=verbose)
-    elif isinstance(sym, symbol.Symbol) and isinstance(params, dict):
-        onnx_graph = converter.create_onnx_graph_proto(sym, params, input_shape,
-                                                       mapping.NP_TYPE_TO_TENSOR_TYPE[data_format],
-                                                       verbose=verbose)
-    else:
-        raise ValueError("Input sym and params should either be files or objects")
+    writer = None
+    if external_data:
+        writer = ExternalDataWriter(onnx_file_path + '.data', external_data_threshold)
+    try:
+        # if input parameters are strings(file paths), load files and create symbol parameter objects
+        if isinstance(sym, string_types) and isinstance(params, string_types):
+            logging.info("Converting json and weight file to sym and params")
+            sym_obj, params_obj = load_module(sym, params)
+            onnx_graph = converter.create_onnx_graph_proto(
+                sym_obj, params_obj, input_shape, mapping.NP_TYPE_TO_TENSOR_TYPE[data_format],
+                verbose=verbose, external_data=writer)
+        elif isinstance(sym, symbol.Symbol) and isinstance(params, dict):
+            onnx_graph = converter.create_onnx_graph_proto(
+                sym, params, input_shape, mapping.NP_TYPE_TO_TENSOR_TYPE[data_format],
+                verbose=verbose, external_data=writer)
+        else:
+            raise ValueError("Input sym and params should either be files or objects")
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        logging.info("Weights of the ONNX model saved to %s",
+                     os.path.join(os.path.dirname(onnx_file_path), writer.location))
 
     # Create the model (ModelProto)
     onnx_model = helper.make_model(onnx_graph)
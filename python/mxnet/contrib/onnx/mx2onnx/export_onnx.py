@@ -53,10 +53,62 @@ from __future__ import print_function
 from __future__ import unicode_literals
 import logging
 import json
+import os
+
+import numpy as np
 
 from .... import ndarray as nd
 
 
+class ExternalDataWriter(object):
+    """Writes tensors one at a time to a file next to the ONNX model, to be
+    referenced as ONNX external data instead of being stored in the model.
+
+    Parameters
+    ----------
+    path : str
+        Path of the external data file. It is referenced by its base name, so it
+        must be in the directory of the ONNX model.
+    threshold : int
+        Tensors smaller than this number of bytes are stored in the model.
+    """
+    def __init__(self, path, threshold=1024):
+        self.location = os.path.basename(path)
+        self.threshold = threshold
+        self._file = open(path, 'wb')
+
+    def write(self, np_arr):
+        """Appends a tensor to the file and returns its external data entries."""
+        offset = self._file.tell()
+        np.ascontiguousarray(np_arr).tofile(self._file)
+        return [('location', self.location), ('offset', str(offset)),
+                ('length', str(np_arr.nbytes))]
+
+    def close(self):
+        """Closes the file."""
+        self._file.close()
+
+
+class _NumpyWeights(object):
+    """Read-only mapping converting each weight to numpy only when it is accessed,
+    so that a single weight is copied at a time."""
+    def __init__(self, weights_dict):
+        self._weights = dict([(k.replace("arg:", "").replace("aux:", ""), v)
+                              for k, v in weights_dict.items()])
+
+    def __getitem__(self, key):
+        return self._weights[key].asnumpy()
+
+    def __contains__(self, key):
+        return key in self._weights
+
+    def __len__(self):
+        return len(self._weights)
+
+    def keys(self):
+        return self._weights.keys()
+
+
 class MXNetGraph(object):
     """Class to convert MXNet to ONNX graph"""
     registry_ = {}
@@ -161,7 +213,8 @@ class MXNetGraph(object):
         return dict([(k.replace("arg:", "").replace("aux:", ""), v.asnumpy())
                      for k, v in weights_dict.items()])
 
-    def create_onnx_graph_proto(self, sym, params, in_shape, in_type, verbose=False):
+    def create_onnx_graph_proto(self, sym, params, in_shape, in_type, verbose=False,
+                                external_data=None):
         """Convert MXNet graph to ONNX graph
 
         Parameters
@@ -176,6 +229,9 @@ class MXNetGraph(object):
             Input data type e.g. np.float32
         verbose : Boolean
             If true will print logs of the model conversion
+        external_data : ExternalDataWriter, optional
+            If given, weights are written to it as they are converted and referenced
+            as external data, instead of being stored in the graph
 
         Returns
         -------
@@ -196,7 +252,8 @@ class MXNetGraph(object):
         # Deriving the output_label name.
         output_label = sym.get_internals()[len(sym.get_internals()) - 1].name + "_label"
 
-        weights = MXNetGraph.convert_weights_to_numpy(params)
+        # weights are converted one at a time, when their initializer is created
+        weights = _NumpyWeights(params)
 
         mx_graph = json.loads(sym.tojson())["nodes"]
 
@@ -235,7 +292,8 @@ class MXNetGraph(object):
                     in_type=in_type,
                     proc_nodes=all_processed_nodes,
                     initializer=initializer,
-                    index_lookup=index_lookup)
+                    index_lookup=index_lookup,
+                    external_data=external_data)
                 graph_input_idx += 1
 
             else:
@@ -250,7 +308,8 @@ class MXNetGraph(object):
                     proc_nodes=all_processed_nodes,
                     initializer=initializer,
                     index_lookup=index_lookup,
-                    idx=idx
+                    idx=idx,
+                    external_data=external_data
                 )
 
             if isinstance(converted, list):
@@ -307,7 +366,13 @@ class MXNetGraph(object):
             onnx_processed_outputs
         )
 
-        graph.initializer.extend(initializer)
+        # external tensors are added after checking the graph, as the checker
+        # may try to resolve their location relative to the working directory.
+        # data_location is missing before onnx 1.5, 1 is TensorProto.EXTERNAL
+        external = [t for t in initializer if getattr(t, 'data_location', 0) == 1]
+        graph.initializer.extend([t for t in initializer
+                                  if getattr(t, 'data_location', 0) != 1])
 
         checker.check_graph(graph)
+        graph.initializer.extend(external)
         return graph
@@ -19,8 +19,18 @@
 """Functions for importing ONNX models to MXNet and for checking metadata"""
 # pylint: disable=no-member
 
+import os
+
 from .import_onnx import GraphProto
 
+def _load_model(onnx, model_file):
+    """Loads an ONNX model without loading the tensors stored as external data."""
+    try:
+        return onnx.load_model(model_file, load_external_data=False)
+    except TypeError:
+        # onnx < 1.5 doesn't support external data
+        return onnx.load_model(model_file)
+
 def import_model(model_file):
     """Imports the ONNX model file, passed as a parameter, into MXNet symbol and parameters.
     Operator support and coverage -
@@ -54,9 +64,11 @@ def import_model(model_file):
     except ImportError:
         raise ImportError("Onnx and protobuf need to be installed. "
                           + "Instructions to install - https://github.com/onnx/onnx")
-    # loads model file and returns ONNX protobuf object
-    model_proto = onnx.load_model(model_file)
-    sym, arg_params, aux_params = graph.from_onnx(model_proto.graph)
+    # loads model file and returns ONNX protobuf object,
+    # tensors stored as external data are memory-mapped when they are parsed
+    model_proto = _load_model(onnx, model_file)
+    sym, arg_params, aux_params = graph.from_onnx(
+        model_proto.graph, os.path.dirname(os.path.abspath(model_file)))
     return sym, arg_params, aux_params
 
 def get_model_metadata(model_file):
@@ -88,6 +100,6 @@ def get_model_metadata(model_file):
     except ImportError:
         raise ImportError("Onnx and protobuf need to be installed. "
                           + "Instructions to install - https://github.com/onnx/onnx")
-    model_proto = onnx.load_model(model_file)
+    model_proto = _load_model(onnx, model_file)
     metadata = graph.get_graph_metadata(model_proto.graph)
     return metadata
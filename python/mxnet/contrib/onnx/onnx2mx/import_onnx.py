@@ -19,6 +19,7 @@
 # pylint: disable=invalid-name,too-many-locals,no-self-use
 """ Support import export formats."""
 from __future__ import absolute_import as _abs
+import os
 import numpy as np
 from .... import symbol
 from .... import ndarray as nd
@@ -37,6 +38,7 @@ class GraphProto(object): # pylint: disable=too-few-public-methods
         self.aux_dict = {}
         self.arg_dict = {}
         self.model_metadata = {}
+        self._base_dir = None
 
     def _convert_operator(self, node_name, op_name, attrs, inputs):
         """Convert from onnx operator to mxnet operator.
@@ -73,13 +75,16 @@ class GraphProto(object): # pylint: disable=too-few-public-methods
             return mxnet_sym
         return op_name
 
-    def from_onnx(self, graph):
+    def from_onnx(self, graph, base_dir=None):
         """Construct symbol from onnx graph.
 
         Parameters
         ----------
         graph : onnx protobuf object
             The loaded onnx graph
+        base_dir : str, optional
+            Directory of the model file, where the files of tensors stored as
+            external data are looked up. Defaults to the working directory.
 
         Returns
         -------
@@ -88,6 +93,7 @@ class GraphProto(object): # pylint: disable=too-few-public-methods
         params : dict
             A dict of name: nd.array pairs, used as pretrained weights
         """
+        self._base_dir = base_dir
         # get input, output shapes
         self.model_metadata = self.get_graph_metadata(graph)
         # parse network inputs, aka parameters
@@ -118,13 +124,13 @@ class GraphProto(object): # pylint: disable=too-few-public-methods
             for k, i in zip(list(node.output), range(len(mxnet_sym.list_outputs()))):
                 self._nodes[k] = mxnet_sym[i]
 
-            # splitting params into args and aux params
+            # splitting params into args and aux params, sharing the parsed arrays
             for args in mxnet_sym.list_arguments():
                 if args in self._params:
-                    self.arg_dict.update({args: nd.array(self._params[args])})
+                    self.arg_dict.update({args: self._params[args]})
             for aux in mxnet_sym.list_auxiliary_states():
                 if aux in self._params:
-                    self.aux_dict.update({aux: nd.array(self._params[aux])})
+                    self.aux_dict.update({aux: self._params[aux]})
 
         # now return the outputs
         out = [self._nodes[i.name] for i in graph.output]
@@ -157,7 +163,7 @@ class GraphProto(object): # pylint: disable=too-few-public-methods
                    }
         return metadata
 
-    def graph_to_gluon(self, graph, ctx):
+    def graph_to_gluon(self, graph, ctx, base_dir=None):
         """Construct SymbolBlock from onnx graph.
 
         Parameters
@@ -166,13 +172,16 @@ class GraphProto(object): # pylint: disable=too-few-public-methods
             The loaded onnx graph
         ctx : Context or list of Context
             Loads the model into one or many context(s).
+        base_dir : str, optional
+            Directory of the model file, where the files of tensors stored as
+            external data are looked up.
 
         Returns
         -------
         sym_block :gluon.nn.SymbolBlock
             The returned gluon SymbolBlock
         """
-        sym, arg_params, aux_params = self.from_onnx(graph)
+        sym, arg_params, aux_params = self.from_onnx(graph, base_dir)
         metadata = self.get_graph_metadata(graph)
         data_names = [input_tensor[0] for input_tensor in metadata['input_tensor_data']]
         data_inputs = [symbol.var(data_name) for data_name in data_names]
@@ -197,6 +206,9 @@ class GraphProto(object): # pylint: disable=too-few-public-methods
         except ImportError:
             raise ImportError("Onnx and protobuf need to be installed. "
                               + "Instructions to install - https://github.com/onnx/onnx")
+        # data_location is missing before onnx 1.5, 1 is TensorProto.EXTERNAL
+        if getattr(tensor_proto, 'data_location', 0) == 1:
+            return self._parse_external_array(tensor_proto)
         if len(tuple(tensor_proto.dims)) > 0:
             np_array = to_array(tensor_proto).reshape(tuple(tensor_proto.dims))
         else:
@@ -204,6 +216,20 @@ class GraphProto(object): # pylint: disable=too-few-public-methods
             np_array = np.array([to_array(tensor_proto)])
         return nd.array(np_array)
 
+    def _parse_external_array(self, tensor_proto):
+        """Memory-map a tensor stored as external data and copy it to an NDArray,
+        so that the file is read one tensor at a time without intermediate copies."""
+        from onnx.mapping import TENSOR_TYPE_TO_NP_TYPE
+        info = dict((entry.key, entry.value) for entry in tensor_proto.external_data)
+        path = os.path.join(self._base_dir or '', info['location'])
+        dtype = TENSOR_TYPE_TO_NP_TYPE[tensor_proto.data_type]
+        shape = tuple(tensor_proto.dims) if len(tensor_proto.dims) > 0 else (1,)
+        np_array = np.memmap(path, dtype=dtype, mode='r', shape=shape,
+                             offset=int(info.get('offset', 0)))
+        array = nd.array(np_array, dtype=dtype)
+        del np_array
+        return array
+
     def _parse_attr(self, attr_proto):
         """Convert a list of AttributeProto to a dict, with names as keys."""
         attrs = {}
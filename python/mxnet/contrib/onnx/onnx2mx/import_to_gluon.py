@@ -19,7 +19,10 @@
 """Import ONNX model to gluon interface"""
 # pylint: disable=no-member
 
+import os
+
 from .import_onnx import GraphProto
+from .import_model import _load_model
 
 def import_to_gluon(model_file, ctx):
     """
@@ -48,6 +51,7 @@ def import_to_gluon(model_file, ctx):
     except ImportError:
         raise ImportError("Onnx and protobuf need to be installed. Instructions to"
                           + " install - https://github.com/onnx/onnx#installation")
-    model_proto = onnx.load_model(model_file)
-    net = graph.graph_to_gluon(model_proto.graph, ctx)
+    model_proto = _load_model(onnx, model_file)
+    net = graph.graph_to_gluon(model_proto.graph, ctx,
+                               os.path.dirname(os.path.abspath(model_file)))
     return net
@@ -20,13 +20,117 @@
 SVRG optimization logic.
 """
 
+import math
 import time
 import logging
 import mxnet as mx
+from mxnet.io import DataDesc
 from mxnet.module import Module
+from mxnet.module.executor_group import _load_data, _load_label
 from .svrg_optimizer import _SVRGOptimizer
 
 
+class _SnapshotExecutors(object):
+    """Executors computing the gradients at the snapshot weights of a SVRGModule, used in place of
+    a second Module when `shared_snapshot` is set. They read the data and labels of the executors of
+    the module and share their memory pool, so that only the snapshot weights, auxiliary states and
+    gradients are allocated.
+
+    As the memory pool is shared, the snapshot gradients of a batch are computed in `forward`, before
+    the forward pass of the module, and without head gradients: the outputs must be losses.
+
+    Parameters
+    ----------
+    module : SVRGModule
+        The module whose executors are shared.
+    """
+    def __init__(self, module):
+        self._module = module
+        self.binded = False
+        self.execs = []
+        self.grad_arrays = []
+
+    def _reset_bind(self):
+        """Releases the executors and the snapshot."""
+        self.binded = False
+        self.execs = []
+        self.grad_arrays = []
+
+    def bind(self):
+        """Binds the executors on the current executors of the module. The snapshot is kept when
+        rebinding, e.g. after the module is reshaped."""
+        exec_group = self._module._exec_group
+        param_names = set(exec_group.param_names)
+        old_execs = self.execs
+        self.execs = []
+        for i, exe in enumerate(exec_group.execs):
+            old = old_execs[i] if i < len(old_execs) else None
+            args, args_grad, grad_req = {}, {}, {}
+            for name, arr in exe.arg_dict.items():
+                if name not in param_names:
+                    # data and labels are read from the executor of the module
+                    args[name] = arr
+                    grad_req[name] = 'null'
+                    continue
+                args[name] = old.arg_dict[name] if old else mx.nd.zeros_like(arr)
+                grad = exe.grad_dict.get(name)
+                if grad is None:
+                    grad_req[name] = 'null'
+                else:
+                    args_grad[name] = old.grad_dict[name] if old else mx.nd.zeros_like(grad)
+                    grad_req[name] = 'write'
+            aux_states = {name: old.aux_dict[name] if old else mx.nd.zeros_like(arr)
+                          for name, arr in exe.aux_dict.items()}
+            self.execs.append(exe._symbol.bind(exe._ctx, args, args_grad=args_grad, grad_req=grad_req,
+                                               aux_states=aux_states, group2ctx=exe._group2ctx,
+                                               shared_exec=exe))
+        self.grad_arrays = [[exe.grad_dict.get(name) for exe in self.execs]
+                            for name in exec_group.param_names]
+        self.binded = True
+
+    def take_snapshot(self):
+        """Copies the current weights and auxiliary states of the module on every device."""
+        exec_group = self._module._exec_group
+        for exe, snapshot in zip(exec_group.execs, self.execs):
+            for name in exec_group.param_names:
+                exe.arg_dict[name].copyto(snapshot.arg_dict[name])
+            for name, arr in exe.aux_dict.items():
+                arr.copyto(snapshot.aux_dict[name])
+
+    def forward(self, data_batch, is_train=None):  # pylint: disable=unused-argument
+        """Computes the gradients at the snapshot weights on a batch, on all devices in parallel."""
+        module = self._module
+        if not isinstance(data_batch, list):
+            data_shapes = tuple(arr.shape for arr in data_batch.data)
+            if data_shapes != tuple(desc.shape for desc in module._data_shapes):
+                # reshaping the module rebinds the snapshot executors
+                data_descs = getattr(data_batch, 'provide_data', None) or \
+                    [DataDesc(desc.name, shape, desc.dtype, desc.layout)
+                     for desc, shape in zip(module._data_shapes, data_shapes)]
+                label_descs = getattr(data_batch, 'provide_label', None)
+                if not label_descs and data_batch.label and module._label_shapes:
+                    label_descs = [DataDesc(desc.name, arr.shape, desc.dtype, desc.layout)
+                                   for desc, arr in zip(module._label_shapes, data_batch.label)]
+                module.reshape(data_descs, label_descs)
+        exec_group = module._exec_group
+        _load_data(data_batch, exec_group.data_arrays, exec_group.data_layouts)
+        labels = data_batch[0].label if isinstance(data_batch, list) else data_batch.label
+        if exec_group.label_arrays is not None and labels:
+            _load_label(data_batch, exec_group.label_arrays, exec_group.label_layouts)
+        for exe in self.execs:
+            exe.forward(is_train=True)
+            exe.backward()
+
+    def backward(self, out_grads=None):
+        """The gradients are computed in `forward`, only loss outputs are supported."""
+        if out_grads is not None:
+            raise ValueError("SVRGModule with shared_snapshot=True only supports loss outputs, "
+                             "out_grads cannot be given to backward")
+
+    def prepare(self, data_batch, sparse_row_id_fn=None):  # pylint: disable=unused-argument
+        """The snapshot holds all the rows of the weights, nothing needs to be prepared."""
+
+
 class SVRGModule(Module):
     """SVRGModule is a module that encapsulates two Modules to accommodate the SVRG optimization technique.
     It is functionally the same as Module API, except it is implemented using SVRG optimization logic.
@@ -59,6 +163,17 @@ class SVRGModule(Module):
     update_freq: int
         Specifies the number of times to update the full gradients to be used in the SVRG optimization. For instance, \
         update_freq = 2 will calculates the gradients over all data every two epochs
+    full_grad_ratio : float
+        Default 1.0. Fraction of the batches of the training data used to estimate the full
+        gradients, taken evenly spaced through the epoch. For instance, full_grad_ratio = 0.1
+        estimates them from one batch out of ten, which makes the snapshots ten times cheaper on
+        large datasets at the cost of a noisier estimate. The skipped batches are still read.
+    shared_snapshot : bool
+        Default ``False``. Whether to compute the snapshot gradients with executors sharing the
+        inputs and the memory pool of the executors of this module, instead of an auxiliary Module.
+        Only a copy of the weights, auxiliary states and gradients is then kept for the snapshot,
+        instead of a second set of executors with their own activations. The outputs of the
+        symbol must be losses.
 
     Examples
     --------
@@ -71,7 +186,7 @@ class SVRGModule(Module):
     def __init__(self, symbol, data_names=('data',), label_names=('softmax_label',),
                  logger=logging, context=mx.cpu(), work_load_list=None,
                  fixed_param_names=None, state_names=None, group2ctxs=None,
-                 compression_params=None, update_freq=None):
+                 compression_params=None, update_freq=None, full_grad_ratio=1.0, shared_snapshot=False):
         super(SVRGModule, self).__init__(symbol, data_names=data_names, label_names=label_names, logger=logger,
                                          context=context, work_load_list=work_load_list,
                                          fixed_param_names=fixed_param_names, state_names=state_names,
@@ -87,8 +202,17 @@ class SVRGModule(Module):
             raise TypeError("update_freq in SVRGModule must be an integer to represent the frequency for "
                             "calculating full gradients")
 
-        self._mod_aux = mx.mod.Module(symbol, data_names, label_names, logger, context, work_load_list,
-                                      fixed_param_names, state_names, group2ctxs, compression_params)
+        if not 0 < full_grad_ratio <= 1:
+            raise ValueError("full_grad_ratio in SVRGModule must be in (0, 1] to represent the fraction of "
+                             "batches used for calculating full gradients")
+        self.full_grad_ratio = full_grad_ratio
+        self.shared_snapshot = shared_snapshot
+
+        if shared_snapshot:
+            self._mod_aux = _SnapshotExecutors(self)
+        else:
+            self._mod_aux = mx.mod.Module(symbol, data_names, label_names, logger, context, work_load_list,
+                                          fixed_param_names, state_names, group2ctxs, compression_params)
 
         self._param_dict = None
         self._ctx_len = len(self._context)
@@ -109,7 +233,10 @@ class SVRGModule(Module):
             Typically is ``data_iter.provide_label``.
         """
         super(SVRGModule, self).reshape(data_shapes, label_shapes=label_shapes)
-        self._mod_aux.reshape(data_shapes, label_shapes=label_shapes)
+        if self.shared_snapshot:
+            self._mod_aux.bind()
+        else:
+            self._mod_aux.reshape(data_shapes, label_shapes=label_shapes)
 
     def init_optimizer(self, kvstore='local', optimizer='sgd',
                        optimizer_params=(('learning_rate', 0.01),), force_init=False):
@@ -226,8 +353,11 @@ class SVRGModule(Module):
                                      shared_module, grad_req)
 
         if for_training:
-            self._mod_aux.bind(data_shapes, label_shapes, for_training, inputs_need_grad, force_rebind, shared_module,
-                               grad_req)
+            if self.shared_snapshot:
+                self._mod_aux.bind()
+            else:
+                self._mod_aux.bind(data_shapes, label_shapes, for_training, inputs_need_grad, force_rebind,
+                                   shared_module, grad_req)
 
     def forward(self, data_batch, is_train=None):
         """Forward computation for both two modules. It supports data batches with different shapes, such as
@@ -247,11 +377,19 @@ class SVRGModule(Module):
         is_train : bool
             Default is ``None``, which means ``is_train`` takes the value of ``self.for_training``.
         """
-        super(SVRGModule, self).forward(data_batch, is_train)
-
+        # the snapshot executors may share the memory pool of this module, so they run first
+        if is_train and self.shared_snapshot:
+            # the snapshot reshapes this module if needed and loads the batch into the
+            # arrays it shares with it, so the batch is not loaded twice
+            self._mod_aux.forward(data_batch, is_train)
+            for exe in self._exec_group.execs:
+                exe.forward(is_train=is_train)
+            return
         if is_train:
             self._mod_aux.forward(data_batch, is_train)
 
+        super(SVRGModule, self).forward(data_batch, is_train)
+
     def backward(self, out_grads=None):
         """Backward computation.
 
@@ -289,9 +427,19 @@ class SVRGModule(Module):
         self._update_svrg_gradients()
         super(SVRGModule, self).update()
 
+    def _aux_grad_arrays(self):
+        """Returns the gradients at the snapshot weights, as a list over parameters of lists over devices."""
+        if self.shared_snapshot:
+            return self._mod_aux.grad_arrays
+        return self._mod_aux._exec_group.grad_arrays
+
     def update_full_grads(self, train_data):
         """Computes the gradients over all data w.r.t weights of past
-        m epochs. For distributed env, it will accumulate full grads in the kvstore.
+        m epochs, or over the fraction `full_grad_ratio` of the batches. The batches are
+        split over the devices, which run in parallel. For distributed env, the full grads of all
+        workers are accumulated in the kvstore. The data is not sharded here: `train_data` of each
+        worker should only yield that worker's part of the data, for example by creating a
+        record iterator with `num_parts=kv.num_workers` and `part_index=kv.rank`.
 
         Parameters
         ----------
@@ -299,22 +447,30 @@ class SVRGModule(Module):
             Train data iterator
         """
         param_names = self._exec_group.param_names
-        arg, aux = self.get_params()
-        self._mod_aux.set_params(arg_params=arg, aux_params=aux)
+        if self.shared_snapshot:
+            self._mod_aux.take_snapshot()
+        else:
+            arg, aux = self.get_params()
+            self._mod_aux.set_params(arg_params=arg, aux_params=aux)
+        for ctx in range(self._ctx_len):
+            for name in param_names:
+                self._param_dict[ctx][name][:] = 0
         train_data.reset()
         nbatch = 0
-        padding = 0
+        true_num_batch = 0.
         for batch in train_data:
+            nbatch += 1
+            # batches evenly spaced through the epoch, starting with the first one
+            if math.ceil(nbatch * self.full_grad_ratio) == math.ceil((nbatch - 1) * self.full_grad_ratio):
+                continue
             self._mod_aux.forward(batch, is_train=True)
             self._mod_aux.backward()
-            nbatch += 1
+            aux_grads = self._aux_grad_arrays()
             for ctx in range(self._ctx_len):
                 for index, name in enumerate(param_names):
-                    grads = self._mod_aux._exec_group.grad_arrays[index][ctx]
-                    self._param_dict[ctx][name] = mx.nd.broadcast_add(self._param_dict[ctx][name], grads, axis=0)
-            padding = batch.pad
+                    self._param_dict[ctx][name] += aux_grads[index][ctx]
+            true_num_batch += 1 - float(batch.pad or 0) / train_data.batch_size
 
-        true_num_batch = nbatch - padding / train_data.batch_size
         for name in param_names:
             grad_list = []
             for i in range(self._ctx_len):
@@ -383,10 +539,11 @@ class SVRGModule(Module):
         """Calculates gradients based on the SVRG update rule.
         """
         param_names = self._exec_group.param_names
+        aux_grads = self._aux_grad_arrays()
         for ctx in range(self._ctx_len):
             for index, name in enumerate(param_names):
                 g_curr_batch_reg = self._exec_group.grad_arrays[index][ctx]
-                g_curr_batch_special = self._mod_aux._exec_group.grad_arrays[index][ctx]
+                g_curr_batch_special = aux_grads[index][ctx]
                 g_special_weight_all_batch = self._param_dict[ctx][name]
                 g_svrg = self._svrg_grads_update_rule(g_curr_batch_reg, g_curr_batch_special,
                                                       g_special_weight_all_batch)
@@ -0,0 +1,339 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+# coding: utf-8
+"""Step time telemetry based on engine timestamps, with streaming latency percentiles."""
+from __future__ import absolute_import
+
+import ctypes
+import json
+import logging
+import math
+import os
+import threading
+from collections import deque, OrderedDict
+
+from ..engine import record_timestamp
+from ..ndarray import NDArray, waitall
+
+__all__ = ['LatencyHistogram', 'StepTelemetry']
+
+
+class LatencyHistogram(object):
+    """Streaming estimate of the quantiles of a latency.
+
+    Latencies are counted in logarithmic buckets, so that quantiles are estimated
+    with a relative error of at most `precision` / 2 in constant memory, whatever
+    the number of samples.
+
+    Parameters
+    ----------
+    precision : float, default 0.02
+        Relative width of the buckets.
+    """
+    def __init__(self, precision=0.02):
+        self._log_base = math.log1p(precision)
+        self._counts = {}
+        self.count = 0
+        self.sum = 0.
+        self.max = 0.
+
+    def add(self, value):
+        """Adds a latency in seconds."""
+        bucket = int(math.floor(math.log(max(value, 1e-9)) / self._log_base))
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Returns the estimated q-quantile, or nan when no latency was added."""
+        if not self.count:
+            return float('nan')
+        target = q * self.count
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= target:
+                return min(math.exp((bucket + 0.5) * self._log_base), self.max)
+        return self.max
+
+
+def _flatten(arrays):
+    """Returns the NDArrays of a possibly nested list."""
+    if arrays is None:
+        return []
+    if isinstance(arrays, NDArray):
+        return [arrays]
+    return [a for arr in arrays for a in _flatten(arr)]
+
+
+def _exec_group(module):
+    """Returns the executor group of a Module or of the current Module of a BucketingModule."""
+    while hasattr(module, '_curr_module'):
+        module = module._curr_module
+    return getattr(module, '_exec_group', None)
+
+
+class StepTelemetry(object):
+    """Records the wall time of training steps split into phases, without synchronizing.
+
+    The end of each phase is timestamped by the engine once the arrays written by the
+    phase are ready, so recording does not wait for the computation. Each phase is
+    charged the time between its end and the end of the previous phase; time during
+    which a phase overlapped with the previous ones, such as data loading hidden behind
+    computation, is not counted. Steps are accounted once all their timestamps are set,
+    and quantiles of the step time and of every phase are kept in
+    :py:class:`LatencyHistogram`.
+
+    Pass it to `Module.fit` with the `telemetry` argument, which records the 'forward',
+    'backward', 'comm', 'update' and 'data' phases, or mark the phases of a Gluon loop::
+
+        telemetry = StepTelemetry(frequent=100, path='telemetry.prom')
+        for data, label in train_data:
+            telemetry.begin_step()
+            with autograd.record():
+                loss = loss_fn(net(data), label)
+            telemetry.mark('forward', loss)
+            loss.backward()
+            grads = [p.grad() for p in params]
+            telemetry.mark('backward', grads)
+            trainer.allreduce_grads()
+            telemetry.mark('comm', grads)
+            trainer.update(batch_size)
+            telemetry.mark('update', [p.data() for p in params])
+            telemetry.end_step()
+
+    When parameters are updated on the kvstore, the communication is part of 'update'.
+    Steps are accounted asynchronously, call :py:meth:`flush` to account the last ones,
+    e.g. at the end of training. `Module.fit` does it when it returns.
+
+    Parameters
+    ----------
+    quantiles : tuple of float, default (0.5, 0.9, 0.99)
+        Quantiles to report.
+    frequent : int, default 0
+        Logs a summary and writes `path` every `frequent` accounted steps. 0 disables it.
+    path : str, optional
+        File the statistics are written to, as JSON if it ends with '.json' and in the
+        Prometheus text format otherwise.
+    batch_size : int, optional
+        Number of samples of a step, used to report samples per second.
+    logger : Logger, optional
+        Logger of the summaries, defaults to the root logger.
+    """
+    def __init__(self, quantiles=(0.5, 0.9, 0.99), frequent=0, path=None,
+                 batch_size=None, logger=None):
+        self.quantiles = tuple(quantiles)
+        self.frequent = frequent
+        self.path = path
+        self.batch_size = batch_size
+        self.logger = logger if logger else logging
+        self.num_steps = 0
+        self._histograms = OrderedDict([('step', LatencyHistogram())])
+        self._marks = None
+        self._pending = deque()
+        self._last_end = None
+        self._lock = threading.Lock()
+        self._server = None
+
+    @staticmethod
+    def _timestamp(arrays):
+        out = ctypes.c_int64(0)
+        record_timestamp(_flatten(arrays), out)
+        return out
+
+    def begin_step(self):
+        """Starts a step at the current time."""
+        if self._marks:
+            self.end_step()
+        self._marks = [('begin', self._timestamp([]))]
+
+    def mark(self, phase, arrays=None):
+        """Ends a phase of the current step once all pending writes to `arrays` are done.
+
+        Parameters
+        ----------
+        phase : str
+            Name of the phase.
+        arrays : NDArray or list of NDArray, optional
+            Arrays written by the phase. Without arrays the phase ends at the current
+            time, which suits work done in Python such as waiting for data.
+        """
+        if self._marks is None:
+            self.begin_step()
+        self._marks.append((phase, self._timestamp(arrays)))
+
+    def end_step(self):
+        """Ends the current step, and accounts the steps whose timestamps are all set."""
+        if self._marks:
+            self._pending.append(self._marks)
+        self._marks = None
+        num_steps = self.num_steps
+        with self._lock:
+            self._collect()
+        if self.frequent and self.num_steps // self.frequent > num_steps // self.frequent:
+            self.log()
+            if self.path:
+                self.dump(self.path)
+
+    def _collect(self):
+        while self._pending and all(ts.value for _, ts in self._pending[0]):
+            marks = self._pending.popleft()
+            begin = marks[0][1].value
+            start = begin if self._last_end is None else max(begin, self._last_end)
+            prev = start
+            for phase, ts in marks[1:]:
+                end = ts.value
+                if phase not in self._histograms:
+                    self._histograms[phase] = LatencyHistogram()
+                self._histograms[phase].add(max(0, end - prev) / 1e6)
+                prev = max(prev, end)
+            step_begin = begin if self._last_end is None else self._last_end
+            self._histograms['step'].add(max(0, prev - step_begin) / 1e6)
+            self._last_end = prev
+            self.num_steps += 1
+
+    def flush(self):
+        """Ends the current step, waits for all pending computation and accounts every
+        recorded step. Writes `path` if it is set."""
+        if self._marks:
+            self._pending.append(self._marks)
+        self._marks = None
+        waitall()
+        with self._lock:
+            self._collect()
+        if self.path:
+            self.dump(self.path)
+
+    def module_step(self, module, data_batch):
+        """Runs forward, backward and update of a Module on a batch and marks their phases.
+        The step must be ended with :py:meth:`end_step`."""
+        self.begin_step()
+        module.forward(data_batch, is_train=True)
+        self.mark('forward', module.get_outputs(merge_multi_context=False))
+        module.backward()
+        exec_group = _exec_group(module)
+        grads = exec_group.grad_arrays if exec_group is not None else []
+        self.mark('backward', grads)
+        module.update()
+        # the reduced gradients are written back by the kvstore
+        self.mark('comm', grads)
+        self.mark('update', exec_group.param_arrays if exec_group is not None else [])
+
+    def summary(self):
+        """Returns the statistics of the accounted steps.
+
+        Returns
+        -------
+        dict of str to dict
+            For 'step' and every phase, the number of steps, the mean, maximum and
+            quantiles of the time in seconds, keyed by 'count', 'mean', 'max' and
+            'p50', 'p90'... Also contains 'samples_per_sec' when `batch_size` is set.
+        """
+        with self._lock:
+            result = OrderedDict()
+            for phase, hist in self._histograms.items():
+                stats = OrderedDict([('count', hist.count),
+                                     ('mean', hist.sum / hist.count if hist.count else 0.),
+                                     ('max', hist.max)])
+                for q in self.quantiles:
+                    stats['p%g' % (q * 100)] = hist.quantile(q)
+                result[phase] = stats
+            step = self._histograms['step']
+            if self.batch_size and step.sum > 0:
+                result['samples_per_sec'] = self.batch_size * step.count / step.sum
+        return result
+
+    def log(self):
+        """Logs the quantiles of the step time and of every phase."""
+        summary = self.summary()
+        speed = summary.pop('samples_per_sec', None)
+        msg = ['Steps [%d]' % self.num_steps]
+        if speed is not None:
+            msg.append('Speed: %.2f samples/sec' % speed)
+        for phase, stats in summary.items():
+            msg.append('%s %s' % (phase, ' '.join(
+                '%s=%.2fms' % (k, v * 1e3) for k, v in stats.items() if k[0] == 'p')))
+        self.logger.info('\t'.join(msg))
+
+    def prometheus(self, prefix='mxnet_step'):
+        """Returns the statistics in the Prometheus text exposition format."""
+        summary = self.summary()
+        speed = summary.pop('samples_per_sec', None)
+        name = prefix + '_seconds'
+        lines = ['# HELP %s Wall time of training steps and of their phases.' % name,
+                 '# TYPE %s summary' % name]
+        for phase, stats in summary.items():
+            for q in self.quantiles:
+                value = stats['p%g' % (q * 100)]
+                if not math.isnan(value):
+                    lines.append('%s{phase="%s",quantile="%g"} %.9g' % (name, phase, q, value))
+            lines.append('%s_sum{phase="%s"} %.9g' % (name, phase, stats['mean'] * stats['count']))
+            lines.append('%s_count{phase="%s"} %d' % (name, phase, stats['count']))
+        if speed is not None:
+            lines += ['# TYPE %s_samples_per_second gauge' % prefix,
+                      '%s_samples_per_second %.9g' % (prefix, speed)]
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """Writes the statistics to a file, as JSON if its name ends with '.json' and in
+        the Prometheus text format otherwise. The file is replaced atomically."""
+        if path.endswith('.json'):
+            content = json.dumps(self.summary())
+        else:
+            content = self.prometheus()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.rename(tmp_path, path)
+
+    def serve(self, port, host=''):
+        """Serves the statistics in the Prometheus text format over HTTP from a daemon
+        thread, e.g. at http://host:port/metrics."""
+        try:
+            from http.server import BaseHTTPRequestHandler, HTTPServer
+        except ImportError:
+            from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+        telemetry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # pylint: disable=invalid-name
+                body = telemetry.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                pass
+
+        self._server = HTTPServer((host, port), _Handler)
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self._server.server_address
+
+    def close(self):
+        """Accounts the pending steps with :py:meth:`flush` and stops serving the
+        statistics."""
+        self.flush()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -30,6 +30,8 @@ import tarfile
 import warnings
 import zipfile
 
+import numpy as np
+
 from . import _constants as C
 from . import vocab
 from ... import ndarray as nd
@@ -369,8 +371,9 @@ class _TokenEmbedding(vocab.Vocabulary):
 
         Parameters
         ----------
-        tokens : str or list of strs
-            A token or a list of tokens.
+        tokens : str, list of strs or numpy.ndarray of strs
+            A token, a list of tokens or an array of tokens, which is looked up without
+            iterating over its tokens in Python.
         lower_case_backup : bool, default False
             If False, each token in the original case will be looked up; if True, each token in the
             original case will be looked up first, if not found in the keys of the property
@@ -382,9 +385,14 @@ class _TokenEmbedding(vocab.Vocabulary):
         mxnet.ndarray.NDArray:
             The embedding vector(s) of the token(s). According to numpy conventions, if `tokens` is
             a string, returns a 1-D NDArray of shape `self.vec_len`; if `tokens` is a list of
-            strings, returns a 2-D NDArray of shape=(len(tokens), self.vec_len).
+            strings, returns a 2-D NDArray of shape=(len(tokens), self.vec_len). For an array
+            of tokens, the shape is `tokens.shape + (self.vec_len,)`.
         """
 
+        if isinstance(tokens, np.ndarray):
+            indices = nd.array(self._lookup(tokens, lower_case_backup), dtype='int32')
+            return nd.Embedding(indices, self.idx_to_vec, self.idx_to_vec.shape[0],
+                                self.idx_to_vec.shape[1])
         to_reduce = False
         if not isinstance(tokens, list):
             tokens = [tokens]
@@ -22,8 +22,13 @@ from __future__ import absolute_import
 from __future__ import print_function
 
 import collections
+import multiprocessing
 import re
 
+import numpy as np
+
+from ... import ndarray as nd
+
 
 def count_tokens_from_str(source_str, token_delim=' ', seq_delim='\n',
                           to_lower=False, counter_to_update=None):
@@ -83,3 +88,131 @@ def count_tokens_from_str(source_str, token_delim=' ', seq_delim='\n',
     else:
         counter_to_update.update(source_str)
         return counter_to_update
+
+
+def _split_chunks(source_str, seq_delim, num_chunks):
+    """Splits a string into about `num_chunks` chunks of whole sequences."""
+    seqs = re.split(seq_delim, source_str)
+    step = max(1, -(-len(seqs) // max(1, num_chunks)))
+    return [seqs[i:i + step] for i in range(0, len(seqs), step)]
+
+
+def _tokenize(seqs, token_delim, to_lower):
+    tokens = [t for seq in seqs for t in re.split(token_delim, seq) if t]
+    return [t.lower() for t in tokens] if to_lower else tokens
+
+
+def _count_chunk(args):
+    seqs, token_delim, to_lower = args
+    return collections.Counter(_tokenize(seqs, token_delim, to_lower))
+
+
+_WORKER_VOCAB = None
+
+
+def _init_index_worker(vocab):
+    global _WORKER_VOCAB  # pylint: disable=global-statement
+    _WORKER_VOCAB = vocab
+
+
+def _index_chunk(args):
+    seqs, token_delim, to_lower = args
+    tokens = _tokenize(seqs, token_delim, to_lower)
+    return _WORKER_VOCAB.to_indices(np.array(tokens, dtype=np.unicode_))
+
+
+def _map_chunks(fn, chunks, num_workers, initializer=None, initargs=()):
+    if num_workers <= 1 or len(chunks) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [fn(chunk) for chunk in chunks]
+    pool = multiprocessing.Pool(num_workers, initializer=initializer, initargs=initargs)
+    try:
+        return pool.map(fn, chunks)
+    finally:
+        pool.terminate()
+
+
+def count_tokens(source_str, token_delim=' ', seq_delim='\n', to_lower=False,
+                 counter_to_update=None, num_workers=None):
+    """Counts tokens in the specified string with multiple processes.
+
+    Equivalent to :py:func:`count_tokens_from_str`. The string is split into chunks of
+    whole sequences, which are counted in parallel by `num_workers` processes.
+
+    Parameters
+    ----------
+    source_str : str
+        A source string of tokens.
+    token_delim : str, default ' '
+        A token delimiter, as a regular expression.
+    seq_delim : str, default '\\n'
+        A sequence delimiter, as a regular expression.
+    to_lower : bool, default False
+        Whether to convert the source source_str to the lower case.
+    counter_to_update : collections.Counter or None, default None
+        The collections.Counter instance to be updated with the token counts of `source_str`.
+    num_workers : int, optional
+        Number of processes, the number of cpus by default. With 0 or 1, tokens are
+        counted in the calling process.
+
+    Returns
+    -------
+    collections.Counter
+        The token counts of `source_str`, added to `counter_to_update` if given.
+    """
+    if num_workers is None:
+        num_workers = multiprocessing.cpu_count()
+    chunks = _split_chunks(source_str, seq_delim, num_workers)
+    counter = collections.Counter() if counter_to_update is None else counter_to_update
+    for counts in _map_chunks(_count_chunk,
+                              [(seqs, token_delim, to_lower) for seqs in chunks],
+                              num_workers):
+        counter.update(counts)
+    return counter
+
+
+def index_tokens(source_str, vocabulary, token_delim=' ', seq_delim='\n', to_lower=False,
+                 num_workers=None, ctx=None):
+    """Converts the tokens of the specified string to indices with multiple processes.
+
+    The string is split into chunks of whole sequences, whose tokens are looked up in
+    parallel by `num_workers` processes in the sorted string table of the vocabulary.
+
+    Parameters
+    ----------
+    source_str : str
+        A source string of tokens.
+    vocabulary : Vocabulary
+        The vocabulary to index the tokens with. Unknown tokens get the index of the
+        unknown token.
+    token_delim : str, default ' '
+        A token delimiter, as a regular expression.
+    seq_delim : str, default '\\n'
+        A sequence delimiter, as a regular expression.
+    to_lower : bool, default False
+        Whether to convert the source source_str to the lower case.
+    num_workers : int, optional
+        Number of processes, the number of cpus by default. With 0 or 1, tokens are
+        indexed in the calling process.
+    ctx : Context, optional
+        Context of the returned NDArray.
+
+    Returns
+    -------
+    NDArray
+        The int32 indices of the tokens of `source_str`, in order.
+
+    Examples
+    --------
+    >>> counter = count_tokens(corpus)
+    >>> vocab = Vocabulary(counter, min_freq=5)
+    >>> indices = index_tokens(corpus, vocab)
+    """
+    if num_workers is None:
+        num_workers = multiprocessing.cpu_count()
+    chunks = _split_chunks(source_str, seq_delim, num_workers)
+    indices = _map_chunks(_index_chunk, [(seqs, token_delim, to_lower) for seqs in chunks],
+                          num_workers, _init_index_worker, (vocabulary,))
+    indices = np.concatenate(indices) if indices else np.zeros((0,), dtype=np.int32)
+    return nd.array(indices, ctx=ctx, dtype=np.int32)
@@ -23,8 +23,12 @@ from __future__ import absolute_import
 from __future__ import print_function
 
 import collections
+import itertools
+
+import numpy as np
 
 from . import _constants as C
+from ...base import string_types
 
 
 class Vocabulary(object):
@@ -137,6 +141,68 @@ class Vocabulary(object):
     def __len__(self):
         return len(self.idx_to_token)
 
+    def _string_table(self):
+        """Returns the str tokens grouped by length, for vectorized lookups, as a dict mapping
+        a length to the sorted tokens of that length and their indices. The tokens are stored
+        in one buffer of code points, each group being a view of the buffer, so that one long
+        token doesn't widen the storage of all the others. The tables are rebuilt when tokens
+        were indexed since they were built."""
+        table = getattr(self, '_table', None)
+        if table is None or table[0] is not self._idx_to_token or \
+                table[1] != len(self._idx_to_token):
+            tokens = sorted((len(token), token, idx) for idx, token in enumerate(self._idx_to_token)
+                            if isinstance(token, string_types) and token)
+            buf = np.frombuffer(u''.join(t for _, t, _ in tokens).encode('utf-32-le'),
+                                dtype='<u4')
+            ids = np.array([i for _, _, i in tokens], dtype=np.int32)
+            by_length = {}
+            start = offset = 0
+            for length, group in itertools.groupby(tokens, key=lambda t: t[0]):
+                count = len(list(group))
+                by_length[length] = (buf[offset:offset + count * length].view('<U%d' % length),
+                                     ids[start:start + count])
+                start += count
+                offset += count * length
+            # filled one by one, as numpy would expand tuple tokens into a 2-D array
+            all_tokens = np.empty(len(self._idx_to_token), dtype=object)
+            for idx, token in enumerate(self._idx_to_token):
+                all_tokens[idx] = token
+            table = (self._idx_to_token, len(self._idx_to_token), by_length, all_tokens)
+            self._table = table
+        return table[2]
+
+    def _lookup(self, tokens, lower_case_backup=False):
+        """Converts a numpy array of str tokens to an int32 array of indices."""
+        if tokens.dtype.kind == 'S':
+            tokens = np.char.decode(tokens, 'utf-8')
+        elif tokens.dtype.kind != 'U':
+            tokens = tokens.astype(str)
+        by_length = self._string_table()
+        indices = np.full(tokens.shape, C.UNKNOWN_IDX, dtype=np.int32)
+        found = np.zeros(tokens.shape, dtype=bool)
+        lengths = np.char.str_len(tokens)
+        for length in np.unique(lengths):
+            selected = lengths == length
+            if length == 0:
+                if u'' in self._token_to_idx:
+                    indices[selected] = self._token_to_idx[u'']
+                    found[selected] = True
+                continue
+            if length not in by_length:
+                continue
+            table, ids = by_length[length]
+            queries = tokens[selected]
+            pos = np.searchsorted(table, queries)
+            pos[pos == len(table)] = 0
+            group_found = table[pos] == queries
+            group_indices = np.full(queries.shape, C.UNKNOWN_IDX, dtype=np.int32)
+            group_indices[group_found] = ids[pos[group_found]]
+            indices[selected] = group_indices
+            found[selected] = group_found
+        if lower_case_backup and not found.all():
+            indices[~found] = self._lookup(np.char.lower(tokens[~found]))
+        return indices
+
     @property
     def token_to_idx(self):
         """
@@ -165,16 +231,20 @@ class Vocabulary(object):
 
         Parameters
         ----------
-        tokens : str or list of strs
-            A source token or tokens to be converted.
+        tokens : str, list of strs or numpy.ndarray of strs
+            A source token or tokens to be converted. Arrays of tokens are looked up in
+            a sorted table of the tokens, without iterating over them in Python.
 
 
         Returns
         -------
-        int or list of ints
-            A token index or a list of token indices according to the vocabulary.
+        int, list of ints or numpy.ndarray of int32
+            A token index, or token indices according to the vocabulary. Indices of an
+            array of tokens are returned as an array of the same shape.
         """
 
+        if isinstance(tokens, np.ndarray):
+            return self._lookup(tokens)
         to_reduce = False
         if not isinstance(tokens, list):
             tokens = [tokens]
@@ -191,16 +261,25 @@ class Vocabulary(object):
 
         Parameters
         ----------
-        indices : int or list of ints
+        indices : int, list of ints, numpy.ndarray or NDArray
             A source token index or token indices to be converted.
 
 
         Returns
         -------
-        str or list of strs
-            A token or a list of tokens according to the vocabulary.
+        str, list of strs or numpy.ndarray
+            A token, or tokens according to the vocabulary. Tokens of an array of indices
+            are returned as a numpy array of the same shape.
         """
 
+        if not isinstance(indices, (list, int)) and hasattr(indices, 'shape'):
+            indices = indices.asnumpy() if hasattr(indices, 'asnumpy') else indices
+            indices = np.asarray(indices)
+            if indices.dtype.kind not in 'iu' and (indices != np.round(indices)).any() or \
+                    indices.size and (indices.min() < 0 or indices.max() >= len(self)):
+                raise ValueError('Token indices in the provided `indices` are invalid.')
+            self._string_table()
+            return self._table[3][indices.astype(np.int64)]
         to_reduce = False
         if not isinstance(indices, list):
             indices = [indices]
@@ -20,7 +20,12 @@
 from __future__ import absolute_import
 
 import ctypes
-from .base import _LIB, check_call
+import threading
+from .base import _LIB, check_call, c_handle_array
+
+# timestamps recorded by the engine are kept alive here until they are written
+_pending_timestamps = []
+_pending_lock = threading.Lock()
 
 
 def set_bulk_size(size):
@@ -46,6 +51,28 @@ def set_bulk_size(size):
     return prev.value
 
 
+def record_timestamp(arrays, out):
+    """Records the time at which all pending writes to some arrays have completed,
+    without waiting for them.
+
+    Parameters
+    ----------
+    arrays : list of NDArray
+        Arrays to wait for in the engine. When empty, the current time is recorded
+        immediately.
+    out : ctypes.c_int64
+        Receives the time, in microseconds of a monotonic clock, once the writes have
+        completed. It must be 0 and is left unchanged until then. A reference to it is
+        held until it is written, so it may be dropped by the caller at any time.
+    """
+    with _pending_lock:
+        _pending_timestamps[:] = [ts for ts in _pending_timestamps if not ts.value]
+        if arrays:
+            _pending_timestamps.append(out)
+    check_call(_LIB.MXEngineRecordTimestamp(
+        c_handle_array(arrays), ctypes.c_int(len(arrays)), ctypes.byref(out)))
+
+
 class _BulkScope(object):
     """Scope object for bulk execution."""
     def __init__(self, size):
@@ -23,6 +23,7 @@ from __future__ import absolute_import
 from array import array as py_array
 import ctypes
 import copy
+import json
 import numpy as np
 from .base import _LIB
 from .base import mx_uint, NDArrayHandle, ExecutorHandle, py_str
@@ -42,6 +43,31 @@ def _monitor_callback_wrapper(callback):
         callback(name, array)
     return callback_handle
 
+def infer_cache_stats():
+    """Returns the statistics of the caches of shape and type inference.
+
+    Shapes and types inferred when binding or reshaping executors, and in
+    ``Symbol.infer_shape`` and ``Symbol.infer_type``, are cached by the structure of
+    the graph and the shapes and types of its inputs, so that binding again on the
+    same input shapes skips the inference. The number of results kept by each cache
+    is set by the ``MXNET_EXEC_INFER_CACHE_SIZE`` environment variable, 0 disables them.
+
+    Returns
+    -------
+    dict of str to dict
+        For 'shape' and 'dtype', the number of 'hits', 'misses' and 'evictions', and
+        the current 'size' and 'capacity' of the cache.
+    """
+    stats_str = ctypes.c_char_p()
+    check_call(_LIB.MXExecutorGetInferCacheStats(ctypes.byref(stats_str)))
+    return json.loads(py_str(stats_str.value))
+
+
+def clear_infer_cache():
+    """Clears the caches of shape and type inference and resets their statistics."""
+    check_call(_LIB.MXExecutorClearInferCache())
+
+
 class Executor(object):
     """Executor is the object providing efficient symbolic graph execution and optimization.
 
@@ -511,3 +537,99 @@ class Executor(object):
         check_call(_LIB.MXExecutorPrint(
             self.handle, ctypes.byref(debug_str)))
         return py_str(debug_str.value)
+
+    def memory_plan(self):
+        """Get the memory layout planned for this executor.
+
+        The plan reports, for every operator node in execution order, the storage
+        id each output is assigned to, its size in bytes and whether it is
+        computed inplace or accumulated with ``addto``. The live bytes of the
+        internal storage pool are simulated over the execution order to find the
+        peak and the operator at which it happens.
+
+        Returns
+        -------
+        plan : dict
+            A dictionary with the following keys:
+
+            - ``nodes``: list of dict with keys ``name``, ``op``, ``storage_id``,
+              ``bytes``, ``inplace``, ``addto`` (one entry per output) and
+              ``live_bytes``, the internal pool bytes live while the node runs.
+            - ``storage_allocated_bytes``: total bytes of the shared storage pool.
+            - ``pool_shared_bytes``: bytes of the pool reused from the executor it was
+              bound with as `shared_exec`.
+            - ``pool_new_bytes``: bytes of the pool allocated when binding this executor.
+            - ``external_bytes``: bytes of arguments, gradients, auxiliary states and
+              outputs, which are allocated outside of the pool.
+            - ``peak_bytes``: maximum of ``live_bytes`` over all nodes.
+            - ``peak_node``: name of the node at which ``peak_bytes`` is reached.
+            - ``num_forward_nodes``: number of nodes in the forward pass.
+
+        Examples
+        --------
+        >>> x = mx.sym.Variable('x')
+        >>> y = mx.sym.Activation(mx.sym.FullyConnected(x, num_hidden=64), act_type='relu')
+        >>> texec = y.simple_bind(mx.cpu(), x=(32, 128))
+        >>> plan = texec.memory_plan()
+        >>> [(n['name'], n['storage_id']) for n in plan['nodes']][:2]
+        [('fullyconnected0', [0]), ('activation0', [-2])]
+        """
+        plan_str = ctypes.c_char_p()
+        check_call(_LIB.MXExecutorGetMemoryPlan(
+            self.handle, ctypes.byref(plan_str)))
+        raw = json.loads(py_str(plan_str.value))
+        storage_id = raw['entry_storage_id']
+        entry_bytes = raw['entry_bytes']
+        inplace_index = raw['entry_inplace_index']
+        addto = raw['entry_addto']
+        num_nodes = len(raw['node_name'])
+
+        # storage pool entries are live from their first write to their last read
+        first_use = {}
+        last_use = {}
+        pool_bytes = {}
+        for nid in range(num_nodes):
+            for eid in raw['node_inputs'][nid] + raw['node_outputs'][nid]:
+                sid = storage_id[eid]
+                if sid < 0:
+                    continue
+                first_use.setdefault(sid, nid)
+                last_use[sid] = nid
+                pool_bytes[sid] = max(pool_bytes.get(sid, 0), entry_bytes[eid])
+        delta = [0] * (num_nodes + 1)
+        for sid, start in first_use.items():
+            delta[start] += pool_bytes[sid]
+            delta[last_use[sid] + 1] -= pool_bytes[sid]
+
+        nodes = []
+        live = 0
+        peak_bytes = 0
+        peak_node = None
+        external_bytes = 0
+        for nid in range(num_nodes):
+            live += delta[nid]
+            outputs = raw['node_outputs'][nid]
+            if raw['node_op'][nid] == 'null':
+                external_bytes += sum(entry_bytes[eid] for eid in outputs)
+                continue
+            nodes.append({
+                'name': raw['node_name'][nid],
+                'op': raw['node_op'][nid],
+                'storage_id': [storage_id[eid] for eid in outputs],
+                'bytes': [entry_bytes[eid] for eid in outputs],
+                'inplace': [inplace_index[eid] >= 0 for eid in outputs],
+                'addto': [bool(addto[eid]) for eid in outputs],
+                'live_bytes': live})
+            if live > peak_bytes:
+                peak_bytes = live
+                peak_node = raw['node_name'][nid]
+        external_bytes += sum(entry_bytes[eid] for eid in raw['output_entries']
+                              if storage_id[eid] == -2)
+        return {'nodes': nodes,
+                'storage_allocated_bytes': raw['storage_allocated_bytes'],
+                'pool_shared_bytes': raw['pool_shared_bytes'],
+                'pool_new_bytes': raw['pool_new_bytes'],
+                'external_bytes': external_bytes,
+                'peak_bytes': peak_bytes,
+                'peak_node': peak_node,
+                'num_forward_nodes': raw['num_forward_nodes']}
@@ -22,14 +22,16 @@ __all__ = ['Block', 'HybridBlock', 'SymbolBlock']
 
 import threading
 import copy
+import json
 import warnings
 import re
 from collections import OrderedDict
 
 from ..base import mx_real_t
 from .. import symbol, ndarray, initializer
+from ..attribute import AttrScope
 from ..symbol import Symbol
-from ..ndarray import NDArray
+from ..ndarray import NDArray, _DTYPE_NP_TO_MX
 from .. import name as _name
 from .parameter import Parameter, ParameterDict, DeferredInitializationError
 from .utils import _indent, _brief_print_list, HookHandle
@@ -124,6 +126,24 @@ def _regroup(args, fmt):
     return ret, args
 
 
+def _fusion_symbol(out, data, args):
+    """Partitions the graph with the ELEMWISE_FUSION backend. The input variables
+    of a copy of the graph are annotated with the types of the inputs, so that the
+    operators not computing floating point types are left out of the fusion. The
+    fused kernel only runs on CPU, so the graph is not partitioned for inputs on
+    other devices."""
+    flat_args = _flatten(args, "input")[0]
+    if any(arg.context.device_type == 'gpu' for arg in flat_args):
+        return out
+    out = copy.copy(out)
+    internals = out.get_internals()
+    used_names = set(out.list_inputs())
+    for var, arg in zip(data, flat_args):
+        if var.name in used_names and arg.dtype in _DTYPE_NP_TO_MX:
+            internals[var.name]._set_attr(__dtype__=str(_DTYPE_NP_TO_MX[arg.dtype]))
+    return out.get_backend_symbol('ELEMWISE_FUSION')
+
+
 class Block(object):
     """Base class for all neural network layers and models. Your models should
     subclass this class.
@@ -515,6 +535,18 @@ class Block(object):
             Optimize for invariant input shapes between iterations. Must also
             set static_alloc to True. Change of input shapes is still allowed
             but slower.
+        fuse : bool, default False
+            Fuse chains of elementwise and broadcast operators in the cached graph
+            into single CPU kernels, so intermediate results are not written to
+            memory. Has no effect when the inputs of the first call are on GPU.
+        checkpoint : bool, default False
+            Discard the intermediate outputs of the operators of this block after
+            the forward pass and recompute them during backward, trading extra
+            compute for activation memory when training. Random operators such as
+            Dropout and operators updating states such as BatchNorm keep their
+            outputs. As hybridize applies to children, call it on a child after
+            its parent to checkpoint the child only, before the first forward.
+            See :py:meth:`HybridBlock.checkpoint_stats`.
         """
         for cld in self._children.values():
             cld.hybridize(active, **kwargs)
@@ -720,6 +752,8 @@ class HybridBlock(Block):
         self._in_format = None
         self._active = False
         self._flags = []
+        self._fuse = False
+        self._checkpoint = False
 
     def __setattr__(self, name, value):
         """Registers parameters."""
@@ -737,7 +771,7 @@ class HybridBlock(Block):
             grouped_inputs = _regroup(inputs, self._in_format)[0]
 
             params = {i: j.var() for i, j in self._reg_params.items()}
-            with self.name_scope():
+            with self.name_scope(), self._checkpoint_scope():
                 out = self.hybrid_forward(symbol, *grouped_inputs, **params)  # pylint: disable=no-value-for-parameter
             out, self._out_format = _flatten(out, "output")
 
@@ -745,8 +779,17 @@ class HybridBlock(Block):
 
         return self._cached_graph
 
+    def _checkpoint_scope(self):
+        """Marks the operators created in the scope for recomputation in the backward
+        pass when checkpoint is set, also when the block is inlined in its parent."""
+        if self._checkpoint:
+            return AttrScope(__force_mirroring__='True')
+        return AttrScope()
+
     def _build_cache(self, *args):
         data, out = self._get_graph(*args)
+        if self._fuse:
+            out = _fusion_symbol(out, data, args)
         data_names = {data.name : i for i, data in enumerate(data)}
         params = self.collect_params()
         input_names = out.list_inputs()
@@ -831,7 +874,9 @@ class HybridBlock(Block):
 
     def hybridize(self, active=True, **kwargs):
         self._active = active
-        self._flags = list(kwargs.items())
+        self._fuse = kwargs.get('fuse', False)
+        self._checkpoint = kwargs.get('checkpoint', False)
+        self._flags = [(k, v) for k, v in kwargs.items() if k not in ('fuse', 'checkpoint')]
         self._clear_cached_op()
         if active and self._forward_hooks or self._forward_pre_hooks:
             warnings.warn('"{}" is being hybridized while still having forward hook/pre-hook. '
@@ -865,7 +910,45 @@ class HybridBlock(Block):
         """Infers data type of Parameters from inputs."""
         self._infer_attrs('infer_type', 'dtype', *args)
 
-    def export(self, path, epoch=0):
+    def checkpoint_stats(self, *args):
+        """Estimates the memory saved and the compute added by checkpointing, from
+        the memory plans of the graph of this block bound for training on the shapes
+        of `args`, with and without recomputation of the checkpointed operators.
+
+        Returns
+        -------
+        dict of str to int
+            ``storage_bytes`` and ``checkpoint_storage_bytes``, the bytes of the
+            memory pool without and with recomputation, ``saved_bytes``, their
+            difference, ``num_ops``, the number of operators of the forward pass and
+            ``num_recomputed_ops``, how many of them are run again during backward.
+
+        Examples
+        --------
+        >>> net = gluon.model_zoo.vision.resnet18_v1()
+        >>> net.initialize()
+        >>> net.hybridize(checkpoint=True)
+        >>> stats = net.checkpoint_stats(mx.nd.ones((32, 3, 224, 224)))
+        """
+        inputs, out = self._get_graph(*args)
+        args, _ = _flatten(args, "input")
+        shapes = {i.name: j.shape for i, j in zip(inputs, args)}
+        graph = json.loads(out.tojson())
+        for node in graph['nodes']:
+            node.get('attrs', {}).pop('__force_mirroring__', None)
+        baseline = symbol.load_json(json.dumps(graph))
+        ctx = args[0].context
+        plan = baseline.simple_bind(ctx, **shapes).memory_plan()
+        checkpoint_plan = out.simple_bind(ctx, **shapes).memory_plan()
+        return {'storage_bytes': plan['storage_allocated_bytes'],
+                'checkpoint_storage_bytes': checkpoint_plan['storage_allocated_bytes'],
+                'saved_bytes': plan['storage_allocated_bytes'] -
+                               checkpoint_plan['storage_allocated_bytes'],
+                'num_ops': sum(1 for node in graph['nodes'] if node['op'] != 'null'),
+                'num_recomputed_ops': sum(1 for node in checkpoint_plan['nodes']
+                                          if node['name'].endswith('_mirror'))}
+
+    def export(self, path, epoch=0, optimize=False):
         """Export HybridBlock to json format that can be loaded by
         `SymbolBlock.imports`, `mxnet.mod.Module` or the C++ interface.
 
@@ -879,12 +962,25 @@ class HybridBlock(Block):
             will be created, where xxxx is the 4 digits epoch number.
         epoch : int
             Epoch number of saved model.
+        optimize : bool, default False
+            Whether to optimize the exported graph for inference with
+            :py:func:`mxnet.contrib.graph_optimization.optimize_for_inference`, which
+            removes Dropout and folds BatchNorm and constant subgraphs into the
+            parameters. The optimized model cannot be trained as the original one.
         """
         if not self._cached_graph:
             raise RuntimeError(
                 "Please first call block.hybridize() and then run forward with "
                 "this block at least once before calling export.")
         sym = self._cached_graph[1]
+        if optimize:
+            from ..contrib.graph_optimization import save_optimized
+            arg_names = set(sym.list_arguments())
+            params = {name: param._reduce() for name, param in self.collect_params().items()}
+            save_optimized(path, epoch, sym,
+                           {k: v for k, v in params.items() if k in arg_names},
+                           {k: v for k, v in params.items() if k not in arg_names})
+            return
         sym.save('%s-symbol.json'%path)
 
         arg_names = set(sym.list_arguments())
@@ -920,7 +1016,7 @@ class HybridBlock(Block):
             "HybridBlock requires the first argument to forward be either " \
             "Symbol or NDArray, but got %s"%type(x)
         params = {i: j.var() for i, j in self._reg_params.items()}
-        with self.name_scope():
+        with self.name_scope(), self._checkpoint_scope():
             return self.hybrid_forward(symbol, x, *args, **params)
 
     def hybrid_forward(self, F, x, *args, **kwargs):
@@ -982,7 +1078,8 @@ class SymbolBlock(HybridBlock):
     >>> print(feat_model(x))
     """
     @staticmethod
-    def imports(symbol_file, input_names, param_file=None, ctx=None):
+    def imports(symbol_file, input_names, param_file=None, ctx=None, cache=None,
+                model_name=None):
         """Import model previously saved by `HybridBlock.export` or
         `Module.save_checkpoint` as a SymbolBlock for use in Gluon.
 
@@ -996,6 +1093,13 @@ class SymbolBlock(HybridBlock):
             Path to parameter file.
         ctx : Context, default None
             The context to initialize SymbolBlock on.
+        cache : ParameterCache or bool, optional
+            Cache the parameters are deduplicated with, to share identical parameters
+            read-only between models hosted in the same process.
+            See :py:meth:`ParameterDict.load`.
+        model_name : str, optional
+            Name the parameters are accounted to in the cache. Defaults to `param_file`,
+            suffixed with a number if a model of that name is already in the cache.
 
         Returns
         -------
@@ -1021,7 +1125,8 @@ class SymbolBlock(HybridBlock):
         inputs = [symbol.var(i) for i in input_names]
         ret = SymbolBlock(sym, inputs)
         if param_file is not None:
-            ret.collect_params().load(param_file, ctx=ctx)
+            ret.collect_params().load(param_file, ctx=ctx, cache=cache,
+                                      model_name=model_name)
         return ret
 
     def __repr__(self):
@@ -22,3 +22,5 @@
 from . import text
 
 from .sampler import *
+
+from .graph import *
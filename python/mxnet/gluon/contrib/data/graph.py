@@ -0,0 +1,157 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+# coding: utf-8
+# pylint: disable=too-many-arguments
+"""Loaders of subgraphs sampled from large graphs."""
+__all__ = ['NeighborSubgraphLoader']
+
+from collections import deque
+
+import numpy as np
+
+from .... import ndarray as nd
+from ...data import sampler as _sampler
+
+
+class NeighborSubgraphLoader(object):
+    """Loads subgraphs sampled around batches of seed vertices of a graph.
+
+    Batches of seed vertices are drawn like the samples of
+    :py:class:`mxnet.gluon.data.DataLoader`, and the neighborhood of each batch is
+    sampled with `dgl_csr_neighbor_uniform_sample`, or with
+    `dgl_csr_neighbor_non_uniform_sample` when `probability` is given.
+    `batches_per_call` seed batches are sampled by a single operator call, which samples
+    them in parallel, and `prefetch` calls are issued ahead of the batch being consumed
+    so that sampling runs in the background while the model is trained.
+
+    Each batch is the list of outputs of the operator for one seed array: the sampled
+    vertices whose last element is the number of valid vertices, the sampled edges as a
+    CSRNDArray, the sampling probability of the vertices when `probability` is given,
+    and the layer of each vertex.
+
+    Parameters
+    ----------
+    csr : CSRNDArray
+        Adjacency matrix of the graph, with int64 edge ids as data.
+    seeds : NDArray or numpy.ndarray
+        Vertices to draw the seed batches from.
+    batch_size : int, optional
+        Number of seed vertices in each batch.
+    num_hops : int, default 1
+        Number of hops to sample from the seed vertices.
+    num_neighbor : int, default 2
+        Number of neighbors sampled for each vertex.
+    max_num_vertices : int, default 100
+        Maximal number of vertices of a sampled subgraph.
+    probability : NDArray, optional
+        Probability of sampling each vertex of the graph.
+    shuffle : bool
+        Whether to shuffle the seeds.
+    sampler : Sampler, optional
+        Sampler of the seed indices. Either specify sampler or shuffle, not both.
+    last_batch : {'keep', 'discard', 'rollover'}
+        How to handle the last batch if batch_size does not evenly divide
+        `len(seeds)`, as for :py:class:`mxnet.gluon.data.DataLoader`.
+    batch_sampler : Sampler, optional
+        Sampler returning lists of seed indices. If specified, batch_size, shuffle,
+        sampler and last_batch must not be specified.
+    batches_per_call : int, default 8
+        Number of seed batches sampled in parallel by one operator call.
+    prefetch : int, default 2
+        Number of operator calls issued ahead of the batch being consumed.
+
+    Examples
+    --------
+    >>> loader = NeighborSubgraphLoader(csr, train_vertices, batch_size=1000,
+    ...                                 num_hops=2, num_neighbor=10, max_num_vertices=50000)
+    >>> for vertices, subgraph, layers in loader:
+    ...     train_step(vertices, subgraph, layers)
+    """
+    def __init__(self, csr, seeds, batch_size=None, num_hops=1, num_neighbor=2,
+                 max_num_vertices=100, probability=None, shuffle=False, sampler=None,
+                 last_batch=None, batch_sampler=None, batches_per_call=8, prefetch=2):
+        if isinstance(seeds, nd.NDArray):
+            seeds = seeds.asnumpy()
+        self._seeds = np.asarray(seeds, dtype=np.int64)
+        self._csr = csr
+        self._probability = probability
+        self._kwargs = {'num_hops': num_hops, 'num_neighbor': num_neighbor,
+                        'max_num_vertices': max_num_vertices}
+        if batch_sampler is None:
+            if batch_size is None:
+                raise ValueError("batch_size must be specified unless " \
+                                 "batch_sampler is specified")
+            if sampler is None:
+                if shuffle:
+                    sampler = _sampler.RandomSampler(len(self._seeds))
+                else:
+                    sampler = _sampler.SequentialSampler(len(self._seeds))
+            elif shuffle:
+                raise ValueError("shuffle must not be specified if sampler is specified")
+            batch_sampler = _sampler.BatchSampler(
+                sampler, batch_size, last_batch if last_batch else 'keep')
+        elif batch_size is not None or shuffle or sampler is not None or \
+                last_batch is not None:
+            raise ValueError("batch_size, shuffle, sampler and last_batch must " \
+                             "not be specified if batch_sampler is specified.")
+        self._batch_sampler = batch_sampler
+        self._batches_per_call = max(1, batches_per_call)
+        self._prefetch = max(1, prefetch)
+
+    def _sample(self, batches):
+        """Issues one sampling call for a list of seed index batches."""
+        seed_arrays = [nd.array(self._seeds[np.asarray(batch)], dtype=np.int64)
+                       for batch in batches]
+        num = len(seed_arrays)
+        if self._probability is None:
+            outputs = nd.contrib.dgl_csr_neighbor_uniform_sample(
+                self._csr, *seed_arrays, num_args=num + 1, **self._kwargs)
+        else:
+            outputs = nd.contrib.dgl_csr_neighbor_non_uniform_sample(
+                self._csr, self._probability, *seed_arrays, num_args=num + 2, **self._kwargs)
+        if not isinstance(outputs, (list, tuple)):
+            outputs = [outputs]
+        num_sets = len(outputs) // num
+        return [[outputs[j * num + i] for j in range(num_sets)] for i in range(num)]
+
+    def __iter__(self):
+        batch_iter = iter(self._batch_sampler)
+        pending = deque()
+
+        def issue():
+            batches = []
+            for batch in batch_iter:
+                batches.append(batch)
+                if len(batches) == self._batches_per_call:
+                    break
+            if batches:
+                # operators run asynchronously, so sampling proceeds in the background
+                pending.append(self._sample(batches))
+            return bool(batches)
+
+        for _ in range(self._prefetch):
+            if not issue():
+                break
+        while pending:
+            results = pending.popleft()
+            issue()
+            for result in results:
+                yield result
+
+    def __len__(self):
+        return len(self._batch_sampler)
@@ -18,16 +18,18 @@
 # coding: utf-8
 # pylint: disable=ungrouped-imports
 """Dataset generator."""
-__all__ = ['DataLoader']
+__all__ = ['DataLoader', 'DeviceLoader']
 
 import pickle
 import io
+import itertools
 import sys
 import multiprocessing
 import multiprocessing.queues
 from multiprocessing.reduction import ForkingPickler
 from multiprocessing.pool import ThreadPool
 import threading
+from collections import deque
 import numpy as np
 
 try:
@@ -36,6 +38,7 @@ except ImportError:
     pass
 
 from . import sampler as _sampler
+from ..utils import split_data
 from ... import nd, context
 
 if sys.platform == 'darwin' or sys.platform == 'win32':
@@ -593,3 +596,112 @@ class DataLoader(object):
             # https://bugs.python.org/issue34172
             assert isinstance(self._worker_pool, multiprocessing.pool.Pool)
             self._worker_pool.terminate()
+
+
+class DeviceLoader(object):
+    """Wraps a :py:class:`DataLoader` to split its batches and copy them to devices ahead
+    of time.
+
+    Each array of a batch is split along `batch_axis` like
+    :py:func:`mxnet.gluon.utils.split_and_load`, and the slices are copied to their
+    context through staging buffers in pinned memory of the device, which are reused
+    across batches. The copies of the next `prefetch` batches are issued before the
+    current batch is returned, so that they run in the background while it is being
+    computed on.
+
+    With `cpu(i)` contexts, slices are copied directly into arrays of the context,
+    which overlaps the copies with the computation the same way.
+
+    Parameters
+    ----------
+    loader : iterable
+        Loader of batches, such as a DataLoader. A batch is an NDArray, or a possibly
+        nested list or tuple of NDArrays.
+    ctx_list : Context or list of Context
+        Contexts to split the batches over.
+    batch_axis : int, default 0
+        The axis along which to split the arrays.
+    even_split : bool, default True
+        Whether to force all slices to have the same number of elements.
+    prefetch : int, default 1
+        Number of batches whose copies are issued ahead of the returned batch.
+
+    Examples
+    --------
+    >>> loader = DeviceLoader(DataLoader(dataset, batch_size=256, num_workers=4),
+    ...                       [mx.gpu(0), mx.gpu(1)])
+    >>> for data, label in loader:
+    ...     # data and label are lists with one slice per GPU
+    ...     with autograd.record():
+    ...         losses = [loss_fn(net(x), y) for x, y in zip(data, label)]
+    """
+    def __init__(self, loader, ctx_list, batch_axis=0, even_split=True, prefetch=1):
+        self._loader = loader
+        self._ctx_list = [ctx_list] if isinstance(ctx_list, context.Context) else list(ctx_list)
+        self._batch_axis = batch_axis
+        self._even_split = even_split
+        self._prefetch = max(1, prefetch)
+        # (slot, field, context index) -> staging buffer
+        self._staging = {}
+
+    def _stage(self, arr, ctx, key):
+        """Copies arr into a reused pinned buffer of the device of ctx."""
+        pinned = context.cpu_pinned(ctx.device_id)
+        if arr.context == pinned:
+            return arr
+        buf = self._staging.get(key)
+        if buf is None or buf.shape != arr.shape or buf.dtype != arr.dtype:
+            buf = nd.empty(arr.shape, ctx=pinned, dtype=arr.dtype)
+            self._staging[key] = buf
+        # the engine orders this write after the copy of the previous use of buf
+        arr.copyto(buf)
+        return buf
+
+    def _load(self, data, slot, fields):
+        """Issues the copies of the slices of data, and returns them. `fields` numbers
+        the arrays of the batch."""
+        if isinstance(data, (list, tuple)):
+            out = [self._load(d, slot, fields) for d in data]
+            return tuple(out) if isinstance(data, tuple) else out
+        field = next(fields)
+        if not isinstance(data, nd.NDArray):
+            data = nd.array(data)
+        if len(self._ctx_list) == 1:
+            slices = [data]
+        else:
+            slices = split_data(data, len(self._ctx_list), self._batch_axis, self._even_split)
+        out = []
+        for i, (arr, ctx) in enumerate(zip(slices, self._ctx_list)):
+            if arr.context == ctx:
+                out.append(arr)
+                continue
+            if ctx.device_type == 'gpu':
+                arr = self._stage(arr, ctx, (slot, field, i))
+            out.append(arr.copyto(ctx))
+        return out
+
+    def __iter__(self):
+        batches = iter(self._loader)
+        pending = deque()
+        state = {'slot': 0}
+
+        def issue():
+            try:
+                batch = next(batches)
+            except StopIteration:
+                return False
+            # staging buffers of prefetch + 1 batches are in use at a time
+            pending.append(self._load(batch, state['slot'], itertools.count()))
+            state['slot'] = (state['slot'] + 1) % (self._prefetch + 1)
+            return True
+
+        for _ in range(self._prefetch):
+            if not issue():
+                break
+        while pending:
+            batch = pending.popleft()
+            issue()
+            yield batch
+
+    def __len__(self):
+        return len(self._loader)
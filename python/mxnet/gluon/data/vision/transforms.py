@@ -19,15 +19,75 @@
 # pylint: disable= arguments-differ
 "Image transforms."
 
+import math
+
 from ...block import Block, HybridBlock
 from ...nn import Sequential, HybridSequential
 from .... import image
+from .... import ndarray
 from ....base import numeric_types
 
 
+def _as_batch(F, x):
+    """Reshape (H x W x C) or (N x H x W x C) input to (N x H x W x C)."""
+    return F.reshape(x, shape=(-1, 0, 0, 0), reverse=True)
+
+
+def _restore_batch(F, out, x):
+    """Reshape (N x h x w x C) output back to the leading dimensions of `x`."""
+    # the leading unit axis keeps the reshaped range non-empty for 3D inputs
+    out = F.reshape_like(out, F.expand_dims(x, axis=0),
+                         lhs_begin=0, lhs_end=1, rhs_begin=0, rhs_end=-3)
+    return F.squeeze(out, axis=0)
+
+
+def _batch_uniform(F, x, low=0.0, high=1.0):
+    """Draw one uniform sample per image of a (N x H x W x C) batch in one call."""
+    ref = F.slice_axis(F.slice_axis(F.slice_axis(x, axis=1, begin=0, end=1),
+                                    axis=2, begin=0, end=1), axis=3, begin=0, end=1)
+    ref = F.reshape(F.cast(ref, 'float32'), shape=(-1,))
+    return F.random.uniform_like(ref, low=low, high=high)
+
+
+def _image_size(F, x):
+    """Height and width of a (N x H x W x C) batch as float32 arrays of shape (1,)."""
+    shape = F.cast(F.shape_array(x), 'float32')
+    return (F.slice_axis(shape, axis=0, begin=1, end=2),
+            F.slice_axis(shape, axis=0, begin=2, end=3))
+
+
+def _crop_resize(F, x, fw, fh, cx, cy, size):
+    """Crop each image of a (N x H x W x C) batch and resize it to `size` (W, H).
+
+    The crop of image `i` has width `fw[i]` and height `fh[i]` relative to the image
+    and is centered at (`cx[i]`, `cy[i]`) in normalized [-1, 1] coordinates. All crops
+    are sampled with bilinear interpolation by one affine grid sampler. The output
+    is float32 (N x H x W x C).
+    """
+    zeros = F.zeros_like(fw)
+    theta = F.stack(fw, zeros, cx, zeros, fh, cy, axis=1)
+    grid = F.GridGenerator(theta, transform_type='affine', target_shape=(size[1], size[0]))
+    data = F.transpose(F.cast(x, 'float32'), axes=(0, 3, 1, 2))
+    out = F.BilinearSampler(data, grid)
+    return F.transpose(out, axes=(0, 2, 3, 1))
+
+
+def _random_flip(F, x, axis):
+    """Flip each image of (H x W x C) or (N x H x W x C) input with probability 0.5."""
+    batch = _as_batch(F, x)
+    flip = _batch_uniform(F, batch) < 0.5
+    out = F.where(flip, F.flip(batch, axis=axis), batch)
+    return _restore_batch(F, out, x)
+
+
 class Compose(Sequential):
     """Sequentially composes multiple transforms.
 
+    Consecutive HybridBlocks are grouped and hybridized. A batch of images
+    (N x H x W x C) goes through the largest groups, where crops and flips
+    run in the same graph as the other transforms. Crops and flips of a single
+    image (H x W x C) run out of the groups, with OpenCV and the flip operators.
+
     Parameters
     ----------
     transforms : list of transform Blocks.
@@ -51,25 +111,49 @@ class Compose(Sequential):
     """
     def __init__(self, transforms):
         super(Compose, self).__init__()
-        transforms.append(None)
+        for block in self._group(transforms, _SAMPLE_EAGER_TRANSFORMS):
+            self.add(block)
+        if any(isinstance(i, _SAMPLE_EAGER_TRANSFORMS) for i in transforms):
+            self._batch_blocks = self._group(transforms, ())
+        else:
+            self._batch_blocks = list(self._children.values())
+
+    @staticmethod
+    def _group(transforms, eager):
+        """Groups consecutive HybridBlocks which are not instances of `eager`
+        into hybridized HybridSequentials."""
+        blocks = []
         hybrid = []
-        for i in transforms:
-            if isinstance(i, HybridBlock):
+        for i in list(transforms) + [None]:
+            if isinstance(i, HybridBlock) and not isinstance(i, eager):
                 hybrid.append(i)
                 continue
             elif len(hybrid) == 1:
-                self.add(hybrid[0])
+                blocks.append(hybrid[0])
                 hybrid = []
             elif len(hybrid) > 1:
                 hblock = HybridSequential()
                 for j in hybrid:
                     hblock.add(j)
                 hblock.hybridize()
-                self.add(hblock)
+                blocks.append(hblock)
                 hybrid = []
 
             if i is not None:
-                self.add(i)
+                blocks.append(i)
+        return blocks
+
+    def hybridize(self, active=True, **kwargs):
+        super(Compose, self).hybridize(active, **kwargs)
+        for block in self._batch_blocks:
+            block.hybridize(active, **kwargs)
+
+    def forward(self, x):
+        if isinstance(x, ndarray.NDArray) and x.ndim == 4:
+            for block in self._batch_blocks:
+                x = block(x)
+            return x
+        return super(Compose, self).forward(x)
 
 
 class Cast(HybridBlock):
@@ -190,13 +274,21 @@ class Normalize(HybridBlock):
         return F.image.normalize(x, self._mean, self._std)
 
 
-class RandomResizedCrop(Block):
+class RandomResizedCrop(HybridBlock):
     """Crop the input image with random scale and aspect ratio.
 
     Makes a crop of the original image with random size (default: 0.08
     to 1.0 of the original image size) and random aspect ratio (default:
     3/4 to 4/3), then resize it to the specified size.
 
+    A batch of images is cropped with independent random parameters per
+    image, drawn in one call, and the transform can be hybridized so the
+    augmentation of a whole batch runs as one graph, e.g. on device after
+    `batchify_fn`. Batches are resized with bilinear interpolation and return
+    float32; crops that would exceed the image are clipped to the image size.
+    Single images are always cropped with OpenCV using `interpolation` and keep
+    their dtype, also when the transform is hybridized or composed.
+
     Parameters
     ----------
     size : int or tuple of (W, H)
@@ -207,15 +299,24 @@ class RandomResizedCrop(Block):
     ratio : tuple of two floats
         Range of aspect ratio of the cropped image before resizing.
     interpolation : int
-        Interpolation method for resizing. By default uses bilinear
-        interpolation. See OpenCV's resize function for available choices.
+        Interpolation method for resizing a single image. By
+        default uses bilinear interpolation. See OpenCV's resize function for
+        available choices.
 
 
     Inputs:
-        - **data**: input tensor with (Hi x Wi x C) shape.
+        - **data**: input tensor with (Hi x Wi x C) or (N x Hi x Wi x C) shape.
 
     Outputs:
-        - **out**: output tensor with (H x W x C) shape.
+        - **out**: output tensor with (H x W x C) or (N x H x W x C) shape.
+
+    Examples
+    --------
+    >>> transformer = vision.transforms.RandomResizedCrop(224)
+    >>> transformer.hybridize()
+    >>> images = mx.nd.random.uniform(0, 255, (8, 256, 320, 3))
+    >>> transformer(images)
+    <NDArray 8x224x224x3 @cpu(0)>
     """
     def __init__(self, size, scale=(0.08, 1.0), ratio=(3.0/4.0, 4.0/3.0),
                  interpolation=1):
@@ -225,28 +326,52 @@ class RandomResizedCrop(Block):
         self._args = (size, scale, ratio, interpolation)
 
     def forward(self, x):
-        return image.random_size_crop(x, *self._args)[0]
-
+        if isinstance(x, ndarray.NDArray) and x.ndim == 3:
+            return image.random_size_crop(x, *self._args)[0]
+        return super(RandomResizedCrop, self).forward(x)
 
-class CenterCrop(Block):
+    def hybrid_forward(self, F, x):
+        size, scale, ratio, _ = self._args
+        batch = _as_batch(F, x)
+        height, width = _image_size(F, batch)
+        aspect = F.broadcast_div(height, width)
+        area = _batch_uniform(F, batch, scale[0], scale[1])
+        log_ratio = _batch_uniform(F, batch, math.log(ratio[0]), math.log(ratio[1]))
+        crop_ratio = F.exp(log_ratio)
+        # crop width and height relative to the image, w = sqrt(area * ratio) etc.
+        fw = F.minimum(F.sqrt(F.broadcast_mul(area * crop_ratio, aspect)), 1.0)
+        fh = F.minimum(F.sqrt(F.broadcast_div(area / crop_ratio, aspect)), 1.0)
+        cx = _batch_uniform(F, batch, -1.0, 1.0) * (1 - fw)
+        cy = _batch_uniform(F, batch, -1.0, 1.0) * (1 - fh)
+        return _restore_batch(F, _crop_resize(F, batch, fw, fh, cx, cy, size), x)
+
+
+class CenterCrop(HybridBlock):
     """Crops the image `src` to the given `size` by trimming on all four
     sides and preserving the center of the image. Upsamples if `src` is
     smaller than `size`.
 
+    Batches of images are cropped with one affine grid sampler and the
+    transform can be hybridized. Batches are resized with bilinear
+    interpolation and return float32. Single images are always cropped with
+    OpenCV using `interpolation` and keep their dtype, also when the
+    transform is hybridized or composed.
+
     Parameters
     ----------
     size : int or tuple of (W, H)
         Size of output image.
     interpolation : int
-        Interpolation method for resizing. By default uses bilinear
-        interpolation. See OpenCV's resize function for available choices.
+        Interpolation method for resizing a single image. By
+        default uses bilinear interpolation. See OpenCV's resize function for
+        available choices.
 
 
     Inputs:
-        - **data**: input tensor with (Hi x Wi x C) shape.
+        - **data**: input tensor with (Hi x Wi x C) or (N x Hi x Wi x C) shape.
 
     Outputs:
-        - **out**: output tensor with (H x W x C) shape.
+        - **out**: output tensor with (H x W x C) or (N x H x W x C) shape.
 
     Examples
     --------
@@ -262,7 +387,25 @@ class CenterCrop(Block):
         self._args = (size, interpolation)
 
     def forward(self, x):
-        return image.center_crop(x, *self._args)[0]
+        if isinstance(x, ndarray.NDArray) and x.ndim == 3:
+            return image.center_crop(x, *self._args)[0]
+        return super(CenterCrop, self).forward(x)
+
+    def hybrid_forward(self, F, x):
+        size = self._args[0]
+        batch = _as_batch(F, x)
+        height, width = _image_size(F, batch)
+        # crop size relative to the image, scaled down to fit when the image is smaller
+        fw = size[0] / width
+        fh = size[1] / height
+        scale = F.maximum(F.broadcast_maximum(fw, fh), 1.0)
+        fw = F.broadcast_div(fw, scale)
+        fh = F.broadcast_div(fh, scale)
+        ones = F.ones_like(_batch_uniform(F, batch))
+        fw = F.broadcast_mul(ones, fw)
+        fh = F.broadcast_mul(ones, fh)
+        zeros = F.zeros_like(ones)
+        return _restore_batch(F, _crop_resize(F, batch, fw, fh, zeros, zeros, size), x)
 
 
 class Resize(HybridBlock):
@@ -312,10 +455,12 @@ class Resize(HybridBlock):
 
 class RandomFlipLeftRight(HybridBlock):
     """Randomly flip the input image left to right with a probability
-    of 0.5.
+    of 0.5. Each image of a batch is flipped independently. A single image
+    is flipped by one operator, also when the transform is hybridized or
+    composed.
 
     Inputs:
-        - **data**: input tensor with (H x W x C) shape.
+        - **data**: input tensor with (H x W x C) or (N x H x W x C) shape.
 
     Outputs:
         - **out**: output tensor with same shape as `data`.
@@ -323,16 +468,23 @@ class RandomFlipLeftRight(HybridBlock):
     def __init__(self):
         super(RandomFlipLeftRight, self).__init__()
 
+    def forward(self, x):
+        if isinstance(x, ndarray.NDArray) and x.ndim == 3:
+            return ndarray.image.random_flip_left_right(x)
+        return super(RandomFlipLeftRight, self).forward(x)
+
     def hybrid_forward(self, F, x):
-        return F.image.random_flip_left_right(x)
+        return _random_flip(F, x, axis=2)
 
 
 class RandomFlipTopBottom(HybridBlock):
     """Randomly flip the input image top to bottom with a probability
-    of 0.5.
+    of 0.5. Each image of a batch is flipped independently. A single image
+    is flipped by one operator, also when the transform is hybridized or
+    composed.
 
     Inputs:
-        - **data**: input tensor with (H x W x C) shape.
+        - **data**: input tensor with (H x W x C) or (N x H x W x C) shape.
 
     Outputs:
         - **out**: output tensor with same shape as `data`.
@@ -340,8 +492,18 @@ class RandomFlipTopBottom(HybridBlock):
     def __init__(self):
         super(RandomFlipTopBottom, self).__init__()
 
+    def forward(self, x):
+        if isinstance(x, ndarray.NDArray) and x.ndim == 3:
+            return ndarray.image.random_flip_top_bottom(x)
+        return super(RandomFlipTopBottom, self).forward(x)
+
     def hybrid_forward(self, F, x):
-        return F.image.random_flip_top_bottom(x)
+        return _random_flip(F, x, axis=1)
+
+
+# transforms running a single image out of the hybridized groups of Compose
+_SAMPLE_EAGER_TRANSFORMS = (RandomResizedCrop, CenterCrop, RandomFlipLeftRight,
+                            RandomFlipTopBottom)
 
 
 class RandomBrightness(HybridBlock):
@@ -24,10 +24,11 @@ __all__ = ['DeferredInitializationError', 'Parameter', 'Constant',
 
 from collections import OrderedDict
 import warnings
+import zlib
 import numpy as np
 
 from ..base import mx_real_t, MXNetError
-from .. import symbol, ndarray, initializer, context
+from .. import symbol, ndarray, initializer, context, random
 from ..context import Context, cpu
 from .. import autograd
 from .utils import _indent, _brief_print_list
@@ -40,6 +41,11 @@ class DeferredInitializationError(MXNetError):
     """Error for unfinished deferred initialization."""
     pass
 
+def _param_seed(seed, name):
+    """Returns the seed of the random values of a Parameter, which only depends on
+    the global seed and the name of the Parameter."""
+    return (seed * 1000003 + zlib.crc32(name.encode('utf-8'))) % (1 << 31)
+
 class Parameter(object):
     """A Container holding parameters (weights) of Blocks.
 
@@ -109,6 +115,9 @@ class Parameter(object):
         self._ctx_map = None
         self._trainer = None
         self._deferred_init = ()
+        self._init_seed = None
+        self._lazy_init = False
+        self._shared = None
         self._differentiable = differentiable
         self._allow_deferred_init = allow_deferred_init
         self._grad_req = None
@@ -147,6 +156,8 @@ class Parameter(object):
             req = 'null'
         if self._grad_req == req:
             return
+        if req != 'null':
+            self._unshare()
         self._grad_req = req
         if req == 'null' and self._grad is not None:
             self._grad = None
@@ -199,6 +210,11 @@ class Parameter(object):
                 "Parameter '%s' was not initialized on context %s. "
                 "It was only initialized on %s."%(
                     self.name, str(ctx), str(self._ctx_list)))
+        if self._lazy_init:
+            raise RuntimeError(
+                "Parameter '%s' was initialized with lazy=True and is only created when " \
+                "accessed through row_sparse_data, list_row_sparse_data, its gradient or " \
+                "when saved."%(self.name))
         if self._deferred_init:
             raise DeferredInitializationError(
                 "Parameter '%s' has not been initialized yet because initialization was " \
@@ -227,8 +243,10 @@ class Parameter(object):
         self._trainer._row_sparse_pull(self, results, row_id)
         return results
 
-    def _load_init(self, data, ctx):
-        """(Re)initializes by loading from data."""
+    def _load_init(self, data, ctx, cache=None, owner=None):
+        """(Re)initializes by loading from data. With a ParameterCache, the data is shared
+        read-only with the other parameters of identical content, and the gradient of this
+        parameter is disabled."""
         if self.shape:
             for self_dim, data_dim in zip(self.shape, data.shape):
                 assert self_dim in (0, data_dim), \
@@ -245,7 +263,9 @@ class Parameter(object):
             data = data.tostype(self._stype)
         if isinstance(ctx, Context):
             ctx = [ctx]
-        if self._data is None:
+        if cache is not None and self._stype == 'default':
+            self._load_shared(data, ctx, cache, owner)
+        elif self._data is None:
             if self._deferred_init:
                 assert ctx is None or set(ctx) == set(self._deferred_init[1]), \
                     "Failed to load Parameter '%s' on %s because it was " \
@@ -262,6 +282,32 @@ class Parameter(object):
                     self.name, str(ctx), str(self.list_ctx()))
             self.set_data(data)
         self._deferred_init = ()
+        self._lazy_init = False
+
+    def _load_shared(self, data, ctx, cache, owner):
+        """Initializes with read-only arrays shared through a ParameterCache."""
+        if self._data is not None:
+            assert ctx is None or set(ctx) == set(self.list_ctx()), \
+                "Failed to load Parameter '%s' on %s because it was " \
+                "previous initialized on %s."%(
+                    self.name, str(ctx), str(self.list_ctx()))
+            ctx = self._ctx_list
+        elif self._deferred_init:
+            ctx = self._deferred_init[1]
+        elif ctx is None:
+            ctx = [cpu()]
+        self._init_impl(data, ctx, share=(cache, owner))
+
+    def _unshare(self, copy=True):
+        """Stops sharing the arrays through a ParameterCache, replacing them by private
+        copies unless `copy` is False."""
+        if self._shared is None:
+            return
+        cache, owner = self._shared
+        self._shared = None
+        if copy and self._data is not None:
+            self._data = [arr.copyto(arr.context) for arr in self._data]
+        cache.release(owner, [self.name])
 
     def _finish_deferred_init(self):
         """Finishes deferred initialization."""
@@ -269,6 +315,7 @@ class Parameter(object):
             return
         init, ctx, default_init, data = self._deferred_init
         self._deferred_init = ()
+        self._lazy_init = False
         assert self.shape is not None and np.prod(self.shape) > 0, \
             "Cannot initialize Parameter '%s' because it has " \
             "invalid shape: %s. Please specify in_units, " \
@@ -279,13 +326,25 @@ class Parameter(object):
             if data is None:
                 data = ndarray.zeros(shape=self.shape, dtype=self.dtype,
                                      ctx=context.cpu(), stype=self._stype)
+                if self._init_seed is not None:
+                    # the seeding runs right before the initializer on the engine, so the
+                    # values do not depend on the order Parameters are initialized in
+                    random.seed(self._init_seed, ctx=context.cpu())
                 initializer.create(default_init)(
                     initializer.InitDesc(self.name, {'__init__': init}), data)
 
             self._init_impl(data, ctx)
 
-    def _init_impl(self, data, ctx_list):
-        """Sets data and grad."""
+    def _finish_lazy_init(self):
+        """Finishes the initialization of a Parameter initialized with `lazy=True`
+        when it is first accessed."""
+        if self._lazy_init and self.shape and np.prod(self.shape) > 0:
+            self._finish_deferred_init()
+
+    def _init_impl(self, data, ctx_list, share=None):
+        """Sets data and grad. `share` is a tuple of ParameterCache and owner the data is
+        shared through."""
+        self._unshare(copy=False)
         self._ctx_list = list(ctx_list)
         self._ctx_map = [[], []]
         for i, ctx in enumerate(self._ctx_list):
@@ -294,7 +353,15 @@ class Parameter(object):
                 dev_list.append(None)
             dev_list[ctx.device_id] = i
 
-        self._data = [data.copyto(ctx) for ctx in self._ctx_list]
+        if share is None:
+            self._data = [data.copyto(ctx) for ctx in self._ctx_list]
+        else:
+            cache, owner = share
+            self._data = [cache.get(data, owner, self.name, ctx, holder=self)
+                          for ctx in self._ctx_list]
+            self._shared = share
+            # shared arrays are read-only, so the parameter cannot be trained
+            self._grad_req = 'null'
         self._init_grad()
 
     def _init_grad(self):
@@ -311,6 +378,7 @@ class Parameter(object):
 
     def _reduce(self):
         """Reduce data from multiple context to cpu."""
+        self._finish_lazy_init()
         ctx = context.cpu()
         if self._stype == 'default':
             block = self.list_data()
@@ -323,7 +391,7 @@ class Parameter(object):
         return data
 
     def initialize(self, init=None, ctx=None, default_init=initializer.Uniform(),
-                   force_reinit=False):
+                   force_reinit=False, seed=None, lazy=False):
         """Initializes parameter and gradient arrays. Only used for :py:class:`NDArray` API.
 
         Parameters
@@ -344,6 +412,16 @@ class Parameter(object):
             and :py:meth:`Parameter.init` are ``None``.
         force_reinit : bool, default False
             Whether to force re-initialization if parameter is already initialized.
+        seed : int, optional
+            Seeds the random number generator with `seed` and the name of the Parameter
+            right before initializing it, so that its value does not depend on when or in
+            which order Parameters are initialized. Note that this changes the state of
+            the random number generator on CPU.
+        lazy : bool, default False
+            For 'row_sparse' Parameters, defers the initialization until the Parameter is
+            first accessed by :py:meth:`row_sparse_data`, :py:meth:`list_row_sparse_data`,
+            :py:meth:`grad` or :py:meth:`list_grad`, or saved. A :py:class:`Trainer`
+            neither initializes nor updates it before. Ignored for other storage types.
 
         Examples
         --------
@@ -372,6 +450,7 @@ class Parameter(object):
                           "Set force_reinit=True to re-initialize."%self.name,
                           stacklevel=2)
             return
+        self._unshare(copy=False)
         self._data = self._grad = None
 
         if ctx is None:
@@ -380,6 +459,8 @@ class Parameter(object):
             ctx = [ctx]
         if init is None:
             init = default_init if self.init is None else self.init
+        self._init_seed = None if seed is None else _param_seed(seed, self.name)
+        self._lazy_init = lazy and self._stype == 'row_sparse'
         if not self.shape or np.prod(self.shape) <= 0:
             if self._allow_deferred_init:
                 self._deferred_init = (init, ctx, default_init, None)
@@ -388,6 +469,8 @@ class Parameter(object):
                              "invalid shape: %s."%(self.name, str(self.shape)))
 
         self._deferred_init = (init, ctx, default_init, None)
+        if self._lazy_init:
+            return
         self._finish_deferred_init()
 
     def reset_ctx(self, ctx):
@@ -406,7 +489,7 @@ class Parameter(object):
         if self._data:
             data = self._reduce()
             with autograd.pause():
-                self._init_impl(data, ctx)
+                self._init_impl(data, ctx, share=self._shared)
         elif self._deferred_init:
             init, _, default_init, data = self._deferred_init
             self._deferred_init = (init, ctx, default_init, data)
@@ -430,6 +513,7 @@ class Parameter(object):
             if self not in self._trainer._params_to_init:
                 self._trainer._reset_kvstore()
 
+        self._unshare()
         for arr in self._check_and_get(self._data, list):
             arr[:] = data
 
@@ -451,6 +535,7 @@ class Parameter(object):
             raise RuntimeError("Cannot return a copy of Parameter %s via row_sparse_data() " \
                                "because its storage type is %s. Please use data() instead." \
                                %(self.name, self._stype))
+        self._finish_lazy_init()
         return self._get_row_sparse(self._data, row_id.context, row_id)
 
     def list_row_sparse_data(self, row_id):
@@ -471,6 +556,7 @@ class Parameter(object):
             raise RuntimeError("Cannot return copies of Parameter '%s' on all contexts via " \
                                "list_row_sparse_data() because its storage type is %s. Please " \
                                "use data() instead." % (self.name, self._stype))
+        self._finish_lazy_init()
         return self._get_row_sparse(self._data, list, row_id)
 
     def data(self, ctx=None):
@@ -516,6 +602,7 @@ class Parameter(object):
         ctx : Context
             Desired context.
         """
+        self._finish_lazy_init()
         if self._data is not None and self._grad is None:
             raise RuntimeError(
                 "Cannot get gradient array for Parameter '%s' " \
@@ -525,6 +612,7 @@ class Parameter(object):
     def list_grad(self):
         """Returns gradient buffers on all contexts, in the same order
         as :py:meth:`values`."""
+        self._finish_lazy_init()
         if self._data is not None and self._grad is None:
             raise RuntimeError(
                 "Cannot get gradient array for Parameter '%s' " \
@@ -566,6 +654,8 @@ class Parameter(object):
         self.dtype = dtype
         if self._data is None:
             return
+        # astype copies the shared arrays
+        self._unshare(copy=False)
         with autograd.pause():
             self._data = [i.astype(dtype) for i in self._data]
             if self._grad is None:
@@ -791,10 +881,14 @@ class ParameterDict(object):
             self._params[k] = v
 
     def initialize(self, init=initializer.Uniform(), ctx=None, verbose=False,
-                   force_reinit=False):
+                   force_reinit=False, seed=None, lazy=False):
         """Initializes all Parameters managed by this dictionary to be used for :py:class:`NDArray`
         API. It has no effect when using :py:class:`Symbol` API.
 
+        Initialization is dispatched asynchronously to the engine and does not wait for
+        the values to be computed, so it overlaps with the rest of the program until a
+        value is read.
+
         Parameters
         ----------
         init : Initializer
@@ -806,11 +900,19 @@ class ParameterDict(object):
             Whether to verbosely print out details on initialization.
         force_reinit : bool, default False
             Whether to force re-initialization if parameter is already initialized.
+        seed : int, optional
+            Initializes each Parameter from a random number generator seeded with `seed`
+            and its name, so that the values do not depend on the set of Parameters or on
+            the order they are initialized in.
+        lazy : bool, default False
+            Defers the initialization of 'row_sparse' Parameters until they are first
+            accessed, so that huge sparse embeddings do not delay the start of a job.
+            See :py:meth:`Parameter.initialize`.
         """
         if verbose:
             init.set_verbosity(verbose=verbose)
         for _, v in self.items():
-            v.initialize(None, ctx, init, force_reinit=force_reinit)
+            v.initialize(None, ctx, init, force_reinit=force_reinit, seed=seed, lazy=lazy)
 
     def zero_grad(self):
         """Sets all Parameters' gradient buffer to 0."""
@@ -877,7 +979,7 @@ class ParameterDict(object):
         ndarray.save(filename, arg_dict)
 
     def load(self, filename, ctx=None, allow_missing=False,
-             ignore_extra=False, restore_prefix=''):
+             ignore_extra=False, restore_prefix='', cache=None, model_name=None):
         """Load parameters from file.
 
         Parameters
@@ -893,7 +995,26 @@ class ParameterDict(object):
             present in this ParameterDict.
         restore_prefix : str, default ''
             prepend prefix to names of stored parameters before loading.
+        cache : ParameterCache or bool, optional
+            Cache the loaded parameters are deduplicated with. Parameters identical to
+            ones already loaded by other models on the same context share their memory
+            read-only, and their gradient is disabled. Setting their data or enabling
+            their gradient afterwards makes a private copy. `True` uses the process-wide
+            cache returned by :py:meth:`mxnet.ndarray.ParameterCache.default`.
+        model_name : str, optional
+            Name the parameters are accounted to in the cache, see
+            :py:meth:`mxnet.ndarray.ParameterCache.memory_usage`. It must not be used by
+            another model in the cache. Defaults to `filename`, suffixed with a number if
+            a model of that name is already in the cache.
         """
+        if cache is True:
+            cache = ndarray.ParameterCache.default()
+        if cache:
+            if model_name is None:
+                model_name = cache.new_owner(filename)
+            elif cache.held_by_others(model_name, self.values()):
+                raise ValueError("model_name '%s' is used by another model in the cache"
+                                 %model_name)
         if restore_prefix:
             for name in self.keys():
                 assert name.startswith(restore_prefix), \
@@ -917,4 +1038,5 @@ class ParameterDict(object):
                     "Please make sure source and target networks have the same prefix."%(
                         name[lprefix:], filename, _brief_print_list(self._params.keys()))
                 continue
-            self[name]._load_init(arg_dict[name], ctx)
+            self[name]._load_init(arg_dict[name], ctx, cache=cache if cache else None,
+                                  owner=model_name)
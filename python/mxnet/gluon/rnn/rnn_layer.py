@@ -37,7 +37,7 @@ class _RNNLayer(HybridBlock):
                  i2h_bias_initializer, h2h_bias_initializer,
                  mode, projection_size, h2r_weight_initializer,
                  lstm_state_clip_min, lstm_state_clip_max, lstm_state_clip_nan,
-                 dtype, **kwargs):
+                 dtype, use_sequence_length=False, **kwargs):
         super(_RNNLayer, self).__init__(**kwargs)
         assert layout in ('TNC', 'NTC'), \
             "Invalid layout %s; must be one of ['TNC' or 'NTC']"%layout
@@ -58,6 +58,7 @@ class _RNNLayer(HybridBlock):
         self._lstm_state_clip_max = lstm_state_clip_max
         self._lstm_state_clip_nan = lstm_state_clip_nan
         self._dtype = dtype
+        self._use_sequence_length = use_sequence_length
 
         self._gates = {'rnn_relu': 1, 'rnn_tanh': 1, 'lstm': 4, 'gru': 3}[mode]
 
@@ -219,7 +220,31 @@ class _RNNLayer(HybridBlock):
             states.append(func(name='%sh0_%d'%(self.prefix, i), **info))
         return states
 
-    def hybrid_forward(self, F, inputs, states=None, **kwargs):
+    def __call__(self, inputs, states=None, valid_length=None, **kwargs):
+        if not self._use_sequence_length:
+            assert valid_length is None, \
+                "valid_length requires a layer created with use_sequence_length=True"
+            if states is None:
+                return super(_RNNLayer, self).__call__(inputs, **kwargs)
+            return super(_RNNLayer, self).__call__(inputs, states, **kwargs)
+
+        assert valid_length is not None, \
+            "valid_length is required by a layer created with use_sequence_length=True"
+        # the begin states are created here so that the inputs of the layer are the same
+        # whether `states` is given or not
+        skip_states = states is None
+        if skip_states:
+            if isinstance(inputs, ndarray.NDArray):
+                batch_size = inputs.shape[self._layout.find('N')]
+                states = self.begin_state(batch_size, ctx=inputs.context, dtype=inputs.dtype)
+            else:
+                states = self.begin_state(0, func=symbol.zeros)
+        if isinstance(states, tensor_types):
+            states = [states]
+        out = super(_RNNLayer, self).__call__(inputs, states, valid_length, **kwargs)
+        return out[0] if skip_states else out
+
+    def hybrid_forward(self, F, inputs, states=None, valid_length=None, **kwargs):
         if F is ndarray:
             batch_size = inputs.shape[self._layout.find('N')]
         skip_states = states is None
@@ -236,12 +261,12 @@ class _RNNLayer(HybridBlock):
                     raise ValueError(
                         "Invalid recurrent state shape. Expecting %s, got %s."%(
                             str(info['shape']), str(state.shape)))
-        out = self._forward_kernel(F, inputs, states, **kwargs)
+        out = self._forward_kernel(F, inputs, states, valid_length, **kwargs)
 
         # out is (output, state)
         return out[0] if skip_states else out
 
-    def _forward_kernel(self, F, inputs, states, **kwargs):
+    def _forward_kernel(self, F, inputs, states, valid_length, **kwargs):
         """ forward using CUDNN or CPU kenrel"""
         if self._layout == 'NTC':
             inputs = F.swapaxes(inputs, dim1=0, dim2=1)
@@ -261,13 +286,17 @@ class _RNNLayer(HybridBlock):
 
         params = F._internal._rnn_param_concat(*params, dim=0)
 
+        if self._use_sequence_length:
+            kwargs = {'sequence_length': valid_length, 'use_sequence_length': True}
+        else:
+            kwargs = {}
         rnn = F.RNN(inputs, params, *states, state_size=self._hidden_size,
                     projection_size=self._projection_size,
                     num_layers=self._num_layers, bidirectional=self._dir == 2,
                     p=self._dropout, state_outputs=True, mode=self._mode,
                     lstm_state_clip_min=self._lstm_state_clip_min,
                     lstm_state_clip_max=self._lstm_state_clip_max,
-                    lstm_state_clip_nan=self._lstm_state_clip_nan)
+                    lstm_state_clip_nan=self._lstm_state_clip_nan, **kwargs)
 
         if self._mode == 'lstm':
             outputs, states = rnn[0], [rnn[1], rnn[2]]
@@ -439,6 +468,9 @@ class LSTM(_RNNLayer):
     state_clip_nan : boolean, default False
         Whether to stop NaN from propagating in state by clipping it to min/max.
         If the clipping range is not specified, this option is ignored.
+    use_sequence_length : bool, default False
+        If `True`, the layer takes the lengths of the sequences of the batch as
+        `valid_length` input, and skips the padded steps on CPU. Not supported on GPU yet.
     dtype : str, default 'float32'
         Type to initialize the parameters and default states to
     input_size: int, default 0
@@ -459,6 +491,10 @@ class LSTM(_RNNLayer):
           `(num_layers, batch_size, num_hidden)`. If `bidirectional` is True,
           shape will instead be `(2*num_layers, batch_size, num_hidden)`. If
           `states` is None, zeros will be used as default begin states.
+        - **valid_length**: only with `use_sequence_length`, tensor of shape
+          `(batch_size,)` holding the number of valid steps of every sequence.
+          The output is zero after the end of a sequence, the reverse direction
+          starts at its last valid step and `out_states` are the states at that step.
 
     Outputs:
         - **out**: output tensor with shape `(sequence_length, batch_size, num_hidden)`
@@ -486,14 +522,14 @@ class LSTM(_RNNLayer):
                  i2h_bias_initializer='zeros', h2h_bias_initializer='zeros',
                  projection_size=None, h2r_weight_initializer=None,
                  state_clip_min=None, state_clip_max=None, state_clip_nan=False,
-                 dtype='float32', **kwargs):
+                 dtype='float32', use_sequence_length=False, **kwargs):
         super(LSTM, self).__init__(hidden_size, num_layers, layout,
                                    dropout, bidirectional, input_size,
                                    i2h_weight_initializer, h2h_weight_initializer,
                                    i2h_bias_initializer, h2h_bias_initializer,
                                    'lstm', projection_size, h2r_weight_initializer,
                                    state_clip_min, state_clip_max, state_clip_nan,
-                                   dtype, **kwargs)
+                                   dtype, use_sequence_length, **kwargs)
 
     def state_info(self, batch_size=0):
         if self._projection_size is None:
@@ -553,6 +589,9 @@ class GRU(_RNNLayer):
         Initializer for the bias vector.
     h2h_bias_initializer : str or Initializer
         Initializer for the bias vector.
+    use_sequence_length : bool, default False
+        If `True`, the layer takes the lengths of the sequences of the batch as
+        `valid_length` input, and skips the padded steps on CPU. Not supported on GPU yet.
     dtype : str, default 'float32'
         Type to initialize the parameters and default states to
     input_size: int, default 0
@@ -573,6 +612,10 @@ class GRU(_RNNLayer):
           `(num_layers, batch_size, num_hidden)`. If `bidirectional` is True,
           shape will instead be `(2*num_layers, batch_size, num_hidden)`. If
           `states` is None, zeros will be used as default begin states.
+        - **valid_length**: only with `use_sequence_length`, tensor of shape
+          `(batch_size,)` holding the number of valid steps of every sequence.
+          The output is zero after the end of a sequence, the reverse direction
+          starts at its last valid step and `out_states` are the states at that step.
 
     Outputs:
         - **out**: output tensor with shape `(sequence_length, batch_size, num_hidden)`
@@ -597,13 +640,13 @@ class GRU(_RNNLayer):
                  dropout=0, bidirectional=False, input_size=0,
                  i2h_weight_initializer=None, h2h_weight_initializer=None,
                  i2h_bias_initializer='zeros', h2h_bias_initializer='zeros',
-                 dtype='float32', **kwargs):
+                 dtype='float32', use_sequence_length=False, **kwargs):
         super(GRU, self).__init__(hidden_size, num_layers, layout,
                                   dropout, bidirectional, input_size,
                                   i2h_weight_initializer, h2h_weight_initializer,
                                   i2h_bias_initializer, h2h_bias_initializer,
                                   'gru', None, None, None, None, False,
-                                  dtype, **kwargs)
+                                  dtype, use_sequence_length, **kwargs)
 
     def state_info(self, batch_size=0):
         return [{'shape': (self._num_layers * self._dir, batch_size, self._hidden_size),
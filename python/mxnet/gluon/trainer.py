@@ -349,7 +349,8 @@ class Trainer(object):
     def _allreduce_grads(self):
         if self._kvstore:
             for i, param in enumerate(self._params):
-                if param.grad_req != 'null':
+                # lazily initialized Parameters that have not been accessed have no gradient
+                if param.grad_req != 'null' and not param._lazy_init:
 
                     self._kvstore.push(i, param.list_grad(), priority=-i)
                     if not self._update_on_kvstore:
@@ -393,7 +394,7 @@ class Trainer(object):
         updates = [[] for _ in self._updaters]
 
         for i, param in enumerate(self._params):
-            if param.grad_req == 'null':
+            if param.grad_req == 'null' or param._lazy_init:
                 continue
 
             if not ignore_stale_grad:
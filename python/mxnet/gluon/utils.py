@@ -107,6 +107,10 @@ def split_and_load(data, ctx_list, batch_axis=0, even_split=True):
     -------
     list of NDArray
         Each corresponds to a context in `ctx_list`.
+
+    .. note:: The copies are issued when the batch is used. Wrap the data loader in
+              :py:class:`mxnet.gluon.data.DeviceLoader` to split and copy the next
+              batches in the background instead.
     """
     if not isinstance(data, ndarray.NDArray):
         data = ndarray.array(data, ctx=ctx_list[0])
@@ -61,6 +61,31 @@ class DetAugmenter(object):
         """Abstract implementation body"""
         raise NotImplementedError("Must override implementation.")
 
+    def apply_batch(self, srcs, labels):
+        """Augment a batch of images and labels in one call.
+
+        The default implementation applies the augmenter to each sample in turn.
+        Augmenters that can share work across samples override it.
+
+        Parameters
+        ----------
+        srcs : list of NDArray
+            Images in (H, W, C) layout.
+        labels : list of numpy.ndarray
+            Labels of the images, one (N, 5+) array per image.
+
+        Returns
+        -------
+        tuple of (list of NDArray, list of numpy.ndarray)
+            Augmented images and labels, in the order of the inputs.
+        """
+        out_srcs, out_labels = [], []
+        for src, label in zip(srcs, labels):
+            src, label = self(src, label)
+            out_srcs.append(src)
+            out_labels.append(label)
+        return (out_srcs, out_labels)
+
 
 class DetBorrowAug(DetAugmenter):
     """Borrow standard augmenter from image classification.
@@ -122,6 +147,25 @@ class DetRandomSelectAug(DetAugmenter):
             random.shuffle(self.aug_list)
             return self.aug_list[0](src, label)
 
+    def apply_batch(self, srcs, labels):
+        """Select an augmenter per sample and apply each one to its samples as a batch."""
+        out_srcs, out_labels = list(srcs), list(labels)
+        num = len(out_srcs)
+        if num == 0 or not self.aug_list:
+            return (out_srcs, out_labels)
+        skip = np.random.uniform(size=num) < self.skip_prob
+        choice = np.random.randint(len(self.aug_list), size=num)
+        for k, aug in enumerate(self.aug_list):
+            indices = np.flatnonzero(np.logical_and(choice == k, np.logical_not(skip)))
+            if not indices.size:
+                continue
+            aug_srcs, aug_labels = aug.apply_batch([out_srcs[i] for i in indices],
+                                                   [out_labels[i] for i in indices])
+            for i, src, label in zip(indices, aug_srcs, aug_labels):
+                out_srcs[i] = src
+                out_labels[i] = label
+        return (out_srcs, out_labels)
+
 
 class DetHorizontalFlipAug(DetAugmenter):
     """Random horizontal flipping.
@@ -210,13 +254,28 @@ class DetRandomCropAug(DetAugmenter):
             src = fixed_crop(src, x, y, w, h, None)
         return (src, label)
 
+    def apply_batch(self, srcs, labels):
+        """Crop a batch of images, drawing the candidate boxes of all images at once."""
+        out_srcs, out_labels = list(srcs), list(labels)
+        if not self.enabled or not out_srcs:
+            return (out_srcs, out_labels)
+        heights = [src.shape[0] for src in out_srcs]
+        widths = [src.shape[1] for src in out_srcs]
+        candidates = self._crop_candidates(heights, widths)
+        for i, src in enumerate(out_srcs):
+            crop = self._select_crop(out_labels[i], [c[i] for c in candidates],
+                                     heights[i], widths[i])
+            if crop:
+                x, y, w, h, out_labels[i] = crop
+                out_srcs[i] = fixed_crop(src, x, y, w, h, None)
+        return (out_srcs, out_labels)
+
     def _calculate_areas(self, label):
         """Calculate areas for multiple labels"""
-        heights = np.maximum(0, label[:, 3] - label[:, 1])
-        widths = np.maximum(0, label[:, 2] - label[:, 0])
+        heights = np.maximum(0, label[..., 3] - label[..., 1])
+        widths = np.maximum(0, label[..., 2] - label[..., 0])
         return heights * widths
 
-
     def _intersect(self, label, xmin, ymin, xmax, ymax):
         """Calculate intersect areas, normalized."""
         left = np.maximum(label[:, 0], xmin)
@@ -232,23 +291,6 @@ class DetRandomCropAug(DetAugmenter):
         out[invalid, :] = 0
         return out
 
-    def _check_satisfy_constraints(self, label, xmin, ymin, xmax, ymax, width, height):
-        """Check if constrains are satisfied"""
-        if (xmax - xmin) * (ymax - ymin) < 2:
-            return False  # only 1 pixel
-        x1 = float(xmin) / width
-        y1 = float(ymin) / height
-        x2 = float(xmax) / width
-        y2 = float(ymax) / height
-        object_areas = self._calculate_areas(label[:, 1:])
-        valid_objects = np.where(object_areas * width * height > 2)[0]
-        if valid_objects.size < 1:
-            return False
-        intersects = self._intersect(label[valid_objects, 1:], x1, y1, x2, y2)
-        coverages = self._calculate_areas(intersects) / object_areas[valid_objects]
-        coverages = coverages[np.where(coverages > 0)[0]]
-        return coverages.size > 0 and np.amin(coverages) > self.min_object_covered
-
     def _update_labels(self, label, crop_box, height, width):
         """Convert labels according to crop box"""
         xmin = float(crop_box[0]) / width
@@ -271,53 +313,103 @@ class DetRandomCropAug(DetAugmenter):
         out = out[valid, :]
         return out
 
+    def _crop_candidates(self, heights, widths):
+        """Draw `max_attempts` candidate crop boxes for each image at once.
+
+        Returns x, y, w, h and a validity mask, each of shape (num_images, max_attempts).
+        """
+        heights = np.asarray(heights, dtype=np.float64).reshape(-1, 1)
+        widths = np.asarray(widths, dtype=np.float64).reshape(-1, 1)
+        shape = (heights.shape[0], self.max_attempts)
+        min_area = self.area_range[0] * heights * widths
+        max_area = self.area_range[1] * heights * widths
+        ratio = np.random.uniform(self.aspect_ratio_range[0], self.aspect_ratio_range[1],
+                                  size=shape)
+        h = np.round(np.sqrt(min_area / ratio))
+        max_h = np.round(np.sqrt(max_area / ratio))
+        # find smallest max_h satifying round(max_h * ratio) <= width
+        max_h = np.where(np.round(max_h * ratio) > widths,
+                         np.floor((widths + 0.4999999) / ratio), max_h)
+        max_h = np.minimum(max_h, heights)
+        h = np.minimum(h, max_h)
+        # generate random h in range [h, max_h]
+        h += np.floor(np.random.uniform(size=shape) * (max_h - h + 1))
+        w = np.round(h * ratio)
+
+        # trying to fix rounding problems
+        area = w * h
+        grow = area < min_area
+        h = np.where(grow, h + 1, h)
+        w = np.where(grow, np.round(h * ratio), w)
+        area = w * h
+        shrink = area > max_area
+        h = np.where(shrink, h - 1, h)
+        w = np.where(shrink, np.round(h * ratio), w)
+        area = w * h
+        valid = (min_area <= area) & (area <= max_area) & (w >= 0) & (w <= widths) & \
+                (h >= 0) & (h <= heights)
+
+        y = np.floor(np.random.uniform(size=shape) * (np.maximum(0, heights - h) + 1))
+        x = np.floor(np.random.uniform(size=shape) * (np.maximum(0, widths - w) + 1))
+        return (x, y, w, h, valid)
+
+    def _select_crop(self, label, candidates, height, width):
+        """Return the first candidate crop satisfying all constraints, checked at once."""
+        if height <= 0 or width <= 0:
+            return ()
+        x, y, w, h, valid = candidates
+        # only 1 pixel
+        valid = np.logical_and(valid, w * h >= 2)
+        if not valid.any():
+            return ()
+        boxes = label[:, 1:5]
+        object_areas = self._calculate_areas(boxes)
+        valid_objects = object_areas * width * height > 2
+        if not valid_objects.any():
+            return ()
+        # normalized candidate boxes, shape (max_attempts, 1) to broadcast over objects
+        x1 = (x / width)[:, None]
+        y1 = (y / height)[:, None]
+        x2 = ((x + w) / width)[:, None]
+        y2 = ((y + h) / height)[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # coverage of each valid object by each candidate
+            inter_w = np.maximum(0, np.minimum(boxes[valid_objects, 2], x2) -
+                                 np.maximum(boxes[valid_objects, 0], x1))
+            inter_h = np.maximum(0, np.minimum(boxes[valid_objects, 3], y2) -
+                                 np.maximum(boxes[valid_objects, 1], y1))
+            coverages = inter_w * inter_h / object_areas[valid_objects]
+            covered = coverages > 0
+            min_coverage = np.where(covered, coverages, np.inf).min(axis=1)
+            valid &= covered.any(axis=1) & (min_coverage > self.min_object_covered)
+
+            # at least one object must survive the crop
+            crop_w = x2 - x1
+            crop_h = y2 - y1
+            left = np.clip((boxes[:, 0] - x1) / crop_w, 0, 1)
+            top = np.clip((boxes[:, 1] - y1) / crop_h, 0, 1)
+            right = np.clip((boxes[:, 2] - x1) / crop_w, 0, 1)
+            bot = np.clip((boxes[:, 3] - y1) / crop_h, 0, 1)
+            coverage = (right - left) * (bot - top) * crop_w * crop_h / object_areas
+            kept = (right > left) & (bot > top) & (coverage > self.min_eject_coverage)
+        valid &= kept.any(axis=1)
+
+        attempts = np.flatnonzero(valid)
+        if not attempts.size:
+            return ()
+        k = attempts[0]
+        crop_box = (int(x[k]), int(y[k]), int(w[k]), int(h[k]))
+        new_label = self._update_labels(label, crop_box, height, width)
+        if new_label is None:
+            return ()
+        return crop_box + (new_label,)
+
     def _random_crop_proposal(self, label, height, width):
         """Propose cropping areas"""
-        from math import sqrt
-
         if not self.enabled or height <= 0 or width <= 0:
             return ()
-        min_area = self.area_range[0] * height * width
-        max_area = self.area_range[1] * height * width
-        for _ in range(self.max_attempts):
-            ratio = random.uniform(*self.aspect_ratio_range)
-            if ratio <= 0:
-                continue
-            h = int(round(sqrt(min_area / ratio)))
-            max_h = int(round(sqrt(max_area / ratio)))
-            if round(max_h * ratio) > width:
-                # find smallest max_h satifying round(max_h * ratio) <= width
-                max_h = int((width + 0.4999999) / ratio)
-            if max_h > height:
-                max_h = height
-            if h > max_h:
-                h = max_h
-            if h < max_h:
-                # generate random h in range [h, max_h]
-                h = random.randint(h, max_h)
-            w = int(round(h * ratio))
-            assert w <= width
-
-            # trying to fix rounding problems
-            area = w * h
-            if area < min_area:
-                h += 1
-                w = int(round(h * ratio))
-                area = w * h
-            if area > max_area:
-                h -= 1
-                w = int(round(h * ratio))
-                area = w * h
-            if not (min_area <= area <= max_area and 0 <= w <= width and 0 <= h <= height):
-                continue
-
-            y = random.randint(0, max(0, height - h))
-            x = random.randint(0, max(0, width - w))
-            if self._check_satisfy_constraints(label, x, y, x + w, y + h, width, height):
-                new_label = self._update_labels(label, (x, y, w, h), height, width)
-                if new_label is not None:
-                    return (x, y, w, h, new_label)
-        return ()
+        candidates = self._crop_candidates([height], [width])
+        return self._select_crop(label, [c[0] for c in candidates], height, width)
 
 
 class DetRandomPadAug(DetAugmenter):
@@ -375,6 +467,23 @@ class DetRandomPadAug(DetAugmenter):
             src = copyMakeBorder(src, y, h-y-height, x, w-x-width, 16, values=self.pad_val)
         return (src, label)
 
+    def apply_batch(self, srcs, labels):
+        """Pad a batch of images, drawing the candidate regions of all images at once."""
+        out_srcs, out_labels = list(srcs), list(labels)
+        if not self.enabled or not out_srcs:
+            return (out_srcs, out_labels)
+        heights = [src.shape[0] for src in out_srcs]
+        widths = [src.shape[1] for src in out_srcs]
+        candidates = self._pad_candidates(heights, widths)
+        for i, src in enumerate(out_srcs):
+            pad = self._select_pad(out_labels[i], [c[i] for c in candidates],
+                                   heights[i], widths[i])
+            if pad:
+                x, y, w, h, out_labels[i] = pad
+                out_srcs[i] = copyMakeBorder(src, y, h-y-heights[i], x, w-x-widths[i], 16,
+                                             values=self.pad_val)
+        return (out_srcs, out_labels)
+
     def _update_labels(self, label, pad_box, height, width):
         """Update label according to padding region"""
         out = label.copy()
@@ -382,36 +491,49 @@ class DetRandomPadAug(DetAugmenter):
         out[:, (2, 4)] = (out[:, (2, 4)] * height + pad_box[1]) / pad_box[3]
         return out
 
+    def _pad_candidates(self, heights, widths):
+        """Draw `max_attempts` candidate padding regions for each image at once.
+
+        Returns x, y, w, h and a validity mask, each of shape (num_images, max_attempts).
+        """
+        heights = np.asarray(heights, dtype=np.float64).reshape(-1, 1)
+        widths = np.asarray(widths, dtype=np.float64).reshape(-1, 1)
+        shape = (heights.shape[0], self.max_attempts)
+        min_area = self.area_range[0] * heights * widths
+        max_area = self.area_range[1] * heights * widths
+        ratio = np.random.uniform(self.aspect_ratio_range[0], self.aspect_ratio_range[1],
+                                  size=shape)
+        h = np.round(np.sqrt(min_area / ratio))
+        max_h = np.round(np.sqrt(max_area / ratio))
+        h = np.where(np.round(h * ratio) < widths, np.floor((widths + 0.499999) / ratio), h)
+        h = np.minimum(np.maximum(h, heights), max_h)
+        h += np.floor(np.random.uniform(size=shape) * (max_h - h + 1))
+        w = np.round(h * ratio)
+        # marginal padding is not helpful
+        valid = ((h - heights) >= 2) & ((w - widths) >= 2)
+
+        y = np.floor(np.random.uniform(size=shape) * (np.maximum(0, h - heights) + 1))
+        x = np.floor(np.random.uniform(size=shape) * (np.maximum(0, w - widths) + 1))
+        return (x, y, w, h, valid)
+
+    def _select_pad(self, label, candidates, height, width):
+        """Return the first valid candidate padding region."""
+        if height <= 0 or width <= 0:
+            return ()
+        x, y, w, h, valid = candidates
+        attempts = np.flatnonzero(valid)
+        if not attempts.size:
+            return ()
+        k = attempts[0]
+        pad_box = (int(x[k]), int(y[k]), int(w[k]), int(h[k]))
+        return pad_box + (self._update_labels(label, pad_box, height, width),)
+
     def _random_pad_proposal(self, label, height, width):
         """Generate random padding region"""
-        from math import sqrt
         if not self.enabled or height <= 0 or width <= 0:
             return ()
-        min_area = self.area_range[0] * height * width
-        max_area = self.area_range[1] * height * width
-        for _ in range(self.max_attempts):
-            ratio = random.uniform(*self.aspect_ratio_range)
-            if ratio <= 0:
-                continue
-            h = int(round(sqrt(min_area / ratio)))
-            max_h = int(round(sqrt(max_area / ratio)))
-            if round(h * ratio) < width:
-                h = int((width + 0.499999) / ratio)
-            if h < height:
-                h = height
-            if h > max_h:
-                h = max_h
-            if h < max_h:
-                h = random.randint(h, max_h)
-            w = int(round(h * ratio))
-            if (h - height) < 2 or (w - width) < 2:
-                continue  # marginal padding is not helpful
-
-            y = random.randint(0, max(0, h - height))
-            x = random.randint(0, max(0, w - width))
-            new_label = self._update_labels(label, (x, y, w, h), height, width)
-            return (x, y, w, h, new_label)
-        return ()
+        candidates = self._pad_candidates([height], [width])
+        return self._select_pad(label, [c[0] for c in candidates], height, width)
 
 
 def CreateMultiRandCropAugmenter(min_object_covered=0.1, aspect_ratio_range=(0.75, 1.33),
@@ -762,29 +884,42 @@ class ImageDetIter(ImageIter):
         """Override the helper function for batchifying data"""
         i = start
         batch_size = self.batch_size
-        try:
-            while i < batch_size:
-                label, s = self.next_sample()
-                data = self.imdecode(s)
+        exhausted = False
+        while i < batch_size and not exhausted:
+            # read and decode the samples still needed, then augment them as one batch
+            data_list, label_list = [], []
+            try:
+                while len(data_list) < batch_size - i:
+                    label, s = self.next_sample()
+                    data = self.imdecode(s)
+                    try:
+                        self.check_valid_image([data])
+                        label = self._parse_label(label)
+                    except RuntimeError as e:
+                        logging.debug('Invalid image, skipping:  %s', str(e))
+                        continue
+                    data_list.append(data)
+                    label_list.append(label)
+            except StopIteration:
+                exhausted = True
+            if not data_list:
+                continue
+            data_list, label_list = self.augmentation_transform_batch(data_list, label_list)
+            for data, label in zip(data_list, label_list):
                 try:
-                    self.check_valid_image([data])
-                    label = self._parse_label(label)
-                    data, label = self.augmentation_transform(data, label)
                     self._check_valid_label(label)
                 except RuntimeError as e:
                     logging.debug('Invalid image, skipping:  %s', str(e))
                     continue
-                for datum in [data]:
-                    assert i < batch_size, 'Batch size must be multiples of augmenter output length'
-                    batch_data[i] = self.postprocess_data(datum)
-                    num_object = label.shape[0]
-                    batch_label[i][0:num_object] = nd.array(label)
-                    if num_object < batch_label[i].shape[0]:
-                        batch_label[i][num_object:] = -1
-                    i += 1
-        except StopIteration:
-            if not i:
-                raise StopIteration
+                assert i < batch_size, 'Batch size must be multiples of augmenter output length'
+                batch_data[i] = self.postprocess_data(data)
+                num_object = label.shape[0]
+                batch_label[i][0:num_object] = nd.array(label)
+                if num_object < batch_label[i].shape[0]:
+                    batch_label[i][num_object:] = -1
+                i += 1
+        if exhausted and not i:
+            raise StopIteration
 
         return i
 
@@ -835,6 +970,24 @@ class ImageDetIter(ImageIter):
             data, label = aug(data, label)
         return (data, label)
 
+    def augmentation_transform_batch(self, data, label):
+        """Transforms a list of images and labels with specified augmentations,
+        one batched call per augmenter. When a subclass overrides
+        `augmentation_transform`, it is called on each sample instead."""
+        transform = type(self).augmentation_transform
+        if getattr(transform, '__func__', transform) is not ImageDetIter.__dict__[
+                'augmentation_transform']:
+            pairs = [self.augmentation_transform(d, l) for d, l in zip(data, label)]
+            return ([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+        for aug in self.auglist:
+            if isinstance(aug, DetAugmenter):
+                data, label = aug.apply_batch(data, label)
+            else:
+                pairs = [aug(d, l) for d, l in zip(data, label)]
+                data = [pair[0] for pair in pairs]
+                label = [pair[1] for pair in pairs]
+        return (data, label)
+
     def check_label_shape(self, label_shape):
         """Checks if the new label shape is valid"""
         if not len(label_shape) == 2:
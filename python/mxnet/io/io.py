@@ -21,9 +21,18 @@ from collections import namedtuple
 
 import sys
 import ctypes
+import io
 import logging
+import multiprocessing
+import pickle
 import threading
+import time
+import traceback
 import numpy as np
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
 from ..base import _LIB
 from ..base import c_str_array, mx_uint, py_str
@@ -486,6 +495,219 @@ class PrefetchingIter(DataIter):
         return self.current_batch.pad
 
 
+def _prefetch_worker(data_iter, ctrl_queue, data_queue, epoch_value):
+    """Worker process of ProcessPrefetchingIter. Puts (epoch, kind, payload) items, where
+    kind is 'batch', 'end' or 'error', until it is stopped."""
+    # registers the pickling of NDArrays through shared memory
+    from ..gluon.data.dataloader import ForkingPickler
+    epoch = epoch_value.value
+    done = False
+    while True:
+        try:
+            cmd = ctrl_queue.get(block=done)
+        except queue.Empty:
+            cmd = None
+        if cmd is not None:
+            if cmd[0] == 'stop':
+                break
+            epoch = cmd[1]
+            data_iter.reset()
+            done = False
+            continue
+        try:
+            buf = io.BytesIO()
+            ForkingPickler(buf, pickle.HIGHEST_PROTOCOL).dump(data_iter.next())
+            item = (epoch, 'batch', buf.getvalue())
+        except StopIteration:
+            item, done = (epoch, 'end', None), True
+        except Exception:  # pylint: disable=broad-except
+            item, done = (epoch, 'error', traceback.format_exc()), True
+        while epoch_value.value == epoch:
+            try:
+                data_queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        # batches of an epoch that was reset are dropped
+        if epoch_value.value != epoch:
+            done = True
+
+
+class ProcessPrefetchingIter(PrefetchingIter):
+    """Performs pre-fetch for other data iterators in worker processes.
+
+    Unlike :py:class:`PrefetchingIter`, each wrapped iterator runs in its own process,
+    so that iterators doing their work in Python do not compete for the GIL, and up to
+    `prefetch` batches of each are read ahead. The NDArrays of the batches are passed
+    back through shared memory, and batches are returned in the order of the wrapped
+    iterators. Exceptions raised by a wrapped iterator are raised again by `next`.
+
+    The wrapped iterators are copied into the worker processes when they are created,
+    so they must not be used directly afterwards. The worker processes are stopped by
+    :py:meth:`close`, or when the iterator is deleted. The batches read ahead and not
+    returned, on `reset` or `close`, are received and dropped to release their shared
+    memory.
+
+    Parameters
+    ----------
+    iters : DataIter or list of DataIter
+        The data iterators to be pre-fetched.
+    rename_data : None or list of dict
+        The *i*-th element is a renaming map for the *i*-th iter, in the form of
+        {'original_name' : 'new_name'}. Should have one entry for each entry
+        in iter[i].provide_data.
+    rename_label : None or list of dict
+        Similar to ``rename_data``.
+    prefetch : int, default 2
+        Number of batches of each iterator read ahead.
+
+    Examples
+    --------
+    >>> train_iter = mx.io.ImageIter(batch_size=32, data_shape=(3, 224, 224),
+    ...                              path_imglist='train.lst', path_root='images')
+    >>> piter = mx.io.ProcessPrefetchingIter(train_iter, prefetch=4)
+    >>> for batch in piter:
+    ...     mod.forward_backward(batch)
+    """
+    def __init__(self, iters, rename_data=None, rename_label=None, prefetch=2):
+        # pylint: disable=super-init-not-called
+        DataIter.__init__(self)
+        # registers the unpickling of NDArrays through shared memory
+        from ..gluon.data import dataloader  # pylint: disable=unused-variable
+        if not isinstance(iters, list):
+            iters = [iters]
+        self.n_iter = len(iters)
+        assert self.n_iter > 0
+        self.iters = iters
+        self.rename_data = rename_data
+        self.rename_label = rename_label
+        self.batch_size = self.provide_data[0][1][0]
+        self.current_batch = None
+        self._epoch = 0
+        self._exhausted = False
+        self._pending = [None] * self.n_iter
+        self._epoch_value = multiprocessing.Value('i', 0)
+        self._ctrl_queues = [multiprocessing.Queue() for _ in iters]
+        self._data_queues = [multiprocessing.Queue(max(1, prefetch)) for _ in iters]
+        self._workers = [multiprocessing.Process(
+            target=_prefetch_worker, args=(it, ctrl, data, self._epoch_value))
+                         for it, ctrl, data in zip(iters, self._ctrl_queues, self._data_queues)]
+        for worker in self._workers:
+            worker.daemon = True
+            worker.start()
+
+    def close(self):
+        """Stops the worker processes."""
+        workers, self._workers = getattr(self, '_workers', []), []
+        if not workers:
+            return
+        with self._epoch_value.get_lock():
+            self._epoch_value.value = -1
+        for ctrl in self._ctrl_queues:
+            ctrl.put(('stop',))
+        # no epoch matches, so that all the batches left are dropped
+        self._epoch = -1
+        for i, worker in enumerate(workers):
+            pending, self._pending[i] = self._pending[i], None
+            if pending is not None:
+                self._release(pending)
+            # the batches left are received while the worker can still hand over their
+            # shared memory, and so that it can flush its queue and exit
+            deadline = time.time() + 1
+            while worker.is_alive() and time.time() < deadline:
+                self._drain(i)
+                worker.join(timeout=0.1)
+            if worker.is_alive():
+                worker.terminate()
+            self._drain(i)
+            self._data_queues[i].close()
+
+    def _drain(self, i):
+        """Receives and drops the batches of previous epochs in the queue of the i-th
+        iterator, which releases their shared memory. The first item of the current
+        epoch is kept for `_get`."""
+        while self._pending[i] is None:
+            try:
+                item = self._data_queues[i].get_nowait()
+            except (queue.Empty, IOError, OSError, EOFError):
+                return
+            if item[0] == self._epoch:
+                self._pending[i] = item
+            else:
+                self._release(item)
+
+    @staticmethod
+    def _release(item):
+        """Unpickles and drops the batch of a queue item, which releases its shared
+        memory."""
+        if item[1] != 'batch':
+            return
+        try:
+            pickle.loads(item[2])
+        except Exception:  # pylint: disable=broad-except
+            # the worker exited before handing over the shared memory
+            pass
+
+    def __del__(self):
+        self.close()
+
+    def reset(self):
+        self._epoch += 1
+        self._exhausted = False
+        with self._epoch_value.get_lock():
+            self._epoch_value.value = self._epoch
+        for ctrl in self._ctrl_queues:
+            ctrl.put(('reset', self._epoch))
+        # batches of the previous epoch that are put later are dropped by _get
+        for i in range(self.n_iter):
+            self._pending[i] = None
+            self._drain(i)
+
+    def _get(self, i):
+        """Returns the next batch of the i-th iterator, or None at the end of the epoch."""
+        while True:
+            if self._pending[i] is not None:
+                (epoch, kind, payload), self._pending[i] = self._pending[i], None
+                break
+            try:
+                epoch, kind, payload = self._data_queues[i].get(timeout=1)
+            except queue.Empty:
+                if not self._workers[i].is_alive():
+                    raise RuntimeError('Worker process %d of ProcessPrefetchingIter exited '
+                                       'with code %s' % (i, self._workers[i].exitcode))
+                continue
+            if epoch == self._epoch:
+                break
+            # a batch of a previous epoch
+            self._release((epoch, kind, payload))
+        if kind == 'error':
+            self._exhausted = True
+            raise RuntimeError('Iterator %d of ProcessPrefetchingIter raised an exception:\n%s'
+                               % (i, payload))
+        return pickle.loads(payload) if kind == 'batch' else None
+
+    def iter_next(self):
+        assert self._workers, 'ProcessPrefetchingIter is closed'
+        if self._exhausted:
+            return False
+        batches = [self._get(i) for i in range(self.n_iter)]
+        if batches[0] is None:
+            for batch in batches:
+                assert batch is None, "Number of entry mismatches between iterators"
+            self._exhausted = True
+            return False
+        for batch in batches:
+            assert batch is not None and batch.pad == batches[0].pad, \
+                "Number of entry mismatches between iterators"
+        self.current_batch = DataBatch(sum([batch.data for batch in batches], []),
+                                       sum([batch.label for batch in batches], []),
+                                       batches[0].pad,
+                                       batches[0].index,
+                                       provide_data=self.provide_data,
+                                       provide_label=self.provide_label)
+        return True
+
+
 class NDArrayIter(DataIter):
     """Returns an iterator for ``mx.nd.NDArray``, ``numpy.ndarray``, ``h5py.Dataset``
     ``mx.nd.sparse.CSRNDArray`` or ``scipy.sparse.csr_matrix``.
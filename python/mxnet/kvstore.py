@@ -429,13 +429,27 @@ class KVStore(object):
         a dictionary which includes `threshold` like:
         {'type': '2bit', 'threshold': 0.5}
 
+        1bit Gradient Compression also takes a positive float `threshold`. Every value
+        in the gradient is sent as its sign, and decompressed to `threshold` or the
+        negative of threshold, so that every 32 float values are represented using one
+        float. As for 2bit compression, the error is stored as residual and added to the
+        gradient in the next iteration, so `threshold` should be of the order of the
+        magnitude of the gradient values, like:
+        {'type': '1bit', 'threshold': 0.01}
+
+        Top-k Gradient Compression takes a float `ratio` in (0, 0.5], the fraction of
+        gradient values which are sent. The gradient is split into blocks and the values
+        with the largest magnitude in each block are sent with their offsets, every
+        other value is accumulated in the residual until it is large enough to be sent.
+        For example, {'type': 'topk', 'ratio': 0.01} sends 8 out of every 800 values.
+
         Parameters
         ----------
         compression_params : dict
             A dictionary specifying the type and parameters for gradient compression.
             The key `type` in this dictionary is a
             required string argument and specifies the type of gradient compression.
-            Currently `type` can be only `2bit`
+            Currently `type` can be `2bit`, `1bit` or `topk`.
             Other keys in this dictionary are optional and specific to the type
             of gradient compression.
         """
@@ -447,6 +461,30 @@ class KVStore(object):
         else:
             raise Exception('Gradient compression is not supported for this type of kvstore')
 
+    def gradient_compression_stats(self):
+        """ Returns counters of the gradient compression done by this kvstore.
+
+        Returns
+        -------
+        stats : dict
+            `original_bytes` and `compressed_bytes` are the total sizes of the gradients
+            before and after compression, `compression_ratio` is their ratio and
+            `residual_norm` is the L2 norm of the compression error not sent yet.
+        """
+        original_bytes = ctypes.c_int64()
+        compressed_bytes = ctypes.c_int64()
+        residual_norm = ctypes.c_float()
+        check_call(_LIB.MXKVStoreGetGradientCompressionStats(self.handle,
+                                                             ctypes.byref(original_bytes),
+                                                             ctypes.byref(compressed_bytes),
+                                                             ctypes.byref(residual_norm)))
+        ratio = float(original_bytes.value) / compressed_bytes.value \
+                if compressed_bytes.value > 0 else 1.0
+        return {'original_bytes': original_bytes.value,
+                'compressed_bytes': compressed_bytes.value,
+                'compression_ratio': ratio,
+                'residual_norm': residual_norm.value}
+
     def set_optimizer(self, optimizer):
         """ Registers an optimizer with the kvstore.
 
@@ -413,7 +413,7 @@ class BaseModule(object):
             eval_batch_end_callback=None, initializer=Uniform(0.01),
             arg_params=None, aux_params=None, allow_missing=False,
             force_rebind=False, force_init=False, begin_epoch=0, num_epoch=None,
-            validation_metric=None, monitor=None, sparse_row_id_fn=None):
+            validation_metric=None, monitor=None, sparse_row_id_fn=None, telemetry=None):
         """Trains the module parameters.
 
         Checkout `Module Tutorial <http://mxnet.io/tutorials/basic/module.html>`_ to see
@@ -480,6 +480,9 @@ class BaseModule(object):
             str -> NDArray. The resulting dict is used for pulling row_sparse
             parameters from the kvstore, where the str key is the name of the param,
             and the value is the row id of the param to pull.
+        telemetry : StepTelemetry
+            A :py:class:`mxnet.contrib.telemetry.StepTelemetry` recording the time spent
+            in the forward, backward, comm, update and data phases of every batch.
 
         Examples
         --------
@@ -522,8 +525,11 @@ class BaseModule(object):
                 data_batch = next_data_batch
                 if monitor is not None:
                     monitor.tic()
-                self.forward_backward(data_batch)
-                self.update()
+                if telemetry is None:
+                    self.forward_backward(data_batch)
+                    self.update()
+                else:
+                    telemetry.module_step(self, data_batch)
 
                 if isinstance(data_batch, list):
                     self.update_metric(eval_metric,
@@ -538,6 +544,9 @@ class BaseModule(object):
                     self.prepare(next_data_batch, sparse_row_id_fn=sparse_row_id_fn)
                 except StopIteration:
                     end_of_batch = True
+                if telemetry is not None:
+                    telemetry.mark('data')
+                    telemetry.end_step()
 
                 if monitor is not None:
                     monitor.toc_print()
@@ -580,6 +589,9 @@ class BaseModule(object):
             # end of 1 epoch, reset the data-iter for another epoch
             train_data.reset()
 
+        if telemetry is not None:
+            telemetry.flush()
+
     ################################################################################
     # Symbol information
     ################################################################################
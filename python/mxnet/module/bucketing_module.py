@@ -22,10 +22,17 @@ symbols to be used depending on the `bucket_key` provided by each different
 mini-batch of data.
 """
 
+import ctypes
 import logging
 import warnings
+from collections import OrderedDict
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
 
 from .. import context as ctx
+from ..base import _LIB, check_call
 
 from ..initializer import Uniform
 
@@ -61,11 +68,19 @@ class BucketingModule(BaseModule):
         on the type of compression being used. For example, 2bit compression requires a threshold.
         Arguments would then be {'type':'2bit', 'threshold':0.5}
         See mxnet.KVStore.set_gradient_compression method for more details on gradient compression.
+    max_buckets : int, optional
+        Maximal number of buckets whose executors are kept alive. When more buckets are
+        used, the executors of the least recently used ones are released, and bound
+        again with the memory of the default bucket when they are used again. The
+        default bucket is always kept. Defaults to ``None``, which keeps all of them.
+        Releasing a bucket does not release memory it added to the memory pool of the
+        default bucket, e.g. for larger shapes: the pool keeps its largest size, and is
+        reused by the other buckets.
     """
     def __init__(self, sym_gen, default_bucket_key=None, logger=logging,
                  context=ctx.cpu(), work_load_list=None,
                  fixed_param_names=None, state_names=None, group2ctxs=None,
-                 compression_params=None):
+                 compression_params=None, max_buckets=None):
         super(BucketingModule, self).__init__(logger=logger)
 
         assert default_bucket_key is not None
@@ -89,8 +104,12 @@ class BucketingModule(BaseModule):
         self._context = context
         self._work_load_list = work_load_list
         self._group2ctxs = group2ctxs
+        assert max_buckets is None or max_buckets >= 2, \
+            'max_buckets must keep the default bucket and at least another one'
+        self._max_buckets = max_buckets
 
-        self._buckets = {}
+        # buckets ordered from the least to the most recently used
+        self._buckets = OrderedDict()
         self._curr_module = None
         self._curr_bucket_key = None
         self._params_dirty = False
@@ -100,7 +119,7 @@ class BucketingModule(BaseModule):
     def _reset_bind(self):
         """Internal utility function to reset binding."""
         self.binded = False
-        self._buckets = {}
+        self._buckets = OrderedDict()
         self._curr_module = None
         self._curr_bucket_key = None
 
@@ -365,24 +384,149 @@ class BucketingModule(BaseModule):
         """
         assert self.binded, 'call bind before switching bucket'
         if not bucket_key in self._buckets:
-            symbol, data_names, label_names = self._call_sym_gen(bucket_key)
-            module = Module(symbol, data_names, label_names,
-                            logger=self.logger, context=self._context,
-                            work_load_list=self._work_load_list,
-                            fixed_param_names=self._fixed_param_names,
-                            state_names=self._state_names,
-                            group2ctxs=self._group2ctxs,
-                            compression_params=self._compression_params)
-            module.bind(data_shapes, label_shapes, self._curr_module.for_training,
-                        self._curr_module.inputs_need_grad,
-                        force_rebind=False, shared_module=self._buckets[self._default_bucket_key],
-                        grad_req=self._grad_req)
-            if self._monitor is not None:
-                module.install_monitor(self._monitor)
-            self._buckets[bucket_key] = module
+            self._buckets[bucket_key] = self._bind_bucket(bucket_key, data_shapes, label_shapes)
+        else:
+            self._buckets[bucket_key] = self._buckets.pop(bucket_key)
 
+        prev_bucket_key = self._curr_bucket_key
         self._curr_module = self._buckets[bucket_key]
         self._curr_bucket_key = bucket_key
+        # the previous bucket is kept, as prepare switches back to it
+        self._evict_buckets((bucket_key, prev_bucket_key))
+
+    def _bind_bucket(self, bucket_key, data_shapes, label_shapes, sym_gen_result=None):
+        """Creates the module of a bucket and binds it with the memory of the default
+        bucket."""
+        if sym_gen_result is None:
+            sym_gen_result = self._call_sym_gen(bucket_key)
+        symbol, data_names, label_names = sym_gen_result
+        default_module = self._buckets[self._default_bucket_key]
+        module = Module(symbol, data_names, label_names,
+                        logger=self.logger, context=self._context,
+                        work_load_list=self._work_load_list,
+                        fixed_param_names=self._fixed_param_names,
+                        state_names=self._state_names,
+                        group2ctxs=self._group2ctxs,
+                        compression_params=self._compression_params)
+        module.bind(data_shapes, label_shapes, default_module.for_training,
+                    default_module.inputs_need_grad,
+                    force_rebind=False, shared_module=default_module,
+                    grad_req=self._grad_req)
+        if self._monitor is not None:
+            module.install_monitor(self._monitor)
+        return module
+
+    def _evict_buckets(self, keep):
+        """Releases the least recently used buckets beyond `max_buckets`, except the
+        default bucket and the buckets in `keep`."""
+        if self._max_buckets is None:
+            return
+        for key in list(self._buckets):
+            if len(self._buckets) <= self._max_buckets:
+                break
+            if key == self._default_bucket_key or key in keep:
+                continue
+            # parameters and optimizer are shared with the default bucket, so the
+            # executors can be released without saving anything
+            del self._buckets[key]
+            self.logger.debug('Released the executors of bucket %s', str(key))
+
+    def prebind(self, buckets, num_threads=None):
+        """Binds the executors of a set of buckets ahead of time, so that switching to
+        them during training does not stall. The symbols of the buckets are generated
+        in parallel, the executors are bound one after another as they all share the
+        memory pool of the default bucket.
+
+        Parameters
+        ----------
+        buckets : list of (bucket_key, data_shapes, label_shapes)
+            The buckets to bind. `data_shapes` and the optional `label_shapes` are the
+            shapes the batches of the bucket provide, typically ``data_batch.provide_data`` and
+            ``data_batch.provide_label``.
+        num_threads : int, optional
+            Number of symbols generated concurrently. Defaults to the number of buckets, up
+            to the number of cpus.
+
+        Examples
+        --------
+        >>> mod.bind(data_shapes=train_iter.provide_data,
+        ...          label_shapes=train_iter.provide_label)
+        >>> mod.prebind([(key, [('data', (batch_size, key))],
+        ...               [('softmax_label', (batch_size, key))])
+        ...              for key in train_iter.buckets])
+        """
+        assert self.binded, 'call bind before prebind'
+        buckets = [b for b in buckets if b[0] not in self._buckets]
+        if not buckets:
+            return
+        if self._max_buckets is not None and len(self._buckets) + len(buckets) > \
+                self._max_buckets:
+            self.logger.warning('Binding %d buckets with max_buckets=%d, the least '
+                                'recently used ones will be released',
+                                len(self._buckets) + len(buckets), self._max_buckets)
+        if num_threads is None:
+            num_threads = min(len(buckets), multiprocessing.cpu_count())
+        pool = ThreadPool(max(1, num_threads))
+        try:
+            sym_gen_results = pool.map(lambda b: self._call_sym_gen(b[0]), buckets)
+        finally:
+            pool.close()
+        # binding grows the memory pool and the shared buffers of the default bucket,
+        # which are not thread safe
+        curr_key = self._curr_bucket_key
+        for bucket, sym_gen_result in zip(buckets, sym_gen_results):
+            self._buckets[bucket[0]] = self._bind_bucket(
+                bucket[0], bucket[1], bucket[2] if len(bucket) > 2 else None, sym_gen_result)
+        self._buckets[curr_key] = self._buckets.pop(curr_key)
+        self._evict_buckets((curr_key,))
+
+    def memory_report(self):
+        """Reports the memory of the live buckets that is shared with the default bucket
+        and the memory that is private to each bucket.
+
+        Parameters, gradients and auxiliary states of all buckets are those of the
+        default bucket. The internal memory of a bucket is taken from the memory of the
+        buckets bound before it when it fits, and is allocated otherwise.
+
+        Returns
+        -------
+        OrderedDict of bucket_key to dict of str to int
+            For every live bucket, from the least to the most recently used, the
+            'shared_bytes' and 'private_bytes' of its arrays, which are the inputs,
+            parameters, gradients, auxiliary states and outputs, and 'pool_shared_bytes'
+            and 'pool_private_bytes' of its internal memory. The memory of the default
+            bucket is reported as private.
+        """
+        assert self.binded, 'call bind before memory_report'
+
+        def arrays_of(module):
+            arrays = {}
+            for exe in module._exec_group.execs:
+                for arr in exe.arg_arrays + exe.aux_arrays + exe.outputs + \
+                        [g for g in exe.grad_arrays if g is not None]:
+                    if arr.stype != 'default':
+                        continue
+                    ptr = ctypes.c_void_p()
+                    check_call(_LIB.MXNDArrayGetData(arr.handle, ctypes.byref(ptr)))
+                    arrays[ptr.value] = max(arrays.get(ptr.value, 0),
+                                            arr.size * np.dtype(arr.dtype).itemsize)
+            return arrays
+
+        default_arrays = arrays_of(self._buckets[self._default_bucket_key])
+        report = OrderedDict()
+        for key, module in self._buckets.items():
+            is_default = key == self._default_bucket_key
+            stats = {'shared_bytes': 0, 'private_bytes': 0,
+                     'pool_shared_bytes': 0, 'pool_private_bytes': 0}
+            for ptr, nbytes in arrays_of(module).items():
+                shared = not is_default and ptr in default_arrays
+                stats['shared_bytes' if shared else 'private_bytes'] += nbytes
+            for exe in module._exec_group.execs:
+                plan = exe.memory_plan()
+                stats['pool_shared_bytes'] += plan['pool_shared_bytes']
+                stats['pool_private_bytes'] += plan['pool_new_bytes']
+            report[key] = stats
+        return report
 
     def init_optimizer(self, kvstore='local', optimizer='sgd',
                        optimizer_params=(('learning_rate', 0.01),),
@@ -27,7 +27,7 @@ from . import register
 from .op import *
 from .ndarray import *
 # pylint: enable=wildcard-import
-from .utils import load, load_frombuffer, save, zeros, empty, array
+from .utils import load, load_frombuffer, save, zeros, empty, array, ParameterCache
 from .sparse import _ndarray_cls
 from .ndarray import _GRAD_REQ_MAP, _DTYPE_MX_TO_NP, _DTYPE_NP_TO_MX, _new_empty_handle
 
@@ -132,7 +132,7 @@ def _regroup(args, fmt):
     return ret, args
 
 
-def foreach(body, data, init_states):
+def foreach(body, data, init_states, unroll_length=None):
     """Run a for loop with user-defined computation over NDArrays on dimension 0.
 
     This operator simulates a for loop and body has the computation for an iteration
@@ -173,6 +173,9 @@ def foreach(body, data, init_states):
         The initial values of the loop states.
     name: string.
         The name of the operator.
+    unroll_length: int, optional
+        The length of data along dimension 0. The loop always runs step by step on
+        NDArrays, it is only checked against the data.
 
     Returns
     -------
@@ -209,6 +212,8 @@ def foreach(body, data, init_states):
 
     not_data_list = isinstance(data, ndarray.NDArray)
     num_iters = data.shape[0] if not_data_list else data[0].shape[0]
+    assert unroll_length is None or unroll_length == num_iters, \
+        "unroll_length is %d but data has length %d" % (unroll_length, num_iters)
     states = init_states
     outputs = []
     for i in range(num_iters):
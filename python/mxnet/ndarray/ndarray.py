@@ -36,7 +36,7 @@ import numpy as np
 from ..base import _LIB, numeric_types, integer_types
 from ..base import c_str, c_array, c_array_buf, c_handle_array, mx_real_t
 from ..base import mx_uint, NDArrayHandle, check_call, DLPackHandle
-from ..base import ctypes2buffer
+from ..base import ctypes2buffer, MXNetError
 from ..context import Context, current_context
 from . import _internal
 from . import op
@@ -47,7 +47,8 @@ __all__ = ["NDArray", "concatenate", "_DTYPE_NP_TO_MX", "_DTYPE_MX_TO_NP", "_GRA
            "imdecode", "lesser", "lesser_equal", "logical_and", "logical_or", "logical_xor",
            "maximum", "minimum", "moveaxis", "modulo", "multiply", "not_equal", "onehot_encode",
            "power", "subtract", "true_divide", "waitall", "_new_empty_handle", "histogram",
-           "split_v2", "to_dlpack_for_read", "to_dlpack_for_write", "from_dlpack"]
+           "split_v2", "to_dlpack_for_read", "to_dlpack_for_write", "from_dlpack",
+           "from_numpy"]
 
 _STORAGE_TYPE_UNDEFINED = -1
 _STORAGE_TYPE_DEFAULT = 0
@@ -401,8 +402,10 @@ fixed-size items.
 
         - If key is a list type, only a list of integers is supported, e.g. key=[1, 2] is supported,
           while not for key=[[1, 2]].
-        - Ellipsis (...) and np.newaxis are not supported.
-        - Boolean array indexing is not supported.
+        - np.newaxis is not supported.
+        - Boolean array indexing is only supported with numpy boolean arrays.
+        - A single integer array indexing one axis, while the other axes are taken whole,
+          e.g. key=(slice(None), [1, 2]), is done by one take or scatter operator.
 
         Parameters
         ----------
@@ -446,6 +449,10 @@ fixed-size items.
         array([[ 6.,  5.,  5.],
                [ 6.,  0.,  4.]], dtype=float32)
         """
+        key = _normalize_index_key(key, self.shape)
+        if _get_empty_index_shape(key, self.shape) is not None:
+            # no element is selected, e.g. by a boolean mask without True elements
+            return
         indexing_dispatch_code = _get_indexing_dispatch_code(key)
         if indexing_dispatch_code == _NDARRAY_BASIC_INDEXING:
             self._set_nd_basic_indexing(key, value)
@@ -469,8 +476,10 @@ fixed-size items.
 
         - If key is a list type, only a list of integers is supported, e.g. key=[1, 2] is supported,
           while not for key=[[1, 2]].
-        - Ellipsis (...) and np.newaxis are not supported.
-        - Boolean array indexing is not supported.
+        - np.newaxis is not supported.
+        - Boolean array indexing is only supported with numpy boolean arrays.
+        - A single integer array indexing one axis, while the other axes are taken whole,
+          e.g. key=(slice(None), [1, 2]), is done by one take or scatter operator.
 
         Parameters
         ----------
@@ -508,6 +517,10 @@ fixed-size items.
         [[[4 5]
           [6 7]]]
         """
+        key = _normalize_index_key(key, self.shape)
+        empty_shape = _get_empty_index_shape(key, self.shape)
+        if empty_shape is not None:
+            return empty(empty_shape, ctx=self.context, dtype=self.dtype)
         indexing_dispatch_code = _get_indexing_dispatch_code(key)
         if indexing_dispatch_code == _NDARRAY_BASIC_INDEXING:
             return self._get_nd_basic_indexing(key)
@@ -518,6 +531,42 @@ fixed-size items.
                              % (str(key), str(type(key))))
     # pylint: enable=line-too-long
 
+    def _get_single_axis_index(self, key):
+        """Returns (axis, index) when key indexes a single axis with an integer array
+        and takes all the other axes whole, or None otherwise. Negative indices are
+        made positive. Indices given in a list or a numpy array are checked against
+        the size of the axis, NDArray indices are not to avoid a synchronization."""
+        if not isinstance(key, tuple):
+            key = (key,)
+        axis = None
+        for i, idx in enumerate(key):
+            if isinstance(idx, (NDArray, np.ndarray, list, tuple)):
+                if axis is not None:
+                    return None
+                axis = i
+            elif not isinstance(idx, py_slice) or idx != py_slice(None):
+                return None
+        if axis is None:
+            return None
+        index = key[axis]
+        size = self.shape[axis]
+        if isinstance(index, NDArray):
+            index = index.as_in_context(self.context)
+            if index.dtype != np.int32:
+                index = index.astype(np.int32)
+            index = op.where(index < 0, index + size, index)
+        else:
+            index = np.asarray(index)
+            if index.ndim == 0 or index.dtype.kind not in 'iu':
+                return None
+            if index.size and (index.min() < -size or index.max() >= size):
+                bad = index.min() if index.min() < -size else index.max()
+                raise IndexError('index %d is out of bounds for axis %d with size %d'
+                                 % (bad, axis, size))
+            index = np.where(index < 0, index + size, index)
+            index = array(index, ctx=self.context, dtype=np.int32)
+        return axis, index
+
     def _get_index_nd(self, key):
         """Returns an index array for use in scatter_nd and gather_nd."""
         def _is_advanced_index(index):
@@ -769,7 +818,13 @@ fixed-size items.
 
     def _set_nd_advanced_indexing(self, key, value):
         """This function is called by __setitem__ when key is an advanced index."""
-        indices = self._get_index_nd(key)
+        single_axis_index = self._get_single_axis_index(key)
+        if single_axis_index is not None and single_axis_index[0] == 0:
+            # the index array itself gives the positions along the first axis
+            index = single_axis_index[1]
+            indices = index.reshape((1,) + index.shape)
+        else:
+            indices = self._get_index_nd(key)
         vshape = _get_oshape_of_gather_nd_op(self.shape, indices.shape)
         value_nd = self._prepare_value_nd(value, vshape)
         _internal._scatter_set_nd(lhs=self, rhs=value_nd, indices=indices,
@@ -843,6 +898,10 @@ fixed-size items.
     def _get_nd_advanced_indexing(self, key):
         """Get item when key is a tuple of any objects of the following types:
         NDArray, np.ndarray, list, tuple, slice, and integer."""
+        single_axis_index = self._get_single_axis_index(key)
+        if single_axis_index is not None:
+            axis, index = single_axis_index
+            return op.take(self, index, axis=axis, mode='clip')
         return op.gather_nd(self, self._get_index_nd(key))
 
     def _sync_copyfrom(self, source_array):
@@ -1995,6 +2054,54 @@ fixed-size items.
             ctypes.c_size_t(data.size)))
         return data
 
+    def numpy_view(self, writable=False):
+        """Returns a ``numpy.ndarray`` sharing the memory of this array, without copying.
+
+        The pending writes to this array are waited for, as with :py:meth:`wait_to_read`,
+        or all its pending operations when `writable` is ``True``. The view does not
+        take part in the dependency tracking of the engine, so it must not be used
+        while operations writing this array are pending, and, when writable, must not
+        be written while operations reading this array are pending. The view keeps
+        this array alive.
+
+        Only dense arrays in cpu memory can be viewed.
+
+        Parameters
+        ----------
+        writable : bool, default False
+            Whether the view can be written to.
+
+        Examples
+        --------
+        >>> x = mx.nd.ones((2,3))
+        >>> y = x.numpy_view()
+        >>> y
+        array([[1., 1., 1.],
+               [1., 1., 1.]], dtype=float32)
+        >>> x += 1
+        >>> x.wait_to_read()
+        >>> y
+        array([[2., 2., 2.],
+               [2., 2., 2.]], dtype=float32)
+        """
+        if self.stype != 'default':
+            raise ValueError('numpy_view only supports dense arrays, not %s' % self.stype)
+        if self.context.device_type not in ('cpu', 'cpu_pinned', 'cpu_shared'):
+            raise ValueError('numpy_view only supports arrays in cpu memory, not on %s'
+                             % str(self.context))
+        if writable:
+            check_call(_LIB.MXNDArrayWaitToWrite(self.handle))
+        else:
+            self.wait_to_read()
+        if self.size == 0:
+            # an empty array has no memory to view
+            view = np.empty(self.shape, dtype=self.dtype)
+            view.flags['WRITEABLE'] = writable
+            return view
+        ptr = ctypes.c_void_p()
+        check_call(_LIB.MXNDArrayGetData(self.handle, ctypes.byref(ptr)))
+        return np.asarray(_NumpyViewOwner(self, ptr.value, writable))
+
     def asscalar(self):
         """Returns a scalar whose value is copied from this array.
 
@@ -2228,6 +2335,16 @@ fixed-size items.
         """
         return op.cast_storage(self, stype=stype)
 
+    def __dlpack__(self, stream=None):  # pylint: disable=unused-argument
+        """Returns a DLPack capsule of the array once its pending writes are finished, for
+        ``from_dlpack`` functions of other frameworks."""
+        return to_dlpack_for_read(self)
+
+    def __dlpack_device__(self):
+        """Returns the DLPack device type and id of the array."""
+        ctx = self.context
+        return (_DLPACK_DEVICE_TYPE[ctx.device_type], ctx.device_id)
+
     def to_dlpack_for_read(self):
         """Returns a reference view of NDArray that represents as DLManagedTensor until
         all previous write operations on the current array are finished.
@@ -2275,6 +2392,60 @@ fixed-size items.
         """
         return to_dlpack_for_write(self)
 
+def _is_bool_mask(index):
+    return isinstance(index, np.ndarray) and index.dtype == np.bool_
+
+
+def _normalize_index_key(key, shape):
+    """Expands an Ellipsis in key into whole slices and replaces numpy boolean
+    masks by the integer arrays of the positions of their True elements."""
+    if key is Ellipsis:
+        return py_slice(None)
+    if _is_bool_mask(key):
+        key = (key,)
+    if not isinstance(key, tuple) or \
+            not any(idx is Ellipsis or _is_bool_mask(idx) for idx in key):
+        return key
+    num_ellipsis = sum(1 for idx in key if idx is Ellipsis)
+    if num_ellipsis > 1:
+        raise IndexError("an index can only have a single ellipsis ('...')")
+    num_indexed = sum(idx.ndim if _is_bool_mask(idx) else 1 for idx in key if idx is not Ellipsis)
+    if num_indexed > len(shape):
+        raise IndexError('too many indices for array of %d dimensions' % len(shape))
+    normalized = []
+    axis = 0
+    for idx in key:
+        if idx is Ellipsis:
+            normalized.extend([py_slice(None)] * (len(shape) - num_indexed))
+            axis += len(shape) - num_indexed
+        elif _is_bool_mask(idx):
+            if idx.shape != tuple(shape[axis:axis + idx.ndim]):
+                raise IndexError('boolean index of shape %s does not match the shape %s of'
+                                 ' the indexed dimensions'
+                                 % (str(idx.shape), str(shape[axis:axis + idx.ndim])))
+            normalized.extend(np.nonzero(idx))
+            axis += idx.ndim
+        else:
+            normalized.append(idx)
+            axis += 1
+    return normalized[0] if len(normalized) == 1 else tuple(normalized)
+
+
+def _get_empty_index_shape(key, shape):
+    """Returns the shape of the result of indexing an array of the given shape with
+    a normalized key that selects no element through an empty integer array, such as
+    the positions of a boolean mask without True elements, or None otherwise. The
+    take and gather_nd operators do not accept empty indices."""
+    keys = key if isinstance(key, tuple) else (key,)
+    if not any(isinstance(idx, np.ndarray) and idx.size == 0 for idx in keys):
+        return None
+    if not all(isinstance(idx, (py_slice,) + integer_types) or
+               (isinstance(idx, np.ndarray) and idx.dtype.kind in 'iu') for idx in keys):
+        return None
+    # index a view with zero strides, which does not allocate the array
+    return np.broadcast_to(np.zeros((), dtype=np.bool_), shape)[key].shape
+
+
 def _get_indexing_dispatch_code(key):
     """Returns a dispatch code for calling basic or advanced indexing functions."""
     if isinstance(key, (NDArray, np.ndarray)):
@@ -4072,8 +4243,8 @@ def from_dlpack(dlpack):
 
     Parameters
     ----------
-    dlpack: PyCapsule (the pointer of DLManagedTensor)
-        input data
+    dlpack: PyCapsule (the pointer of DLManagedTensor) or object with a __dlpack__ method
+        input data, such as a tensor of another framework.
 
     Returns
     -------
@@ -4104,6 +4275,8 @@ def from_dlpack(dlpack):
      [2. 2. 2.]]
     <NDArray 2x3 @cpu(0)>
     """
+    if hasattr(dlpack, '__dlpack__'):
+        dlpack = dlpack.__dlpack__()
     handle = NDArrayHandle()
     dlpack = ctypes.py_object(dlpack)
     assert ctypes.pythonapi.PyCapsule_IsValid(dlpack, _c_str_dltensor), ValueError(
@@ -4115,3 +4288,133 @@ def from_dlpack(dlpack):
     # delete the deleter of the old dlpack
     ctypes.pythonapi.PyCapsule_SetDestructor(dlpack, None)
     return NDArray(handle=handle)
+
+_DLPACK_DEVICE_TYPE = {'cpu': 1, 'gpu': 2, 'cpu_pinned': 3, 'cpu_shared': 1}
+
+
+class _NumpyViewOwner(object):
+    """Exposes the memory of an NDArray through the numpy array interface, and keeps the
+    NDArray alive as the base of the numpy views."""
+    def __init__(self, arr, ptr, writable):
+        self._arr = arr
+        self.__array_interface__ = {'data': (ptr, not writable),
+                                    'shape': arr.shape,
+                                    'typestr': np.dtype(arr.dtype).str,
+                                    'version': 3}
+
+
+class _DLContext(ctypes.Structure):
+    _fields_ = [("device_type", ctypes.c_int),
+                ("device_id", ctypes.c_int)]
+
+
+class _DLDataType(ctypes.Structure):
+    _fields_ = [("type_code", ctypes.c_uint8),
+                ("bits", ctypes.c_uint8),
+                ("lanes", ctypes.c_uint16)]
+    TYPE_MAP = {
+        "int8": (0, 8, 1),
+        "int32": (0, 32, 1),
+        "int64": (0, 64, 1),
+        "uint8": (1, 8, 1),
+        "float16": (2, 16, 1),
+        "float32": (2, 32, 1),
+        "float64": (2, 64, 1),
+    }
+
+
+class _DLTensor(ctypes.Structure):
+    _fields_ = [("data", ctypes.c_void_p),
+                ("ctx", _DLContext),
+                ("ndim", ctypes.c_int),
+                ("dtype", _DLDataType),
+                ("shape", ctypes.POINTER(ctypes.c_int64)),
+                ("strides", ctypes.POINTER(ctypes.c_int64)),
+                ("byte_offset", ctypes.c_uint64)]
+
+
+class _DLManagedTensor(ctypes.Structure):
+    pass
+
+
+_DLManagedTensorDeleter = ctypes.CFUNCTYPE(None, ctypes.POINTER(_DLManagedTensor))
+
+_DLManagedTensor._fields_ = [("dl_tensor", _DLTensor),  # pylint: disable=protected-access
+                             ("manager_ctx", ctypes.c_void_p),
+                             ("deleter", _DLManagedTensorDeleter)]
+
+
+@_DLManagedTensorDeleter
+def _numpy_dlpack_deleter(managed_tensor):
+    # releases the reference taken by from_numpy on the numpy array and the tensor
+    owner = ctypes.cast(managed_tensor.contents.manager_ctx, ctypes.py_object)
+    ctypes.pythonapi.Py_DecRef(owner)
+
+
+def from_numpy(ndarray, zero_copy=True):
+    """Returns an NDArray on `cpu(0)` with the content of a numpy array or of an object
+    supporting the buffer protocol.
+
+    With `zero_copy`, the NDArray uses the memory of the numpy array, which is kept
+    alive until the NDArray and all the arrays sharing its memory are freed. The
+    numpy array is made read-only, since its writes would not be tracked by the
+    engine, but operators writing the NDArray, such as ``x[:] = 0``, change the
+    numpy array. The numpy array must be C-contiguous, aligned and of a data type
+    supported by DLPack, float16, float32, float64, uint8, int8, int32 or int64.
+    Read-only and empty sources are copied, since the NDArray could be written, and
+    so is a numpy array already shared by a previous call, which was made read-only.
+
+    Parameters
+    ----------
+    ndarray : numpy.ndarray or object supporting the buffer protocol
+        The source array. Other objects are converted with ``numpy.asarray``, which
+        does not copy them when they expose their memory.
+    zero_copy : bool, default True
+        Whether to share the memory of the source instead of copying it.
+
+    Returns
+    -------
+    NDArray
+        The array with the content of the source.
+
+    Examples
+    --------
+    >>> x = np.arange(6, dtype='float32').reshape((2, 3))
+    >>> y = mx.nd.from_numpy(x)
+    >>> y
+    [[0. 1. 2.]
+     [3. 4. 5.]]
+    <NDArray 2x3 @cpu(0)>
+    >>> x.flags['WRITEABLE']
+    False
+    """
+    source = np.asarray(ndarray)
+    if not zero_copy or not source.flags['WRITEABLE'] or source.size == 0:
+        return array(source, dtype=source.dtype)
+    if not source.flags['C_CONTIGUOUS'] or not source.flags['ALIGNED']:
+        raise ValueError('Only C-contiguous and aligned arrays can be shared without copy')
+    if str(source.dtype) not in _DLDataType.TYPE_MAP:
+        raise ValueError('Data type %s cannot be shared without copy' % str(source.dtype))
+    source.flags['WRITEABLE'] = False
+
+    managed = _DLManagedTensor()
+    managed.dl_tensor.data = source.ctypes.data_as(ctypes.c_void_p)
+    managed.dl_tensor.ctx = _DLContext(1, 0)
+    managed.dl_tensor.ndim = source.ndim
+    managed.dl_tensor.dtype = _DLDataType(*_DLDataType.TYPE_MAP[str(source.dtype)])
+    shape = (ctypes.c_int64 * max(1, source.ndim))(*source.shape)
+    managed.dl_tensor.shape = ctypes.cast(shape, ctypes.POINTER(ctypes.c_int64))
+    managed.dl_tensor.strides = None
+    managed.dl_tensor.byte_offset = 0
+    managed.deleter = _numpy_dlpack_deleter
+    # the NDArray calls the deleter with the tensor, which must stay alive until then
+    owner = ctypes.py_object((source, managed, shape))
+    ctypes.pythonapi.Py_IncRef(owner)
+    managed.manager_ctx = ctypes.cast(ctypes.pointer(owner), ctypes.POINTER(ctypes.c_void_p))[0]
+    handle = NDArrayHandle()
+    try:
+        check_call(_LIB.MXNDArrayFromDLPack(ctypes.byref(managed), ctypes.byref(handle)))
+    except MXNetError:
+        ctypes.pythonapi.Py_DecRef(owner)
+        raise
+    return NDArray(handle=handle)
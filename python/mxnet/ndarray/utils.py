@@ -18,6 +18,9 @@
 # coding: utf-8
 """Utility functions for NDArray and BaseSparseNDArray."""
 import ctypes
+import hashlib
+import threading
+import weakref
 
 from ..base import _LIB, check_call, py_str, c_str, string_types, mx_uint, NDArrayHandle
 from ..base import c_array, c_handle_array, c_str_array
@@ -34,7 +37,7 @@ try:
 except ImportError:
     spsp = None
 
-__all__ = ['zeros', 'empty', 'array', 'load', 'load_frombuffer', 'save']
+__all__ = ['zeros', 'empty', 'array', 'load', 'load_frombuffer', 'save', 'ParameterCache']
 
 
 def zeros(shape, ctx=None, dtype=None, stype=None, **kwargs):
@@ -146,7 +149,7 @@ def array(source_array, ctx=None, dtype=None):
         return _array(source_array, ctx=ctx, dtype=dtype)
 
 
-def load(fname):
+def load(fname, cache=None, owner=None):
     """Loads an array from file.
 
     See more details in ``save``.
@@ -155,6 +158,13 @@ def load(fname):
     ----------
     fname : str
         The filename.
+    cache : ParameterCache or bool, optional
+        Cache the loaded dense arrays are deduplicated with, so that arrays identical
+        to ones already loaded by other models are shared read-only. `True` uses the
+        process-wide cache returned by :py:meth:`ParameterCache.default`.
+    owner : str, optional
+        Name of the model the arrays are accounted to in the cache. Defaults to `fname`,
+        suffixed with a number if a model of that name is already in the cache.
 
     Returns
     -------
@@ -174,12 +184,16 @@ def load(fname):
                                   ctypes.byref(out_name_size),
                                   ctypes.byref(names)))
     if out_name_size.value == 0:
-        return [_ndarray_cls(NDArrayHandle(handles[i])) for i in range(out_size.value)]
+        data = [_ndarray_cls(NDArrayHandle(handles[i])) for i in range(out_size.value)]
     else:
         assert out_name_size.value == out_size.value
-        return dict(
+        data = dict(
             (py_str(names[i]), _ndarray_cls(NDArrayHandle(handles[i])))
             for i in range(out_size.value))
+    if cache:
+        cache = ParameterCache.default() if cache is True else cache
+        data = cache.share(data, cache.new_owner(fname) if owner is None else owner)
+    return data
 
 
 def load_frombuffer(buf):
@@ -271,3 +285,197 @@ def save(fname, data):
                                   mx_uint(len(handles)),
                                   handles,
                                   keys))
+
+
+class ParameterCache(object):
+    """Content-addressed store of read-only arrays shared between models.
+
+    Arrays are identified by their context, data type, shape and a hash of their
+    content, so that identical parameters loaded by several models, such as the
+    backbone of fine-tuned models, are kept once in memory. Shared arrays are made
+    read-only. Each model is registered as an owner of the arrays it uses, which are
+    freed from the cache once no owner uses them any more. Arrays registered with a
+    holder, such as the Parameters of a ParameterDict, are released when the holder
+    is garbage collected, others by :py:meth:`release`.
+
+    Examples
+    --------
+    >>> cache = mx.nd.ParameterCache.default()
+    >>> net1 = gluon.SymbolBlock.imports('a-symbol.json', ['data'], 'a-0000.params',
+    ...                                  cache=cache, model_name='a')
+    >>> net2 = gluon.SymbolBlock.imports('b-symbol.json', ['data'], 'b-0000.params',
+    ...                                  cache=cache, model_name='b')
+    >>> cache.memory_usage('b')['unique_bytes']
+    """
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> [array, nbytes, set of owners]
+        self._entries = {}
+        # owner -> dict of name to set of keys, one per context
+        self._owners = {}
+        # (owner, name) -> weak reference to the holder
+        self._holders = {}
+        # registrations of collected holders, released on the next access
+        self._collected = []
+
+    @classmethod
+    def default(cls):
+        """Returns the process-wide cache."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def _key(arr, ctx):
+        content = arr.asnumpy()
+        digest = hashlib.sha1(content.tobytes()).hexdigest()
+        return (str(ctx), str(content.dtype), arr.shape, digest), content.nbytes
+
+    def new_owner(self, name):
+        """Returns `name`, or `name` suffixed with a number if a model of that name
+        is already in the cache."""
+        with self._lock:
+            self._release_collected()
+            owner = name
+            i = 0
+            while owner in self._owners:
+                i += 1
+                owner = '%s:%d' % (name, i)
+            return owner
+
+    def get(self, arr, owner, name, ctx=None, holder=None):
+        """Returns the cached array identical to `arr` on `ctx`, adding it to the cache
+        if needed, and registers it as used by `owner` under `name`.
+
+        Parameters
+        ----------
+        arr : NDArray
+            The array to share. Sparse arrays are not shared and are returned as is.
+        owner : str
+            Name of the model using the array.
+        name : str
+            Name of the array in the model.
+        ctx : Context, optional
+            Context of the returned array, the context of `arr` by default.
+        holder : object, optional
+            Object using the array, such as a Parameter. The registration is released
+            when it is garbage collected.
+
+        Returns
+        -------
+        NDArray
+            A read-only array with the content of `arr`.
+        """
+        if arr.stype != 'default':
+            return arr
+        ctx = arr.context if ctx is None else ctx
+        key, nbytes = self._key(arr, ctx)
+        with self._lock:
+            self._release_collected()
+            if holder is not None:
+                self._holders[(owner, name)] = weakref.ref(holder, self._on_collected)
+            keys = self._owners.setdefault(owner, {}).setdefault(name, set())
+            keys.add(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                shared = arr.copyto(ctx) if ctx != arr.context else arr
+                shared.writable = False
+                entry = self._entries[key] = [shared, nbytes, set()]
+            entry[2].add((owner, name))
+            return entry[0]
+
+    def share(self, data, owner):
+        """Replaces the arrays of a list or dict, as returned by `load`, by shared ones."""
+        if isinstance(data, dict):
+            return {k: self.get(v, owner, k) for k, v in data.items()}
+        return [self.get(v, owner, str(i)) for i, v in enumerate(data)]
+
+    def held_by_others(self, owner, holders):
+        """Returns whether arrays of `owner` are registered with holders other than
+        `holders`, or without a holder."""
+        with self._lock:
+            self._release_collected()
+            ids = set(id(holder) for holder in holders)
+            for name in self._owners.get(owner, {}):
+                ref = self._holders.get((owner, name))
+                if ref is None or id(ref()) not in ids:
+                    return True
+            return False
+
+    def _on_collected(self, ref):
+        # runs in the garbage collector, possibly while the lock is held by this thread
+        self._collected.append(ref)
+        if self._lock.acquire(False):
+            try:
+                self._release_collected()
+            finally:
+                self._lock.release()
+
+    def _release_collected(self):
+        while self._collected:
+            ref = self._collected.pop()
+            for (owner, name), held in list(self._holders.items()):
+                if held is ref:
+                    self._release(owner, [name])
+
+    def _release(self, owner, names):
+        registered = self._owners.get(owner, {})
+        for name in names:
+            self._holders.pop((owner, name), None)
+            for key in registered.pop(name, ()):
+                entry = self._entries[key]
+                entry[2].discard((owner, name))
+                if not entry[2]:
+                    del self._entries[key]
+        if owner in self._owners and not registered:
+            del self._owners[owner]
+
+    def release(self, owner, names=None):
+        """Unregisters arrays used by `owner`, all of them when `names` is None. Arrays
+        no longer used by any owner are removed from the cache."""
+        with self._lock:
+            self._release_collected()
+            if names is None:
+                names = list(self._owners.get(owner, {}))
+            self._release(owner, names)
+
+    def memory_usage(self, owner=None):
+        """Returns the memory used by the arrays of a model, or of the whole cache.
+
+        Parameters
+        ----------
+        owner : str, optional
+            Name of the model. When omitted, the usage of all the models is returned.
+
+        Returns
+        -------
+        dict of str to int
+            For a model, 'total_bytes' of the arrays it uses, the 'unique_bytes' of those
+            used by no other model, which would be freed by releasing it, the
+            'shared_bytes' of the others and the 'amortized_bytes' where every array
+            is split evenly between the models using it. For the whole cache,
+            'resident_bytes' held by the cache, 'logical_bytes' that the models would
+            use without sharing, and the number of 'arrays' and 'models'.
+        """
+        with self._lock:
+            self._release_collected()
+            if owner is None:
+                logical = sum(self._entries[key][1] for names in self._owners.values()
+                              for key in set().union(*names.values()))
+                return {'resident_bytes': sum(e[1] for e in self._entries.values()),
+                        'logical_bytes': logical,
+                        'arrays': len(self._entries),
+                        'models': len(self._owners)}
+            usage = {'total_bytes': 0, 'unique_bytes': 0, 'shared_bytes': 0,
+                     'amortized_bytes': 0}
+            for key in set().union(*self._owners.get(owner, {}).values()):
+                _, nbytes, users = self._entries[key]
+                num_owners = len(set(user for user, _ in users))
+                usage['total_bytes'] += nbytes
+                usage['unique_bytes' if num_owners == 1 else 'shared_bytes'] += nbytes
+                usage['amortized_bytes'] += nbytes // num_owners
+            return usage
@@ -25,6 +25,9 @@ import warnings
 from .base import _LIB, check_call, c_str, ProfileHandle, c_str_array, py_str, KVStoreHandle
 
 profiler_kvstore_handle = KVStoreHandle()
+# the last configuration and state set for the worker, None until set
+_config = None
+_state = None
 
 def set_kvstore_handle(handle):
     global profiler_kvstore_handle
@@ -59,12 +62,15 @@ def set_config(**kwargs):
         server can only be profiled when kvstore is of type dist.
         if this is not passed, defaults to `worker`
     """
+    global _config
     kk = kwargs.keys()
     vv = kwargs.values()
     check_call(_LIB.MXSetProcessProfilerConfig(len(kwargs),
                                                c_str_array([key for key in kk]),
                                                c_str_array([str(val) for val in vv]),
                                                profiler_kvstore_handle))
+    if kwargs.get('profile_process', 'worker') == 'worker':
+        _config = dict(kwargs)
 
 
 def profiler_set_config(mode='symbolic', filename='profile.json'):
@@ -78,12 +84,14 @@ def profiler_set_config(mode='symbolic', filename='profile.json'):
     filename : string, optional
         The name of output trace file. Defaults to 'profile.json'.
     """
+    global _config
     warnings.warn('profiler.profiler_set_config() is deprecated. '
                   'Please use profiler.set_config() instead')
     keys = c_str_array([key for key in ["profile_" + mode, "filename"]])
     values = c_str_array([str(val) for val in [True, filename]])
     assert len(keys) == len(values)
     check_call(_LIB.MXSetProcessProfilerConfig(len(keys), keys, values, profiler_kvstore_handle))
+    _config = {"profile_" + mode: True, "filename": filename}
 
 
 def set_state(state='stop', profile_process='worker'):
@@ -99,11 +107,14 @@ def set_state(state='stop', profile_process='worker'):
         server can only be profiled when kvstore is of type dist.
         if this is not passed, defaults to `worker`
     """
+    global _state
     state2int = {'stop': 0, 'run': 1}
     profile_process2int = {'worker': 0, 'server': 1}
     check_call(_LIB.MXSetProcessProfilerState(ctypes.c_int(state2int[state]),
                                               profile_process2int[profile_process],
                                               profiler_kvstore_handle))
+    if profile_process == 'worker':
+        _state = state
 
 
 def profiler_set_state(state='stop'):
@@ -209,7 +209,30 @@ def _check_data(inputs, in_type, msg):
         is_NDArray_or_list = isinstance(inputs, in_type)
     assert is_NDArray_or_list, msg
 
-def foreach(body, data, init_states, name="foreach"):
+def _unroll_foreach(body, flatten_data, data_fmt, init_states, length, name):
+    """Builds the graph of a foreach loop of a fixed length by calling body at every step."""
+    if length <= 0:
+        raise ValueError("unroll_length must be positive, got %s" % str(length))
+    name = _get_unique_subgraph_name(name)
+    # split along the first dimension and remove it from every slice with squeeze,
+    # which keeps the slices of 1-D data of shape (1,) as _foreach does
+    steps = [symbol.split(d, num_outputs=length, axis=0, name="%s_split%d" % (name, j))
+             for j, d in enumerate(flatten_data)]
+    states = init_states
+    outputs = []
+    for i in range(length):
+        eles = [symbol.squeeze(d[i], axis=0, name="%s_t%d_data%d" % (name, i, j))
+                for j, d in enumerate(steps)]
+        eles, _ = _regroup(eles, data_fmt)
+        outs, states = body(eles, states)
+        outs, out_fmt = _flatten(outs, "foreach output")
+        outputs.append(outs)
+    outputs = [symbol.stack(*out, axis=0, name="%s_output%d" % (name, j))
+               for j, out in enumerate(zip(*outputs))]
+    outputs, _ = _regroup(outputs, out_fmt)
+    return (outputs, states)
+
+def foreach(body, data, init_states, name="foreach", unroll_length=None):
     """Run a for loop with user-defined computation over Symbols on dimension 0.
 
     This operator simulates a for loop and body has the computation for an iteration
@@ -254,6 +277,11 @@ def foreach(body, data, init_states, name="foreach"):
         The initial values of the loop states.
     name: string.
         The name of the operator.
+    unroll_length: int, optional
+        The length of data along dimension 0. If given, body is called for every step
+        and the loop is unrolled into the graph instead of being run by the foreach
+        operator, which avoids its per-iteration overhead for short loops of a fixed
+        length. It must be positive.
 
     Returns
     -------
@@ -277,6 +305,9 @@ def foreach(body, data, init_states, name="foreach"):
     _check_data(init_flatten_states, symbol.Symbol,
                 "init_states should be a symbol or a nested list of symbols")
 
+    if unroll_length is not None:
+        return _unroll_foreach(body, flatten_data, data_fmt, init_states, unroll_length, name)
+
     # If the input python function references to the symbols outside
     # the python function, we need to prune the computation graph constructed from
     # the function. One way of doing it is to mark the nodes in the computation graph
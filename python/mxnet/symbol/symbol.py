@@ -27,6 +27,7 @@ except ImportError:
 
 from array import array
 import ctypes
+import os
 import warnings
 from numbers import Number
 
@@ -1367,7 +1368,7 @@ class Symbol(SymbolBase):
     # pylint: disable=too-many-locals
     def simple_bind(self, ctx, grad_req='write', type_dict=None, stype_dict=None,
                     group2ctx=None, shared_arg_names=None, shared_exec=None,
-                    shared_buffer=None, **kwargs):
+                    shared_buffer=None, memory_budget=None, **kwargs):
         """Bind current symbol to get an executor, allocate all the arguments needed.
         Allows specifying data types.
 
@@ -1429,6 +1430,12 @@ class Symbol(SymbolBase):
             of the current executor is not found in `shared_arg_names`. The `NDArray` s are
             expected have default storage type.
 
+        memory_budget : int, optional
+            Budget in bytes for the internal storage pool planned by the executor.
+            When the plan without recomputation exceeds the budget, the symbol is
+            bound again with backward mirroring (as with ``MXNET_BACKWARD_DO_MIRROR=1``)
+            and the executor with the smaller storage pool is returned.
+
         kwargs : Dict of str->shape
             Input shape dictionary, name->shape
 
@@ -1437,6 +1444,12 @@ class Symbol(SymbolBase):
         executor : mxnet.Executor
             The generated executor
         """
+        if memory_budget is not None:
+            return self._simple_bind_with_budget(
+                memory_budget, ctx, grad_req=grad_req, type_dict=type_dict,
+                stype_dict=stype_dict, group2ctx=group2ctx,
+                shared_arg_names=shared_arg_names, shared_exec=shared_exec,
+                shared_buffer=shared_buffer, **kwargs)
         # data types
         num_provided_arg_types = 0
         provided_arg_type_names = ctypes.POINTER(ctypes.c_char_p)()  # provided type argument names
@@ -1629,6 +1642,29 @@ class Symbol(SymbolBase):
         executor.aux_arrays = aux_arrays
         return executor
 
+    def _simple_bind_with_budget(self, memory_budget, ctx, **kwargs):
+        """Bind with or without backward mirroring depending on a memory budget."""
+        executor = self.simple_bind(ctx, **kwargs)
+        allocated = executor.memory_plan()['storage_allocated_bytes']
+        if allocated <= memory_budget or os.environ.get('MXNET_BACKWARD_DO_MIRROR') == '1':
+            return executor
+        # the executor mirrors the nodes marked with __backward_do_mirror__ as it would
+        # all nodes with MXNET_BACKWARD_DO_MIRROR=1, the marks are set on a copy
+        mirrored_sym = self.__copy__()
+        internals = mirrored_sym.get_internals()
+        for i in range(len(internals)):
+            if internals[i].get_children() is not None:
+                internals[i]._set_attr(__backward_do_mirror__='True')
+        mirrored = mirrored_sym.simple_bind(ctx, **kwargs)
+        mirrored_allocated = mirrored.memory_plan()['storage_allocated_bytes']
+        if mirrored_allocated > memory_budget:
+            warnings.warn("Planned storage of %d bytes exceeds the memory budget of %d bytes "
+                          "even with backward mirroring" % (mirrored_allocated, memory_budget),
+                          stacklevel=3)
+        if mirrored_allocated < allocated:
+            return mirrored
+        return executor
+
     def bind(self, ctx, args, args_grad=None, grad_req='write',
              aux_states=None, group2ctx=None, shared_exec=None):
         """Binds the current symbol to an executor and returns it.
@@ -23,6 +23,8 @@
  * \brief C API of mxnet
  */
 #include <vector>
+#include <algorithm>
+#include <chrono>
 #include <sstream>
 #include <string>
 #include <mutex>
@@ -128,6 +130,28 @@ int MXEngineSetBulkSize(int bulk_size, int* prev_bulk_size) {
   API_END();
 }
 
+int MXEngineRecordTimestamp(NDArrayHandle* handles, int num, int64_t* out) {
+  API_BEGIN();
+  auto now = []() {
+    return static_cast<int64_t>(std::chrono::duration_cast<std::chrono::microseconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count());
+  };
+  if (num == 0) {
+    *out = now();
+  } else {
+    std::vector<Engine::VarHandle> const_vars;
+    for (int i = 0; i < num; ++i) {
+      const_vars.push_back(static_cast<NDArray*>(handles[i])->var());
+    }
+    std::sort(const_vars.begin(), const_vars.end());
+    const_vars.erase(std::unique(const_vars.begin(), const_vars.end()), const_vars.end());
+    Engine::Get()->PushSync([out, now](RunContext ctx) {
+        *out = now();
+      }, Context::CPU(), const_vars, {}, FnProperty::kCPUPrioritized, 0, "RecordTimestamp");
+  }
+  API_END();
+}
+
 int MXGetGPUCount(int* out) {
   API_BEGIN();
   *out = Context::GetGPUCount();
@@ -845,6 +869,16 @@ int MXKVStoreSetGradientCompression(KVStoreHandle handle, mx_uint num_params,
   API_END();
 }
 
+int MXKVStoreGetGradientCompressionStats(KVStoreHandle handle,
+                                         int64_t *original_bytes,
+                                         int64_t *compressed_bytes,
+                                         float *residual_norm) {
+  API_BEGIN();
+  static_cast<KVStore*>(handle)->GetGradientCompressionStats(original_bytes, compressed_bytes,
+                                                             residual_norm);
+  API_END();
+}
+
 int MXKVStoreFree(KVStoreHandle handle) {
   API_BEGIN();
   delete static_cast<KVStore*>(handle);
@@ -27,6 +27,7 @@
 #include <mxnet/executor.h>
 #include "./c_api_common.h"
 #include "../executor/graph_executor.h"
+#include "../executor/infer_attr_cache.h"
 #if MXNET_USE_TENSORRT
 #include "../executor/trt_graph_executor.h"
 #endif  // MXNET_USE_TENSORRT
@@ -42,6 +43,40 @@ int MXExecutorPrint(ExecutorHandle handle, const char **out_str) {
   API_END();
 }
 
+int MXExecutorGetMemoryPlan(ExecutorHandle handle, const char **out_str) {
+  Executor *exec = static_cast<Executor*>(handle);
+  MXAPIThreadLocalEntry *ret = MXAPIThreadLocalStore::Get();
+  API_BEGIN();
+  std::ostringstream os;
+  exec->PrintMemoryPlan(os);
+  ret->ret_str = os.str();
+  *out_str = (ret->ret_str).c_str();
+  API_END();
+}
+
+int MXExecutorGetInferCacheStats(const char **out_str) {
+  using namespace mxnet::exec;
+  MXAPIThreadLocalEntry *ret = MXAPIThreadLocalStore::Get();
+  API_BEGIN();
+  std::ostringstream os;
+  os << "{\"shape\": ";
+  InferAttrCache<mxnet::TShape>::Get()->PrintStats(os);
+  os << ", \"dtype\": ";
+  InferAttrCache<int>::Get()->PrintStats(os);
+  os << "}";
+  ret->ret_str = os.str();
+  *out_str = (ret->ret_str).c_str();
+  API_END();
+}
+
+int MXExecutorClearInferCache() {
+  using namespace mxnet::exec;
+  API_BEGIN();
+  InferAttrCache<mxnet::TShape>::Get()->Clear();
+  InferAttrCache<int>::Get()->Clear();
+  API_END();
+}
+
 int MXExecutorFree(ExecutorHandle handle) {
   API_BEGIN();
   delete static_cast<Executor*>(handle);
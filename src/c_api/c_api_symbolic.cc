@@ -726,6 +726,15 @@ int MXGenBackendSubgraph(SymbolHandle sym_handle, const char *backend,
       mxnet::op::SubgraphPropertyRegistry::Get()->CreateSubgraphProperty(backend);
   for (auto property : properties) {
     nnvm::Graph g = Symbol2Graph(*s);
+    // give the property the types known from the variables, as the executor infers
+    // the types before partitioning; an inconsistent graph is reported when bound
+    try {
+      nnvm::Graph typed;
+      typed.outputs = g.outputs;
+      typed = mxnet::exec::InferType(std::move(typed), nnvm::DTypeVector(), "__dtype__");
+      g.attrs["dtype"] = typed.attrs.at("dtype");
+    } catch (const dmlc::Error&) {
+    }
     property->SetAttr("graph", g);
     g.attrs["subgraph_property"] = std::make_shared<nnvm::any>(std::move(property));
     g = ApplyPass(std::move(g), "BuildSubgraph");
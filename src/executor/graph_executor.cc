@@ -25,7 +25,9 @@
 #include <mxnet/base.h>
 #include <nnvm/graph.h>
 #include <nnvm/pass_functions.h>
+#include <dmlc/json.h>
 #include <vector>
+#include <string>
 #include <algorithm>
 
 #include "./exec_pass.h"
@@ -101,6 +103,64 @@ void GraphExecutor::Print(std::ostream &os) const {  // NOLINT(*)
   os << "Total " << 11 << " TempSpace resource requested\n";
 }
 
+void GraphExecutor::PrintMemoryPlan(std::ostream &os) const {  // NOLINT(*)
+  const auto& idx = graph_.indexed_graph();
+  const auto& vdtype = graph_.GetAttr<nnvm::DTypeVector>("dtype");
+  const auto& vshape = graph_.GetAttr<mxnet::ShapeVector>("shape");
+  const auto& vstorage = graph_.GetAttr<nnvm::StorageVector>("storage_id");
+  const auto& vinplace = graph_.GetAttr<std::vector<int> >("storage_inplace_index");
+  std::vector<int> addto_entry(idx.num_node_entries(), 0);
+  std::vector<int> skip_plus_node(idx.num_nodes(), 0);
+  if (graph_.attrs.count("addto_entry") != 0) {
+    addto_entry = graph_.GetAttr<std::vector<int> >("addto_entry");
+    skip_plus_node = graph_.GetAttr<std::vector<int> >("skip_plus_node");
+  }
+  // node table, nodes are listed in topological (execution) order
+  std::vector<std::string> node_name(idx.num_nodes()), node_op(idx.num_nodes());
+  std::vector<std::vector<uint32_t> > node_inputs(idx.num_nodes()), node_outputs(idx.num_nodes());
+  for (uint32_t nid = 0; nid < idx.num_nodes(); ++nid) {
+    const auto& inode = idx[nid];
+    node_name[nid] = inode.source->attrs.name;
+    node_op[nid] = inode.source->is_variable() ? "null" : inode.source->op()->name;
+    for (const auto& e : inode.inputs) {
+      node_inputs[nid].push_back(idx.entry_id(e));
+    }
+    for (uint32_t i = 0; i < inode.source->num_outputs(); ++i) {
+      node_outputs[nid].push_back(idx.entry_id(nid, i));
+    }
+  }
+  // entry table
+  std::vector<size_t> entry_bytes(idx.num_node_entries(), 0);
+  for (size_t i = 0; i < vshape.size(); ++i) {
+    if (vshape[i].ndim() == 0 || vdtype[i] == -1) continue;
+    entry_bytes[i] = vshape[i].Size() * mshadow::mshadow_sizeof(vdtype[i]);
+  }
+  std::vector<uint32_t> output_entries;
+  for (const auto& e : idx.outputs()) {
+    output_entries.push_back(idx.entry_id(e));
+  }
+  size_t total_bytes = graph_.GetAttr<size_t>("storage_allocated_bytes");
+  size_t num_forward_nodes = num_forward_nodes_;
+
+  dmlc::JSONWriter writer(&os);
+  writer.BeginObject();
+  writer.WriteObjectKeyValue("storage_allocated_bytes", total_bytes);
+  writer.WriteObjectKeyValue("pool_shared_bytes", pool_shared_bytes_);
+  writer.WriteObjectKeyValue("pool_new_bytes", pool_new_bytes_);
+  writer.WriteObjectKeyValue("num_forward_nodes", num_forward_nodes);
+  writer.WriteObjectKeyValue("node_name", node_name);
+  writer.WriteObjectKeyValue("node_op", node_op);
+  writer.WriteObjectKeyValue("node_inputs", node_inputs);
+  writer.WriteObjectKeyValue("node_outputs", node_outputs);
+  writer.WriteObjectKeyValue("skip_plus_node", skip_plus_node);
+  writer.WriteObjectKeyValue("entry_storage_id", vstorage);
+  writer.WriteObjectKeyValue("entry_bytes", entry_bytes);
+  writer.WriteObjectKeyValue("entry_inplace_index", vinplace);
+  writer.WriteObjectKeyValue("entry_addto", addto_entry);
+  writer.WriteObjectKeyValue("output_entries", output_entries);
+  writer.EndObject();
+}
+
 void GraphExecutor::SetMonitorCallback(const MonitorCallback& callback, bool monitor_all) {
   CHECK(callback) << "invalid callback";
   monitor_callback_ = callback;
@@ -226,6 +286,33 @@ inline ValueType get_node_attr(
   }
 }
 
+bool NeedMirror(const nnvm::Node& node, bool do_mirror) {
+  static const auto& fmutate_inputs = nnvm::Op::GetAttr<nnvm::FMutateInputs>("FMutateInputs");
+  static const auto& fresource = nnvm::Op::GetAttr<FResourceRequest>("FResourceRequest");
+  if (node.is_variable()) return false;
+  const nnvm::Op* op = node.op();
+  const std::string& type = op->name;
+  if (type == "Dropout") return false;
+  // recomputing ops which update their inputs, such as BatchNorm, would update them twice
+  if (fmutate_inputs.count(op)) return false;
+  // random ops would draw different values
+  if (fresource.count(op)) {
+    for (const auto& req : fresource[op](node.attrs)) {
+      if (req.type == ResourceRequest::kRandom ||
+          req.type == ResourceRequest::kParallelRandom) return false;
+    }
+  }
+  if (get_node_attr(node, "__force_mirroring__", false)) return true;
+  if (!do_mirror && !get_node_attr(node, "__backward_do_mirror__", false)) return false;
+  if (type == "Convolution") return false;
+  if (type == "FullyConnected") return false;
+  if (type == "Concat") return false;
+  if (type == "SoftmaxOutput") return false;
+  if (type == "BatchNorm") return false;
+  if (type == "CuDNNBatchNorm") return false;
+  return true;
+}
+
 /*!
  * \brief Create the graph for backward pass.
  * This is triggered by both simple_bind and bind flows.
@@ -260,18 +347,7 @@ nnvm::Graph GraphExecutor::InitFullGraph(nnvm::Symbol symbol,
 
   int do_mirror = dmlc::GetEnv("MXNET_BACKWARD_DO_MIRROR", 0);
   auto need_mirror = [do_mirror](const nnvm::Node& node) -> int {
-    if (node.is_variable()) return 0;
-    const std::string& type = node.attrs.op->name;
-    if (type == "Dropout") return false;
-    if (get_node_attr(node, "__force_mirroring__", false)) return true;
-    if (do_mirror == 0) return false;
-    if (type == "Convolution") return false;
-    if (type == "FullyConnected") return false;
-    if (type == "Concat") return false;
-    if (type == "SoftmaxOutput") return false;
-    if (type == "BatchNorm") return false;
-    if (type == "CuDNNBatchNorm") return false;
-    return true;
+    return NeedMirror(node, do_mirror != 0);
   };
 
   std::vector<const nnvm::Op*> zero_ops;
@@ -1009,6 +1085,8 @@ void GraphExecutor::InitDataEntryMemory(std::vector<NDArray>* shared_pool) {
   // remake the data pool
   data_pool_.clear();
   data_pool_.resize(pool_info.size());
+  pool_shared_bytes_ = 0;
+  pool_new_bytes_ = 0;
 
   // sort the pool info the descending order before allocating memory
   std::vector<size_t> sorted_pool_index;
@@ -1027,6 +1105,7 @@ void GraphExecutor::InitDataEntryMemory(std::vector<NDArray>* shared_pool) {
     for (auto it = free_pool.lower_bound(bytes); it != free_pool.end(); ++it) {
       if (it->second.ctx() == ctx && it->first >= bytes) {
         data_pool_[i] = it->second;
+        pool_shared_bytes_ += it->first;
         free_pool.erase(it);
         allocated = true;
         break;
@@ -1041,6 +1120,7 @@ void GraphExecutor::InitDataEntryMemory(std::vector<NDArray>* shared_pool) {
       // is a temporary solution.
       NDArray nd(shape, ctx, true);
       data_pool_[i] = nd;
+      pool_new_bytes_ += nword * 4;
       // put the new allocated arrays to shared pool
       if (shared_pool != nullptr)  {
         shared_pool->push_back(nd);
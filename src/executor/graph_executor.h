@@ -53,6 +53,15 @@ using nnvm::Graph;
 
 nnvm::NodeEntry AggregateGradient(std::vector<nnvm::NodeEntry>&& v);
 
+/*!
+ * \brief whether the output of a node is recomputed in the backward pass instead of
+ *  being kept from the forward pass. Nodes marked with `__force_mirroring__`, or all
+ *  but a few expensive ones when `do_mirror` is set or they are marked with
+ *  `__backward_do_mirror__`, are, unless recomputing them changes the result: random
+ *  ops and ops updating their inputs are never mirrored.
+ */
+bool NeedMirror(const nnvm::Node& node, bool do_mirror);
+
 // graph executors
 class GraphExecutor : public Executor {
  public:
@@ -68,6 +77,7 @@ class GraphExecutor : public Executor {
   const std::unordered_map<std::string, NDArray>& arg_grad_map() const override;
   const std::unordered_map<std::string, NDArray>& aux_state_map() const override;
   void Print(std::ostream &os) const override; // NOLINT(*)
+  void PrintMemoryPlan(std::ostream &os) const override; // NOLINT(*)
   void SetMonitorCallback(const MonitorCallback& callback, bool monitor_all = false) override;
   // Initialize the rest of attributes
   // after setting up arguments.
@@ -226,6 +236,10 @@ class GraphExecutor : public Executor {
   // internal data pool of allocated entries.
   // these allocated entries can be used for static memory sharing between executors.
   std::vector<NDArray> data_pool_;
+  // bytes of data_pool_ reused from the pool of a shared executor
+  size_t pool_shared_bytes_{0};
+  // bytes of data_pool_ allocated by this executor
+  size_t pool_new_bytes_{0};
   // output arrays
   std::vector<NDArray> output_arrays_;
   // input argument map, key is arg name, value is arg's NDArray
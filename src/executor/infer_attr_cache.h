@@ -0,0 +1,201 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * \file infer_attr_cache.h
+ * \brief LRU cache of the results of shape and type inference, keyed by the
+ *  structure of the graph and the attributes of its inputs.
+ */
+#ifndef MXNET_EXECUTOR_INFER_ATTR_CACHE_H_
+#define MXNET_EXECUTOR_INFER_ATTR_CACHE_H_
+
+#include <dmlc/common.h>
+#include <dmlc/parameter.h>
+#include <nnvm/graph.h>
+#include <cstdint>
+#include <list>
+#include <mutex>
+#include <ostream>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+namespace mxnet {
+namespace exec {
+
+/*!
+ * \brief hashes the attributes of a node independently of their order, so that they
+ *  do not need to be sorted
+ */
+inline uint64_t HashNodeAttrs(const std::unordered_map<std::string, std::string>& dict) {
+  uint64_t ret = dict.size();
+  for (const auto& kv : dict) {
+    ret += dmlc::HashCombine(std::hash<std::string>()(kv.first), kv.second);
+  }
+  return ret;
+}
+
+/*!
+ * \brief appends everything in an indexed graph that inference depends on: the
+ *  operators, a hash of their attributes, the inputs and control dependencies of the
+ *  nodes and the outputs. Names of nodes are left out, so graphs differing only by
+ *  names have the same structure. Backward nodes take their attributes from their
+ *  first control dependency, which is therefore part of the structure.
+ */
+inline void AppendGraphStructure(const nnvm::IndexedGraph& idx, std::vector<uint64_t>* out) {
+  out->push_back(idx.num_nodes());
+  for (uint32_t nid = 0; nid < idx.num_nodes(); ++nid) {
+    const auto& inode = idx[nid];
+    out->push_back(reinterpret_cast<uintptr_t>(inode.source->op()));
+    out->push_back(HashNodeAttrs(inode.source->attrs.dict));
+    out->push_back(inode.inputs.size());
+    for (const auto& e : inode.inputs) {
+      out->push_back((static_cast<uint64_t>(e.node_id) << 32) | e.index);
+    }
+    out->push_back(inode.control_deps.size());
+    for (uint32_t dep : inode.control_deps) out->push_back(dep);
+    out->push_back(inode.source->attrs.subgraphs.size());
+    for (const auto& subgraph : inode.source->attrs.subgraphs) {
+      nnvm::Graph g;
+      g.outputs = subgraph->outputs;
+      AppendGraphStructure(g.indexed_graph(), out);
+    }
+  }
+  out->push_back(idx.outputs().size());
+  for (const auto& e : idx.outputs()) {
+    out->push_back((static_cast<uint64_t>(e.node_id) << 32) | e.index);
+  }
+}
+
+/*!
+ * \brief returns the structure of a graph, see AppendGraphStructure. It reuses the
+ *  indexed graph, which inference builds anyway.
+ */
+inline std::vector<uint64_t> GraphStructure(const nnvm::Graph& graph) {
+  std::vector<uint64_t> ret;
+  AppendGraphStructure(graph.indexed_graph(), &ret);
+  return ret;
+}
+
+/*!
+ * \brief bounded cache of inferred attribute vectors, such as the shapes or the
+ *  dtypes of all the entries of a graph. Binding or reshaping executors on recurring
+ *  input shapes, e.g. the buckets of a BucketingModule, then skips the inference.
+ *  The size is set by MXNET_EXEC_INFER_CACHE_SIZE, 0 disables the cache.
+ */
+template<typename AttrType>
+class InferAttrCache {
+ public:
+  struct Key {
+    /*! \brief the structure of the graph, see GraphStructure */
+    std::vector<uint64_t> graph;
+    size_t graph_hash;
+    std::vector<AttrType> inputs;
+    std::string attr_key;
+
+    Key(std::vector<uint64_t>&& graph, std::vector<AttrType>&& inputs, std::string&& attr_key)
+      : graph(std::move(graph)), graph_hash(this->graph.size()),
+        inputs(std::move(inputs)), attr_key(std::move(attr_key)) {
+      for (uint64_t v : this->graph) graph_hash = dmlc::HashCombine(graph_hash, v);
+    }
+
+    bool operator==(const Key& other) const {
+      return graph_hash == other.graph_hash && inputs == other.inputs &&
+             attr_key == other.attr_key && graph == other.graph;
+    }
+  };
+
+  static InferAttrCache* Get() {
+    static InferAttrCache inst(dmlc::GetEnv("MXNET_EXEC_INFER_CACHE_SIZE", 256));
+    return &inst;
+  }
+
+  bool enabled() const {
+    return capacity_ > 0;
+  }
+
+  /*!
+   * \brief looks up the result of an inference
+   * \return whether it was found, in which case attrs and num_unknown are set
+   */
+  bool Lookup(const Key& key, std::vector<AttrType>* attrs, size_t* num_unknown) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = index_.find(key);
+    if (it == index_.end()) {
+      ++misses_;
+      return false;
+    }
+    ++hits_;
+    entries_.splice(entries_.begin(), entries_, it->second);
+    *attrs = it->second->second.first;
+    *num_unknown = it->second->second.second;
+    return true;
+  }
+
+  void Insert(Key&& key, const std::vector<AttrType>& attrs, size_t num_unknown) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (index_.count(key)) return;
+    entries_.emplace_front(std::move(key), std::make_pair(attrs, num_unknown));
+    index_[entries_.front().first] = entries_.begin();
+    while (entries_.size() > capacity_) {
+      index_.erase(entries_.back().first);
+      entries_.pop_back();
+      ++evictions_;
+    }
+  }
+
+  void Clear() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    index_.clear();
+    entries_.clear();
+    hits_ = misses_ = evictions_ = 0;
+  }
+
+  /*! \brief writes the statistics of the cache as a JSON object */
+  void PrintStats(std::ostream& os) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    os << "{\"hits\": " << hits_ << ", \"misses\": " << misses_
+       << ", \"evictions\": " << evictions_ << ", \"size\": " << entries_.size()
+       << ", \"capacity\": " << capacity_ << "}";
+  }
+
+ private:
+  struct KeyHash {
+    size_t operator()(const Key& key) const {
+      size_t ret = dmlc::HashCombine(key.graph_hash, key.attr_key);
+      for (const auto& attr : key.inputs) ret = dmlc::HashCombine(ret, attr);
+      return ret;
+    }
+  };
+  using Entry = std::pair<Key, std::pair<std::vector<AttrType>, size_t> >;
+
+  explicit InferAttrCache(size_t capacity) : capacity_(capacity) {}
+
+  size_t capacity_;
+  // most recently used first
+  std::list<Entry> entries_;
+  std::unordered_map<Key, typename std::list<Entry>::iterator, KeyHash> index_;
+  size_t hits_ = 0, misses_ = 0, evictions_ = 0;
+  std::mutex mutex_;
+};
+
+}  // namespace exec
+}  // namespace mxnet
+#endif  // MXNET_EXECUTOR_INFER_ATTR_CACHE_H_
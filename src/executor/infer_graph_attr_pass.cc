@@ -25,6 +25,7 @@
 #include <mxnet/op_attr_types.h>
 #include <mxnet/graph_attr_types.h>
 #include "./exec_pass.h"
+#include "./infer_attr_cache.h"
 #include "../operator/operator_common.h"
 #include "../common/exec_utils.h"
 
@@ -634,6 +635,58 @@ nnvm::Graph InferShapeAttr(nnvm::Graph &&ret,
   return ret;
 }
 
+/*!\brief
+ * Runs an inference pass through the InferAttrCache. The cache is bypassed when the
+ * result depends on more than the graph and its input attributes, i.e. when the
+ * graph carries partially inferred attributes, hints or a node range.
+ *
+ * \param graph graph used for attribute inference
+ * \param input_name name of the attribute storing the input attributes
+ * \param attr_key_name name of the attribute used for inference for variable nodes
+ * \param attr_name name of the inferred attribute
+ * \param unknown_name name of the attribute storing number of entries
+ *                     impossible to infer
+ * \param finfer the inference pass
+ */
+template<typename AttrType, typename FInfer>
+nnvm::Graph CachedInferAttr(nnvm::Graph&& graph,
+                            const char* input_name,
+                            const char* attr_key_name,
+                            const char* attr_name,
+                            const char* unknown_name,
+                            FInfer finfer) {
+  using dmlc::any;
+  using Cache = InferAttrCache<AttrType>;
+  Cache* cache = Cache::Get();
+  if (!cache->enabled() || graph.attrs.count(attr_name) ||
+      graph.attrs.count(std::string(attr_name) + "_hints") ||
+      graph.attrs.count("node_range") || graph.attrs.count("entry_range")) {
+    return finfer(std::move(graph));
+  }
+  std::vector<AttrType> inputs;
+  if (graph.attrs.count(input_name)) {
+    inputs = graph.GetAttr<std::vector<AttrType> >(input_name);
+  }
+  std::string attr_key;
+  if (graph.attrs.count(attr_key_name)) {
+    attr_key = graph.GetAttr<std::string>(attr_key_name);
+  }
+  typename Cache::Key key(GraphStructure(graph), std::move(inputs), std::move(attr_key));
+  std::vector<AttrType> attrs;
+  size_t num_unknown;
+  if (cache->Lookup(key, &attrs, &num_unknown)) {
+    // leaves the graph attributes as the pass does
+    graph.attrs.erase(attr_key_name);
+    graph.attrs[attr_name] = std::make_shared<any>(std::move(attrs));
+    graph.attrs[unknown_name] = std::make_shared<any>(num_unknown);
+    return std::move(graph);
+  }
+  nnvm::Graph ret = finfer(std::move(graph));
+  cache->Insert(std::move(key), ret.GetAttr<std::vector<AttrType> >(attr_name),
+                ret.GetAttr<size_t>(unknown_name));
+  return ret;
+}
+
 nnvm::Graph InferShape(nnvm::Graph&& graph,
                        mxnet::ShapeVector&& shape_inputs,
                        const std::string& shape_attr_key) {
@@ -644,24 +697,28 @@ nnvm::Graph InferShape(nnvm::Graph&& graph,
   if (shape_attr_key.length() != 0) {
     graph.attrs["shape_attr_key"] = std::make_shared<any>(shape_attr_key);
   }
-  return InferShapeAttr(
-      std::move(graph), mxnet::TShape(),
-      "FInferShape", "shape_inputs", "shape_attr_key",
-      "shape", "shape_num_unknown_nodes",
-      [](const mxnet::TShape& s) { return s.ndim() == 0 || s.Size() == 0; },
-      [](const mxnet::TShape& s) {
-        if (s.ndim() == 0) {  // TODO(reminisce): Usage of ndim
-          return static_cast<size_t>(1);
-        }
-        size_t ret = 0;
-        for (const auto& val : s) {
-          if (val == 0) {
-            ++ret;
+  return CachedInferAttr<mxnet::TShape>(
+      std::move(graph), "shape_inputs", "shape_attr_key",
+      "shape", "shape_num_unknown_nodes", [](nnvm::Graph&& g) {
+    return InferShapeAttr(
+        std::move(g), mxnet::TShape(),
+        "FInferShape", "shape_inputs", "shape_attr_key",
+        "shape", "shape_num_unknown_nodes",
+        [](const mxnet::TShape& s) { return s.ndim() == 0 || s.Size() == 0; },
+        [](const mxnet::TShape& s) {
+          if (s.ndim() == 0) {  // TODO(reminisce): Usage of ndim
+            return static_cast<size_t>(1);
           }
-        }
-        return ret;
-      },
-      nullptr, true, nullptr);
+          size_t ret = 0;
+          for (const auto& val : s) {
+            if (val == 0) {
+              ++ret;
+            }
+          }
+          return ret;
+        },
+        nullptr, true, nullptr);
+  });
 }
 
 nnvm::Graph InferType(nnvm::Graph&& graph,
@@ -674,12 +731,16 @@ nnvm::Graph InferType(nnvm::Graph&& graph,
   if (dtype_attr_key.length() != 0) {
     graph.attrs["dtype_attr_key"] = std::make_shared<any>(dtype_attr_key);
   }
-  return InferAttr<int, nnvm::FInferType>(
-      std::move(graph), -1,
-      "FInferType", "dtype_inputs", "dtype_attr_key",
-      "dtype", "dtype_num_unknown_nodes",
-      [](const int t) { return t == -1; },
-      common::SameType, true, nullptr);
+  return CachedInferAttr<int>(
+      std::move(graph), "dtype_inputs", "dtype_attr_key",
+      "dtype", "dtype_num_unknown_nodes", [](nnvm::Graph&& g) {
+    return InferAttr<int, nnvm::FInferType>(
+        std::move(g), -1,
+        "FInferType", "dtype_inputs", "dtype_attr_key",
+        "dtype", "dtype_num_unknown_nodes",
+        [](const int t) { return t == -1; },
+        common::SameType, true, nullptr);
+  });
 }
 
 nnvm::Graph InferStorageType(nnvm::Graph&& graph,
@@ -175,9 +175,16 @@ CachedOp::CachedOp(
     CHECK_GT(xs.size(), 0)
         << "There are no inputs in computation graph that require gradients.";
 
+    // nodes marked by __force_mirroring__, e.g. by gluon blocks hybridized with checkpoint,
+    // are recomputed in the backward pass instead of keeping their outputs, except the ones
+    // whose recomputation would differ (random ops) or update states (e.g. BatchNorm).
+    auto need_mirror = [](const nnvm::Node& node) -> int {
+      return exec::NeedMirror(node, false);
+    };
+
     grad_graph_ = pass::MXGradient(
         fwd_graph_, fwd_graph_.outputs, xs, ograd_entries_,
-        exec::AggregateGradient, nullptr, nullptr,
+        exec::AggregateGradient, need_mirror, nullptr,
         zero_ops, "_copy");
   }
 
@@ -269,25 +276,35 @@ bool CachedOp::CheckDynamicShapeExists(const Context& default_ctx,
   using namespace imperative;
   CHECK_EQ(inputs.size(), num_inputs());
 
-  auto state_ptr = GetCachedOpState(default_ctx);
-  auto& state = state_ptr.get_state<CachedOpState>();
-
-  nnvm::Graph& g = state.info.fwd_graph;
   ShapeVector shape_inputs;
   shape_inputs.reserve(inputs.size());
   for (auto input : inputs) {
     shape_inputs.emplace_back(input->shape());
   }
+  // The graph is run again with the input shapes it last ran with, e.g. by loop
+  // operators at every iteration, so the inference below is only redone when they change.
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (erase_result && shape_inputs == static_shape_inputs_) return false;
+  }
+
+  auto state_ptr = GetCachedOpState(default_ctx);
+  auto& state = state_ptr.get_state<CachedOpState>();
+
+  nnvm::Graph& g = state.info.fwd_graph;
   // We leverage the shape inference pass to detect whether dynamic shape exists.
   // If so, the pass will fail with `contain_dynamic_shape = true`,
-  // This method is only called once, so the overhead is negligible.
   bool contain_dynamic_shape = false;
-  CheckAndInferShape(&g, std::move(shape_inputs), true,
+  CheckAndInferShape(&g, ShapeVector(shape_inputs), true,
                      {0, 0}, {0, 0},
                      &contain_dynamic_shape);
   if (erase_result) {
     g.attrs.erase("shape");
     g.attrs.erase("shape_inputs");
+    if (!contain_dynamic_shape) {
+      std::lock_guard<std::mutex> lock(mutex_);
+      static_shape_inputs_ = std::move(shape_inputs);
+    }
   }
   return contain_dynamic_shape;
 }
@@ -202,6 +202,9 @@ class CachedOp {
   std::vector<bool> save_inputs_, save_outputs_;
   std::vector<OpReqType> bwd_output_reqs_;
 
+  // input shapes last found by CheckDynamicShapeExists to have no dynamic shape
+  mxnet::ShapeVector static_shape_inputs_;
+
   std::mutex mutex_;
   std::unordered_map<Context, std::vector<OpStatePtr> > cached_op_states_;
 };
@@ -30,11 +30,16 @@
 #include <vector>
 #include <tuple>
 #include <thread>
+#include <chrono>
+#include <mutex>
+#include <unordered_map>
 #include "mxnet/ndarray.h"
 #include "gradient_compression.h"
+#include "../engine/openmp.h"
 #include "../ndarray/ndarray_function.h"
 #include "../operator/tensor/sparse_retain-inl.h"
 #include "./kvstore_utils.h"
+#include "./numa_utils.h"
 namespace mxnet {
 namespace kvstore {
 /**
@@ -56,6 +61,19 @@ class Comm {
    */
   virtual const NDArray& Reduce(
       int key, const std::vector<NDArray>& src, int priority) = 0;
+  /**
+   * \brief reduces the values of several keys, merged[i] = src[i][0] + .. + src[i][n-1]
+   *
+   * Implementations may reduce many keys with a single operation.
+   */
+  virtual void ReduceBatch(const std::vector<int>& keys,
+                           const std::vector<std::vector<NDArray>>& src,
+                           int priority, std::vector<NDArray>* merged) {
+    merged->resize(keys.size());
+    for (size_t i = 0; i < keys.size(); ++i) {
+      (*merged)[i] = Reduce(keys[i], src[i], priority);
+    }
+  }
   /**
    * \brief copy from src to dst[i] for every i
    */
@@ -103,8 +121,13 @@ class Comm {
 class CommCPU : public Comm {
  public:
   CommCPU() {
+    // 0 tunes the number of reduction threads at runtime
     nthread_reduction_ = dmlc::GetEnv("MXNET_KVSTORE_REDUCTION_NTHREADS", 4);
     bigarray_bound_ = dmlc::GetEnv("MXNET_KVSTORE_BIGARRAY_BOUND", 1000 * 1000);
+    batch_reduction_ = dmlc::GetEnv("MXNET_KVSTORE_REDUCTION_BATCH", 1);
+    numa_reduction_ = dmlc::GetEnv("MXNET_KVSTORE_REDUCTION_NUMA", 1) &&
+                      NumaNodeCPUs().size() > 1;
+    thread_tuner_.Init(std::max(1, engine::OpenMP::Get()->GetRecommendedOMPThreadCount(false)));
     // TODO(junwu) delete the following data member, now for benchmark only
     is_serial_push_ = dmlc::GetEnv("MXNET_KVSTORE_SERIAL_PUSH", 0);
   }
@@ -141,31 +164,15 @@ class CommCPU : public Comm {
     NDArray& buf_merged = buf.merged_buf(stype);
     // normal dense reduce
     if (stype == kDefaultStorage) {
-      std::vector<Engine::VarHandle> const_vars(src.size() - 1);
-      std::vector<NDArray> reduce(src.size());
-      CopyFromTo(src[0], &buf_merged, priority);
-      reduce[0] = buf_merged;
-
-      if (buf.copy_buf.empty()) {
-        buf.copy_buf.resize(src.size()-1);
-        for (size_t j = 0; j < src.size() - 1; ++j) {
-          // allocate copy buffer
-          buf.copy_buf[j] = NDArray(
-            src[0].shape(), pinned_ctx_, false, src[0].dtype());
-        }
-      }
-      CHECK(stype == buf.copy_buf[0].storage_type())
-           << "Storage type mismatch detected. " << stype << "(src) vs. "
-           << buf.copy_buf[0].storage_type() << "(buf.copy_buf)";
-      for (size_t i = 1; i < src.size(); ++i) {
-        CopyFromTo(src[i], &(buf.copy_buf[i-1]), priority);
-        reduce[i] = buf.copy_buf[i-1];
+      std::vector<NDArray> reduce = CopyToReduceBuffers(key, src, priority);
+      std::vector<Engine::VarHandle> const_vars(reduce.size() - 1);
+      for (size_t i = 1; i < reduce.size(); ++i) {
         const_vars[i-1] = reduce[i].var();
       }
 
       Engine::Get()->PushAsync(
-        [reduce, this](RunContext rctx, Engine::CallbackOnComplete on_complete) {
-          ReduceSumCPU(reduce);
+        [reduce, key, this](RunContext rctx, Engine::CallbackOnComplete on_complete) {
+          ReduceSumCPU(reduce, key);
           on_complete();
         }, Context::CPU(), const_vars, {reduce[0].var()},
         FnProperty::kCPUPrioritized, priority, "KVStoreReduce");
@@ -206,6 +213,50 @@ class CommCPU : public Comm {
     return buf_merged;
   }
 
+  void ReduceBatch(const std::vector<int>& keys,
+                   const std::vector<std::vector<NDArray>>& src,
+                   int priority, std::vector<NDArray>* merged) override {
+    merged->resize(keys.size());
+    // dense keys smaller than bigarray_bound_ are reduced together, in batches of
+    // about bigarray_bound_ elements, by one parallel operation each
+    std::vector<std::vector<NDArray>> batch;
+    std::vector<int> batch_keys;
+    std::vector<Engine::VarHandle> const_vars, mutable_vars;
+    size_t batch_size = 0;
+    auto flush = [&]() {
+      if (batch.empty()) return;
+      Engine::Get()->PushAsync(
+        [batch, batch_keys, this](RunContext rctx, Engine::CallbackOnComplete on_complete) {
+          ReduceSumCPUBatch(batch, batch_keys);
+          on_complete();
+        }, Context::CPU(), const_vars, mutable_vars,
+        FnProperty::kCPUPrioritized, priority, "KVStoreReduceBatch");
+      batch.clear();
+      batch_keys.clear();
+      const_vars.clear();
+      mutable_vars.clear();
+      batch_size = 0;
+    };
+    for (size_t i = 0; i < keys.size(); ++i) {
+      const auto& vals = src[i];
+      const size_t size = vals[0].shape().Size();
+      if (!batch_reduction_ || vals.size() == 1 ||
+          vals[0].storage_type() != kDefaultStorage || size >= bigarray_bound_) {
+        (*merged)[i] = Reduce(keys[i], vals, priority);
+        continue;
+      }
+      std::vector<NDArray> reduce = CopyToReduceBuffers(keys[i], vals, priority);
+      for (size_t j = 1; j < reduce.size(); ++j) const_vars.push_back(reduce[j].var());
+      mutable_vars.push_back(reduce[0].var());
+      (*merged)[i] = reduce[0];
+      batch.push_back(std::move(reduce));
+      batch_keys.push_back(keys[i]);
+      batch_size += size;
+      if (batch_size >= bigarray_bound_) flush();
+    }
+    flush();
+  }
+
   void Broadcast(int key, const NDArray& src,
                  const std::vector<NDArray*> dst, int priority) override {
     int mask = src.ctx().dev_mask();
@@ -268,8 +319,81 @@ class CommCPU : public Comm {
   }
 
  private:
+  /*!
+   * \brief copies the dense values of a key to the cpu buffers of the key, and returns
+   *  the buffers to reduce, the first one being the merged buffer
+   */
+  std::vector<NDArray> CopyToReduceBuffers(int key, const std::vector<NDArray>& src,
+                                           int priority) {
+    auto& buf = merge_buf_[key];
+    NDArray& buf_merged = buf.merged_buf(kDefaultStorage);
+    std::vector<NDArray> reduce(src.size());
+    if (buf.copy_buf.empty()) {
+      buf.copy_buf.resize(src.size()-1);
+      for (size_t j = 0; j < src.size() - 1; ++j) {
+        // allocate copy buffer
+        buf.copy_buf[j] = NDArray(
+          src[0].shape(), pinned_ctx_, false, src[0].dtype());
+      }
+      if (numa_reduction_) FirstTouch(key, buf_merged, buf.copy_buf, priority);
+    }
+    CHECK(kDefaultStorage == buf.copy_buf[0].storage_type())
+         << "Storage type mismatch detected. " << kDefaultStorage << "(src) vs. "
+         << buf.copy_buf[0].storage_type() << "(buf.copy_buf)";
+    CopyFromTo(src[0], &buf_merged, priority);
+    reduce[0] = buf_merged;
+    for (size_t i = 1; i < src.size(); ++i) {
+      CopyFromTo(src[i], &(buf.copy_buf[i-1]), priority);
+      reduce[i] = buf.copy_buf[i-1];
+    }
+    return reduce;
+  }
+
+  /*!
+   * \brief zero-fills the new buffers of a key with the threads that reduce them, so
+   *  that their pages are allocated on the NUMA nodes of these threads
+   */
+  void FirstTouch(int key, const NDArray& merged, const std::vector<NDArray>& copy_buf,
+                  int priority) {
+    std::vector<NDArray> bufs(copy_buf);
+    bufs.push_back(merged);
+    std::vector<Engine::VarHandle> mutable_vars;
+    for (const auto& b : bufs) mutable_vars.push_back(b.var());
+    Engine::Get()->PushSync([bufs, key, this](RunContext rctx) {
+        for (const auto& b : bufs) b.CheckAndAlloc();
+        const size_t size = bufs[0].shape().Size();
+        const size_t nbytes = size * mshadow::mshadow_sizeof(bufs[0].dtype());
+        const size_t step = ChunkSize() * mshadow::mshadow_sizeof(bufs[0].dtype());
+        std::vector<std::vector<size_t>> node_tasks(NumaNodeCPUs().size());
+        for (size_t begin = 0, chunk = 0; begin < nbytes; begin += step, ++chunk) {
+          node_tasks[ChunkNode(key, chunk)].push_back(begin);
+        }
+        NumaParallelFor(node_tasks, thread_tuner_.max_threads(), [&](size_t begin) {
+          for (const auto& b : bufs) {
+            char* dptr = static_cast<char*>(b.data().dptr_);
+            std::fill(dptr + begin, dptr + std::min(begin + step, nbytes), 0);
+          }
+        });
+      }, Context::CPU(), {}, mutable_vars,
+      FnProperty::kCPUPrioritized, priority, "KVStoreFirstTouch");
+  }
+
+  /*! \brief number of elements reduced by one task */
+  inline size_t ChunkSize() const {
+    return std::min(bigarray_bound_, static_cast<size_t>(4 << 10));
+  }
+
+  /*!
+   * \brief NUMA node reducing a chunk of a key. It does not depend on how keys are
+   *  batched, so a buffer is always reduced by threads of the node it was touched by.
+   */
+  inline size_t ChunkNode(int key, size_t chunk) const {
+    if (!numa_reduction_) return 0;
+    return (static_cast<size_t>(key) + chunk) % NumaNodeCPUs().size();
+  }
+
   // reduce sum into val[0]
-  inline void ReduceSumCPU(const std::vector<NDArray> &in_data) {
+  inline void ReduceSumCPU(const std::vector<NDArray> &in_data, int key) {
     MSHADOW_TYPE_SWITCH(in_data[0].dtype(), DType, {
       std::vector<DType*> dptr(in_data.size());
       for (size_t i = 0; i < in_data.size(); ++i) {
@@ -278,10 +402,43 @@ class CommCPU : public Comm {
         dptr[i] = data.FlatTo2D<cpu, DType>().dptr_;
       }
       size_t total = in_data[0].shape().Size();
-      ReduceSumCPUImpl(dptr, total);
+      if (total < bigarray_bound_) {
+        ReduceSumCPU(dptr, 0, total);
+      } else {
+        ReduceSumCPUImpl<DType>({dptr}, {total}, {key});
+      }
     });
   }
 
+  // reduce sum into val[0] for every val of the batch
+  inline void ReduceSumCPUBatch(const std::vector<std::vector<NDArray>> &batch,
+                                const std::vector<int> &keys) {
+    // the batch is reduced in one pass per data type
+    std::unordered_map<int, std::vector<size_t>> by_dtype;
+    for (size_t i = 0; i < batch.size(); ++i) {
+      by_dtype[batch[i][0].dtype()].push_back(i);
+    }
+    for (const auto& kv : by_dtype) {
+      MSHADOW_TYPE_SWITCH(kv.first, DType, {
+        std::vector<std::vector<DType*>> dptrs;
+        std::vector<size_t> sizes;
+        std::vector<int> dtype_keys;
+        for (size_t i : kv.second) {
+          std::vector<DType*> dptr(batch[i].size());
+          for (size_t j = 0; j < batch[i].size(); ++j) {
+            TBlob data = batch[i][j].data();
+            CHECK(data.CheckContiguous());
+            dptr[j] = data.FlatTo2D<cpu, DType>().dptr_;
+          }
+          dptrs.push_back(std::move(dptr));
+          sizes.push_back(batch[i][0].shape().Size());
+          dtype_keys.push_back(keys[i]);
+        }
+        ReduceSumCPUImpl(dptrs, sizes, dtype_keys);
+      });
+    }
+  }
+
   // serial implementation of reduce sum for row sparse NDArray.
   inline void ReduceSumCPUExSerial(const std::vector<NDArray> &in, NDArray *out) {
     using namespace rowsparse;
@@ -391,24 +548,97 @@ class CommCPU : public Comm {
     }
   }
 
+  /*!
+   * \brief reduces every array of dptrs into its first input in one parallel pass
+   * \param keys keys of the arrays, a chunk of a key is always reduced on the same NUMA node
+   */
   template<typename DType>
-  inline void ReduceSumCPUImpl(std::vector<DType*> dptr, size_t total) {
-    const size_t step = std::min(bigarray_bound_, static_cast<size_t>(4 << 10));
-    long ntask = (total + step - 1) / step; // NOLINT(*)
-    if (total < bigarray_bound_ || nthread_reduction_ <= 1) {
-      ReduceSumCPU(dptr, 0, total);
-    } else {
-      #pragma omp parallel for schedule(static) num_threads(nthread_reduction_)
-      for (long j = 0; j < ntask; ++j) { // NOLINT(*)
-        size_t k = static_cast<size_t>(j);
-        size_t begin = std::min(k * step, total);
-        size_t end = std::min((k + 1) * step, total);
-        if (j == ntask - 1) CHECK_EQ(end, total);
-        ReduceSumCPU(dptr, begin, static_cast<index_t>(end - begin));
+  inline void ReduceSumCPUImpl(const std::vector<std::vector<DType*>>& dptrs,
+                               const std::vector<size_t>& sizes,
+                               const std::vector<int>& keys) {
+    const size_t step = ChunkSize();
+    std::vector<std::vector<std::pair<size_t, size_t>>> node_tasks(
+        numa_reduction_ ? NumaNodeCPUs().size() : 1);
+    size_t nbytes = 0;
+    for (size_t i = 0; i < dptrs.size(); ++i) {
+      for (size_t begin = 0, chunk = 0; begin < sizes[i]; begin += step, ++chunk) {
+        node_tasks[ChunkNode(keys[i], chunk)].emplace_back(i, begin);
       }
+      nbytes += sizes[i] * dptrs[i].size() * sizeof(DType);
+    }
+    const int nthreads = nthread_reduction_ > 0 ? nthread_reduction_ :
+                         thread_tuner_.Begin(nbytes);
+    auto start = std::chrono::steady_clock::now();
+    NumaParallelFor(node_tasks, nthreads, [&](const std::pair<size_t, size_t>& task) {
+      const size_t i = task.first;
+      const size_t begin = task.second;
+      const size_t end = std::min(begin + step, sizes[i]);
+      ReduceSumCPU(dptrs[i], begin, static_cast<index_t>(end - begin));
+    });
+    if (nthread_reduction_ <= 0) {
+      std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - start;
+      thread_tuner_.End(nbytes, nthreads, elapsed.count());
     }
   }
 
+  /*!
+   * \brief chooses the number of reduction threads by timing every candidate on the
+   *  first reductions of each size class
+   */
+  class ReductionThreadTuner {
+   public:
+    void Init(int max_threads) {
+      max_threads_ = max_threads;
+      candidates_.clear();
+      for (int n = 1; n < max_threads; n *= 2) candidates_.push_back(n);
+      candidates_.push_back(max_threads);
+    }
+    /*! \brief returns the number of threads to reduce nbytes with */
+    int Begin(size_t nbytes) {
+      std::lock_guard<std::mutex> lock(mutex_);
+      auto& state = states_[SizeClass(nbytes)];
+      if (state.best > 0) return state.best;
+      return candidates_[state.trials % candidates_.size()];
+    }
+    /*! \brief records the time a reduction of nbytes took with nthreads */
+    void End(size_t nbytes, int nthreads, double seconds) {
+      std::lock_guard<std::mutex> lock(mutex_);
+      auto& state = states_[SizeClass(nbytes)];
+      if (state.best > 0) return;
+      if (state.seconds.empty()) {
+        state.seconds.assign(candidates_.size(), std::numeric_limits<double>::max());
+      }
+      const size_t c = std::find(candidates_.begin(), candidates_.end(), nthreads) -
+                       candidates_.begin();
+      if (c < candidates_.size()) state.seconds[c] = std::min(state.seconds[c], seconds);
+      if (++state.trials >= kTrials * candidates_.size()) {
+        state.best = candidates_[std::min_element(state.seconds.begin(), state.seconds.end()) -
+                                 state.seconds.begin()];
+      }
+    }
+    int max_threads() const {
+      return max_threads_;
+    }
+
+   private:
+    /*! \brief number of timed reductions for each candidate */
+    static const size_t kTrials = 3;
+    struct State {
+      size_t trials = 0;
+      int best = 0;
+      std::vector<double> seconds;
+    };
+    static int SizeClass(size_t nbytes) {
+      int size_class = 0;
+      while (nbytes >>= 1) ++size_class;
+      return size_class;
+    }
+    std::mutex mutex_;
+    int max_threads_ = 1;
+    std::vector<int> candidates_;
+    std::unordered_map<int, State> states_;
+  };
+
   /// \brief temporal space for pushing and pulling
   struct BufferEntry {
     /// \brief the merged value
@@ -438,6 +668,9 @@ class CommCPU : public Comm {
   size_t bigarray_bound_;
   int nthread_reduction_;
   bool is_serial_push_;
+  bool batch_reduction_;
+  bool numa_reduction_;
+  ReductionThreadTuner thread_tuner_;
 };
 
 /**
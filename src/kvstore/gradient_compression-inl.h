@@ -27,6 +27,7 @@
 
 #include <vector>
 #include "../operator/mxnet_op.h"
+#include "./gradient_compression.h"
 
 namespace mxnet {
 namespace kvstore {
@@ -36,6 +37,15 @@ void Quantize2BitImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet:
                       const float threshold);
 void Dequantize2BitImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet::TBlob> &inputs,
                         const float threshold);
+void Quantize1BitImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                      const float threshold);
+void Dequantize1BitImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                        const float threshold);
+void QuantizeTopKImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                      const int block_size);
+void DequantizeTopKImpl(mshadow::Stream<mshadow::gpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                        const int block_size);
+double ResidualSquaredNorm(mshadow::Stream<mshadow::gpu> *s, const mxnet::TBlob &residual);
 
 struct quantize_2bit {
   MSHADOW_XINLINE static void Map(int out_block_id,
@@ -138,6 +148,149 @@ void Dequantize2BitKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet
           threshold);               // positive threshold
 }
 
+struct quantize_1bit {
+  MSHADOW_XINLINE static void Map(int out_block_id,
+                                  int original_size,
+                                  float *out,
+                                  float *grad,
+                                  float *residual,
+                                  const float threshold) {
+    // this block contains the signs of upto 32 values starting from out_block_id*32
+    float *compr_block = out + out_block_id;
+    *compr_block = 0;
+    const int start = out_block_id << 5;
+    const int end = (start + 32 <= original_size) ? start + 32 : original_size;
+    char *block_ptr = reinterpret_cast < char * > (compr_block);
+    for (int i = start; i < end; i++) {
+      char *curr_byte = block_ptr + ((i - start) >> 3);
+      residual[i] += grad[i];
+      // every value is sent as +threshold or -threshold,
+      // the error is fed back through the residual
+      if (residual[i] >= 0) {
+        *curr_byte |= static_cast<uint8_t>(0x80 >> (i & 7));
+        residual[i] -= threshold;
+      } else {
+        residual[i] += threshold;
+      }
+    }
+  }
+};
+
+template<typename xpu>
+void Quantize1BitKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                              const float threshold) {
+  mxnet::op::mxnet_op::Kernel<quantize_1bit, xpu>
+    ::Launch(s,
+            inputs[2].Size(),         // compressed array size
+            inputs[0].Size(),         // original size
+            inputs[2].dptr<float>(),  // compressed array
+            inputs[0].dptr<float>(),  // original array
+            inputs[1].dptr<float>(),  // residual array
+            threshold);
+}
+
+struct dequantize_1bit {
+  MSHADOW_XINLINE static void Map(int i,
+                                  float *out,
+                                  float *in,
+                                  const float threshold) {
+    // gets byte which holds the sign of this position
+    const char *ch_ptr = reinterpret_cast<char *>(in + (i >> 5)) + ((i & 31) >> 3);
+    const uint8_t mask = static_cast<uint8_t>(0x80 >> (i & 7));
+    out[i] = (*ch_ptr & mask) ? threshold : -threshold;
+  }
+};
+
+template<typename xpu>
+void Dequantize1BitKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                                const float threshold) {
+  mxnet::op::mxnet_op::Kernel<dequantize_1bit, xpu>
+  ::Launch(s,
+          inputs[1].Size(),         // original size
+          inputs[1].dptr<float>(),  // out array
+          inputs[0].dptr<float>(),  // compressed array
+          threshold);
+}
+
+struct quantize_topk {
+  MSHADOW_XINLINE static void Map(int block_id,
+                                  int original_size,
+                                  int block_size,
+                                  float *out,
+                                  float *grad,
+                                  float *residual) {
+    // the compressed block holds kTopKPerBlock offsets within the block of
+    // block_size values starting from block_id*block_size, followed by their values
+    float *offsets = out + block_id * 2 * kTopKPerBlock;
+    float *values = offsets + kTopKPerBlock;
+    const int start = block_id * block_size;
+    const int end = (start + block_size <= original_size) ? start + block_size : original_size;
+    for (int i = start; i < end; i++) {
+      residual[i] += grad[i];
+    }
+    for (int j = 0; j < kTopKPerBlock; j++) {
+      int best = start;
+      float best_abs = -1;
+      for (int i = start; i < end; i++) {
+        const float abs_val = residual[i] < 0 ? -residual[i] : residual[i];
+        if (abs_val > best_abs) {
+          best_abs = abs_val;
+          best = i;
+        }
+      }
+      // sent values are removed from the residual, so they are not selected again;
+      // blocks with fewer than kTopKPerBlock values send zeros for the remaining slots
+      offsets[j] = static_cast<float>(best - start);
+      values[j] = residual[best];
+      residual[best] = 0;
+    }
+  }
+};
+
+template<typename xpu>
+void QuantizeTopKKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                              const int block_size) {
+  mxnet::op::mxnet_op::Kernel<quantize_topk, xpu>
+    ::Launch(s,
+            inputs[2].Size() / (2 * kTopKPerBlock),  // number of blocks
+            inputs[0].Size(),                        // original size
+            block_size,                              // values per block
+            inputs[2].dptr<float>(),                 // compressed array
+            inputs[0].dptr<float>(),                 // original array
+            inputs[1].dptr<float>());                // residual array
+}
+
+struct dequantize_topk {
+  MSHADOW_XINLINE static void Map(int block_id,
+                                  int original_size,
+                                  int block_size,
+                                  float *out,
+                                  float *in) {
+    const float *offsets = in + block_id * 2 * kTopKPerBlock;
+    const float *values = offsets + kTopKPerBlock;
+    const int start = block_id * block_size;
+    const int end = (start + block_size <= original_size) ? start + block_size : original_size;
+    for (int i = start; i < end; i++) {
+      out[i] = 0;
+    }
+    for (int j = 0; j < kTopKPerBlock; j++) {
+      out[start + static_cast<int>(offsets[j])] += values[j];
+    }
+  }
+};
+
+template<typename xpu>
+void DequantizeTopKKernelLaunch(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                                const int block_size) {
+  mxnet::op::mxnet_op::Kernel<dequantize_topk, xpu>
+  ::Launch(s,
+          inputs[0].Size() / (2 * kTopKPerBlock),  // number of blocks
+          inputs[1].Size(),                        // original size
+          block_size,                              // values per block
+          inputs[1].dptr<float>(),                 // out array
+          inputs[0].dptr<float>());                // compressed array
+}
+
 inline void Quantize2BitImpl(mshadow::Stream<mshadow::cpu> *s,
                              const std::vector<mxnet::TBlob> &inputs,
                              const float threshold) {
@@ -149,6 +302,89 @@ inline void Dequantize2BitImpl(mshadow::Stream<mshadow::cpu> *s,
                                const float threshold) {
   Dequantize2BitKernelLaunch(s, inputs, threshold);
 }
+
+inline void Quantize1BitImpl(mshadow::Stream<mshadow::cpu> *s,
+                             const std::vector<mxnet::TBlob> &inputs,
+                             const float threshold) {
+  Quantize1BitKernelLaunch(s, inputs, threshold);
+}
+
+inline void Dequantize1BitImpl(mshadow::Stream<mshadow::cpu> *s,
+                               const std::vector<mxnet::TBlob> &inputs,
+                               const float threshold) {
+  Dequantize1BitKernelLaunch(s, inputs, threshold);
+}
+
+inline void QuantizeTopKImpl(mshadow::Stream<mshadow::cpu> *s,
+                             const std::vector<mxnet::TBlob> &inputs,
+                             const int block_size) {
+  QuantizeTopKKernelLaunch(s, inputs, block_size);
+}
+
+inline void DequantizeTopKImpl(mshadow::Stream<mshadow::cpu> *s,
+                               const std::vector<mxnet::TBlob> &inputs,
+                               const int block_size) {
+  DequantizeTopKKernelLaunch(s, inputs, block_size);
+}
+
+/*!
+ * \brief quantizes inputs[0] into inputs[2] accumulating the error into inputs[1]
+ * \param threshold threshold of 2bit and 1bit compression
+ * \param block_size number of gradient values per compressed block of top-k compression
+ */
+template<typename xpu>
+void QuantizeImpl(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                  const CompressionType type, const float threshold, const int block_size) {
+  switch (type) {
+    case CompressionType::kTwoBit:
+      Quantize2BitImpl(s, inputs, threshold);
+      break;
+    case CompressionType::kOneBit:
+      Quantize1BitImpl(s, inputs, threshold);
+      break;
+    case CompressionType::kTopK:
+      QuantizeTopKImpl(s, inputs, block_size);
+      break;
+    default:
+      LOG(FATAL) << "Unsupported quantization of type " << static_cast<int>(type);
+  }
+}
+
+/*!
+ * \brief dequantizes inputs[0] into inputs[1]
+ */
+template<typename xpu>
+void DequantizeImpl(mshadow::Stream<xpu> *s, const std::vector<mxnet::TBlob> &inputs,
+                    const CompressionType type, const float threshold, const int block_size) {
+  switch (type) {
+    case CompressionType::kTwoBit:
+      Dequantize2BitImpl(s, inputs, threshold);
+      break;
+    case CompressionType::kOneBit:
+      Dequantize1BitImpl(s, inputs, threshold);
+      break;
+    case CompressionType::kTopK:
+      DequantizeTopKImpl(s, inputs, block_size);
+      break;
+    default:
+      LOG(FATAL) << "Unsupported dequantization of type " << static_cast<int>(type);
+  }
+}
+
+/*!
+ * \brief returns the squared L2 norm of a residual array on cpu
+ */
+inline double ResidualSquaredNorm(mshadow::Stream<mshadow::cpu> *s,
+                                  const mxnet::TBlob &residual) {
+  const float *data = residual.dptr<float>();
+  const int64_t size = residual.Size();
+  double sqnorm = 0;
+  #pragma omp parallel for reduction(+:sqnorm)
+  for (int64_t i = 0; i < size; ++i) {
+    sqnorm += static_cast<double>(data[i]) * data[i];
+  }
+  return sqnorm;
+}
 }  // namespace kvstore
 }  // namespace mxnet
 
@@ -23,6 +23,8 @@
  * \author Rahul Huilgol
  */
 
+#include <algorithm>
+#include <cmath>
 #include <vector>
 #include "kvstore_local.h"
 #include "gradient_compression.h"
@@ -35,6 +37,7 @@ DMLC_REGISTER_PARAMETER(GradientCompressionParam);
 
 GradientCompression::GradientCompression() {
   type_ = CompressionType::kNone;
+  stats_ = std::make_shared<GradientCompressionStats>();
 }
 
 void GradientCompression::SetParams(const std::vector<std::pair<std::string, std::string> >
@@ -44,6 +47,12 @@ void GradientCompression::SetParams(const std::vector<std::pair<std::string, std
   CHECK_GT(params.threshold, 0) << "threshold must be greater than 0";
   if (params.type == "2bit") {
     SetTwoBitCompression(params.threshold);
+  } else if (params.type == "1bit") {
+    SetOneBitCompression(params.threshold);
+  } else if (params.type == "topk") {
+    CHECK(params.ratio > 0 && params.ratio <= 0.5)
+      << "ratio for topk compression must be in (0, 0.5]";
+    SetTopKCompression(params.ratio);
   } else {
     LOG(FATAL) << "Unknown type for gradient compression " << params.type;
   }
@@ -62,11 +71,23 @@ void GradientCompression::SetTwoBitCompression(const float threshold) {
   threshold_ = threshold;
 }
 
+void GradientCompression::SetOneBitCompression(const float threshold) {
+  type_ = CompressionType::kOneBit;
+  threshold_ = threshold;
+}
+
+void GradientCompression::SetTopKCompression(const float ratio) {
+  type_ = CompressionType::kTopK;
+  ratio_ = ratio;
+}
+
 std::string GradientCompression::EncodeParams() {
   using namespace std;  // to reduce length of next line
   string rval = get_type_str();
-  if (type_ == CompressionType::kTwoBit) {
+  if (type_ == CompressionType::kTwoBit || type_ == CompressionType::kOneBit) {
     rval += "," + to_string(threshold_);
+  } else if (type_ == CompressionType::kTopK) {
+    rval += "," + to_string(threshold_) + "," + to_string(ratio_);
   }
   return rval;
 }
@@ -80,22 +101,52 @@ void GradientCompression::DecodeParams(const std::string &s) {
       threshold_ = stof(elems[1]);
     }
   }
+  if (elems.size() > 2) {
+    if (!elems[2].empty()) {
+      ratio_ = stof(elems[2]);
+    }
+  }
 }
 
 int GradientCompression::GetCompressionFactor() {
   if (type_ == CompressionType::kTwoBit) {
     return 16;
+  } else if (type_ == CompressionType::kOneBit) {
+    return 32;
+  } else if (type_ == CompressionType::kTopK) {
+    // each value kept is sent as an offset and a value
+    return std::max(1, static_cast<int>(std::round(0.5 / ratio_)));
   } else {
     LOG(FATAL) << "Unsupported compression type: " << get_type_str();
     return 0;
   }
 }
 
+int GradientCompression::GetCompressedBlockSize() {
+  if (type_ == CompressionType::kTopK) {
+    return 2 * kTopKPerBlock;
+  }
+  return 1;
+}
+
 int64_t GradientCompression::GetCompressedSize(const int64_t original_size) {
-  const int bits = GetCompressionFactor();
-  return ((original_size % bits == 0) ?
-          original_size / bits :
-          original_size / bits + 1);
+  const int64_t compr_block = GetCompressedBlockSize();
+  const int64_t original_block = GetCompressionFactor() * compr_block;
+  return ((original_size % original_block == 0) ?
+          original_size / original_block :
+          original_size / original_block + 1) * compr_block;
+}
+
+void GradientCompression::GetStats(int64_t *original_bytes, int64_t *compressed_bytes,
+                                   float *residual_norm) {
+  std::lock_guard<std::mutex> lock(stats_->mutex);
+  *original_bytes = stats_->original_bytes;
+  *compressed_bytes = stats_->compressed_bytes;
+  double sqnorm = 0;
+  for (const auto& kv : stats_->residual_sqnorm) {
+    sqnorm += kv.second;
+  }
+  *residual_norm = static_cast<float>(std::sqrt(sqnorm));
 }
 
 void GradientCompression::Quantize(const mxnet::NDArray &from, mxnet::NDArray *to,
@@ -103,35 +154,50 @@ void GradientCompression::Quantize(const mxnet::NDArray &from, mxnet::NDArray *t
   CHECK(from.shape().ndim() != 0) << "source operand has zero dimension shape";
   CHECK(to->shape().ndim() != 0) << "destination operand has zero dimension shape";
   CHECK(residual->shape().ndim() != 0) << "residual operand has zero dimension shape";
+  CHECK(type_ != CompressionType::kNone)
+    << "Unsupported quantization of type " << get_type_str();
   const int a = from.ctx().dev_mask();
   const int b = to->ctx().dev_mask();
+  const CompressionType type = type_;
   const float threshold = threshold_;
-  if (type_ == CompressionType::kTwoBit) {
-    if (a == mshadow::cpu::kDevMask && b == mshadow::cpu::kDevMask) {
-      mxnet::Engine::Get()->PushSync([from, to, residual, threshold](mxnet::RunContext ctx) {
+  const int block_size = GetCompressionFactor() * GetCompressedBlockSize();
+  std::shared_ptr<GradientCompressionStats> stats = stats_;
+  {
+    std::lock_guard<std::mutex> lock(stats->mutex);
+    const int dtype_size = mshadow::mshadow_sizeof(from.dtype());
+    stats->original_bytes += from.shape().Size() * dtype_size;
+    stats->compressed_bytes += to->shape().Size() * dtype_size;
+  }
+  if (a == mshadow::cpu::kDevMask && b == mshadow::cpu::kDevMask) {
+    mxnet::Engine::Get()->PushSync([from, to, residual, type, threshold, block_size, stats]
+                                   (mxnet::RunContext ctx) {
+      std::vector<mxnet::TBlob> inputs = {from.data(), residual->data(), to->data()};
+      QuantizeImpl(ctx.get_stream<mshadow::cpu>(), inputs, type, threshold, block_size);
+      const double sqnorm = ResidualSquaredNorm(ctx.get_stream<mshadow::cpu>(), inputs[1]);
+      std::lock_guard<std::mutex> lock(stats->mutex);
+      stats->residual_sqnorm[residual->var()] = sqnorm;
+    }, from.ctx(), {from.var()}, {to->var(), residual->var()},
+    mxnet::FnProperty::kNormal, priority, "QuantizeCPU");
+  } else {
+#if MXNET_USE_CUDA
+    if (a == mshadow::gpu::kDevMask && b == mshadow::gpu::kDevMask) {
+      mxnet::Engine::Get()->PushSync([from, to, residual, type, threshold, block_size, stats]
+                                     (mxnet::RunContext ctx) {
         std::vector<mxnet::TBlob> inputs = {from.data(), residual->data(), to->data()};
-        Quantize2BitImpl(ctx.get_stream<mshadow::cpu>(), inputs, threshold);
+        QuantizeImpl(ctx.get_stream<mshadow::gpu>(), inputs, type, threshold, block_size);
+        const double sqnorm = ResidualSquaredNorm(ctx.get_stream<mshadow::gpu>(), inputs[1]);
+        // Wait GPU kernel to complete
+        ctx.get_stream<mshadow::gpu>()->Wait();
+        std::lock_guard<std::mutex> lock(stats->mutex);
+        stats->residual_sqnorm[residual->var()] = sqnorm;
       }, from.ctx(), {from.var()}, {to->var(), residual->var()},
-      mxnet::FnProperty::kNormal, priority, "QuantizeCPU");
+      mxnet::FnProperty::kNormal, priority, "QuantizeGPU");
     } else {
-#if MXNET_USE_CUDA
-      if (a == mshadow::gpu::kDevMask && b == mshadow::gpu::kDevMask) {
-        mxnet::Engine::Get()->PushSync([from, to, residual, threshold](mxnet::RunContext ctx) {
-          std::vector<mxnet::TBlob> inputs = {from.data(), residual->data(), to->data()};
-          Quantize2BitImpl(ctx.get_stream<mshadow::gpu>(), inputs, threshold);
-          // Wait GPU kernel to complete
-          ctx.get_stream<mshadow::gpu>()->Wait();
-        }, from.ctx(), {from.var()}, {to->var(), residual->var()},
-        mxnet::FnProperty::kNormal, priority, "QuantizeGPU");
-      } else {
-        LOG(FATAL) << "unknown device mask";
-      }
+      LOG(FATAL) << "unknown device mask";
+    }
 #else
     LOG(FATAL) << MXNET_GPU_NOT_ENABLED_ERROR;
 #endif
-    }
-  } else {
-    LOG(FATAL) << "Unsupported quantization of type " << get_type_str();
   }
 }
 
@@ -139,35 +205,37 @@ void GradientCompression::Dequantize(const mxnet::NDArray &from, mxnet::NDArray
                                      const int priority) {
   CHECK(from.shape().ndim() != 0) << "source operands has zero dimension shape";
   CHECK(to->shape().ndim() != 0) << "destination operand has zero dimension shape";
+  CHECK(type_ != CompressionType::kNone)
+    << "Unsupported dequantization of type " << get_type_str();
   const int a = from.ctx().dev_mask();
   const int b = to->ctx().dev_mask();
+  const CompressionType type = type_;
   const float threshold = threshold_;
-  if (type_ == CompressionType::kTwoBit) {
-    if (a == mshadow::cpu::kDevMask && b == mshadow::cpu::kDevMask) {
-      mxnet::Engine::Get()->PushSync([from, to, threshold](mxnet::RunContext ctx) {
+  const int block_size = GetCompressionFactor() * GetCompressedBlockSize();
+  if (a == mshadow::cpu::kDevMask && b == mshadow::cpu::kDevMask) {
+    mxnet::Engine::Get()->PushSync([from, to, type, threshold, block_size]
+                                   (mxnet::RunContext ctx) {
+      std::vector<mxnet::TBlob> inputs = {from.data(), to->data()};
+      DequantizeImpl(ctx.get_stream<mshadow::cpu>(), inputs, type, threshold, block_size);
+    }, from.ctx(), {from.var()}, {to->var()},
+    mxnet::FnProperty::kNormal, priority, "DequantizeCPU");
+  } else {
+#if MXNET_USE_CUDA
+    if (a == mshadow::gpu::kDevMask && b == mshadow::gpu::kDevMask) {
+      mxnet::Engine::Get()->PushSync([from, to, type, threshold, block_size]
+                                     (mxnet::RunContext ctx) {
         std::vector<mxnet::TBlob> inputs = {from.data(), to->data()};
-        Dequantize2BitImpl(ctx.get_stream<mshadow::cpu>(), inputs, threshold);
+        DequantizeImpl(ctx.get_stream<mshadow::gpu>(), inputs, type, threshold, block_size);
+        // Wait GPU kernel to complete
+        ctx.get_stream<mshadow::gpu>()->Wait();
       }, from.ctx(), {from.var()}, {to->var()},
-      mxnet::FnProperty::kNormal, priority, "DequantizeCPU");
+      mxnet::FnProperty::kNormal, priority, "DequantizeGPU");
     } else {
-#if MXNET_USE_CUDA
-      if (a == mshadow::gpu::kDevMask && b == mshadow::gpu::kDevMask) {
-        mxnet::Engine::Get()->PushSync([from, to, threshold](mxnet::RunContext ctx) {
-          std::vector<mxnet::TBlob> inputs = {from.data(), to->data()};
-          Dequantize2BitImpl(ctx.get_stream<mshadow::gpu>(), inputs, threshold);
-          // Wait GPU kernel to complete
-          ctx.get_stream<mshadow::gpu>()->Wait();
-        }, from.ctx(), {from.var()}, {to->var()},
-        mxnet::FnProperty::kNormal, priority, "DequantizeGPU");
-      } else {
-        LOG(FATAL) << "unknown device mask";
-      }
+      LOG(FATAL) << "unknown device mask";
+    }
 #else
-      LOG(FATAL) << MXNET_GPU_NOT_ENABLED_ERROR;
+    LOG(FATAL) << MXNET_GPU_NOT_ENABLED_ERROR;
 #endif
-    }
-  } else {
-    LOG(FATAL) << "Unsupported dequantization of type " << get_type_str();
   }
 }
 
@@ -23,6 +23,10 @@
  * \brief Implementation for gpu version of code
  */
 
+#include <thrust/device_ptr.h>
+#include <thrust/functional.h>
+#include <thrust/system/cuda/execution_policy.h>
+#include <thrust/transform_reduce.h>
 #include "gradient_compression-inl.h"
 
 namespace mxnet {
@@ -36,5 +40,38 @@ void Dequantize2BitImpl(mshadow::Stream<gpu>* s, const std::vector<TBlob>& input
                         const float threshold) {
   Dequantize2BitKernelLaunch(s, inputs, threshold);
 }
+
+void Quantize1BitImpl(mshadow::Stream<gpu>* s, const std::vector<TBlob>& inputs,
+                      const float threshold) {
+  Quantize1BitKernelLaunch(s, inputs, threshold);
+}
+
+void Dequantize1BitImpl(mshadow::Stream<gpu>* s, const std::vector<TBlob>& inputs,
+                        const float threshold) {
+  Dequantize1BitKernelLaunch(s, inputs, threshold);
+}
+
+void QuantizeTopKImpl(mshadow::Stream<gpu>* s, const std::vector<TBlob>& inputs,
+                      const int block_size) {
+  QuantizeTopKKernelLaunch(s, inputs, block_size);
+}
+
+void DequantizeTopKImpl(mshadow::Stream<gpu>* s, const std::vector<TBlob>& inputs,
+                        const int block_size) {
+  DequantizeTopKKernelLaunch(s, inputs, block_size);
+}
+
+struct residual_square {
+  __device__ double operator()(const float x) const {
+    return static_cast<double>(x) * x;
+  }
+};
+
+double ResidualSquaredNorm(mshadow::Stream<gpu>* s, const TBlob& residual) {
+  thrust::device_ptr<const float> data(residual.dptr<float>());
+  return thrust::transform_reduce(thrust::cuda::par.on(mshadow::Stream<gpu>::GetStream(s)),
+                                  data, data + residual.Size(), residual_square(),
+                                  0.0, thrust::plus<double>());
+}
 }  // namespace kvstore
 }  // namespace mxnet
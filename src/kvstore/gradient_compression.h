@@ -26,7 +26,10 @@
 #ifndef MXNET_KVSTORE_GRADIENT_COMPRESSION_H_
 #define MXNET_KVSTORE_GRADIENT_COMPRESSION_H_
 #include <dmlc/parameter.h>
+#include <memory>
+#include <mutex>
 #include <string>
+#include <unordered_map>
 #include <utility>
 #include <vector>
 #include "mxnet/ndarray.h"
@@ -35,20 +38,40 @@ namespace mxnet {
 namespace kvstore {
 
 enum class CompressionType {
-  kNone, kTwoBit
+  kNone, kTwoBit, kOneBit, kTopK
 };
 
+/*! \brief number of values kept from each block of the gradient by top-k compression */
+const int kTopKPerBlock = 8;
+
 struct GradientCompressionParam : public dmlc::Parameter<GradientCompressionParam> {
   std::string type;
   float threshold;
+  float ratio;
   DMLC_DECLARE_PARAMETER(GradientCompressionParam) {
     DMLC_DECLARE_FIELD(type)
-      .describe("Type of gradient compression to use, like `2bit` for example");
+      .describe("Type of gradient compression to use, like `2bit`, `1bit` or `topk`");
     DMLC_DECLARE_FIELD(threshold).set_default(0.5)
-      .describe("Threshold to use for 2bit gradient compression");
+      .describe("Threshold to use for 2bit and 1bit gradient compression");
+    DMLC_DECLARE_FIELD(ratio).set_default(0.01)
+      .describe("Fraction of gradient values sent by topk gradient compression");
   }
 };
 
+/*!
+ * \brief counters of a gradient compression, shared with the operations
+ * pushed to the engine so they can be updated asynchronously
+ */
+struct GradientCompressionStats {
+  std::mutex mutex;
+  /*! \brief number of bytes of gradients passed to Quantize */
+  int64_t original_bytes = 0;
+  /*! \brief number of bytes of compressed gradients produced by Quantize */
+  int64_t compressed_bytes = 0;
+  /*! \brief squared L2 norm of each residual array, keyed by its engine variable */
+  std::unordered_map<const void*, double> residual_sqnorm;
+};
+
 class GradientCompression {
  public:
   GradientCompression();
@@ -78,6 +101,18 @@ class GradientCompression {
    */
   void SetTwoBitCompression(const float threshold);
 
+  /*!
+   * \brief sets one bit gradient compression
+   * \param threshold float value sent for every gradient value, with the sign of the value
+   */
+  void SetOneBitCompression(const float threshold);
+
+  /*!
+   * \brief sets top-k gradient compression
+   * \param ratio fraction of gradient values, largest in magnitude, which are sent
+   */
+  void SetTopKCompression(const float ratio);
+
   /*!
    * \brief encodes parameters of gc into a string
    */
@@ -99,6 +134,21 @@ class GradientCompression {
    */
   int64_t GetCompressedSize(const int64_t original_size);
 
+  /*!
+   * \brief returns the number of elements of the compressed array which can not be split,
+   * as they together encode `GetCompressionFactor()` times as many gradient values
+   */
+  int GetCompressedBlockSize();
+
+  /*!
+   * \brief returns counters of compression performed so far
+   * \param original_bytes number of bytes of gradients which were compressed
+   * \param compressed_bytes number of bytes of the compressed gradients
+   * \param residual_norm L2 norm of the accumulated compression error over all residual
+   * arrays
+   */
+  void GetStats(int64_t *original_bytes, int64_t *compressed_bytes, float *residual_norm);
+
   /*!
   * \brief Issues quantize operation to be scheduled by the engine
   * Compresses `from` into `to` and accumulates the quantization error
@@ -132,6 +182,16 @@ class GradientCompression {
    * all negative gradients will be thresholded to -1*`threshold_`
    */
   float threshold_ = 0;
+
+  /*!
+   * \brief denotes fraction of gradient values sent by top-k compression
+   */
+  float ratio_ = 0;
+
+  /*!
+   * \brief counters updated by Quantize
+   */
+  std::shared_ptr<GradientCompressionStats> stats_;
 };
 }  // namespace kvstore
 }  // namespace mxnet
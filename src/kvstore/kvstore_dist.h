@@ -316,12 +316,14 @@ class KVStoreDist : public KVStoreLocal {
     std::vector<int> uniq_keys;
     std::vector<std::vector<NDArray> > grouped_vals;
     GroupKVPairsPush(keys, values, &uniq_keys, &grouped_vals, false);
+    // merge over devices
+    std::vector<NDArray> merged_vals;
+    if (do_merge) comm_->ReduceBatch(uniq_keys, grouped_vals, priority, &merged_vals);
 
     for (size_t i = 0; i < uniq_keys.size(); ++i) {
-      // merge over devices
       int key = uniq_keys[i];
       const auto& vals = grouped_vals[i];
-      NDArray merged = do_merge ? comm_->Reduce(key, vals, priority) : vals[0];
+      NDArray merged = do_merge ? merged_vals[i] : vals[0];
 
       const auto storage_type = merged.storage_type();
       auto &comm_buf = comm_buf_[key];
@@ -631,6 +633,8 @@ class KVStoreDist : public KVStoreLocal {
         // partition it to all servers
         push_pskv.size = 0;
         pull_pskv.size = 0;
+        const size_t compr_block_size = gradient_compression_->GetCompressedBlockSize();
+        const size_t compr_num_blocks = compr_num_elem / compr_block_size;
 
         for (int i = 0; i < num_servers; ++i) {
           size_t part_compr, part_orig;
@@ -638,9 +642,11 @@ class KVStoreDist : public KVStoreLocal {
             part_compr = compr_num_elem - push_pskv.size;
             part_orig = original_num_elem - pull_pskv.size;
           } else {
-            part_compr =
-              static_cast<size_t> (round(static_cast<double>(compr_num_elem)/num_servers*(i+1))) -
-              static_cast<size_t> (round(static_cast<double>(compr_num_elem)/num_servers*(i)));
+            // parts are split at boundaries of compressed blocks,
+            // so that each server can decompress its part independently
+            const double blocks_per_server = static_cast<double>(compr_num_blocks) / num_servers;
+            part_compr = (static_cast<size_t> (round(blocks_per_server * (i+1))) -
+                          static_cast<size_t> (round(blocks_per_server * i))) * compr_block_size;
             part_orig = part_compr * gradient_compression_->GetCompressionFactor();
           }
 
@@ -187,9 +187,11 @@ class KVStoreLocal : public KVStore {
     std::vector<int> uniq_keys;
     std::vector<std::vector<NDArray> > grouped_vals;
     GroupKVPairsPush(keys, values, &uniq_keys, &grouped_vals, false);
+    std::vector<NDArray> merged_vals;
+    comm_->ReduceBatch(uniq_keys, grouped_vals, priority, &merged_vals);
     for (size_t i = 0; i < uniq_keys.size(); ++i) {
       int key = uniq_keys[i];
-      const NDArray& merged = comm_->Reduce(key, grouped_vals[i], priority);
+      const NDArray& merged = merged_vals[i];
       NDArray& local = local_[key];
       if (updater_ != nullptr) {
         CHECK(!local.is_none()) << "key " << key << " has not been inited";
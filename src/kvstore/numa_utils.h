@@ -0,0 +1,167 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * \file numa_utils.h
+ * \brief NUMA topology and NUMA-aware parallel loops for CPU reduction.
+ */
+#ifndef MXNET_KVSTORE_NUMA_UTILS_H_
+#define MXNET_KVSTORE_NUMA_UTILS_H_
+
+#include <dmlc/omp.h>
+#include <algorithm>
+#include <fstream>
+#include <sstream>
+#include <string>
+#include <vector>
+#if defined(__linux__)
+#include <pthread.h>
+#include <sched.h>
+#endif
+
+namespace mxnet {
+namespace kvstore {
+
+/*!
+ * \brief parses a Linux cpu list such as "0-3,8,10-11"
+ */
+inline std::vector<int> ParseCPUList(const std::string& list) {
+  std::vector<int> cpus;
+  std::stringstream ss(list);
+  std::string range;
+  while (std::getline(ss, range, ',')) {
+    if (range.empty() || range == "\n") continue;
+    const size_t dash = range.find('-');
+    const int first = std::stoi(range.substr(0, dash));
+    const int last = dash == std::string::npos ? first : std::stoi(range.substr(dash + 1));
+    for (int cpu = first; cpu <= last; ++cpu) cpus.push_back(cpu);
+  }
+  return cpus;
+}
+
+/*!
+ * \brief returns the cpus of every NUMA node the process is allowed to run on.
+ *  The result is empty when the topology is not available.
+ */
+inline const std::vector<std::vector<int>>& NumaNodeCPUs() {
+  static const std::vector<std::vector<int>> nodes = []() {
+    std::vector<std::vector<int>> result;
+#if defined(__linux__)
+    cpu_set_t allowed;
+    CPU_ZERO(&allowed);
+    if (sched_getaffinity(0, sizeof(allowed), &allowed) != 0) return result;
+    std::ifstream online("/sys/devices/system/node/online");
+    std::string node_list;
+    if (!online || !std::getline(online, node_list)) return result;
+    for (int node : ParseCPUList(node_list)) {
+      std::ifstream file("/sys/devices/system/node/node" + std::to_string(node) + "/cpulist");
+      std::string cpu_list;
+      if (!file || !std::getline(file, cpu_list)) continue;
+      std::vector<int> cpus;
+      for (int cpu : ParseCPUList(cpu_list)) {
+        if (cpu < CPU_SETSIZE && CPU_ISSET(cpu, &allowed)) cpus.push_back(cpu);
+      }
+      if (!cpus.empty()) result.push_back(cpus);
+    }
+#endif
+    return result;
+  }();
+  return nodes;
+}
+
+/*!
+ * \brief binds the calling thread to the cpus of a NUMA node returned by NumaNodeCPUs
+ *  for its lifetime. The previous affinity is restored on destruction, as the threads
+ *  of the OpenMP pool and the engine workers run other operators afterwards.
+ */
+class NumaThreadBinding {
+ public:
+  explicit NumaThreadBinding(int node) {
+#if defined(__linux__)
+    const auto& nodes = NumaNodeCPUs();
+    if (node < 0 || node >= static_cast<int>(nodes.size())) return;
+    if (pthread_getaffinity_np(pthread_self(), sizeof(old_cpus_), &old_cpus_) != 0) return;
+    cpu_set_t cpus;
+    CPU_ZERO(&cpus);
+    for (int cpu : nodes[node]) CPU_SET(cpu, &cpus);
+    bound_ = pthread_setaffinity_np(pthread_self(), sizeof(cpus), &cpus) == 0;
+#endif
+  }
+
+  ~NumaThreadBinding() {
+#if defined(__linux__)
+    if (bound_) pthread_setaffinity_np(pthread_self(), sizeof(old_cpus_), &old_cpus_);
+#endif
+  }
+
+ private:
+#if defined(__linux__)
+  cpu_set_t old_cpus_;
+#endif
+  bool bound_ = false;
+
+  NumaThreadBinding(const NumaThreadBinding&) = delete;
+  NumaThreadBinding& operator=(const NumaThreadBinding&) = delete;
+};
+
+/*!
+ * \brief runs fn(task) for every task with nthreads OpenMP threads.
+ *
+ *  node_tasks[k] holds the tasks whose memory should stay local to NUMA node k of
+ *  NumaNodeCPUs(). They are only run by threads bound to that node, so buffers first
+ *  touched by such a loop are accessed by threads of the same node afterwards. With a
+ *  single entry in node_tasks no thread is bound. Threads get their affinity back when
+ *  the loop ends.
+ */
+template<typename Task, typename Fn>
+inline void NumaParallelFor(const std::vector<std::vector<Task>>& node_tasks,
+                            int nthreads, const Fn& fn) {
+  const int num_nodes = static_cast<int>(node_tasks.size());
+  if (nthreads <= 1 || num_nodes == 0) {
+    for (const auto& tasks : node_tasks) {
+      for (const auto& task : tasks) fn(task);
+    }
+    return;
+  }
+  #pragma omp parallel num_threads(nthreads)
+  {
+    const int tid = omp_get_thread_num();
+    const int n = omp_get_num_threads();
+    if (n < num_nodes) {
+      for (int node = tid; node < num_nodes; node += n) {
+        NumaThreadBinding binding(node);
+        for (const auto& task : node_tasks[node]) fn(task);
+      }
+    } else {
+      const int node = tid * num_nodes / n;
+      // threads [first, last) of the team work on this node
+      const int first = (node * n + num_nodes - 1) / num_nodes;
+      const int last = ((node + 1) * n + num_nodes - 1) / num_nodes;
+      NumaThreadBinding binding(num_nodes > 1 ? node : -1);
+      const auto& tasks = node_tasks[node];
+      for (size_t i = tid - first; i < tasks.size(); i += last - first) {
+        fn(tasks[i]);
+      }
+    }
+  }
+}
+
+}  // namespace kvstore
+}  // namespace mxnet
+#endif  // MXNET_KVSTORE_NUMA_UTILS_H_
@@ -24,7 +24,9 @@
 #include <mxnet/operator_util.h>
 #include <dmlc/logging.h>
 #include <dmlc/optional.h>
+#include <random>
 #include "../elemwise_op_common.h"
+#include "../../engine/openmp.h"
 #include "../../imperative/imperative_utils.h"
 #include "../subgraph_op_common.h"
 #include "./dgl_graph-inl.h"
@@ -538,6 +540,19 @@ struct neigh_list {
     : neighs(_neighs), edges(_edges) {}
 };
 
+/*
+ * Buffers of the sampling of one subgraph, reused across the hops of the BFS
+ */
+struct SampleWorkspace {
+  std::unordered_set<dgl_id_t> sub_ver_mp;
+  std::vector<std::pair<dgl_id_t, dgl_id_t> > sub_vers;
+  std::vector<std::pair<dgl_id_t, size_t> > neigh_pos;
+  std::vector<dgl_id_t> neighbor_list;
+  // sampled neighbors and edges of each vertex of the current level
+  std::vector<std::vector<dgl_id_t> > level_src;
+  std::vector<std::vector<dgl_id_t> > level_edge;
+};
+
 /*
  * Sample sub-graph from csr graph
  */
@@ -550,8 +565,9 @@ static void SampleSubgraph(const NDArray &csr,
                            const float* probability,
                            int num_hops,
                            size_t num_neighbor,
-                           size_t max_num_vertices) {
-  unsigned int time_seed = time(nullptr);
+                           size_t max_num_vertices,
+                           unsigned int base_seed,
+                           int num_threads) {
   size_t num_seeds = seed_arr.shape().Size();
   CHECK_GE(max_num_vertices, num_seeds);
 
@@ -562,10 +578,13 @@ static void SampleSubgraph(const NDArray &csr,
   dgl_id_t* out = sampled_ids.data().dptr<dgl_id_t>();
   dgl_id_t* out_layer = sub_layer.data().dptr<dgl_id_t>();
 
+  SampleWorkspace ws;
   // BFS traverse the graph and sample vertices
   // <vertex_id, layer_id>
-  std::unordered_set<dgl_id_t> sub_ver_mp;
-  std::vector<std::pair<dgl_id_t, dgl_id_t> > sub_vers;
+  std::unordered_set<dgl_id_t> &sub_ver_mp = ws.sub_ver_mp;
+  std::vector<std::pair<dgl_id_t, dgl_id_t> > &sub_vers = ws.sub_vers;
+  sub_ver_mp.clear();
+  sub_vers.clear();
   sub_vers.reserve(num_seeds * 10);
   // add seed vertices
   for (size_t i = 0; i < num_seeds; ++i) {
@@ -575,75 +594,93 @@ static void SampleSubgraph(const NDArray &csr,
       sub_vers.emplace_back(seed[i], 0);
     }
   }
-  std::vector<dgl_id_t> tmp_sampled_src_list;
-  std::vector<dgl_id_t> tmp_sampled_edge_list;
   // ver_id, position
-  std::vector<std::pair<dgl_id_t, size_t> > neigh_pos;
+  std::vector<std::pair<dgl_id_t, size_t> > &neigh_pos = ws.neigh_pos;
+  neigh_pos.clear();
   neigh_pos.reserve(num_seeds);
-  std::vector<dgl_id_t> neighbor_list;
+  std::vector<dgl_id_t> &neighbor_list = ws.neighbor_list;
+  neighbor_list.clear();
   size_t num_edges = 0;
 
   // sub_vers is used both as a node collection and a queue.
-  // In the while loop, we iterate over sub_vers and new nodes are added to the vector.
-  // A vertex in the vector only needs to be accessed once. If there is a vertex behind idx
-  // isn't in the last level, we will sample its neighbors. If not, the while loop terminates.
+  // The queue is processed one level at a time. The neighbors of all vertices of the
+  // level are sampled in parallel, each vertex with its own random seed so that the
+  // result doesn't depend on the number of threads. They are then merged in queue order,
+  // which gives the same subgraph as visiting the vertices one by one. If the vertex at
+  // idx isn't in the last level, we sample its neighbors. If not, the loop terminates.
   size_t idx = 0;
   while (idx < sub_vers.size() &&
     sub_ver_mp.size() < max_num_vertices) {
-    dgl_id_t dst_id = sub_vers[idx].first;
-    int cur_node_level = sub_vers[idx].second;
-    idx++;
-    // If the node is in the last level, we don't need to sample neighbors
-    // from this node.
+    const int cur_node_level = sub_vers[idx].second;
+    // If the nodes are in the last level, we don't need to sample neighbors
+    // from them.
     if (cur_node_level >= num_hops)
-      continue;
-
-    tmp_sampled_src_list.clear();
-    tmp_sampled_edge_list.clear();
-    dgl_id_t ver_len = *(indptr+dst_id+1) - *(indptr+dst_id);
-    if (probability == nullptr) {  // uniform-sample
-      GetUniformSample(val_list + *(indptr + dst_id),
-                       col_list + *(indptr + dst_id),
-                       ver_len,
-                       num_neighbor,
-                       &tmp_sampled_src_list,
-                       &tmp_sampled_edge_list,
-                       &time_seed);
-    } else {  // non-uniform-sample
-      GetNonUniformSample(probability,
-                       val_list + *(indptr + dst_id),
-                       col_list + *(indptr + dst_id),
-                       ver_len,
-                       num_neighbor,
-                       &tmp_sampled_src_list,
-                       &tmp_sampled_edge_list,
-                       &time_seed);
-    }
-    CHECK_EQ(tmp_sampled_src_list.size(), tmp_sampled_edge_list.size());
-    size_t pos = neighbor_list.size();
-    neigh_pos.emplace_back(dst_id, pos);
-    // First we push the size of neighbor vector
-    neighbor_list.push_back(tmp_sampled_edge_list.size());
-    // Then push the vertices
-    for (size_t i = 0; i < tmp_sampled_src_list.size(); ++i) {
-      neighbor_list.push_back(tmp_sampled_src_list[i]);
+      break;
+    const int64_t level_size = sub_vers.size() - idx;
+    if (ws.level_src.size() < static_cast<size_t>(level_size)) {
+      ws.level_src.resize(level_size);
+      ws.level_edge.resize(level_size);
     }
-    // Finally we push the edge list
-    for (size_t i = 0; i < tmp_sampled_edge_list.size(); ++i) {
-      neighbor_list.push_back(tmp_sampled_edge_list[i]);
+    const size_t level_begin = idx;
+    #pragma omp parallel for num_threads(num_threads) if (num_threads > 1 && level_size > 1)
+    for (int64_t j = 0; j < level_size; ++j) {
+      dgl_id_t dst_id = sub_vers[level_begin + j].first;
+      std::vector<dgl_id_t> &tmp_sampled_src_list = ws.level_src[j];
+      std::vector<dgl_id_t> &tmp_sampled_edge_list = ws.level_edge[j];
+      tmp_sampled_src_list.clear();
+      tmp_sampled_edge_list.clear();
+      unsigned int vertex_seed = base_seed ^
+        static_cast<unsigned int>(dst_id * 2654435761u + cur_node_level);
+      dgl_id_t ver_len = *(indptr+dst_id+1) - *(indptr+dst_id);
+      if (probability == nullptr) {  // uniform-sample
+        GetUniformSample(val_list + *(indptr + dst_id),
+                         col_list + *(indptr + dst_id),
+                         ver_len,
+                         num_neighbor,
+                         &tmp_sampled_src_list,
+                         &tmp_sampled_edge_list,
+                         &vertex_seed);
+      } else {  // non-uniform-sample
+        GetNonUniformSample(probability,
+                         val_list + *(indptr + dst_id),
+                         col_list + *(indptr + dst_id),
+                         ver_len,
+                         num_neighbor,
+                         &tmp_sampled_src_list,
+                         &tmp_sampled_edge_list,
+                         &vertex_seed);
+      }
+      CHECK_EQ(tmp_sampled_src_list.size(), tmp_sampled_edge_list.size());
     }
-    num_edges += tmp_sampled_src_list.size();
-    for (size_t i = 0; i < tmp_sampled_src_list.size(); ++i) {
-      // If we have sampled the max number of vertices, we have to stop.
-      if (sub_ver_mp.size() >= max_num_vertices)
-        break;
-      // We need to add the neighbor in the hashtable here. This ensures that
-      // the vertex in the queue is unique. If we see a vertex before, we don't
-      // need to add it to the queue again.
-      auto ret = sub_ver_mp.insert(tmp_sampled_src_list[i]);
-      // If the sampled neighbor is inserted to the map successfully.
-      if (ret.second)
-        sub_vers.emplace_back(tmp_sampled_src_list[i], cur_node_level + 1);
+
+    for (int64_t j = 0; j < level_size && sub_ver_mp.size() < max_num_vertices; ++j) {
+      dgl_id_t dst_id = sub_vers[idx].first;
+      idx++;
+      const std::vector<dgl_id_t> &tmp_sampled_src_list = ws.level_src[j];
+      const std::vector<dgl_id_t> &tmp_sampled_edge_list = ws.level_edge[j];
+      size_t pos = neighbor_list.size();
+      neigh_pos.emplace_back(dst_id, pos);
+      // First we push the size of neighbor vector
+      neighbor_list.push_back(tmp_sampled_edge_list.size());
+      // Then push the vertices
+      neighbor_list.insert(neighbor_list.end(),
+                           tmp_sampled_src_list.begin(), tmp_sampled_src_list.end());
+      // Finally we push the edge list
+      neighbor_list.insert(neighbor_list.end(),
+                           tmp_sampled_edge_list.begin(), tmp_sampled_edge_list.end());
+      num_edges += tmp_sampled_src_list.size();
+      for (size_t i = 0; i < tmp_sampled_src_list.size(); ++i) {
+        // If we have sampled the max number of vertices, we have to stop.
+        if (sub_ver_mp.size() >= max_num_vertices)
+          break;
+        // We need to add the neighbor in the hashtable here. This ensures that
+        // the vertex in the queue is unique. If we see a vertex before, we don't
+        // need to add it to the queue again.
+        auto ret = sub_ver_mp.insert(tmp_sampled_src_list[i]);
+        // If the sampled neighbor is inserted to the map successfully.
+        if (ret.second)
+          sub_vers.emplace_back(tmp_sampled_src_list[i], cur_node_level + 1);
+      }
     }
   }
   // Let's check if there is a vertex that we haven't sampled its neighbors.
@@ -726,6 +763,27 @@ static void SampleSubgraph(const NDArray &csr,
   }
 }
 
+/*
+ * Picks a single level of parallelism: the seed arrays are sampled in parallel when
+ * there are several of them, the vertices of each level otherwise. Also draws a random
+ * seed for each seed array from the random resource of the operator
+ */
+static void GetSampleThreadsAndSeeds(const OpContext& ctx,
+                                     int num_subgraphs,
+                                     std::vector<unsigned int>* seeds,
+                                     int* outer_threads,
+                                     int* inner_threads) {
+  const int omp_threads = engine::OpenMP::Get()->GetRecommendedOMPThreadCount();
+  *outer_threads = std::max(1, std::min(num_subgraphs, omp_threads));
+  *inner_threads = num_subgraphs > 1 ? 1 : std::max(1, omp_threads);
+  std::mt19937 &rnd = ctx.requested[0].get_random<cpu, float>(
+      ctx.get_stream<cpu>())->GetRndEngine();
+  seeds->resize(num_subgraphs);
+  for (int i = 0; i < num_subgraphs; i++) {
+    seeds->at(i) = rnd();
+  }
+}
+
 /*
  * Operator: contrib_csr_neighbor_uniform_sample
  */
@@ -740,7 +798,11 @@ static void CSRNeighborUniformSampleComputeExCPU(const nnvm::NodeAttrs& attrs,
   int num_subgraphs = inputs.size() - 1;
   CHECK_EQ(outputs.size(), 3 * num_subgraphs);
 
-#pragma omp parallel for
+  std::vector<unsigned int> seeds;
+  int outer_threads, inner_threads;
+  GetSampleThreadsAndSeeds(ctx, num_subgraphs, &seeds, &outer_threads, &inner_threads);
+
+#pragma omp parallel for num_threads(outer_threads) if (outer_threads > 1)
   for (int i = 0; i < num_subgraphs; i++) {
     SampleSubgraph(inputs[0],                     // graph_csr
                    inputs[i + 1],                 // seed vector
@@ -751,7 +813,9 @@ static void CSRNeighborUniformSampleComputeExCPU(const nnvm::NodeAttrs& attrs,
                    nullptr,                       // probability
                    params.num_hops,
                    params.num_neighbor,
-                   params.max_num_vertices);
+                   params.max_num_vertices,
+                   seeds[i],
+                   inner_threads);
   }
 }
 
@@ -767,6 +831,10 @@ The first set of 1D NDArrays have a length of max_num_vertices+1. The last eleme
 indicate the acutal number of vertices in a subgraph. The third set of NDArrays have a length
 of max_num_vertices, and the valid number of vertices is the same as the ones in the first set.
 
+The seed arrays are sampled in parallel. With a single seed array, the neighbors of the
+vertices of each hop are sampled in parallel instead, so a single call with many seed arrays
+or with a large seed array uses all OpenMP threads. Sampling follows the random seed set with `mx.random.seed`.
+
 Example:
 
    .. code:: python
@@ -812,6 +880,9 @@ Example:
 .set_attr<mxnet::FInferShape>("FInferShape", CSRNeighborUniformSampleShape)
 .set_attr<nnvm::FInferType>("FInferType", CSRNeighborUniformSampleType)
 .set_attr<FComputeEx>("FComputeEx<cpu>", CSRNeighborUniformSampleComputeExCPU)
+.set_attr<FResourceRequest>("FResourceRequest", [](const NodeAttrs& attrs) {
+  return std::vector<ResourceRequest>{ResourceRequest::kRandom};
+})
 .add_argument("csr_matrix", "NDArray-or-Symbol", "csr matrix")
 .add_argument("seed_arrays", "NDArray-or-Symbol[]", "seed vertices")
 .set_attr<std::string>("key_var_num_args", "num_args")
@@ -833,7 +904,11 @@ static void CSRNeighborNonUniformSampleComputeExCPU(const nnvm::NodeAttrs& attrs
 
   const float* probability = inputs[1].data().dptr<float>();
 
-#pragma omp parallel for
+  std::vector<unsigned int> seeds;
+  int outer_threads, inner_threads;
+  GetSampleThreadsAndSeeds(ctx, num_subgraphs, &seeds, &outer_threads, &inner_threads);
+
+#pragma omp parallel for num_threads(outer_threads) if (outer_threads > 1)
   for (int i = 0; i < num_subgraphs; i++) {
     float* sub_prob = outputs[i+2*num_subgraphs].data().dptr<float>();
     SampleSubgraph(inputs[0],                     // graph_csr
@@ -845,7 +920,9 @@ static void CSRNeighborNonUniformSampleComputeExCPU(const nnvm::NodeAttrs& attrs
                    probability,
                    params.num_hops,
                    params.num_neighbor,
-                   params.max_num_vertices);
+                   params.max_num_vertices,
+                   seeds[i],
+                   inner_threads);
   }
 }
 
@@ -862,6 +939,9 @@ The first set of 1D NDArrays have a length of max_num_vertices+1. The last eleme
 indicate the acutal number of vertices in a subgraph. The third and fourth set of NDArrays have a length
 of max_num_vertices, and the valid number of vertices is the same as the ones in the first set.
 
+The seed arrays are sampled in parallel. With a single seed array, the neighbors of the
+vertices of each hop are sampled in parallel instead. Sampling follows the random seed set with `mx.random.seed`.
+
 Example:
 
    .. code:: python
@@ -911,6 +991,9 @@ Example:
 .set_attr<mxnet::FInferShape>("FInferShape", CSRNeighborNonUniformSampleShape)
 .set_attr<nnvm::FInferType>("FInferType", CSRNeighborNonUniformSampleType)
 .set_attr<FComputeEx>("FComputeEx<cpu>", CSRNeighborNonUniformSampleComputeExCPU)
+.set_attr<FResourceRequest>("FResourceRequest", [](const NodeAttrs& attrs) {
+  return std::vector<ResourceRequest>{ResourceRequest::kRandom};
+})
 .add_argument("csr_matrix", "NDArray-or-Symbol", "csr matrix")
 .add_argument("probability", "NDArray-or-Symbol", "probability vector")
 .add_argument("seed_arrays", "NDArray-or-Symbol[]", "seed vertices")
@@ -563,7 +563,6 @@ static void WhileLoopComputeExCPU(const OpStatePtr& state_ptr,
   // The argument `outputs' are output and new_loop_vars
   // [0: num_out_data) are outputs at each step.
   // [num_out_data: ) are new_loop_vars
-  // TODO(Junru): avoid dynamic NDArray allocation
   WhileLoopState &state = state_ptr.get_state<WhileLoopState>();
   const WhileLoopParam& params = state.params;
   // a helper function, converting std::vector<NDArray> to std::vector<NDArray*>
@@ -590,6 +589,16 @@ static void WhileLoopComputeExCPU(const OpStatePtr& state_ptr,
   // construct inputs and outputs for func
   std::vector<NDArray> func_inputs, func_outputs(outputs.size());
   extract_by_loc(inputs, params.func_input_locs, &func_inputs);
+  // When not recording, the new_loop_vars of a step are only read by the next step,
+  // so two sets of buffers are used in turn instead of allocating them at every step.
+  std::vector<NDArray> var_bufs[2];
+  if (!ctx.need_grad) {
+    for (auto &bufs : var_bufs) {
+      for (size_t i = params.num_out_data; i < outputs.size(); ++i) {
+        bufs.emplace_back(outputs[i].shape(), outputs[i].ctx(), true, outputs[i].dtype());
+      }
+    }
+  }
   for (size_t &step = state.n_iterations = 0; step < (size_t) params.max_iterations; ++step) {
     state.cond_op->Forward(nullptr, cond_input_ptr, cond_output_ptr);
     if (!as_bool_scalar(*cond_output_ptr[0])) {
@@ -600,9 +609,15 @@ static void WhileLoopComputeExCPU(const OpStatePtr& state_ptr,
     for (size_t i = 0; i < (size_t) params.num_out_data; ++i) {
       func_outputs[i] = outputs[i].At(step);
     }
-    // func_outputs[num_out_data: ] are new_loop_vars, need to allocate new memory
+    // func_outputs[num_out_data: ] are new_loop_vars, which need new memory at every
+    // step when recording, because the backward reads the loop_vars of all the steps
     for (size_t i = params.num_out_data; i < outputs.size(); ++i) {
-      func_outputs[i] = NDArray(outputs[i].shape(), outputs[i].ctx(), true, outputs[i].dtype());
+      if (ctx.need_grad) {
+        func_outputs[i] = NDArray(outputs[i].shape(), outputs[i].ctx(), true,
+                                  outputs[i].dtype());
+      } else {
+        func_outputs[i] = var_bufs[step % 2][i - params.num_out_data];
+      }
     }
     state.Forward(step, func_inputs, req, func_outputs, ctx.need_grad);
     // func_inputs on the next step:
@@ -44,6 +44,8 @@ class CuDNNRNNOp : public Operator {
  public:
   explicit CuDNNRNNOp(RNNParam param) {
     this->param_ = param;
+    CHECK(!param_.use_sequence_length)
+      << "sequence_length is only supported by the CPU implementation of RNN";
     init_cudnn_ = false;
     dtype_ = mshadow::DataType<DType>::kCudnnFlag;
     // TensorCore algos only allowed on fp16-I/O convolutions if permitted by the global policy.
@@ -155,6 +155,57 @@ inline size_t GetRNNReserveSpaceSize(int num_layer,
   return size;
 }
 
+/*!
+ * \brief orders the sequences of a batch by decreasing length, the layout the CPU kernels
+ *  use for variable length sequences: only the first batch_sizes[t] sequences are active
+ *  at time t, so the steps after the end of a sequence are skipped.
+ * \return whether the sequences were already in that order
+ */
+inline bool PackSequenceLengths(const std::vector<int>& lengths,
+                                const int seq_length,
+                                std::vector<int>* order,
+                                std::vector<int>* batch_sizes) {
+  const int batch_size = lengths.size();
+  order->resize(batch_size);
+  for (int i = 0; i < batch_size; ++i) {
+    (*order)[i] = i;
+  }
+  std::stable_sort(order->begin(), order->end(),
+                   [&lengths](int a, int b) { return lengths[a] > lengths[b]; });
+  batch_sizes->assign(seq_length, 0);
+  bool sorted = true;
+  for (int i = 0; i < batch_size; ++i) {
+    for (int t = 0; t < lengths[i]; ++t) {
+      ++(*batch_sizes)[t];
+    }
+    sorted = sorted && (*order)[i] == i;
+  }
+  return sorted;
+}
+
+/*!
+ * \brief copies a [outer, batch_size, row_size] array with its batch reordered:
+ *  dst[o][i] = src[o][order[i]], or dst[o][order[i]] = src[o][i] when unpack is set.
+ */
+template<typename DType>
+inline void PermuteSequenceRows(const DType* src,
+                                DType* dst,
+                                const int outer,
+                                const int row_size,
+                                const std::vector<int>& order,
+                                const bool unpack) {
+  const int batch_size = order.size();
+  const int omp_threads = mxnet::engine::OpenMP::Get()->GetRecommendedOMPThreadCount();
+  #pragma omp parallel for num_threads(omp_threads)
+  for (int oi = 0; oi < outer * batch_size; ++oi) {
+    const int o = oi / batch_size;
+    const int i = oi % batch_size;
+    const DType* from = src + (o * batch_size + (unpack ? i : order[i])) * row_size;
+    DType* to = dst + (o * batch_size + (unpack ? order[i] : i)) * row_size;
+    std::copy(from, from + row_size, to);
+  }
+}
+
 struct RNNParam : public dmlc::Parameter<RNNParam> {
   uint32_t state_size;
   uint32_t num_layers;
@@ -166,6 +217,7 @@ struct RNNParam : public dmlc::Parameter<RNNParam> {
   dmlc::optional<int> projection_size;
   dmlc::optional<double> lstm_state_clip_min, lstm_state_clip_max;
   bool lstm_state_clip_nan;
+  bool use_sequence_length;
 
   DMLC_DECLARE_PARAMETER(RNNParam) {
     DMLC_DECLARE_FIELD(state_size)
@@ -209,6 +261,14 @@ struct RNNParam : public dmlc::Parameter<RNNParam> {
     .set_default(false)
     .describe("Whether to stop NaN from propagating in state by clipping it to min/max. "
               "If clipping range is not specified, this option is ignored.");
+
+    DMLC_DECLARE_FIELD(use_sequence_length)
+    .set_default(false)
+    .describe("If set to true, this layer takes in an extra input parameter "
+              "`sequence_length` to specify variable length sequences. The steps after "
+              "the end of a sequence are skipped, its output there is zero and its final "
+              "states are the states at its last step. Only supported for LSTM and GRU "
+              "on CPU.");
   }
 };
 
@@ -257,17 +317,18 @@ void RNNForwardTraining(DType* ws,
                         DType* hy_ptr,
                         DType* cy_ptr,
                         const float dropout,
-                        int mode) {
+                        int mode,
+                        const int* batch_sizes = NULL) {
   switch (mode) {
     case rnn_enum::kLstm:
       LstmForwardTraining<DType>(ws, rs, state_outputs, num_layers, direction, seq_length,
                                  batch_size, input_size, state_size, x_ptr, hx_ptr, cx_ptr,
-                                 w_ptr, b_ptr, y_ptr, hy_ptr, cy_ptr, dropout);
+                                 w_ptr, b_ptr, y_ptr, hy_ptr, cy_ptr, dropout, batch_sizes);
       break;
     case rnn_enum::kGru:
       GruForwardTraining<DType>(ws, rs, state_outputs, num_layers, direction, seq_length,
                                 batch_size, input_size, state_size, x_ptr, hx_ptr,
-                                w_ptr, y_ptr, hy_ptr, dropout);
+                                w_ptr, y_ptr, hy_ptr, dropout, batch_sizes);
       break;
     case rnn_enum::kRnnTanh:
     case rnn_enum::kRnnRelu:
@@ -298,17 +359,18 @@ void RNNForwardInference(DType* ws,
                          DType* y_ptr,
                          DType* hy_ptr,
                          DType* cy_ptr,
-                         int mode) {
+                         int mode,
+                         const int* batch_sizes = NULL) {
   switch (mode) {
     case rnn_enum::kLstm:
       LstmForwardInference<DType>(ws, state_outputs, num_layers, direction, seq_length,
                                   batch_size, input_size, state_size, x_ptr, hx_ptr, cx_ptr,
-                                  w_ptr, b_ptr, y_ptr, hy_ptr, cy_ptr);
+                                  w_ptr, b_ptr, y_ptr, hy_ptr, cy_ptr, batch_sizes);
       break;
     case rnn_enum::kGru:
       GruForwardInference<DType>(ws, state_outputs, num_layers, direction, seq_length,
                                  batch_size, input_size, state_size, x_ptr, hx_ptr,
-                                 w_ptr, y_ptr, hy_ptr);
+                                 w_ptr, y_ptr, hy_ptr, batch_sizes);
       break;
     case rnn_enum::kRnnTanh:
     case rnn_enum::kRnnRelu:
@@ -349,19 +411,21 @@ void RNNBackward(DType* ws,
                  int req_state,
                  int req_statecell,
                  const float dropout,
-                 int mode) {
+                 int mode,
+                 const int* batch_sizes = NULL) {
   switch (mode) {
     case rnn_enum::kLstm:
       LstmBackward<DType>(ws, rs, num_layers, direction, seq_length, batch_size,
                           input_size, state_size, x_ptr, hx_ptr, cx_ptr, w_ptr, y_ptr,
                           dy_ptr, dhy_ptr, dcy_ptr, dx_ptr, dhx_ptr, dcx_ptr, dw_ptr, db_ptr,
-                          req_data, req_params, req_state, req_statecell, dropout);
+                          req_data, req_params, req_state, req_statecell, dropout,
+                          batch_sizes);
       break;
     case rnn_enum::kGru:
       GruBackward<DType>(ws, rs, num_layers, direction, seq_length, batch_size,
                          input_size, state_size, x_ptr, hx_ptr, w_ptr,
                          dy_ptr, dhy_ptr, dx_ptr, dhx_ptr, dw_ptr,
-                         req_data, req_params, req_state, dropout);
+                         req_data, req_params, req_state, dropout, batch_sizes);
       break;
     case rnn_enum::kRnnTanh:
     case rnn_enum::kRnnRelu:
@@ -388,6 +452,10 @@ class RNNOp : public Operator{
         || param_.lstm_state_clip_max.has_value()) {
       LOG(FATAL) << "LSTM state clipping is only supported for GPU with CuDNN later than 7.2.1";
     }
+    if (param_.use_sequence_length) {
+      CHECK(param_.mode == rnn_enum::kLstm || param_.mode == rnn_enum::kGru)
+        << "sequence_length is only supported for LSTM and GRU";
+    }
   }
 
   ~RNNOp() {
@@ -409,6 +477,9 @@ class RNNOp : public Operator{
 
     size_t in_expected = (param_.mode == rnn_enum::kLstm) ? 4 : 3;
     size_t out_expected = (param_.mode == rnn_enum::kLstm) ? 3 : 2;
+    if (param_.use_sequence_length) {
+      in_expected += 1;
+    }
     if (!param_.state_outputs) {
       out_expected = 1;
     }
@@ -446,11 +517,43 @@ class RNNOp : public Operator{
       }
     }
 
+    // with variable lengths the kernels work on the batch sorted by decreasing length
+    const int* batch_sizes = NULL;
+    bool permute = false;
+    if (param_.use_sequence_length) {
+      permute = !GetBatchSizes(in_data[in_expected - 1]);
+      batch_sizes = batch_sizes_.data();
+    }
+    const int T = param_.seq_length_;
+    const int N = param_.batch_size_;
+    const int H = param_.state_size;
+    const int num_states = param_.num_layers * direction * N * H;
+    DType* x_ptr = x.dptr_;
+    DType* hx_ptr = hx.dptr_;
+    DType* y_ptr = y.dptr_;
+
     // allocate temp space
     const size_t workspace_size = GetRNNWorkspaceSize(param_.seq_length_, param_.batch_size_,
                                                       param_.state_size, direction, param_.mode);
+    const size_t permute_size = permute ?
+        T * N * (param_.input_size_ + direction * H) + 4 * num_states : 0;
     Tensor<cpu, 1, DType> workspace = ctx.requested[rnn_enum::kTempSpace]
-        .get_space_typed<cpu, 1, DType>(Shape1(workspace_size), s);
+        .get_space_typed<cpu, 1, DType>(Shape1(workspace_size + permute_size), s);
+    if (permute) {
+      DType* buf = workspace.dptr_ + workspace_size;
+      x_ptr = buf;
+      y_ptr = x_ptr + T * N * param_.input_size_;
+      hx_ptr = y_ptr + T * N * direction * H;
+      PermuteSequenceRows(x.dptr_, x_ptr, T, param_.input_size_, order_, false);
+      PermuteSequenceRows(hx.dptr_, hx_ptr, param_.num_layers * direction, H, order_, false);
+      if (cx_ptr) {
+        PermuteSequenceRows(cx_ptr, hx_ptr + num_states, param_.num_layers * direction, H,
+                            order_, false);
+        cx_ptr = hx_ptr + num_states;
+      }
+      hy_ptr = hy_ptr ? hx_ptr + 2 * num_states : NULL;
+      cy_ptr = cy_ptr ? hx_ptr + 3 * num_states : NULL;
+    }
 
     if (ctx.is_train) {
       const size_t r_size = GetRNNReserveSpaceSize(param_.num_layers, direction,
@@ -477,16 +580,17 @@ class RNNOp : public Operator{
                                 param_.batch_size_,
                                 param_.input_size_,
                                 param_.state_size,
-                                x.dptr_,
-                                hx.dptr_,
+                                x_ptr,
+                                hx_ptr,
                                 cx_ptr,
                                 w.dptr_,
                                 b_ptr,
-                                y.dptr_,
+                                y_ptr,
                                 hy_ptr,
                                 cy_ptr,
                                 param_.p,
-                                param_.mode);
+                                param_.mode,
+                                batch_sizes);
     } else {
       RNNForwardInference<DType>(workspace.dptr_,
                                  param_.state_outputs,
@@ -496,15 +600,39 @@ class RNNOp : public Operator{
                                  param_.batch_size_,
                                  param_.input_size_,
                                  param_.state_size,
-                                 x.dptr_,
-                                 hx.dptr_,
+                                 x_ptr,
+                                 hx_ptr,
                                  cx_ptr,
                                  w.dptr_,
                                  b_ptr,
-                                 y.dptr_,
+                                 y_ptr,
                                  hy_ptr,
                                  cy_ptr,
-                                 param_.mode);
+                                 param_.mode,
+                                 batch_sizes);
+    }
+
+    if (permute) {
+      PermuteSequenceRows(y_ptr, y.dptr_, T, direction * H, order_, true);
+      if (hy_ptr) {
+        PermuteSequenceRows(hy_ptr, out_data[rnn_enum::kStateOut].dptr<DType>(),
+                            param_.num_layers * direction, H, order_, true);
+      }
+      if (cy_ptr) {
+        PermuteSequenceRows(cy_ptr, out_data[rnn_enum::kStateCellOut].dptr<DType>(),
+                            param_.num_layers * direction, H, order_, true);
+      }
+    }
+    if (param_.use_sequence_length) {
+      // the kernels leave the states of finished sequences in the padded steps
+      const int row_size = direction * H;
+      for (int t = 0; t < T; ++t) {
+        for (int i = 0; i < N; ++i) {
+          if (t >= lengths_[i]) {
+            std::fill_n(y.dptr_ + (t * N + i) * row_size, row_size, DType(0));
+          }
+        }
+      }
     }
   }
 
@@ -522,6 +650,9 @@ class RNNOp : public Operator{
 
     size_t in_expected = (param_.mode == rnn_enum::kLstm) ? 4 : 3;
     size_t out_expected = (param_.mode == rnn_enum::kLstm) ? 3 : 2;
+    if (param_.use_sequence_length) {
+      in_expected += 1;
+    }
     if (!param_.state_outputs) {
       out_expected = 1;
     }
@@ -576,11 +707,60 @@ class RNNOp : public Operator{
       }
     }
 
+    const int* batch_sizes = NULL;
+    bool permute = false;
+    if (param_.use_sequence_length) {
+      const TBlob& sequence_length = in_data[in_expected - 1];
+      permute = !GetBatchSizes(sequence_length);
+      batch_sizes = batch_sizes_.data();
+      const OpReqType length_req = req[in_expected - 1];
+      if (length_req == kWriteTo || length_req == kWriteInplace) {
+        MSHADOW_TYPE_SWITCH(in_grad[in_expected - 1].type_flag_, IType, {
+          in_grad[in_expected - 1].FlatTo1D<cpu, IType>(s) = 0;
+        });
+      }
+    }
+    const int T = param_.seq_length_;
+    const int N = param_.batch_size_;
+    const int H = param_.state_size;
+    const int I = param_.input_size_;
+    const int L = param_.num_layers * direction;
+    const int num_states = L * N * H;
+    DType* x_ptr = x.dptr_;
+    DType* hx_ptr = hx.dptr_;
+    DType* dy_ptr = dy.dptr_;
+    DType* dx_ptr = dx.dptr_;
+    DType* dhx_ptr = dhx.dptr_;
+
     // allocate temp space
     const size_t workspace_size = GetRNNWorkspaceSize(param_.seq_length_, param_.batch_size_,
                                                       param_.state_size, direction, param_.mode);
+    const size_t permute_size = permute ? T * N * (2 * I + direction * H) + 6 * num_states : 0;
     Tensor<cpu, 1, DType> workspace = ctx.requested[rnn_enum::kTempSpace]
-        .get_space_typed<cpu, 1, DType>(Shape1(workspace_size), s);
+        .get_space_typed<cpu, 1, DType>(Shape1(workspace_size + permute_size), s);
+    if (permute) {
+      x_ptr = workspace.dptr_ + workspace_size;
+      dx_ptr = x_ptr + T * N * I;
+      dy_ptr = dx_ptr + T * N * I;
+      hx_ptr = dy_ptr + T * N * direction * H;
+      dhx_ptr = hx_ptr + num_states;
+      PermuteSequenceRows(x.dptr_, x_ptr, T, I, order_, false);
+      PermuteSequenceRows(dy.dptr_, dy_ptr, T, direction * H, order_, false);
+      PermuteSequenceRows(hx.dptr_, hx_ptr, L, H, order_, false);
+      if (dhy_ptr) {
+        PermuteSequenceRows(dhy_ptr, hx_ptr + 2 * num_states, L, H, order_, false);
+        dhy_ptr = hx_ptr + 2 * num_states;
+      }
+      if (cx_ptr) {
+        PermuteSequenceRows(cx_ptr, hx_ptr + 3 * num_states, L, H, order_, false);
+        cx_ptr = hx_ptr + 3 * num_states;
+        dcx_ptr = hx_ptr + 4 * num_states;
+      }
+      if (dcy_ptr) {
+        PermuteSequenceRows(dcy_ptr, hx_ptr + 5 * num_states, L, H, order_, false);
+        dcy_ptr = hx_ptr + 5 * num_states;
+      }
+    }
 
     size_t r_size = GetRNNReserveSpaceSize(param_.num_layers, direction,
                                            param_.seq_length_, param_.batch_size_,
@@ -598,16 +778,16 @@ class RNNOp : public Operator{
                        param_.batch_size_,
                        param_.input_size_,
                        param_.state_size,
-                       x.dptr_,
-                       hx.dptr_,
+                       x_ptr,
+                       hx_ptr,
                        cx_ptr,
                        w.dptr_,
                        y.dptr_,
-                       dy.dptr_,
+                       dy_ptr,
                        dhy_ptr,
                        dcy_ptr,
-                       dx.dptr_,
-                       dhx.dptr_,
+                       dx_ptr,
+                       dhx_ptr,
                        dcx_ptr,
                        dw.dptr_,
                        db_ptr,
@@ -617,11 +797,48 @@ class RNNOp : public Operator{
                        // State cell should be present for LSTMs, but is absent for other RNNs.
                        param_.mode == rnn_enum::kLstm ? req[rnn_enum::kStateCell] : kNullOp,
                        param_.p,
-                       param_.mode);
+                       param_.mode,
+                       batch_sizes);
+
+    if (permute) {
+      if (req[rnn_enum::kData] != kNullOp) {
+        PermuteSequenceRows(dx_ptr, dx.dptr_, T, I, order_, true);
+      }
+      if (req[rnn_enum::kState] != kNullOp) {
+        PermuteSequenceRows(dhx_ptr, dhx.dptr_, L, H, order_, true);
+      }
+      if (param_.mode == rnn_enum::kLstm && req[rnn_enum::kStateCell] != kNullOp) {
+        PermuteSequenceRows(dcx_ptr, in_grad[rnn_enum::kStateCell].dptr<DType>(), L, H,
+                            order_, true);
+      }
+    }
   }
 
  private:
+  /*!
+   * \brief reads the sequence lengths and computes the order and the number of active
+   *  sequences at every step of the batch sorted by decreasing length.
+   * \return whether the batch is already sorted
+   */
+  bool GetBatchSizes(const TBlob& sequence_length) {
+    const int N = param_.batch_size_;
+    CHECK_EQ(sequence_length.Size(), static_cast<size_t>(N))
+      << "sequence_length should have one element per sequence of the batch";
+    lengths_.resize(N);
+    MSHADOW_TYPE_SWITCH(sequence_length.type_flag_, IType, {
+      const IType* ptr = sequence_length.dptr<IType>();
+      for (int i = 0; i < N; ++i) {
+        lengths_[i] = static_cast<int>(ptr[i]);
+        CHECK(lengths_[i] >= 0 && lengths_[i] <= param_.seq_length_)
+          << "sequence_length " << lengths_[i] << " is out of range [0, "
+          << param_.seq_length_ << "]";
+      }
+    });
+    return PackSequenceLengths(lengths_, param_.seq_length_, &order_, &batch_sizes_);
+  }
+
   RNNParam param_;
+  std::vector<int> lengths_, order_, batch_sizes_;
   bool init_space_;
   size_t reserve_space_size_;
   Storage::Handle reserve_space_;
@@ -634,11 +851,12 @@ Operator* CreateOp(RNNParam param, int dtype);
 class RNNProp : public OperatorProperty {
  public:
   std::vector<std::string> ListArguments() const override {
-    if (param_.mode == rnn_enum::kLstm) {
-      return {"data", "parameters", "state", "state_cell"};
-    } else {
-      return {"data", "parameters", "state"};
-    }
+    std::vector<std::string> arguments = {"data", "parameters", "state"};
+    if (param_.mode == rnn_enum::kLstm)
+      arguments.emplace_back("state_cell");
+    if (param_.use_sequence_length)
+      arguments.emplace_back("sequence_length");
+    return arguments;
   }
 
   std::vector<std::string> ListOutputs() const override {
@@ -670,10 +888,13 @@ class RNNProp : public OperatorProperty {
                   mxnet::ShapeVector *out_shape,
                   mxnet::ShapeVector *aux_shape) const override {
     using namespace mshadow;
+    const size_t num_inputs = param_.use_sequence_length ? 1U : 0U;
     if (param_.mode == rnn_enum::kLstm) {
-      CHECK_EQ(in_shape->size(), 4U) << "Input:[data, parameters, state, cell_state]";
+      CHECK_EQ(in_shape->size(), 4U + num_inputs)
+        << "Input:[data, parameters, state, cell_state(, sequence_length)]";
     } else {
-      CHECK_EQ(in_shape->size(), 3U) << "Input:[data, parameters, state]";
+      CHECK_EQ(in_shape->size(), 3U + num_inputs)
+        << "Input:[data, parameters, state(, sequence_length)]";
     }
     const mxnet::TShape &dshape = (*in_shape)[rnn_enum::kData];
     if (dshape.ndim() ==  0) return false;
@@ -702,6 +923,9 @@ class RNNProp : public OperatorProperty {
                                      param_.mode,
                                      param_.projection_size);
     SHAPE_ASSIGN_CHECK(*in_shape, rnn_enum::kParams, Shape1(param_size));
+    if (param_.use_sequence_length) {
+      SHAPE_ASSIGN_CHECK(*in_shape, in_shape->size() - 1, Shape1(batch_size));
+    }
 
     out_shape->clear();
     // output: [sequence len, batch, output size]
@@ -746,7 +970,8 @@ class RNNProp : public OperatorProperty {
     for (size_t i = 0; i < in_type->size(); ++i) {
       if ((*in_type)[i] == -1) {
         (*in_type)[i] = dtype;
-      } else {
+      } else if (!param_.use_sequence_length || i + 1 < in_type->size()) {
+        // sequence_length may have any type
         UNIFORM_TYPE_CHECK((*in_type)[i], dtype, ListArguments()[i]);
       }
     }
@@ -792,6 +1017,9 @@ class RNNProp : public OperatorProperty {
         dep.push_back(out_grad[rnn_enum::kStateCellOut]);
       }
     }
+    if (param_.use_sequence_length) {
+      dep.push_back(in_data.back());
+    }
     return dep;
   }
 
@@ -97,13 +97,26 @@ The definition of GRU here is slightly different from paper but compatible with
             z_t = \mathrm{sigmoid}(W_{iz} x_t + b_{iz} + W_{hz} h_{(t-1)} + b_{hz}) \\
             n_t = \tanh(W_{in} x_t + b_{in} + r_t * (W_{hn} h_{(t-1)}+ b_{hn})) \\
             h_t = (1 - z_t) * n_t + z_t * h_{(t-1)} \\
-            \end{array})code")
+            \end{array}
+
+**Variable length sequences**
+
+With `use_sequence_length=True`, the lengths of the sequences of the batch are given in
+`sequence_length`. On CPU, LSTM and GRU then skip the steps after the end of every
+sequence: the batch is ordered by decreasing length, and only the sequences which are
+still running take part in the recurrent matrix products and gate computations of a step.
+The output is zero after the end of a sequence, the reverse direction of a bidirectional
+layer starts at the last step of every sequence, and the output states are the states at
+the last step of every sequence.)code")
 .add_argument("data", "NDArray-or-Symbol", "Input data to RNN")
 .add_argument("parameters", "NDArray-or-Symbol",
               "Vector of all RNN trainable parameters concatenated")
 .add_argument("state", "NDArray-or-Symbol", "initial hidden state of the RNN")
 .add_argument("state_cell", "NDArray-or-Symbol",
               "initial cell state for LSTM networks (only for LSTM)")
+.add_argument("sequence_length", "NDArray-or-Symbol",
+              "Vector of valid sequence lengths for each element in batch. (Only used if"
+              " use_sequence_length kwarg is True)")
 .add_arguments(RNNParam::__FIELDS__());
 }  // namespace op
 }  // namespace mxnet
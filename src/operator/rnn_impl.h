@@ -70,7 +70,8 @@ void LstmForwardTrainingSingleLayer(DType* ws,
                                     DType* w_ptr,
                                     DType* b_ptr,
                                     DType* hy_ptr,
-                                    DType* cy_ptr) {
+                                    DType* cy_ptr,
+                                    const int* batch_sizes) {
   using namespace mshadow;
   const Tensor<cpu, 2, DType> wx(w_ptr, Shape2(H * 4, I));
   const Tensor<cpu, 2, DType> wh(w_ptr + I * H * 4, Shape2(H * 4, H));
@@ -94,9 +95,14 @@ void LstmForwardTrainingSingleLayer(DType* ws,
   const int omp_threads = mxnet::engine::OpenMP::Get()->GetRecommendedOMPThreadCount();
   for (int i = 0; i < T; ++i) {
     int t = bid ? T - 1 - i : i;
-    linalg_gemm(i ? h : hx, wh, yh_flat, alpha, beta, false, true);
+    const int n = batch_sizes ? batch_sizes[t] : N;
+    if (n > 0) {
+      const Tensor<cpu, 2, DType> hprev((i ? h : hx).dptr_, Shape2(n, H));
+      Tensor<cpu, 2, DType> yh_n(yh_flat.dptr_, Shape2(n, 4 * H));
+      linalg_gemm(hprev, wh, yh_n, alpha, beta, false, true);
+    }
     #pragma omp parallel for num_threads(omp_threads)
-    for (int jk = 0; jk < cell_size; ++jk) {
+    for (int jk = 0; jk < n * H; ++jk) {
       int j = jk / H;
       int k = jk % H;
       DType it = sigmoid<DType>(yx[t][j][0][k] + yh[j][0][k] + bx[0][k] + bh[0][k]);
@@ -118,6 +124,22 @@ void LstmForwardTrainingSingleLayer(DType* ws,
         cy_ptr[jk] = ct;
       }
     }
+    // sequences which ended or did not start yet carry their state over the step,
+    // so that the backward pass finds the previous state of every step in y and c
+    #pragma omp parallel for num_threads(omp_threads)
+    for (int jk = n * H; jk < cell_size; ++jk) {
+      int j = jk / H;
+      int k = jk % H;
+      DType ct = i ? c[i-1][j][k] : cx[j][k];
+      DType ht = i ? h[j][k] : hx[j][k];
+      h[j][k] = ht;
+      y[t][j][k + offset] = ht;
+      c[i][j][k] = ct;
+      if (i == T - 1 && state_outputs) {
+        hy_ptr[jk] = ht;
+        cy_ptr[jk] = ct;
+      }
+    }
   }
 }
 
@@ -139,7 +161,8 @@ void LstmForwardTraining(DType* ws,
                          DType* y_ptr,
                          DType* hy_ptr,
                          DType* cy_ptr,
-                         const float dropout) {
+                         const float dropout,
+                         const int* batch_sizes) {
   DType* dropout_random = rs;
   DType* rs2 = dropout_random + (L - 1) * D * T * N * H;
   const int total_layers = D * L;
@@ -158,7 +181,8 @@ void LstmForwardTraining(DType* ws,
     Tensor<cpu, 2, DType> x(x_ptr, Shape2(T * N, input_size));
     Tensor<cpu, 3, DType> y(rs2 + y_offset, Shape3(T, N, H * D));
     LstmForwardTrainingSingleLayer<DType>(ws, rs2, state_outputs, false, T, N, input_size, H, x,
-                                          hx[idx], cx[idx], y, w_ptr, b_ptr, hy_ptr, cy_ptr);
+                                          hx[idx], cx[idx], y, w_ptr, b_ptr, hy_ptr, cy_ptr,
+                                          batch_sizes);
     if (D == 2) {
       w_ptr += w_size;
       b_ptr += b_size;
@@ -168,7 +192,8 @@ void LstmForwardTraining(DType* ws,
         cy_ptr += cell_size;
       }
       LstmForwardTrainingSingleLayer<DType>(ws, rs2, state_outputs, true, T, N, input_size, H, x,
-                                            hx[idx], cx[idx], y, w_ptr, b_ptr, hy_ptr, cy_ptr);
+                                            hx[idx], cx[idx], y, w_ptr, b_ptr, hy_ptr, cy_ptr,
+                                            batch_sizes);
     }
     if (i != L - 1) {
       w_ptr += w_size;
@@ -216,7 +241,8 @@ void LstmForwardInferenceSingleLayer(DType* ws,
                                      DType* w_ptr,
                                      DType* b_ptr,
                                      DType* hy_ptr,
-                                     DType* cy_ptr) {
+                                     DType* cy_ptr,
+                                     const int* batch_sizes) {
   using namespace mshadow;
   const Tensor<cpu, 2, DType> wx(w_ptr, Shape2(H * 4, I));
   const Tensor<cpu, 2, DType> wh(w_ptr + I * H * 4, Shape2(H * 4, H));
@@ -237,9 +263,14 @@ void LstmForwardInferenceSingleLayer(DType* ws,
   const int omp_threads = mxnet::engine::OpenMP::Get()->GetRecommendedOMPThreadCount();
   for (int i = 0; i < T; ++i) {
     int t = bid ? T - 1 - i : i;
-    linalg_gemm(i ? h : hx, wh, yh_flat, alpha, beta, false, true);
+    const int n = batch_sizes ? batch_sizes[t] : N;
+    if (n > 0) {
+      const Tensor<cpu, 2, DType> hprev((i ? h : hx).dptr_, Shape2(n, H));
+      Tensor<cpu, 2, DType> yh_n(yh_flat.dptr_, Shape2(n, H * 4));
+      linalg_gemm(hprev, wh, yh_n, alpha, beta, false, true);
+    }
     #pragma omp parallel for num_threads(omp_threads)
-    for (int jk = 0; jk < cell_size; ++jk) {
+    for (int jk = 0; jk < n * H; ++jk) {
       int j = jk / H;
       int k = jk % H;
       DType it = sigmoid<DType>(yx[t][j][0][k] + yh[j][0][k] + bx[0][k] + bh[0][k]);
@@ -257,6 +288,22 @@ void LstmForwardInferenceSingleLayer(DType* ws,
         c[j][k] = ct;
       }
     }
+    // sequences which ended or did not start yet carry their state over the step
+    #pragma omp parallel for num_threads(omp_threads)
+    for (int jk = n * H; jk < cell_size; ++jk) {
+      int j = jk / H;
+      int k = jk % H;
+      DType ct = i ? c[j][k] : cx[j][k];
+      DType ht = i ? h[j][k] : hx[j][k];
+      y[t][j][k + offset] = 0;
+      if (i == T - 1 && state_outputs) {
+        hy_ptr[jk] = ht;
+        cy_ptr[jk] = ct;
+      } else {
+        h[j][k] = ht;
+        c[j][k] = ct;
+      }
+    }
   }
 }
 
@@ -276,7 +323,8 @@ void LstmForwardInference(DType* ws,
                           DType* b_ptr,
                           DType* y_ptr,
                           DType* hy_ptr,
-                          DType* cy_ptr) {
+                          DType* cy_ptr,
+                          const int* batch_sizes) {
   const int total_layers = D * L;
   Tensor<cpu, 3, DType> hx(hx_ptr, Shape3(total_layers, N, H));
   Tensor<cpu, 3, DType> cx(cx_ptr, Shape3(total_layers, N, H));
@@ -297,7 +345,8 @@ void LstmForwardInference(DType* ws,
     Tensor<cpu, 2, DType> x(x_ptr, Shape2(T * N, input_size));
     Tensor<cpu, 3, DType> y(y_cur_ptr, Shape3(T, N, H * D));
     LstmForwardInferenceSingleLayer<DType>(ws, state_outputs, false, T, N, input_size, H,
-                                           x, hx[idx], cx[idx], y, w_ptr, b_ptr, hy_ptr, cy_ptr);
+                                           x, hx[idx], cx[idx], y, w_ptr, b_ptr, hy_ptr, cy_ptr,
+                                           batch_sizes);
     // If bidirectional, then calculate the reverse direction's forward result.
     if (D == 2) {
       w_ptr += w_size;
@@ -308,7 +357,8 @@ void LstmForwardInference(DType* ws,
         cy_ptr += cell_size;
       }
       LstmForwardInferenceSingleLayer<DType>(ws, state_outputs, true, T, N, input_size, H,
-                                             x, hx[idx], cx[idx], y, w_ptr, b_ptr, hy_ptr, cy_ptr);
+                                             x, hx[idx], cx[idx], y, w_ptr, b_ptr, hy_ptr, cy_ptr,
+                                             batch_sizes);
     }
     // Don't need to move pointer in the last layer.
     if (i != L - 1) {
@@ -349,7 +399,8 @@ void LstmBackwardSingleLayer(DType* ws,
                              int req_data,
                              int req_params,
                              int req_state,
-                             int req_statecell) {
+                             int req_statecell,
+                             const int* batch_sizes) {
   using namespace mshadow;
   const Tensor<cpu, 2, DType> wx(w_ptr, Shape2(H * 4, I));
   const Tensor<cpu, 2, DType> wh(w_ptr + I * H * 4, Shape2(H * 4, H));
@@ -408,12 +459,30 @@ void LstmBackwardSingleLayer(DType* ws,
   for (int i = T - 1; i >= 0; --i) {
     int t = bid ? T - 1 - i : i;
     int tnext = bid ? t + 1 : t - 1;
+    const int n = batch_sizes ? batch_sizes[t] : N;
     const Tensor<cpu, 2, DType>& dhnext = i ? dh : dhx;
     const Tensor<cpu, 2, DType>& dcnext = i ? dc : dcx;
     const Tensor<cpu, 2, DType>& hnext = i ? htmp : hx;
     const Tensor<cpu, 2, DType>& cnext = i ? c[i - 1] : cx;
+    // sequences inactive at this step pass the state gradients through unchanged
+    #pragma omp parallel for num_threads(omp_threads)
+    for (int jk = n * H; jk < cell_size; ++jk) {
+      int j = jk / H;
+      int k = jk % H;
+      difgo[t][j][0][k] = 0;
+      difgo[t][j][1][k] = 0;
+      difgo[t][j][2][k] = 0;
+      difgo[t][j][3][k] = 0;
+      if (!i && req_state != kNullOp) {
+        dhx[j][k] = dh[j][k];
+      }
+      if (!i && req_statecell != kNullOp) {
+        dcx[j][k] = dc[j][k];
+      }
+    }
+    if (n == 0) continue;
     #pragma omp parallel for num_threads(omp_threads)
-    for (int jk = 0; jk < cell_size; ++jk) {
+    for (int jk = 0; jk < n * H; ++jk) {
       int j = jk / H;
       int k = jk % H;
       DType tc = tanh(c[i][j][k]);
@@ -434,15 +503,17 @@ void LstmBackwardSingleLayer(DType* ws,
         htmp[j][k] = y[tnext][j][k + offset];
       }
     }
-    Tensor<cpu, 2, DType> dyh(difgo[t].dptr_, Shape2(N, H * 4));
+    Tensor<cpu, 2, DType> dyh(difgo[t].dptr_, Shape2(n, H * 4));
+    const Tensor<cpu, 2, DType> hnext_n(hnext.dptr_, Shape2(n, H));
     if (req_state != kNullOp || i > 0) {
-      linalg_gemm(dyh, wh, dhnext, alpha, beta0, false, false);
+      Tensor<cpu, 2, DType> dhnext_n(dhnext.dptr_, Shape2(n, H));
+      linalg_gemm(dyh, wh, dhnext_n, alpha, beta0, false, false);
     }
     if (req_params != kNullOp) {
       if (req_params != kAddTo) {
-        linalg_gemm(dyh, hnext, dwh, alpha, beta1, true, false);
+        linalg_gemm(dyh, hnext_n, dwh, alpha, beta1, true, false);
       } else {
-        linalg_gemm(dyh, hnext, dwh, alpha, beta2, true, false);
+        linalg_gemm(dyh, hnext_n, dwh, alpha, beta2, true, false);
 
         //  generate dwx every time step for AddTo
         Tensor<cpu, 2, DType> x_t(x.dptr_ + i * N * I, Shape2(N, I));
@@ -521,7 +592,8 @@ void LstmBackward(DType* ws,
                   int req_params,
                   int req_state,
                   int req_statecell,
-                  const float dropout) {
+                  const float dropout,
+                  const int* batch_sizes) {
   DType* dropout_random = rs + (L - 1) * D * T * N * H;
   DType* rs2 = rs + (L - 1) * D * T * N * H;
   DType* tmp_buf = ws;
@@ -555,7 +627,8 @@ void LstmBackward(DType* ws,
     LstmBackwardSingleLayer<DType>(ws2, rs_cur_ptr, tmp_buf, false, T, N, input_size, H,
                                    x, hx[idx], cx[idx], y, dy, dx, dhx[idx], dcx[idx],
                                    dhy_cur_ptr, dcy_cur_ptr, w_cur_ptr, dw_cur_ptr, db_cur_ptr,
-                                   req_data, req_params, req_state, req_statecell);
+                                   req_data, req_params, req_state, req_statecell,
+                                   batch_sizes);
     if (D == 2) {
       w_cur_ptr += w_size;
       dw_cur_ptr += w_size;
@@ -566,7 +639,8 @@ void LstmBackward(DType* ws,
       LstmBackwardSingleLayer<DType>(ws2, rs_cur_ptr, tmp_buf, true, T, N, input_size, H,
                                      x, hx[idx], cx[idx], y, dy, dx, dhx[idx], dcx[idx],
                                      dhy_cur_ptr, dcy_cur_ptr, w_cur_ptr, dw_cur_ptr, db_cur_ptr,
-                                     req_data, req_params, req_state, req_statecell);
+                                     req_data, req_params, req_state, req_statecell,
+                                     batch_sizes);
     }
     if (dropout > 0.0f && i > 0 && req_data != kNullOp) {
       dropout_random = dropout_random - T * N * D * H;
@@ -600,7 +674,8 @@ void GruForwardInferenceSingleLayer(DType* ws,
                                     DType* bx_ptr,
                                     DType* bh_ptr,
                                     DType* y_ptr,
-                                    DType* hy_ptr) {
+                                    DType* hy_ptr,
+                                    const int* batch_sizes) {
   DType* ht = y_ptr;
   DType* ht_1 = y_ptr;
   DType* back_ht_1 = y_ptr + (T-1) * N * H * D + H;
@@ -641,7 +716,6 @@ void GruForwardInferenceSingleLayer(DType* ws,
     }
   }
   Tensor<cpu, 2, DType> dgemmC1(ws, Shape2(T * N, 3 * H));
-  Tensor<cpu, 2, DType> dgemmC2(gemmC2, Shape2(N, 3 * H));
   Tensor<cpu, 2, DType> dback_gemmC1(back_gemmC1, Shape2(T * N, 3 * H));
 
   // x * wx.T : [T * N, I] * [I, 3 * H]
@@ -653,20 +727,23 @@ void GruForwardInferenceSingleLayer(DType* ws,
   }
 
   for (int t = 0; t < T; t++) {
+    //  only the first n sequences of the batch are active at step t
+    int n = batch_sizes ? batch_sizes[t] : N;
     //  perform the first direction, X * wx and H * wh for each step
     //  ht-1 * wh, ht-1:[N, H] wh:[3 * H, H]
-    Tensor<cpu, 2, DType> dht_1(ht_1, Shape2(N, D * H));
-    if (D == 1) {
+    Tensor<cpu, 2, DType> dht_1(ht_1, Shape2(n, D * H));
+    Tensor<cpu, 2, DType> dgemmC2(gemmC2, Shape2(n, 3 * H));
+    if (n > 0 && D == 1) {
       linalg_gemm(dht_1, wh, dgemmC2, alpha, beta, false, true);
-    } else {
+    } else if (n > 0) {
       Tensor<cpu, 3, DType> dht_1_tmp = Tensor<cpu, 3, DType>(reinterpret_cast<DType*>(tmp_buf),
-                                     Shape3(D, H, N));
-      dht_1_tmp = reshape(dht_1.T(), Shape3(D, H, N));
+                                     Shape3(D, H, n));
+      dht_1_tmp = reshape(dht_1.T(), Shape3(D, H, n));
       linalg_gemm(dht_1_tmp[0], wh, dgemmC2, alpha, beta, true, true);
     }
     gemmC1_t = gemmC1 + t * N * 3 * H;
     #pragma omp parallel for num_threads(omp_threads)
-    for (int i = 0; i < N; ++i) {
+    for (int i = 0; i < n; ++i) {
       for (int j = 0; j < H; ++j) {
         int rtb = i * 3 * H;
         int ztb = i * 3 * H + H;
@@ -681,19 +758,30 @@ void GruForwardInferenceSingleLayer(DType* ws,
             zt[i * H + j] * ht_1[i * D * H + j];
       }
     }
+    //  sequences which ended carry their state over the step
+    #pragma omp parallel for num_threads(omp_threads)
+    for (int i = n; i < N; ++i) {
+      for (int j = 0; j < H; ++j) {
+        ht[i * D * H + j] = ht_1[i * D * H + j];
+      }
+    }
     ht_1 = ht;
     ht = ht + D * H * N;
     //  perform the second direction
     if (D == 2) {
       gemmC1_t = back_gemmC1 + (T - 1 - t) * N * 3 * H;
-      Tensor<cpu, 2, DType> dback_ht_1(back_ht_1 - H, Shape2(N, D * H));
-      Tensor<cpu, 3, DType> dback_ht_1_tmp = Tensor<cpu, 3, DType>
-          (reinterpret_cast<DType*>(tmp_buf), Shape3(D, H, N));
-      dback_ht_1_tmp = reshape(dback_ht_1.T(), Shape3(D, H, N));
-      linalg_gemm(dback_ht_1_tmp[1], back_wh, dgemmC2, alpha, beta, true, true);
+      n = batch_sizes ? batch_sizes[T - 1 - t] : N;
+      if (n > 0) {
+        Tensor<cpu, 2, DType> dback_ht_1(back_ht_1 - H, Shape2(n, D * H));
+        Tensor<cpu, 2, DType> dback_gemmC2(gemmC2, Shape2(n, 3 * H));
+        Tensor<cpu, 3, DType> dback_ht_1_tmp = Tensor<cpu, 3, DType>
+            (reinterpret_cast<DType*>(tmp_buf), Shape3(D, H, n));
+        dback_ht_1_tmp = reshape(dback_ht_1.T(), Shape3(D, H, n));
+        linalg_gemm(dback_ht_1_tmp[1], back_wh, dback_gemmC2, alpha, beta, true, true);
+      }
 
       #pragma omp parallel for num_threads(omp_threads)
-      for (int i = 0; i < N; ++i) {
+      for (int i = 0; i < n; ++i) {
         for (int j = 0; j < H; ++j) {
           int rtb = i * 3 * H;
           int ztb = i * 3 * H + H;
@@ -708,6 +796,13 @@ void GruForwardInferenceSingleLayer(DType* ws,
               + zt[i * H + j] * back_ht_1[i * D * H + j];
         }
       }
+      //  sequences which did not start yet keep their initial state
+      #pragma omp parallel for num_threads(omp_threads)
+      for (int i = n; i < N; ++i) {
+        for (int j = 0; j < H; ++j) {
+          back_ht[i * D * H + j] = back_ht_1[i * D * H + j];
+        }
+      }
       back_ht_1 = back_ht;
       back_ht = back_ht - D * H * N;
     }
@@ -747,7 +842,8 @@ void GruForwardInference(DType* ws,
                          DType* hx_ptr,
                          DType* w_ptr,
                          DType* y_ptr,
-                         DType* hy_ptr) {
+                         DType* hy_ptr,
+                         const int* batch_sizes) {
   DType* wx = w_ptr;
   DType* wh = wx + I * H * 3;
   DType* bx = wh + H * H * 3 + (D - 1) * (H * H * 3 + I * H * 3)
@@ -774,7 +870,8 @@ void GruForwardInference(DType* ws,
     }
     Tensor<cpu, 2, DType> hx_l = hx[D * l];
     GruForwardInferenceSingleLayer<DType>(ws2, tmp_buf, state_outputs, D, T, N, I, H,
-                                        x_l, hx_l, wx_l, wh_l, bx_l, bh_l, y_l, hy_l);
+                                        x_l, hx_l, wx_l, wh_l, bx_l, bh_l, y_l, hy_l,
+                                        batch_sizes);
     hy_l = hy_l + D * N * H;
     bx_l = bx_l + 3 * H * D * 2;
     bh_l = bh_l + 3 * H * D * 2;
@@ -807,7 +904,8 @@ void GruForwardTrainingSingleLayer(DType* ws,
                                    DType* gateN,
                                    DType* Mnh,
                                    DType* y_ptr,
-                                   DType* hy_ptr) {
+                                   DType* hy_ptr,
+                                   const int* batch_sizes) {
   DType* ht = y_ptr;
   DType* ht_1 = y_ptr;
   DType* back_ht_1 = y_ptr + (T - 1)* N * H * D + H;
@@ -854,7 +952,6 @@ void GruForwardTrainingSingleLayer(DType* ws,
   }
 
   Tensor<cpu, 2, DType> dgemmC1(ws, Shape2(T * N, 3 * H));
-  Tensor<cpu, 2, DType> dgemmC2(gemmC2, Shape2(N, 3 * H));
   Tensor<cpu, 2, DType> dback_gemmC1(back_gemmC1, Shape2(T * N, 3 * H));
 
   // x * wx.T : [T * N, I] * [I, 3 * H]
@@ -866,15 +963,18 @@ void GruForwardTrainingSingleLayer(DType* ws,
   }
 
   for (int t = 0; t < T; t++) {
+    //  only the first n sequences of the batch are active at step t
+    int n = batch_sizes ? batch_sizes[t] : N;
     //  perform the first direction, X * wx and H * wh for each step
     //  ht-1 * wh, ht-1:[N, H] wh:[3 * H, H]
-    Tensor<cpu, 2, DType> dht_1(ht_1, Shape2(N, D * H));
-    if (D == 1) {
+    Tensor<cpu, 2, DType> dht_1(ht_1, Shape2(n, D * H));
+    Tensor<cpu, 2, DType> dgemmC2(gemmC2, Shape2(n, 3 * H));
+    if (n > 0 && D == 1) {
       linalg_gemm(dht_1, wh, dgemmC2, alpha, beta, false, true);
-    } else {
+    } else if (n > 0) {
       Tensor<cpu, 3, DType> dht_1_tmp = Tensor<cpu, 3, DType>(reinterpret_cast<DType*>(tmp_buf),
-                                     Shape3(D, H, N));
-      dht_1_tmp = reshape(dht_1.T(), Shape3(D, H, N));
+                                     Shape3(D, H, n));
+      dht_1_tmp = reshape(dht_1.T(), Shape3(D, H, n));
       linalg_gemm(dht_1_tmp[0], wh, dgemmC2, alpha, beta, true, true);
     }
     rt = gateR + t * N * H;
@@ -883,7 +983,7 @@ void GruForwardTrainingSingleLayer(DType* ws,
     gemmC1_t = gemmC1 + t * N * 3 * H;
     DType* Mnht = Mnh + t * N * H;
     #pragma omp parallel for num_threads(omp_threads)
-    for (int i = 0; i < N; ++i) {
+    for (int i = 0; i < n; ++i) {
       for (int j = 0; j < H; ++j) {
         int rtb = i * 3 * H;
         int ztb = i * 3 * H + H;
@@ -899,6 +999,13 @@ void GruForwardTrainingSingleLayer(DType* ws,
             zt[i * H + j] * ht_1[i * D * H + j];
       }
     }
+    //  sequences which ended carry their state over the step
+    #pragma omp parallel for num_threads(omp_threads)
+    for (int i = n; i < N; ++i) {
+      for (int j = 0; j < H; ++j) {
+        ht[i * D * H + j] = ht_1[i * D * H + j];
+      }
+    }
     ht_1 = ht;
     ht = ht + D * H * N;
     //  perform the second direction
@@ -907,15 +1014,19 @@ void GruForwardTrainingSingleLayer(DType* ws,
       zt = back_gateZ + (T - 1 - t) * N * H;
       nt = back_gateN + (T - 1 - t) * N * H;
       gemmC1_t = back_gemmC1 + (T - 1 - t) * N * 3 * H;
-      Tensor<cpu, 2, DType> dback_ht_1(back_ht_1 - H, Shape2(N, D * H));
-      Tensor<cpu, 3, DType> dback_ht_1_tmp = Tensor<cpu, 3, DType>
-          (reinterpret_cast<DType*>(tmp_buf), Shape3(D, H, N));
-      dback_ht_1_tmp = reshape(dback_ht_1.T(), Shape3(D, H, N));
-      linalg_gemm(dback_ht_1_tmp[1], back_wh, dgemmC2, alpha, beta, true, true);
+      n = batch_sizes ? batch_sizes[T - 1 - t] : N;
+      if (n > 0) {
+        Tensor<cpu, 2, DType> dback_ht_1(back_ht_1 - H, Shape2(n, D * H));
+        Tensor<cpu, 2, DType> dback_gemmC2(gemmC2, Shape2(n, 3 * H));
+        Tensor<cpu, 3, DType> dback_ht_1_tmp = Tensor<cpu, 3, DType>
+            (reinterpret_cast<DType*>(tmp_buf), Shape3(D, H, n));
+        dback_ht_1_tmp = reshape(dback_ht_1.T(), Shape3(D, H, n));
+        linalg_gemm(dback_ht_1_tmp[1], back_wh, dback_gemmC2, alpha, beta, true, true);
+      }
 
       DType* back_Mnht = back_Mnh + (T - 1 - t) * N * H;
       #pragma omp parallel for num_threads(omp_threads)
-      for (int i = 0; i < N; ++i) {
+      for (int i = 0; i < n; ++i) {
         for (int j = 0; j < H; ++j) {
           int rtb = i * 3 * H;
           int ztb = i * 3 * H + H;
@@ -931,6 +1042,13 @@ void GruForwardTrainingSingleLayer(DType* ws,
               + zt[i * H + j] * back_ht_1[i * D * H + j];
         }
       }
+      //  sequences which did not start yet keep their initial state
+      #pragma omp parallel for num_threads(omp_threads)
+      for (int i = n; i < N; ++i) {
+        for (int j = 0; j < H; ++j) {
+          back_ht[i * D * H + j] = back_ht_1[i * D * H + j];
+        }
+      }
       back_ht_1 = back_ht;
       back_ht = back_ht - D * H * N;
     }
@@ -973,7 +1091,8 @@ void GruForwardTraining(DType* ws,
                         DType* w_ptr,
                         DType* y_ptr,
                         DType* hy_ptr,
-                        const float dropout) {
+                        const float dropout,
+                        const int* batch_sizes) {
   DType* wx = w_ptr;
   DType* wh = wx + I * H * 3;
   DType* bx = wh + H * H * 3 + (D - 1) * (H * H * 3 + I * H * 3)
@@ -1018,7 +1137,8 @@ void GruForwardTraining(DType* ws,
     Tensor<cpu, 2, DType> hx_l = hx[D * l];
     GruForwardTrainingSingleLayer<DType>(ws2, tmp_buf, state_outputs, D, T, N, I, H,
                                          x_l, hx_l, wx_l, wh_l, bx_l, bh_l,
-                                         gateR_l, gateZ_l, gateN_l, Mnh_l, y_l, hy_l);
+                                         gateR_l, gateZ_l, gateN_l, Mnh_l, y_l, hy_l,
+                                         batch_sizes);
     gateR_l = gateR_l + T * D * N * H;
     gateZ_l = gateZ_l + T * D * N * H;
     gateN_l = gateN_l + T * D * N * H;
@@ -1067,7 +1187,8 @@ void GruBackwardSingleLayer(DType* ws,
                             DType* dbh,
                             int req_data,
                             int req_params,
-                            int req_state) {
+                            int req_state,
+                            const int* batch_sizes) {
   DType* dyt;
   DType* ht1;  // [N, D, H]
   DType* rt;
@@ -1149,11 +1270,13 @@ void GruBackwardSingleLayer(DType* ws,
     } else {
       ht1 = hx_;
     }
+    // only the first n sequences of the batch are active at step t
+    const int n = batch_sizes ? batch_sizes[t] : N;
     // add dy[T, N, D, H] to dhy[D, N, H]
     dyt = dy_ptr + t * N * D * H;
 
     #pragma omp parallel for num_threads(omp_threads)
-    for (int i = 0; i < N; ++i) {
+    for (int i = 0; i < n; ++i) {
       for (int j = 0; j < H; ++j) {
         dht1[i * H + j] += dyt[i * D * H + j];
       }
@@ -1165,8 +1288,15 @@ void GruBackwardSingleLayer(DType* ws,
     Mnht = Mnh +  t * N * H;
     dat = da + t * N * 3 * H;
     dart = dar + t * N * 3 * H;
+    // inactive sequences have no gate gradients and pass dht1 through unchanged
     #pragma omp parallel for num_threads(omp_threads)
-    for (int i = 0; i < N; ++i) {
+    for (int i = n * 3 * H; i < N * 3 * H; ++i) {
+      dat[i] = 0;
+      dart[i] = 0;
+    }
+    if (n == 0) continue;
+    #pragma omp parallel for num_threads(omp_threads)
+    for (int i = 0; i < n; ++i) {
       for (int j = 0; j < H; ++j) {
         int nid = i * 3 * H + 2 * H + j;
         int zid = i * 3 * H + H + j;
@@ -1185,8 +1315,8 @@ void GruBackwardSingleLayer(DType* ws,
       alpha = 1.0;
       beta = 1.0;
       // dht1 = dart * wh    [N, H] = [N, 3 * H] * [3 * H, H]
-      Tensor<cpu, 2, DType> d_dht1(dht1, Shape2(N, H));
-      Tensor<cpu, 2, DType> d_dart(dart, Shape2(N, 3 * H));
+      Tensor<cpu, 2, DType> d_dht1(dht1, Shape2(n, H));
+      Tensor<cpu, 2, DType> d_dart(dart, Shape2(n, 3 * H));
       linalg_gemm(d_dart, wh, d_dht1, alpha, beta, false, false);
 
       if (req_params == kAddTo) {
@@ -1198,11 +1328,11 @@ void GruBackwardSingleLayer(DType* ws,
         linalg_gemm(d_dat, d_xt, d_dwx, alpha, beta, true, false);
       }
       // dwh = dart.T * ht1    [3 * H, H] = [3 * H, N] * [N, H]
-      Tensor<cpu, 2, DType> d_ht1(ht1, Shape2(N, D * H));
+      Tensor<cpu, 2, DType> d_ht1(ht1, Shape2(n, D * H));
       Tensor<cpu, 2, DType> d_dwh(dwh, Shape2(3 * H, H));
       Tensor<cpu, 3, DType> d_ht1_tmp = Tensor<cpu, 3, DType>
-          (reinterpret_cast<DType*>(tmp_buf), Shape3(D, H, N));
-      d_ht1_tmp = reshape(d_ht1.T(), Shape3(D, H, N));
+          (reinterpret_cast<DType*>(tmp_buf), Shape3(D, H, n));
+      d_ht1_tmp = reshape(d_ht1.T(), Shape3(D, H, n));
       linalg_gemm(d_dart, d_ht1_tmp[0], d_dwh, alpha, beta, true, true);
     }
   }
@@ -1266,10 +1396,11 @@ void GruBackwardSingleLayer(DType* ws,
         back_ht1 = y_ptr + (t + 1) * N * D * H;
       }
 
+      const int n = batch_sizes ? batch_sizes[t] : N;
       //  add dy[T, N, D, H] to dhy[D, N, H]
       dyt = dy_ptr + t * N * D * H;
       #pragma omp parallel for num_threads(omp_threads)
-      for (int i = 0; i < N; ++i) {
+      for (int i = 0; i < n; ++i) {
         for (int j = 0; j < H; ++j) {
           back_dht1[i * H + j] += dyt[i * D * H + H + j];
         }
@@ -1281,9 +1412,15 @@ void GruBackwardSingleLayer(DType* ws,
       back_Mnht = Mnh + (T + t) * N * H;
       dat = da + t * N * 3 * H;
       dart = dar + t * N * 3 * H;
+      #pragma omp parallel for num_threads(omp_threads)
+      for (int i = n * 3 * H; i < N * 3 * H; ++i) {
+        dat[i] = 0;
+        dart[i] = 0;
+      }
+      if (n == 0) continue;
 
       #pragma omp parallel for num_threads(omp_threads)
-      for (int i = 0; i < N; ++i) {
+      for (int i = 0; i < n; ++i) {
         for (int j = 0; j < H; ++j) {
           int nid = i * 3 * H + 2 * H + j;
           int zid = i * 3 * H + H + j;
@@ -1303,16 +1440,16 @@ void GruBackwardSingleLayer(DType* ws,
         alpha = 1.0;
         beta = 1.0;
         // dht1 = da * wh    [N, H] = [N, 3 * H] * [3 * H, H]
-        Tensor<cpu, 2, DType> d_dart(dart, Shape2(N, 3 * H));
-        Tensor<cpu, 2, DType> d_back_dht1(back_dht1, Shape2(N, H));
+        Tensor<cpu, 2, DType> d_dart(dart, Shape2(n, 3 * H));
+        Tensor<cpu, 2, DType> d_back_dht1(back_dht1, Shape2(n, H));
         linalg_gemm(d_dart, back_wh, d_back_dht1, alpha, beta, false, false);
 
         // dwh = da.T * ht1     [3 * H, H] = [3 * H, N] * [N, H]
         Tensor<cpu, 2, DType> d_back_dwh(back_dwh, Shape2(3 * H, H));
-        Tensor<cpu, 2, DType> d_back_ht1(back_ht1 + H, Shape2(N, D * H));
+        Tensor<cpu, 2, DType> d_back_ht1(back_ht1 + H, Shape2(n, D * H));
         Tensor<cpu, 3, DType> d_back_ht1_tmp = Tensor<cpu, 3, DType>
-            (reinterpret_cast<DType*>(tmp_buf), Shape3(D, H, N));
-        d_back_ht1_tmp = reshape(d_back_ht1.T(), Shape3(D, H, N));
+            (reinterpret_cast<DType*>(tmp_buf), Shape3(D, H, n));
+        d_back_ht1_tmp = reshape(d_back_ht1.T(), Shape3(D, H, n));
         if (req_params == kAddTo) {
           beta = 2.0;
           // dwx = da.T * x    [3 * H, I] = [3 * H, N] * [N, I] for AddTo
@@ -1403,7 +1540,8 @@ void GruBackward(DType* ws,
                  int req_data,
                  int req_params,
                  int req_state,
-                 const float dropout) {
+                 const float dropout,
+                 const int* batch_sizes) {
   DType* wx = w_ptr;
   DType* dwx = dw_ptr;
   DType* dwh = dwx + I * H * 3;
@@ -1457,7 +1595,8 @@ void GruBackward(DType* ws,
     Tensor<cpu, 2, DType> x_l(y_tmp, Shape2(T * N, I));
     GruBackwardSingleLayer<DType>(ws2, tmp_buf, D, T, N, I, H, x_l, hx_l, wx_l, wh_l, y_l, dy_l,
                                   dhy_l, gateR_l, gateZ_l, gateN_l, Mnh_l, dx_l, dhx_l,
-                                  dwx_l, dwh_l, dbx_l, dbh_l, req_data, req_params, req_state);
+                                  dwx_l, dwh_l, dbx_l, dbh_l, req_data, req_params, req_state,
+                                  batch_sizes);
     if (dropout > 0.0f && l > 0 && req_data != kNullOp) {
       dropout_random = dropout_random - T * N * D * H;
       #pragma omp parallel for num_threads(omp_threads)
@@ -0,0 +1,323 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * Copyright (c) 2019 by Contributors
+ * \file elemwise_fused_op.cc
+ * \brief CPU kernel for a fused chain of elementwise/broadcast operators.
+ *
+ * The subgraph is compiled into a small register program when the node is
+ * created. The kernel evaluates the whole program block by block over the
+ * output, so intermediate results stay in per-thread buffers that fit in
+ * cache instead of being written to and read back from full-size tensors.
+ */
+#include <mxnet/operator_util.h>
+#include <cmath>
+#include <string>
+#include <type_traits>
+#include <unordered_map>
+#include <vector>
+#include "./elemwise_fused_op.h"
+#include "../common.h"
+#include "../../operator_common.h"
+#include "../../../executor/graph_executor.h"
+
+namespace mxnet {
+namespace op {
+
+int GetFusedElemwiseOpCode(const nnvm::Node& node) {
+  static const std::unordered_map<std::string, int> op_codes = {
+    {"elemwise_add", kFusedAdd}, {"broadcast_add", kFusedAdd},
+    {"elemwise_sub", kFusedSub}, {"broadcast_sub", kFusedSub},
+    {"elemwise_mul", kFusedMul}, {"broadcast_mul", kFusedMul},
+    {"elemwise_div", kFusedDiv}, {"broadcast_div", kFusedDiv},
+    {"_maximum", kFusedMax}, {"broadcast_maximum", kFusedMax},
+    {"_minimum", kFusedMin}, {"broadcast_minimum", kFusedMin},
+    {"_plus_scalar", kFusedAddScalar}, {"_minus_scalar", kFusedSubScalar},
+    {"_rminus_scalar", kFusedRSubScalar}, {"_mul_scalar", kFusedMulScalar},
+    {"_div_scalar", kFusedDivScalar}, {"_rdiv_scalar", kFusedRDivScalar},
+    {"_maximum_scalar", kFusedMaxScalar}, {"_minimum_scalar", kFusedMinScalar},
+    {"_power_scalar", kFusedPowScalar},
+    {"relu", kFusedRelu}, {"sigmoid", kFusedSigmoid}, {"tanh", kFusedTanh},
+    {"exp", kFusedExp}, {"log", kFusedLog}, {"sqrt", kFusedSqrt},
+    {"square", kFusedSquare}, {"abs", kFusedAbs}, {"negative", kFusedNegative},
+    {"_copy", kFusedIdentity},
+  };
+  static const std::unordered_map<std::string, int> act_codes = {
+    {"relu", kFusedRelu}, {"sigmoid", kFusedSigmoid},
+    {"tanh", kFusedTanh}, {"softrelu", kFusedSoftReLU},
+  };
+  if (node.is_variable()) return -1;
+  const std::string& name = node.op()->name;
+  if (name == "Activation") {
+    auto act = node.attrs.dict.find("act_type");
+    if (act == node.attrs.dict.end()) return -1;
+    auto it = act_codes.find(act->second);
+    return it == act_codes.end() ? -1 : it->second;
+  }
+  auto it = op_codes.find(name);
+  return it == op_codes.end() ? -1 : it->second;
+}
+
+static void FusedElemwiseParamParser(nnvm::NodeAttrs* attrs) {
+  CHECK_EQ(attrs->subgraphs.size(), 1U) << "_sg_elemwise_fused expects one subgraph";
+  nnvm::Graph g;
+  g.outputs = attrs->subgraphs[0]->outputs;
+  CHECK_EQ(g.outputs.size(), 1U) << "_sg_elemwise_fused only supports a single output";
+  const auto& idx = g.indexed_graph();
+  FusedElemwiseParam param;
+  param.num_inputs = static_cast<int>(idx.input_nodes().size());
+  std::vector<int> node_reg(idx.num_nodes(), -1);
+  for (size_t i = 0; i < idx.input_nodes().size(); ++i) {
+    node_reg[idx.input_nodes()[i]] = static_cast<int>(i);
+  }
+  for (uint32_t nid = 0; nid < idx.num_nodes(); ++nid) {
+    const auto& inode = idx[nid];
+    if (inode.source->is_variable()) continue;
+    FusedElemwiseInstr instr;
+    instr.opcode = GetFusedElemwiseOpCode(*inode.source);
+    CHECK_GE(instr.opcode, 0) << "Operator " << inode.source->op()->name
+                              << " cannot be fused by _sg_elemwise_fused";
+    instr.lhs = node_reg[inode.inputs[0].node_id];
+    instr.rhs = inode.inputs.size() > 1 ? node_reg[inode.inputs[1].node_id] : -1;
+    auto scalar = inode.source->attrs.dict.find("scalar");
+    instr.scalar = scalar == inode.source->attrs.dict.end() ? 0.0 : std::stod(scalar->second);
+    node_reg[nid] = param.num_inputs + static_cast<int>(param.instrs.size());
+    param.instrs.push_back(instr);
+  }
+  param.output = node_reg[idx.outputs()[0].node_id];
+  attrs->parsed = std::move(param);
+}
+
+template<typename AType>
+inline void FusedElemwiseApply(const FusedElemwiseInstr& instr, const AType* lhs,
+                               const AType* rhs, AType* out, const index_t len) {
+  const AType s = static_cast<AType>(instr.scalar);
+  switch (instr.opcode) {
+    case kFusedAdd: for (index_t j = 0; j < len; ++j) out[j] = lhs[j] + rhs[j]; break;
+    case kFusedSub: for (index_t j = 0; j < len; ++j) out[j] = lhs[j] - rhs[j]; break;
+    case kFusedMul: for (index_t j = 0; j < len; ++j) out[j] = lhs[j] * rhs[j]; break;
+    case kFusedDiv: for (index_t j = 0; j < len; ++j) out[j] = lhs[j] / rhs[j]; break;
+    case kFusedMax:
+      for (index_t j = 0; j < len; ++j) out[j] = lhs[j] > rhs[j] ? lhs[j] : rhs[j];
+      break;
+    case kFusedMin:
+      for (index_t j = 0; j < len; ++j) out[j] = lhs[j] < rhs[j] ? lhs[j] : rhs[j];
+      break;
+    case kFusedAddScalar: for (index_t j = 0; j < len; ++j) out[j] = lhs[j] + s; break;
+    case kFusedSubScalar: for (index_t j = 0; j < len; ++j) out[j] = lhs[j] - s; break;
+    case kFusedRSubScalar: for (index_t j = 0; j < len; ++j) out[j] = s - lhs[j]; break;
+    case kFusedMulScalar: for (index_t j = 0; j < len; ++j) out[j] = lhs[j] * s; break;
+    case kFusedDivScalar: for (index_t j = 0; j < len; ++j) out[j] = lhs[j] / s; break;
+    case kFusedRDivScalar: for (index_t j = 0; j < len; ++j) out[j] = s / lhs[j]; break;
+    case kFusedMaxScalar:
+      for (index_t j = 0; j < len; ++j) out[j] = lhs[j] > s ? lhs[j] : s;
+      break;
+    case kFusedMinScalar:
+      for (index_t j = 0; j < len; ++j) out[j] = lhs[j] < s ? lhs[j] : s;
+      break;
+    case kFusedPowScalar: for (index_t j = 0; j < len; ++j) out[j] = std::pow(lhs[j], s); break;
+    case kFusedRelu:
+      for (index_t j = 0; j < len; ++j) out[j] = lhs[j] > AType(0) ? lhs[j] : AType(0);
+      break;
+    case kFusedSigmoid:
+      for (index_t j = 0; j < len; ++j) out[j] = AType(1) / (AType(1) + std::exp(-lhs[j]));
+      break;
+    case kFusedTanh: for (index_t j = 0; j < len; ++j) out[j] = std::tanh(lhs[j]); break;
+    case kFusedSoftReLU:
+      for (index_t j = 0; j < len; ++j) out[j] = std::log1p(std::exp(lhs[j]));
+      break;
+    case kFusedExp: for (index_t j = 0; j < len; ++j) out[j] = std::exp(lhs[j]); break;
+    case kFusedLog: for (index_t j = 0; j < len; ++j) out[j] = std::log(lhs[j]); break;
+    case kFusedSqrt: for (index_t j = 0; j < len; ++j) out[j] = std::sqrt(lhs[j]); break;
+    case kFusedSquare: for (index_t j = 0; j < len; ++j) out[j] = lhs[j] * lhs[j]; break;
+    case kFusedAbs: for (index_t j = 0; j < len; ++j) out[j] = std::abs(lhs[j]); break;
+    case kFusedNegative: for (index_t j = 0; j < len; ++j) out[j] = -lhs[j]; break;
+    case kFusedIdentity: for (index_t j = 0; j < len; ++j) out[j] = lhs[j]; break;
+    default: LOG(FATAL) << "Unknown fused elementwise opcode " << instr.opcode;
+  }
+}
+
+template<typename DType>
+void FusedElemwiseCompute(const FusedElemwiseParam& param,
+                          const std::vector<TBlob>& inputs,
+                          const OpReqType req,
+                          const TBlob& out) {
+  // half precision is evaluated in float, like the mshadow_op kernels
+  typedef typename std::conditional<std::is_same<DType, double>::value,
+                                    double, float>::type AType;
+  const index_t kBlock = 1024;
+  const index_t size = out.Size();
+  const int ndim = out.ndim();
+  const int num_inputs = param.num_inputs;
+  const int num_regs = num_inputs + static_cast<int>(param.instrs.size());
+  // strides of each input along the output dimensions, 0 for broadcast axes
+  std::vector<bool> contiguous(num_inputs);
+  std::vector<std::vector<index_t> > strides(num_inputs, std::vector<index_t>(ndim, 0));
+  for (int i = 0; i < num_inputs; ++i) {
+    const mxnet::TShape& ishape = inputs[i].shape_;
+    contiguous[i] = ishape == out.shape_;
+    const int offset = ndim - ishape.ndim();
+    index_t stride = 1;
+    for (int d = ndim - 1; d >= offset && d >= 0; --d) {
+      if (ishape[d - offset] != 1) strides[i][d] = stride;
+      stride *= ishape[d - offset];
+    }
+  }
+  const index_t num_blocks = (size + kBlock - 1) / kBlock;
+  const int omp_threads = engine::OpenMP::Get()->GetRecommendedOMPThreadCount();
+  #pragma omp parallel num_threads(omp_threads)
+  {
+    std::vector<AType> regs(static_cast<size_t>(num_regs) * kBlock);
+    #pragma omp for
+    for (index_t b = 0; b < num_blocks; ++b) {
+      const index_t begin = b * kBlock;
+      const index_t len = std::min(kBlock, size - begin);
+      for (int i = 0; i < num_inputs; ++i) {
+        AType* reg = regs.data() + i * kBlock;
+        const DType* src = inputs[i].dptr<DType>();
+        if (contiguous[i]) {
+          for (index_t j = 0; j < len; ++j) reg[j] = static_cast<AType>(src[begin + j]);
+        } else {
+          for (index_t j = 0; j < len; ++j) {
+            index_t pos = begin + j, offset = 0;
+            for (int d = ndim - 1; d >= 0; --d) {
+              offset += (pos % out.shape_[d]) * strides[i][d];
+              pos /= out.shape_[d];
+            }
+            reg[j] = static_cast<AType>(src[offset]);
+          }
+        }
+      }
+      for (size_t k = 0; k < param.instrs.size(); ++k) {
+        const FusedElemwiseInstr& instr = param.instrs[k];
+        FusedElemwiseApply<AType>(instr, regs.data() + instr.lhs * kBlock,
+                                  instr.rhs >= 0 ? regs.data() + instr.rhs * kBlock : nullptr,
+                                  regs.data() + (num_inputs + k) * kBlock, len);
+      }
+      const AType* res = regs.data() + param.output * kBlock;
+      DType* dst = out.dptr<DType>() + begin;
+      if (req == kAddTo) {
+        for (index_t j = 0; j < len; ++j) {
+          dst[j] = static_cast<DType>(static_cast<AType>(dst[j]) + res[j]);
+        }
+      } else {
+        for (index_t j = 0; j < len; ++j) dst[j] = static_cast<DType>(res[j]);
+      }
+    }
+  }
+}
+
+static bool FusedElemwiseType(const nnvm::NodeAttrs& attrs,
+                              std::vector<int>* in_types,
+                              std::vector<int>* out_types) {
+  if (!DefaultSubgraphOpType(attrs, in_types, out_types)) return false;
+  const int dtype = (*out_types)[0];
+  CHECK(dtype == -1 || dtype == mshadow::kFloat32 || dtype == mshadow::kFloat64 ||
+        dtype == mshadow::kFloat16)
+    << "Fused elementwise operator " << attrs.name << " only supports floating point "
+    << "types, got type flag " << dtype << ". Run the graph without elementwise fusion.";
+  return true;
+}
+
+static void FusedElemwiseForward(const nnvm::NodeAttrs& attrs,
+                                 const OpContext& ctx,
+                                 const std::vector<TBlob>& inputs,
+                                 const std::vector<OpReqType>& req,
+                                 const std::vector<TBlob>& outputs) {
+  const FusedElemwiseParam& param = nnvm::get<FusedElemwiseParam>(attrs.parsed);
+  CHECK_EQ(inputs.size(), static_cast<size_t>(param.num_inputs));
+  CHECK_EQ(outputs.size(), 1U);
+  if (req[0] == kNullOp) return;
+  MSHADOW_REAL_TYPE_SWITCH(outputs[0].type_flag_, DType, {
+    FusedElemwiseCompute<DType>(param, inputs, req[0], outputs[0]);
+  });
+}
+
+/*!
+ * \brief Gradient of the fused node. The gradient graph of the subgraph is
+ *  built with the regular gradient pass and copied into the main graph with
+ *  the subgraph inputs replaced by the inputs of the fused node, so the
+ *  forward values needed by backward are recomputed from the inputs.
+ */
+static std::vector<nnvm::NodeEntry> FusedElemwiseGradient(
+    const nnvm::NodePtr& n, const std::vector<nnvm::NodeEntry>& ograds) {
+  using nnvm::NodeEntry;
+  using nnvm::NodePtr;
+  static const std::vector<const nnvm::Op*> zero_ops{Op::Get("zeros_like"), Op::Get("_zeros")};
+  const nnvm::Symbol& sym = *n->attrs.subgraphs[0];
+  const std::vector<NodePtr> inputs = sym.ListInputs(nnvm::Symbol::kAll);
+  CHECK_EQ(inputs.size(), n->inputs.size());
+  std::vector<NodeEntry> xs;
+  for (const auto& var : inputs) {
+    xs.emplace_back(NodeEntry{var, 0, 0});
+  }
+  NodePtr head_grad = nnvm::Node::Create();
+  head_grad->attrs.name = n->attrs.name + "_head_grad";
+  nnvm::Graph g;
+  g.outputs = sym.outputs;
+  nnvm::Graph g_grad = nnvm::pass::MXGradient(
+      g, sym.outputs, xs, {NodeEntry{head_grad, 0, 0}},
+      exec::AggregateGradient, nullptr, nullptr, zero_ops, "_copy");
+
+  std::unordered_map<const nnvm::Node*, NodeEntry> var_map;
+  for (size_t i = 0; i < inputs.size(); ++i) {
+    var_map[inputs[i].get()] = n->inputs[i];
+  }
+  var_map[head_grad.get()] = ograds[0];
+  std::unordered_map<const nnvm::Node*, NodePtr> copied;
+  auto map_entry = [&](const NodeEntry& e) {
+    if (e.node->is_variable()) return var_map.at(e.node.get());
+    return NodeEntry{copied.at(e.node.get()), e.index, e.version};
+  };
+  DFSVisit(g_grad.outputs, [&](const NodePtr& node) {
+    if (node->is_variable()) return;
+    NodePtr copy = nnvm::Node::Create();
+    copy->attrs = node->attrs;
+    copy->attrs.name = n->attrs.name + "_" + node->attrs.name;
+    for (const auto& e : node->inputs) {
+      copy->inputs.push_back(map_entry(e));
+    }
+    for (const auto& dep : node->control_deps) {
+      if (!dep->is_variable()) copy->control_deps.push_back(copied.at(dep.get()));
+    }
+    copied[node.get()] = copy;
+  });
+  std::vector<NodeEntry> ret;
+  for (const auto& e : g_grad.outputs) {
+    ret.push_back(map_entry(e));
+  }
+  return ret;
+}
+
+NNVM_REGISTER_OP(_sg_elemwise_fused)
+.describe(R"code(Fused chain of elementwise and broadcast operators evaluated
+by a single blocked kernel. Created by the ELEMWISE_FUSION subgraph backend.)code" ADD_FILELINE)
+.set_num_inputs(DefaultSubgraphOpNumInputs)
+.set_num_outputs(1)
+.set_attr_parser(FusedElemwiseParamParser)
+.set_attr<nnvm::FListInputNames>("FListInputNames", DefaultSubgraphOpListInputs)
+.set_attr<nnvm::FListOutputNames>("FListOutputNames", DefaultSubgraphOpListOutputs)
+.set_attr<mxnet::FInferShape>("FInferShape", DefaultSubgraphOpShape)
+.set_attr<nnvm::FInferType>("FInferType", FusedElemwiseType)
+.set_attr<nnvm::FGradient>("FGradient", FusedElemwiseGradient)
+.set_attr<FCompute>("FCompute<cpu>", FusedElemwiseForward);
+
+}  // namespace op
+}  // namespace mxnet
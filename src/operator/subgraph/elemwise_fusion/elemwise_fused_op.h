@@ -0,0 +1,75 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * Copyright (c) 2019 by Contributors
+ * \file elemwise_fused_op.h
+ * \brief Fused operator executing a chain of elementwise/broadcast operators
+ *        in a single blocked CPU kernel.
+ */
+#ifndef MXNET_OPERATOR_SUBGRAPH_ELEMWISE_FUSION_ELEMWISE_FUSED_OP_H_
+#define MXNET_OPERATOR_SUBGRAPH_ELEMWISE_FUSION_ELEMWISE_FUSED_OP_H_
+
+#include <nnvm/node.h>
+#include <string>
+#include <vector>
+
+namespace mxnet {
+namespace op {
+
+/*! \brief operations supported inside a fused elementwise kernel */
+enum FusedElemwiseOpCode {
+  kFusedAdd, kFusedSub, kFusedMul, kFusedDiv, kFusedMax, kFusedMin,
+  kFusedAddScalar, kFusedSubScalar, kFusedRSubScalar, kFusedMulScalar,
+  kFusedDivScalar, kFusedRDivScalar, kFusedMaxScalar, kFusedMinScalar,
+  kFusedPowScalar,
+  kFusedRelu, kFusedSigmoid, kFusedTanh, kFusedSoftReLU, kFusedExp, kFusedLog,
+  kFusedSqrt, kFusedSquare, kFusedAbs, kFusedNegative, kFusedIdentity
+};
+
+/*!
+ * \brief One instruction of the fused program. Operands are register ids:
+ *  registers [0, num_inputs) hold the fused op inputs, register num_inputs + i
+ *  holds the result of instruction i.
+ */
+struct FusedElemwiseInstr {
+  int opcode;
+  int lhs;
+  int rhs;
+  double scalar;
+};
+
+/*! \brief the program executed by _sg_elemwise_fused, parsed from its subgraph */
+struct FusedElemwiseParam {
+  int num_inputs;
+  std::vector<FusedElemwiseInstr> instrs;
+  /*! \brief register holding the output */
+  int output;
+};
+
+/*!
+ * \brief Get the opcode of a node if it can be fused.
+ * \return the opcode, or -1 if the node cannot be part of a fused kernel.
+ */
+int GetFusedElemwiseOpCode(const nnvm::Node& node);
+
+}  // namespace op
+}  // namespace mxnet
+
+#endif  // MXNET_OPERATOR_SUBGRAPH_ELEMWISE_FUSION_ELEMWISE_FUSED_OP_H_
@@ -0,0 +1,170 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * Copyright (c) 2019 by Contributors
+ * \file elemwise_fusion_property.cc
+ * \brief Subgraph property grouping chains of elementwise/broadcast operators
+ *        into _sg_elemwise_fused nodes.
+ */
+#include <string>
+#include <unordered_map>
+#include <unordered_set>
+#include <vector>
+#include "./elemwise_fused_op.h"
+#include "../common.h"
+#include "../subgraph_property.h"
+#include "../../../executor/exec_pass.h"
+
+namespace mxnet {
+namespace op {
+
+/*
+ * Selects connected elementwise operators. The fused kernel has exactly one
+ * output, so when more than one node of the selected set is consumed outside
+ * of it, e.g. after a fan-out, the set is reduced to its largest part that
+ * computes a single node, and the nodes left out can be fused from later seeds. The kernel
+ * only computes floating point types on CPU, so nodes with an output of
+ * another known type or placed on another device are not selected.
+ */
+class ElemwiseFusionSelector : public SubgraphSelectorV2 {
+ public:
+  explicit ElemwiseFusionSelector(const nnvm::Graph& g) : graph_(g) {
+    const auto& idx = graph_.indexed_graph();
+    for (const auto& e : idx.outputs()) {
+      graph_outputs_.insert(idx[e.node_id].source);
+    }
+  }
+
+  bool Select(const BiDirectedNode &seed_node) override {
+    return CanFuse(*seed_node.node);
+  }
+
+  bool SelectInput(const BiDirectedNode &cur_node, const BiDirectedNode &input_node) override {
+    return CanFuse(*input_node.node);
+  }
+
+  bool SelectOutput(const BiDirectedNode &cur_node, const BiDirectedNode &output_node) override {
+    return CanFuse(*output_node.node);
+  }
+
+  std::vector<BiDirectedNode*> Filter(const std::vector<BiDirectedNode*>& candidates) override {
+    std::unordered_map<const nnvm::Node*, const BiDirectedNode*> wrapped;
+    for (const BiDirectedNode* node : candidates) wrapped[node->node] = node;
+    auto consumed_outside = [&](const BiDirectedNode* node,
+                                const std::unordered_set<const BiDirectedNode*>& part) {
+      if (graph_outputs_.count(node->node)) return true;
+      for (const auto& kv : node->outputs) {
+        auto it = wrapped.find(kv.first);
+        if (it == wrapped.end() || !part.count(it->second)) return true;
+      }
+      return false;
+    };
+    std::vector<BiDirectedNode*> best;
+    for (const BiDirectedNode* exit : candidates) {
+      // grow the part computing this node with the nodes all consumed inside of it,
+      // candidates are sorted in topological order. For a set with a single exit,
+      // the part of the exit is the whole set.
+      std::unordered_set<const BiDirectedNode*> part{exit};
+      for (auto it = candidates.rbegin(); it != candidates.rend(); ++it) {
+        if (!part.count(*it) && !consumed_outside(*it, part)) part.insert(*it);
+      }
+      if (part.size() > best.size()) {
+        best.clear();
+        for (BiDirectedNode* node : candidates) {
+          if (part.count(node)) best.push_back(node);
+        }
+      }
+    }
+    // fusing a single operator does not save any memory traffic
+    if (best.size() < 2) return std::vector<BiDirectedNode*>();
+    return best;
+  }
+
+ private:
+  bool CanFuse(const nnvm::Node& node) const {
+    if (GetFusedElemwiseOpCode(node) < 0) return false;
+    const auto& idx = graph_.indexed_graph();
+    const uint32_t nid = idx.node_id(&node);
+    if (graph_.attrs.count("context")) {
+      const auto& contexts = graph_.GetAttr<exec::ContextVector>("context");
+      if (contexts[nid].dev_mask() != Context::kCPU) return false;
+    }
+    if (graph_.attrs.count("dtype")) {
+      const auto& dtypes = graph_.GetAttr<nnvm::DTypeVector>("dtype");
+      for (uint32_t i = 0; i < node.num_outputs(); ++i) {
+        const int dtype = dtypes[idx.entry_id(nid, i)];
+        if (dtype != -1 && dtype != mshadow::kFloat32 && dtype != mshadow::kFloat64 &&
+            dtype != mshadow::kFloat16) {
+          return false;
+        }
+      }
+    }
+    return true;
+  }
+
+  /*! \brief the graph being partitioned, with the types and contexts when known */
+  const nnvm::Graph graph_;
+  std::unordered_set<const nnvm::Node*> graph_outputs_;
+};
+
+class ElemwiseFusionProperty : public SubgraphProperty {
+ public:
+  static SubgraphPropertyPtr Create() { return std::make_shared<ElemwiseFusionProperty>(); }
+
+  nnvm::NodePtr CreateSubgraphNode(const nnvm::Symbol &sym,
+                                   const int subgraph_id = 0) const override {
+    // the selector guarantees a single exit node, remove duplicated outputs
+    nnvm::Symbol new_sym;
+    new_sym.outputs.push_back(sym.outputs[0]);
+    nnvm::NodePtr n = nnvm::Node::Create();
+    n->attrs.op = Op::Get("_sg_elemwise_fused");
+    n->attrs.name = "_sg_elemwise_fused" + std::to_string(subgraph_id);
+    n->attrs.subgraphs.push_back(std::make_shared<nnvm::Symbol>(new_sym));
+    n->op()->attr_parser(&(n->attrs));
+    return n;
+  }
+
+  nnvm::NodePtr CreateSubgraphNode(const nnvm::Symbol &sym,
+                                   const SubgraphSelectorV2Ptr &subgraph_selector,
+                                   const int subgraph_id = 0) const override {
+    return CreateSubgraphNode(sym, subgraph_id);
+  }
+
+  SubgraphSelectorV2Ptr CreateSubgraphSelectorV2() const override {
+    // a selector is created for every seed node, index the graph once so that
+    // the selectors share the indexed graph
+    const nnvm::Graph& g = this->GetAttr<nnvm::Graph>("graph");
+    g.indexed_graph();
+    return std::make_shared<ElemwiseFusionSelector>(g);
+  }
+
+  void ConnectSubgraphOutputs(
+      const nnvm::NodePtr n,
+      std::vector<nnvm::NodeEntry *> *output_entries) const override {
+    for (size_t i = 0; i < output_entries->size(); ++i) {
+      *output_entries->at(i) = nnvm::NodeEntry{n, 0, 0};
+    }
+  }
+};
+
+MXNET_REGISTER_SUBGRAPH_PROPERTY(ELEMWISE_FUSION, ElemwiseFusionProperty);
+
+}  // namespace op
+}  // namespace mxnet
@@ -189,6 +189,44 @@ bool is_type_udf(const int &x) {
   return x == -1;
 }
 
+bool HasDynamicShape(const nnvm::Symbol &subgraph) {
+  static auto& infershape = nnvm::Op::GetAttr<mxnet::FInferShape>("FInferShape");
+  bool dynamic = false;
+  nnvm::DFSVisit(subgraph.outputs, [&](const nnvm::NodePtr& node) {
+    if (dynamic || node->is_variable()) return;
+    if (!infershape.count(node->op())) {
+      dynamic = true;
+      return;
+    }
+    for (const auto& nested : node->attrs.subgraphs) {
+      if (HasDynamicShape(*nested)) {
+        dynamic = true;
+        return;
+      }
+    }
+  });
+  return dynamic;
+}
+
+CachedOpPtr LoopState::MakeSharedOp(const Symbol &sym) {
+  // We turn on static_alloc for two reasons.
+  // It avoids the overhead of unnecessary memory allocation.
+  // only static_alloc supports nested call of CachedOp.
+  std::vector<std::pair<std::string, std::string> > kwargs = {
+    {"inline_limit", "0"},
+    {"static_alloc", "1"}
+  };
+  if (HasDynamicShape(sym)) {
+    kwargs.emplace_back("is_dynamic", "1");
+  } else {
+    // The shapes are the same at every iteration, so the executors of the operators
+    // are set up once and reused by all of them. All the inputs change between
+    // iterations, and CachedOp passes all of them as data by default.
+    kwargs.emplace_back("static_shape", "1");
+  }
+  return std::make_shared<CachedOp>(sym, kwargs);
+}
+
 LoopState::LoopState(const Symbol &g) {
   this->subgraph_sym = g;
   this->subgraph.outputs = g.outputs;
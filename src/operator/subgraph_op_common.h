@@ -59,6 +59,12 @@ bool InferSubgraphStorage(const nnvm::Symbol &subgraph,
 
 bool as_bool_scalar(const NDArray &a);
 
+/*
+ * Whether the outputs of a subgraph may have shapes that are only known after
+ * running it, i.e. it contains an operator without shape inference.
+ */
+bool HasDynamicShape(const nnvm::Symbol &subgraph);
+
 bool is_shape_udf(const mxnet::TShape &x);
 
 bool is_stype_udf(const int &x);
@@ -155,17 +161,7 @@ class LoopState {
     all_inputs.clear();
     all_states.clear();
   }
-  static CachedOpPtr MakeSharedOp(const Symbol &sym) {
-    // We turn on static_alloc for two reasons.
-    // It avoids the overhead of unnecessary memory allocation.
-    // only static_alloc supports nested call of CachedOp.
-    std::vector<std::pair<std::string, std::string> > kwargs = {
-      {"inline_limit", "0"},
-      {"static_alloc", "1"},
-      {"is_dynamic", "1"}
-    };
-    return std::make_shared<CachedOp>(sym, kwargs);
-  }
+  static CachedOpPtr MakeSharedOp(const Symbol &sym);
 };
 
 }  // namespace op
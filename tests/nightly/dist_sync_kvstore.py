@@ -26,6 +26,7 @@ import numpy as np
 import numpy.random as rnd
 from mxnet.test_utils import assert_almost_equal, assert_exception
 from test_kvstore import compute_expected_2bit_quantization
+from test_kvstore import compute_expected_1bit_quantization, compute_expected_topk_quantization
 
 def check_diff(A, x, rank=None):
     """ assert A == x
@@ -99,6 +100,12 @@ def init_kv_compressed(kv):
         kv.init(k, mx.nd.ones(s))
     return kv, threshold
 
+def init_kv_compressed_type(kv, compression_params):
+    kv.set_gradient_compression(compression_params)
+    for k, s in compr_random_keys_shapes:
+        kv.init(k, mx.nd.zeros(s))
+    return kv
+
 def test_sync_push_pull(nrepeat):
     def check_default_keys(dtype, nrepeat):
         # checks pull after push in loop, because behavior during
@@ -328,6 +335,35 @@ def test_sync_2bit_compression(threshold, nrepeat):
     check_compr_random(threshold, nrepeat)
     print('worker ' + str(my_rank) + ' is done with compression tests')
 
+def test_sync_compression_type(compression_params, nrepeat):
+    def compute_expected(grad, curr_residual):
+        if compression_params['type'] == '1bit':
+            return compute_expected_1bit_quantization(grad, curr_residual,
+                                                      compression_params['threshold'])
+        # ratio 0.25 keeps 8 values out of every block of 32
+        return compute_expected_topk_quantization(grad, curr_residual, 32)
+
+    print('worker ' + str(my_rank) + ' started with ' + compression_params['type'] +
+          ' compression tests')
+    # all workers push the same gradients
+    rnd.seed(123)
+    for k, s in compr_random_keys_shapes:
+        curr_residual = np.zeros(s, dtype=np.float32)
+        for l in range(nrepeat):
+            orig_val = mx.nd.zeros(s)
+            kv.pull(k, orig_val)
+            grad = (rnd.rand(s[0], s[1]) - 0.5).astype(np.float32)
+            kv.push(k, mx.nd.array(grad))
+            val = mx.nd.zeros(s)
+            kv.pull(k, val)
+            curr_residual, decompr = compute_expected(grad, curr_residual)
+            assert_almost_equal((val - orig_val).asnumpy(), decompr * nworker * rate,
+                                rtol=1e-4, atol=1e-4)
+    stats = kv.gradient_compression_stats()
+    assert stats['compression_ratio'] > 1
+    print('worker ' + str(my_rank) + ' is done with ' + compression_params['type'] +
+          ' compression tests')
+
 def test_sync_init(gpu_tests=False):
     def get_dtype(idx, cur_keys):
         if idx < len(cur_keys)/2:
@@ -458,5 +494,15 @@ if __name__ == "__main__":
         kv, threshold = init_kv_compressed(kv)
         kv = set_optimizer(use_multiprecision=opt.multiprecision)
         test_sync_2bit_compression(threshold, opt.nrepeat)
+    elif opt.type == 'compressed_1bit_cpu':
+        compression_params = {'type': '1bit', 'threshold': 0.5}
+        kv = init_kv_compressed_type(kv, compression_params)
+        kv = set_optimizer(use_multiprecision=opt.multiprecision)
+        test_sync_compression_type(compression_params, opt.nrepeat)
+    elif opt.type == 'compressed_topk_cpu':
+        compression_params = {'type': 'topk', 'ratio': 0.25}
+        kv = init_kv_compressed_type(kv, compression_params)
+        kv = set_optimizer(use_multiprecision=opt.multiprecision)
+        test_sync_compression_type(compression_params, opt.nrepeat)
     else:
         raise RuntimeError("Unknown test type")
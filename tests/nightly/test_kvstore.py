@@ -75,6 +75,20 @@ def compute_expected_2bit_quantization(arr, curr_residual, threshold):
         i+=32
     return np.array(compr), np.array(new_residual).reshape(arr.shape), np.array(decompr).reshape(arr.shape)
 
+def compute_expected_1bit_quantization(arr, curr_residual, threshold):
+    res = curr_residual + arr
+    decompr = np.where(res >= 0, threshold, -threshold)
+    return res - decompr, decompr
+
+def compute_expected_topk_quantization(arr, curr_residual, block_size, k=8):
+    res = (curr_residual + arr).flatten()
+    decompr = np.zeros_like(res)
+    for start in range(0, res.size, block_size):
+        block = res[start:start+block_size]
+        top = np.argsort(-np.abs(block), kind='mergesort')[:k]
+        decompr[start + top] = block[top]
+    return (res - decompr).reshape(arr.shape), decompr.reshape(arr.shape)
+
 ## individual key interface
 def test_kvstore(kv_type, stype):
     print(kv_type)
@@ -210,6 +224,44 @@ def test_compress_kvstore(kv_type, compression='2bit', threshold=0.5):
     check_neg(kv, -1*threshold, rate, curval)
     check_compr_random(kv, threshold)
 
+def test_compress_kvstore_types(kv_type):
+    rate = 2
+    for compression_params in [{'type': '1bit', 'threshold': 0.5},
+                               {'type': 'topk', 'ratio': 0.25}]:
+        print(kv_type + ' with ' + compression_params['type'] + ' compression')
+        kv = mx.kv.create(kv_type)
+        kv.set_gradient_compression(compression_params)
+        kv.set_optimizer(mx.optimizer.create('test', rescale_grad=rate))
+        for k, s in zip(keys, shapes):
+            kv.init(k, mx.nd.zeros(s))
+        for k, s in zip(keys, shapes):
+            curr_residual = [np.zeros(s) for g in range(nworker)]
+            for i in range(2):
+                orig_val = [mx.nd.zeros(s, mx.gpu(g)) for g in range(nworker)]
+                kv.pull(k, out=orig_val)
+                grads = [mx.nd.random_uniform(-0.6, 0.6, shape=s, ctx=mx.gpu(g))
+                         for g in range(nworker)]
+                grads_cpy = [g.asnumpy() for g in grads]
+                kv.push(k, grads)
+                val = [mx.nd.zeros(s, mx.gpu(g)) for g in range(nworker)]
+                kv.pull(k, out=val)
+                sum_dequantized_vals = np.zeros(s)
+                for g in range(nworker):
+                    if compression_params['type'] == '1bit':
+                        curr_residual[g], decompr = compute_expected_1bit_quantization(
+                            grads_cpy[g], curr_residual[g], compression_params['threshold'])
+                    else:
+                        # ratio 0.25 keeps 8 values out of every block of 32
+                        curr_residual[g], decompr = compute_expected_topk_quantization(
+                            grads_cpy[g], curr_residual[g], 32)
+                    sum_dequantized_vals += (decompr * rate)
+                for g in range(nworker):
+                    assert_almost_equal((val[g] - orig_val[g]).asnumpy(), sum_dequantized_vals,
+                                        rtol=1e-4, atol=1e-4)
+        stats = kv.gradient_compression_stats()
+        assert stats['compressed_bytes'] > 0
+        assert stats['compression_ratio'] > 1
+
 ## group keys interface
 def test_group_kvstore(kv_type, stype):
     print(kv_type)
@@ -252,6 +304,7 @@ if __name__ == "__main__":
 
     ## compression for local kvstore happens only when reduce is on device
     test_compress_kvstore('local_allreduce_device')
+    test_compress_kvstore_types('local_allreduce_device')
     for stype in stypes:
         test_group_kvstore('local_update_cpu', stype)
         test_group_kvstore('local_allreduce_cpu', stype)
@@ -49,7 +49,8 @@ def _optional_group(symbols, group=False):
         return symbols
 
 
-def _check_onnx_export(net, group_outputs=False, shape_type=tuple, extra_params={}):
+def _check_onnx_export(net, group_outputs=False, shape_type=tuple, extra_params={},
+                       external_data=False):
     net.initialize()
     data = nd.random.uniform(0, 1, (1, 1024))
     output = _force_list(net(data))  # initialize weights
@@ -62,8 +63,12 @@ def _check_onnx_export(net, group_outputs=False, shape_type=tuple, extra_params=
             sym=net_sym,
             params=net_params,
             input_shape=[shape_type(data.shape)],
-            onnx_file_path=onnx_file_path)
+            onnx_file_path=onnx_file_path,
+            external_data=external_data)
         assert export_path == onnx_file_path
+        if external_data:
+            # the weights are stored next to the model
+            assert os.path.getsize(onnx_file_path + '.data') > os.path.getsize(onnx_file_path)
         # Try importing the model to symbol
         _assert_sym_equal(net_sym, onnx_mxnet.import_model(export_path)[0])
 
@@ -116,6 +121,12 @@ class TestExport(unittest.TestCase):
             net.add(nn.Dense(100, activation='relu'), nn.Dense(10))
         _check_onnx_export(net, extra_params={'extra_param': nd.array([1, 2])})
 
+    def test_onnx_export_external_data(self):
+        net = nn.HybridSequential(prefix='external_data_net')
+        with net.name_scope():
+            net.add(nn.Dense(100, activation='relu'), nn.Dense(10))
+        _check_onnx_export(net, external_data=True)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -488,6 +488,49 @@ def test_bulking():
             .format(fully_bulked_time - fastest_half_bulked_time, times_str)
 
 
+@with_seed()
+def test_hybrid_fuse_gpu():
+    class ElemwiseBlock(mx.gluon.HybridBlock):
+        def hybrid_forward(self, F, x, y):
+            return F.relu(F.broadcast_mul(F.tanh(x + 1), y) - 0.5) * 3
+
+    ctx = mx.gpu(0)
+    x = mx.nd.random.uniform(shape=(8, 16), ctx=ctx)
+    y = mx.nd.random.uniform(shape=(1, 16), ctx=ctx)
+    block = ElemwiseBlock()
+    expected = block(x, y)
+    # the fused kernel only runs on CPU, the graph on GPU is not fused
+    block.hybridize(fuse=True)
+    out = block(x, y)
+    assert_almost_equal(out.asnumpy(), expected.asnumpy(), rtol=1e-5)
+
+
+@with_seed()
+def test_device_loader_gpu():
+    X = np.random.uniform(size=(12, 4))
+    Y = np.arange(12)
+    dataset = mx.gluon.data.ArrayDataset(X, Y)
+    ctx_list = [mx.gpu(0), mx.gpu(0)]
+    for prefetch in [1, 2]:
+        loader = mx.gluon.data.DeviceLoader(mx.gluon.data.DataLoader(dataset, 4), ctx_list,
+                                            prefetch=prefetch)
+        for _ in range(2):
+            for i, (x, y) in enumerate(loader):
+                assert [a.context for a in x + y] == ctx_list * 2
+                assert_almost_equal(mx.nd.concat(*x, dim=0).asnumpy(), X[i * 4:(i + 1) * 4])
+                assert_almost_equal(mx.nd.concat(*y, dim=0).asnumpy(), Y[i * 4:(i + 1) * 4])
+        # the slices go through pinned buffers which are reused across batches and epochs
+        assert len(loader._staging) == (prefetch + 1) * 2 * len(ctx_list)
+        assert all(buf.context == mx.cpu_pinned(0) for buf in loader._staging.values())
+
+    # batches already in pinned memory are copied without staging
+    loader = mx.gluon.data.DeviceLoader(
+        mx.gluon.data.DataLoader(dataset, 4, pin_memory=True), mx.gpu(0))
+    for i, (x, y) in enumerate(loader):
+        assert x[0].context == mx.gpu(0)
+        assert_almost_equal(x[0].asnumpy(), X[i * 4:(i + 1) * 4])
+    assert not loader._staging
+
 if __name__ == '__main__':
     import nose
     nose.runmodule()
@@ -2156,6 +2156,66 @@ def test_foreach_with_unkown_dim():
     _, output_shape, _ = outs.infer_shape_partial()
     assert_allclose((0, 3, 32, 32), output_shape[0])
 
+@with_seed()
+def test_foreach_unroll():
+    seq_len, batch_size, hidden_dim = 3, 2, 4
+    params = mx.rnn.RNNParams()
+
+    def step(data, states):
+        return mx.rnn.LSTMCell(hidden_dim, prefix='', params=params)(data, states)
+
+    data = mx.sym.var('data')
+    init_states = [mx.sym.var('h'), mx.sym.var('c')]
+    loop_out, loop_states = mx.sym.contrib.foreach(step, data, init_states)
+    unroll_out, unroll_states = mx.sym.contrib.foreach(step, data, init_states,
+                                                       unroll_length=seq_len)
+    assert '_foreach' not in unroll_out.tojson()
+    loop = mx.sym.Group([loop_out] + loop_states)
+    unroll = mx.sym.Group([unroll_out] + unroll_states)
+    arg_shapes, _, _ = loop.infer_shape(data=(seq_len, batch_size, 5),
+                                        h=(batch_size, hidden_dim), c=(batch_size, hidden_dim))
+    args = {name: mx.nd.random.uniform(shape=shape)
+            for name, shape in zip(loop.list_arguments(), arg_shapes)}
+    grads1 = {name: mx.nd.zeros(arr.shape) for name, arr in args.items()}
+    grads2 = {name: mx.nd.zeros(arr.shape) for name, arr in args.items()}
+    e1 = loop.bind(default_context(), args=args, args_grad=grads1)
+    e2 = unroll.bind(default_context(), args=args, args_grad=grads2)
+    e1.forward(is_train=True)
+    e2.forward(is_train=True)
+    out_grads = [mx.nd.random.uniform(-1, 1, arr.shape) for arr in e1.outputs]
+    e1.backward(out_grads)
+    e2.backward(out_grads)
+    for out1, out2 in zip(e1.outputs, e2.outputs):
+        assert_almost_equal(out1.asnumpy(), out2.asnumpy(), rtol=1e-4, atol=1e-4)
+    for name in args:
+        assert_almost_equal(grads1[name].asnumpy(), grads2[name].asnumpy(),
+                            rtol=1e-4, atol=1e-4)
+
+    # the shape of 1-D data is not known when the loop is built
+    step = lambda data, states: (data * states[0], [states[0] + data])
+    data = mx.sym.var('data')
+    init_states = [mx.sym.var('s')]
+    loop_out, loop_states = mx.sym.contrib.foreach(step, data, init_states)
+    unroll_out, unroll_states = mx.sym.contrib.foreach(step, data, init_states,
+                                                       unroll_length=seq_len)
+    loop = mx.sym.Group([loop_out] + loop_states)
+    unroll = mx.sym.Group([unroll_out] + unroll_states)
+    args = {'data': mx.nd.random.uniform(shape=(seq_len,)),
+            's': mx.nd.random.uniform(shape=(1,))}
+    e1 = loop.bind(default_context(), args=args)
+    e2 = unroll.bind(default_context(), args=args)
+    for out1, out2 in zip(e1.forward(), e2.forward()):
+        assert out1.shape == out2.shape
+        assert_almost_equal(out1.asnumpy(), out2.asnumpy(), rtol=1e-5, atol=1e-6)
+
+    # the operators added by unrolling are named after the loop
+    unroll_out, _ = mx.sym.contrib.foreach(step, data, init_states, name='unrolled',
+                                           unroll_length=seq_len)
+    assert unroll_out.name.startswith('unrolled')
+    assert_exception(mx.sym.contrib.foreach, ValueError, step, data, init_states,
+                     unroll_length=0)
+
+
 if __name__ == '__main__':
     import nose
     nose.runmodule()
@@ -0,0 +1,84 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import mxnet as mx
+from mxnet.contrib import cost_model
+from common import with_seed
+
+
+def _conv_fc():
+    data = mx.sym.var('data')
+    conv = mx.sym.Convolution(data, kernel=(3, 3), pad=(1, 1), num_filter=8, name='conv')
+    act = mx.sym.Activation(conv, act_type='relu', name='relu')
+    return mx.sym.FullyConnected(act, num_hidden=10, name='fc')
+
+
+def test_estimate_symbol():
+    cost = cost_model.estimate(_conv_fc(), {'data': (2, 3, 16, 16)})
+    layers = dict((layer['name'], layer) for layer in cost['layers'])
+    conv_macs = 2 * 8 * 16 * 16 * 3 * 9
+    fc_macs = 2 * 8 * 16 * 16 * 10
+    assert layers['conv']['macs'] == conv_macs
+    assert layers['conv']['flops'] == 2 * conv_macs + 2 * 8 * 16 * 16
+    assert layers['fc']['macs'] == fc_macs
+    assert cost['macs'] == conv_macs + fc_macs
+    assert cost['param_bytes'] == 4 * (8 * 3 * 9 + 8 + 10 * 8 * 16 * 16 + 10)
+    assert cost['peak_bytes'] >= cost['param_bytes'] + 4 * 2 * 8 * 16 * 16
+
+    train_cost = cost_model.estimate(_conv_fc(), {'data': (2, 3, 16, 16)}, is_train=True)
+    assert train_cost['macs'] == 3 * cost['macs']
+    assert train_cost['peak_bytes'] > cost['peak_bytes']
+
+
+def test_estimate_hybrid_block():
+    net = mx.gluon.nn.HybridSequential()
+    with net.name_scope():
+        net.add(mx.gluon.nn.Conv2D(8, 3, padding=1))
+        net.add(mx.gluon.nn.Dense(10))
+    cost = cost_model.estimate(net, (2, 3, 16, 16))
+    assert cost['macs'] == 2 * 8 * 16 * 16 * 3 * 9 + 2 * 8 * 16 * 16 * 10
+
+
+def test_estimate_multiple_outputs():
+    # outputs of a node are matched by the node, not by their names
+    data = mx.sym.var('data')
+    parts = mx.sym.split(data, num_outputs=2, axis=1, name='fc')
+    fc = mx.sym.FullyConnected(parts[1], num_hidden=4, name='fc_output')
+    cost = cost_model.estimate(mx.sym.Group([fc, parts[0]]), {'data': (2, 6)})
+    layers = dict((layer['name'], layer) for layer in cost['layers'])
+    assert layers['fc']['output_shape'] == (2, 3)
+    assert layers['fc']['activation_bytes'] == 2 * 4 * 2 * 3
+    assert layers['fc_output']['macs'] == 2 * 3 * 4
+
+
+@with_seed()
+def test_calibrate():
+    shape = {'data': (2, 3, 16, 16)}
+    calibration = cost_model.calibrate(_conv_fc(), shape, num_runs=2)
+    assert '__default__' in calibration
+    cost = cost_model.estimate(_conv_fc(), shape, calibration=calibration)
+    assert cost['latency'] >= 0
+    assert all('latency' in layer for layer in cost['layers'])
+
+    mx.profiler.set_config(profile_all=True, filename='cost_model_profile.json')
+    cost_model.calibrate(_conv_fc(), shape, num_runs=1)
+    assert mx.profiler._config == {'profile_all': True, 'filename': 'cost_model_profile.json'}
+
+
+if __name__ == '__main__':
+    import nose
+    nose.runmodule()
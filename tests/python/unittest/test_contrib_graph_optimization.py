@@ -0,0 +1,105 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+import tempfile
+
+import mxnet as mx
+from mxnet.contrib.graph_optimization import optimize_for_inference
+from mxnet.test_utils import assert_almost_equal
+from common import with_seed
+
+
+def _random_params(sym, data_shape):
+    arg_shapes, _, aux_shapes = sym.infer_shape(data=data_shape)
+    arg_params = {name: mx.nd.random.uniform(0.5, 1.5, shape=shape)
+                  for name, shape in zip(sym.list_arguments(), arg_shapes) if name != 'data'}
+    aux_params = {name: mx.nd.random.uniform(0.5, 1.5, shape=shape)
+                  for name, shape in zip(sym.list_auxiliary_states(), aux_shapes)}
+    return arg_params, aux_params
+
+
+def _forward(sym, arg_params, aux_params, data):
+    args = dict(arg_params)
+    args['data'] = data
+    exe = sym.bind(mx.cpu(), args, aux_states=dict(aux_params), grad_req='null')
+    return exe.forward(is_train=False)[0]
+
+
+@with_seed()
+def test_fold_batchnorm():
+    data = mx.sym.var('data')
+    conv = mx.sym.Convolution(data, kernel=(3, 3), num_filter=4, no_bias=True, name='conv')
+    bn = mx.sym.BatchNorm(conv, fix_gamma=False, eps=1e-5, name='bn')
+    act = mx.sym.Activation(bn, act_type='relu', name='relu')
+    drop = mx.sym.Dropout(act, p=0.5, name='drop')
+    fc = mx.sym.FullyConnected(drop, num_hidden=6, name='fc')
+    sym = mx.sym.BatchNorm(fc, name='bn_fc')
+    shape = (2, 3, 8, 8)
+    arg_params, aux_params = _random_params(sym, shape)
+    opt_sym, opt_args, opt_aux = optimize_for_inference(sym, arg_params, aux_params)
+    ops = [op for op in opt_sym.get_internals().list_outputs()]
+    assert not [name for name in ops if name.startswith(('bn', 'drop'))]
+    assert not opt_aux
+    data = mx.nd.random.uniform(shape=shape)
+    assert_almost_equal(_forward(sym, arg_params, aux_params, data).asnumpy(),
+                        _forward(opt_sym, opt_args, opt_aux, data).asnumpy(),
+                        rtol=1e-4, atol=1e-5)
+
+
+@with_seed()
+def test_fold_constants():
+    data = mx.sym.var('data')
+    weight = mx.sym.var('weight')
+    scale = mx.sym.var('scale')
+    sym = mx.sym.FullyConnected(data, mx.sym.transpose(weight) * scale, num_hidden=5,
+                                no_bias=True, name='fc')
+    arg_params = {'weight': mx.nd.random.uniform(shape=(3, 5)),
+                  'scale': mx.nd.random.uniform(shape=(5, 3))}
+    opt_sym, opt_args, _ = optimize_for_inference(sym, arg_params, {})
+    assert set(opt_sym.list_arguments()) == set(['data'] + list(opt_args))
+    assert 'weight' not in opt_args and 'scale' not in opt_args
+    data = mx.nd.random.uniform(shape=(4, 3))
+    assert_almost_equal(_forward(sym, arg_params, {}, data).asnumpy(),
+                        _forward(opt_sym, opt_args, {}, data).asnumpy())
+
+
+@with_seed()
+def test_export_optimized():
+    net = mx.gluon.nn.HybridSequential()
+    with net.name_scope():
+        net.add(mx.gluon.nn.Conv2D(4, 3, use_bias=False))
+        net.add(mx.gluon.nn.BatchNorm())
+        net.add(mx.gluon.nn.Dropout(0.5))
+        net.add(mx.gluon.nn.Dense(3))
+    net.initialize()
+    net.hybridize()
+    data = mx.nd.random.uniform(shape=(2, 3, 8, 8))
+    net(data)
+    for param in net.collect_params('.*running.*').values():
+        param.set_data(mx.nd.random.uniform(0.5, 1.5, shape=param.shape))
+    out = net(data)
+    path = os.path.join(tempfile.mkdtemp(), 'net')
+    net.export(path, optimize=True)
+    net2 = mx.gluon.SymbolBlock.imports(path + '-symbol.json', ['data'], path + '-0000.params')
+    assert not [name for name in net2.collect_params() if 'batchnorm' in name]
+    assert_almost_equal(out.asnumpy(), net2(data).asnumpy(), rtol=1e-4, atol=1e-5)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.runmodule()
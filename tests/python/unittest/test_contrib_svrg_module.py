@@ -308,6 +308,55 @@ def test_fit():
     assert metric.get()[1] < estimated_mse
 
 
+@with_seed()
+def test_shared_snapshot():
+    def create_module(**kwargs):
+        X = mx.sym.Variable('data')
+        Y = mx.symbol.Variable('lin_reg_label')
+        fully_connected_layer = mx.sym.FullyConnected(data=X, name='fc1', num_hidden=1)
+        lro = mx.sym.LinearRegressionOutput(data=fully_connected_layer, label=Y, name="lro")
+        mod = SVRGModule(symbol=lro, data_names=['data'], label_names=['lin_reg_label'], update_freq=2, **kwargs)
+        mod.bind(data_shapes=di.provide_data, label_shapes=di.provide_label)
+        mod.init_params(initializer=mx.init.One())
+        mod.init_optimizer(kvstore='local', optimizer='sgd', optimizer_params=(('learning_rate', 0.01),))
+        return mod
+
+    train_data = np.random.randint(1, 5, [40, 2])
+    train_label = train_data.dot(np.array([1.0, 2.0]))
+    di = mx.io.NDArrayIter(train_data, train_label, batch_size=10, label_name='lin_reg_label')
+    assertRaises(ValueError, SVRGModule, mx.sym.Variable('data'), update_freq=2, full_grad_ratio=0)
+
+    mod = create_module()
+    shared_mod = create_module(shared_snapshot=True)
+    assert shared_mod._mod_aux.binded
+    for _ in range(2):
+        mod.update_full_grads(di)
+        shared_mod.update_full_grads(di)
+        assert_almost_equal(mod._param_dict[0]['fc1_weight'].asnumpy(),
+                            shared_mod._param_dict[0]['fc1_weight'].asnumpy())
+        di.reset()
+        for batch in di:
+            mod.forward_backward(batch)
+            mod.update()
+            shared_mod.forward_backward(batch)
+            shared_mod.update()
+            assert_almost_equal(mod.get_outputs()[0].asnumpy(), shared_mod.get_outputs()[0].asnumpy())
+        assert_almost_equal(mod.get_params()[0]['fc1_weight'].asnumpy(),
+                            shared_mod.get_params()[0]['fc1_weight'].asnumpy())
+
+    # the full gradients estimated from every other batch
+    sub_mod = create_module(full_grad_ratio=0.5)
+    sub_mod.update_full_grads(di)
+    expected = mx.nd.zeros((1, 2))
+    di.reset()
+    for i, batch in enumerate(di):
+        sub_mod._mod_aux.forward(batch, is_train=True)
+        sub_mod._mod_aux.backward()
+        if i % 2 == 0:
+            expected += sub_mod._mod_aux._exec_group.grad_arrays[0][0]
+    assert_almost_equal(sub_mod._param_dict[0]['fc1_weight'].asnumpy(), (expected / 2).asnumpy())
+
+
 if __name__ == "__main__":
     import nose
     nose.runmodule()
@@ -0,0 +1,92 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import ctypes
+import json
+import os
+import tempfile
+
+import numpy as np
+import mxnet as mx
+from mxnet.contrib.telemetry import LatencyHistogram, StepTelemetry
+from common import with_seed
+
+
+def test_latency_histogram():
+    hist = LatencyHistogram(precision=0.02)
+    values = np.random.uniform(0.001, 0.1, size=10000)
+    for v in values:
+        hist.add(v)
+    assert hist.count == len(values)
+    for q in [0.5, 0.9, 0.99]:
+        expected = np.percentile(values, q * 100)
+        assert abs(hist.quantile(q) - expected) / expected < 0.03
+    assert np.isnan(LatencyHistogram().quantile(0.5))
+
+
+@with_seed()
+def test_step_telemetry():
+    telemetry = StepTelemetry(batch_size=4)
+    x = mx.nd.random.uniform(shape=(4, 64))
+    w = mx.nd.random.uniform(shape=(64, 64))
+    for _ in range(5):
+        telemetry.begin_step()
+        y = mx.nd.dot(x, w)
+        telemetry.mark('forward', y)
+        w -= 0.01 * mx.nd.dot(x.T, y)
+        telemetry.mark('update', [w])
+        telemetry.end_step()
+    telemetry.flush()
+    summary = telemetry.summary()
+    assert telemetry.num_steps == 5
+    assert list(summary.keys())[:3] == ['step', 'forward', 'update']
+    assert summary['step']['count'] == 5
+    assert summary['step']['p50'] <= summary['step']['p99'] <= summary['step']['max']
+    assert summary['samples_per_sec'] > 0
+    text = telemetry.prometheus()
+    assert 'mxnet_step_seconds{phase="forward",quantile="0.9"}' in text
+    assert 'mxnet_step_seconds_count{phase="step"} 5' in text
+
+    # timestamps dropped before they are written stay alive until the engine writes them
+    for _ in range(10):
+        mx.engine.record_timestamp([mx.nd.dot(w, w)], ctypes.c_int64(0))
+    mx.nd.waitall()
+
+
+@with_seed()
+def test_module_fit_telemetry():
+    data = mx.sym.var('data')
+    out = mx.sym.SoftmaxOutput(mx.sym.FullyConnected(data, num_hidden=4), name='softmax')
+    train_data = mx.io.NDArrayIter(np.random.uniform(size=(40, 8)),
+                                   np.random.randint(0, 4, size=(40,)), batch_size=10)
+    mod = mx.mod.Module(out)
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, 'telemetry.json')
+    telemetry = StepTelemetry(frequent=1, path=path)
+    mod.fit(train_data, num_epoch=2, telemetry=telemetry)
+    # fit accounts all the steps when it returns
+    assert telemetry.num_steps == 8
+    summary = telemetry.summary()
+    for phase in ['forward', 'backward', 'comm', 'update', 'data']:
+        assert summary[phase]['count'] == 8
+    with open(path) as f:
+        assert 'step' in json.load(f)
+
+
+if __name__ == '__main__':
+    import nose
+    nose.runmodule()
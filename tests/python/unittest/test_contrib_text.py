@@ -21,6 +21,9 @@ from __future__ import absolute_import
 from __future__ import print_function
 
 from collections import Counter
+import re
+
+import numpy as np
 
 from common import assertRaises
 from mxnet import ndarray as nd
@@ -71,6 +74,47 @@ def test_count_tokens_from_str():
     _test_count_tokens_from_str_with_delims('IS', 'LIFE')
 
 
+def test_count_and_index_tokens():
+    for num_workers in [0, 2]:
+        for token_delim, seq_delim in [(' ', '\n'), ('IS', 'LIFE')]:
+            source_str = _get_test_str_of_tokens(token_delim, seq_delim)
+            expected = text.utils.count_tokens_from_str(source_str, token_delim, seq_delim)
+            counter = text.utils.count_tokens(source_str, token_delim, seq_delim,
+                                              num_workers=num_workers)
+            assert counter == expected
+
+            vocab = text.vocab.Vocabulary(counter, most_freq_count=4)
+            indices = text.utils.index_tokens(source_str, vocab, token_delim, seq_delim,
+                                              num_workers=num_workers)
+            assert indices.dtype == np.int32
+            tokens = [t for t in re.split(token_delim + '|' + seq_delim, source_str) if t]
+            assert indices.asnumpy().tolist() == vocab.to_indices(tokens)
+
+
+def test_tokens_to_indices_array():
+    counter = Counter(['a', 'b', 'b', 'c', 'c', 'c', 'some_word$', 'A'])
+    vocab = text.vocab.Vocabulary(counter, reserved_tokens=['<pad>'])
+    tokens = np.array([['a', 'non-exist', '<pad>'], ['c', '<unk>', 'some_word$']])
+    indices = vocab.to_indices(tokens)
+    assert indices.dtype == np.int32
+    assert indices.shape == (2, 3)
+    assert indices.tolist() == [vocab.to_indices(list(row)) for row in tokens]
+    assert (vocab.to_indices(tokens.astype('S')) == indices).all()
+    assert (vocab.to_indices(tokens.astype(object)) == indices).all()
+    assert vocab.to_tokens(indices).tolist() == [vocab.to_tokens(row) for row in
+                                                 indices.tolist()]
+    assert vocab.to_tokens(nd.array(indices)).tolist() == vocab.to_tokens(indices).tolist()
+    assertRaises(ValueError, vocab.to_tokens, np.array([len(vocab)]))
+    assert vocab.to_indices(np.array([], dtype=str)).shape == (0,)
+
+    # a long token and a prefix of a token of another length
+    long_token = 'x' * 1000
+    vocab = text.vocab.Vocabulary(Counter(['a', 'ab', 'abc', long_token]))
+    tokens = np.array(['ab', long_token, 'abcd', 'abc', 'a', 'x'])
+    assert vocab.to_indices(tokens).tolist() == vocab.to_indices(tokens.tolist())
+    assert sum(t.nbytes for t, _ in vocab._string_table().values()) == 4 * (1 + 2 + 3 + 1000)
+
+
 def test_tokens_to_indices():
     counter = Counter(['a', 'b', 'b', 'c', 'c', 'c', 'some_word$'])
 
@@ -182,6 +182,44 @@ def test_non_uniform_sample():
     assert (len(out) == 4)
     check_non_uniform(out, num_hops=1, max_num_vertices=5)
 
+def test_uniform_sample_parallel():
+    sp_g, g = generate_graph(100)
+    seeds = [mx.nd.array(np.arange(i * 10, i * 10 + 10), dtype=np.int64) for i in range(4)]
+    outs = []
+    for _ in range(2):
+        mx.random.seed(42)
+        outs.append(mx.nd.contrib.dgl_csr_neighbor_uniform_sample(
+            g, *seeds, num_args=len(seeds) + 1, num_hops=2, num_neighbor=3, max_num_vertices=60))
+    assert len(outs[0]) == 3 * len(seeds)
+    for i in range(len(seeds)):
+        out = [outs[0][i], outs[0][i + len(seeds)], outs[0][i + 2 * len(seeds)]]
+        check_uniform(out, num_hops=2, max_num_vertices=60)
+        # sampling follows the random seed
+        assert_array_equal(outs[0][i].asnumpy(), outs[1][i].asnumpy())
+        assert_array_equal(outs[0][i + len(seeds)].indices.asnumpy(),
+                           outs[1][i + len(seeds)].indices.asnumpy())
+
+def test_neighbor_subgraph_loader():
+    from mxnet.gluon.contrib.data import NeighborSubgraphLoader
+    sp_g, g = generate_graph(100)
+    loader = NeighborSubgraphLoader(g, np.arange(100), batch_size=16, num_hops=2,
+                                    num_neighbor=3, max_num_vertices=60,
+                                    batches_per_call=3, prefetch=2)
+    assert len(loader) == 7
+    num_batches = 0
+    for vertices, subgraph, layer in loader:
+        check_uniform([vertices, subgraph, layer], num_hops=2, max_num_vertices=60)
+        num_batches += 1
+    assert num_batches == 7
+
+    prob = mx.nd.random.uniform(shape=(100,))
+    loader = NeighborSubgraphLoader(g, np.arange(100), batch_size=32, probability=prob,
+                                    num_hops=1, max_num_vertices=60, last_batch='discard')
+    batches = list(loader)
+    assert len(batches) == 3
+    for out in batches:
+        check_non_uniform(out, num_hops=1, max_num_vertices=60)
+
 def test_edge_id():
     shape = rand_shape_2d()
     data = rand_ndarray(shape, stype='csr', density=0.4)
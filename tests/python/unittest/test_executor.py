@@ -165,6 +165,66 @@ def test_reshape():
     assert np.all(new_exe.arg_arrays[1].asnumpy() == 1)
 
 
+def test_memory_plan():
+    x = mx.sym.Variable('x')
+    y = mx.sym.FullyConnected(x, num_hidden=16, name='fc')
+    y = mx.sym.Activation(y, act_type='relu', name='relu')
+    y = mx.sym.FullyConnected(y, num_hidden=4, name='out')
+    exe = y.simple_bind(mx.cpu(), x=(8, 32))
+    plan = exe.memory_plan()
+    names = [node['name'] for node in plan['nodes']]
+    assert names[:3] == ['fc', 'relu', 'out']
+    assert plan['peak_node'] in names
+    assert plan['peak_bytes'] <= plan['storage_allocated_bytes']
+    assert max(node['live_bytes'] for node in plan['nodes']) == plan['peak_bytes']
+    # fc output is stored in the internal pool, 8 x 16 float32
+    assert plan['nodes'][0]['bytes'] == [8 * 16 * 4]
+    assert plan['nodes'][0]['storage_id'][0] >= 0
+
+    # a budget that is always met returns the regular plan
+    exe_budget = y.simple_bind(mx.cpu(), x=(8, 32), memory_budget=1 << 30)
+    assert exe_budget.memory_plan()['storage_allocated_bytes'] == plan['storage_allocated_bytes']
+    # a budget that cannot be met still returns a usable executor
+    exe_budget = y.simple_bind(mx.cpu(), x=(8, 32), memory_budget=0)
+    assert exe_budget.memory_plan()['storage_allocated_bytes'] <= plan['storage_allocated_bytes']
+    exe_budget.forward(is_train=True)
+    exe_budget.backward(mx.nd.ones((8, 4)))
+    # mirroring is marked on a copy of the symbol
+    assert all('__backward_do_mirror__' not in attrs for attrs in y.attr_dict().values())
+
+
+def test_infer_cache():
+    mx.executor.clear_infer_cache()
+    x = mx.sym.Variable('x')
+    y = mx.sym.FullyConnected(x, num_hidden=4)
+    exe = y.simple_bind(mx.cpu(), x=(5, 4))
+    stats = mx.executor.infer_cache_stats()
+    if stats['shape']['capacity'] == 0:
+        return
+    assert stats['shape']['misses'] >= 1 and stats['shape']['size'] >= 1
+    # binding again on the same shapes reuses the inferred shapes and types
+    y.simple_bind(mx.cpu(), x=(5, 4))
+    new_stats = mx.executor.infer_cache_stats()
+    assert new_stats['shape']['hits'] > stats['shape']['hits']
+    assert new_stats['dtype']['hits'] > stats['dtype']['hits']
+    # a new shape is inferred, and inferred correctly
+    new_exe = exe.reshape(x=(3, 4))
+    assert new_exe.outputs[0].shape == (3, 4)
+    assert mx.executor.infer_cache_stats()['shape']['misses'] > new_stats['shape']['misses']
+    assert y.infer_shape(x=(3, 4))[1] == [(3, 4)]
+    # graphs differing only by names share the results, not by attributes
+    stats = mx.executor.infer_cache_stats()
+    z = mx.sym.FullyConnected(mx.sym.Variable('z'), num_hidden=4, name='other')
+    assert z.infer_shape(z=(3, 4))[1] == [(3, 4)]
+    new_stats = mx.executor.infer_cache_stats()
+    assert new_stats['shape']['hits'] == stats['shape']['hits'] + 1
+    z = mx.sym.FullyConnected(mx.sym.Variable('z'), num_hidden=6, name='other')
+    assert z.infer_shape(z=(3, 4))[1] == [(3, 6)]
+    assert mx.executor.infer_cache_stats()['shape']['misses'] == new_stats['shape']['misses'] + 1
+    mx.executor.clear_infer_cache()
+    assert mx.executor.infer_cache_stats()['shape']['size'] == 0
+
+
 if __name__ == "__main__":
     import nose
     nose.runmodule()
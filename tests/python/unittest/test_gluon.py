@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import gc
 import os
 import tempfile
 
@@ -79,6 +80,110 @@ def test_sparse_parameter():
     p.reset_ctx(ctx=[mx.cpu(1), mx.cpu(2)])
     assert p.list_ctx() == [mx.cpu(1), mx.cpu(2)]
 
+@with_seed()
+def test_sparse_parameter_lazy_init():
+    p = gluon.Parameter('weight', shape=(10, 10), stype='row_sparse', grad_stype='row_sparse')
+    p.initialize(init='xavier', ctx=[mx.cpu(0), mx.cpu(1)], lazy=True)
+    assert p._data is None
+    assert p.list_ctx() == [mx.cpu(0), mx.cpu(1)]
+    trainer = mx.gluon.Trainer([p], 'sgd')
+    # the first access initializes the parameter
+    row_id = mx.nd.arange(0, 10, ctx=mx.cpu(1))
+    weight = p.row_sparse_data(row_id)
+    assert weight.shape == (10, 10)
+    assert np.abs(weight.asnumpy()).sum() > 0
+    assert len(p.list_grad()) == 2
+
+    # saving initializes an untouched parameter
+    params = gluon.ParameterDict('net_')
+    params.get('weight', shape=(10, 10), stype='row_sparse', grad_stype='row_sparse')
+    params.initialize(init='xavier', lazy=True)
+    trainer = mx.gluon.Trainer(params, 'sgd')
+    assertRaises(RuntimeError, params['net_weight']._check_and_get,
+                 params['net_weight']._data, list)
+    params.save('test_sparse_parameter_lazy_init.params')
+    loaded = mx.nd.load('test_sparse_parameter_lazy_init.params')
+    assert np.abs(loaded['net_weight'].asnumpy()).sum() > 0
+
+@with_seed()
+def test_paramdict_init_seed():
+    def init_params(names, seed):
+        params = gluon.ParameterDict('net_')
+        for name in names:
+            params.get(name, shape=(4, 5))
+        params.initialize(init='xavier', seed=seed)
+        return {k: v.data().asnumpy() for k, v in params.items()}
+
+    params = init_params(['w0', 'w1', 'w2'], 42)
+    # values do not depend on the other parameters or the initialization order
+    reordered = init_params(['w2', 'w1'], 42)
+    for name, value in reordered.items():
+        assert_almost_equal(params[name], value)
+    assert np.abs(params['net_w0'] - params['net_w1']).sum() > 0
+    reseeded = init_params(['w0'], 7)
+    assert np.abs(params['net_w0'] - reseeded['net_w0']).sum() > 0
+
+@with_seed()
+def test_paramdict_load_shared():
+    def make_params(prefix):
+        params = gluon.ParameterDict(prefix)
+        params.get('backbone', shape=(10, 10))
+        params.get('head', shape=(10, 2))
+        return params
+
+    params = make_params('net_')
+    params.initialize()
+    params.save('test_paramdict_load_shared.params')
+    tuned = make_params('net_')
+    tuned.initialize()
+    tuned['net_backbone'].set_data(params['net_backbone'].data())
+    tuned.save('test_paramdict_load_shared_tuned.params')
+
+    cache = mx.nd.ParameterCache()
+    model1 = make_params('net_')
+    model1.load('test_paramdict_load_shared.params', cache=cache, model_name='model1')
+    model2 = make_params('net_')
+    model2.load('test_paramdict_load_shared_tuned.params', cache=cache, model_name='model2')
+    backbone = model1['net_backbone'].data()
+    assert backbone.handle.value == model2['net_backbone'].data().handle.value
+    assert model1['net_head'].data().handle.value != model2['net_head'].data().handle.value
+    assert model1['net_backbone'].grad_req == 'null'
+    assertRaises(ValueError, backbone.__iadd__, 1)
+
+    usage = cache.memory_usage('model1')
+    assert usage['total_bytes'] == 4 * (100 + 20)
+    assert usage['shared_bytes'] == 4 * 100
+    assert usage['unique_bytes'] == 4 * 20
+    assert usage['amortized_bytes'] == 4 * (50 + 20)
+    total = cache.memory_usage()
+    assert total['resident_bytes'] == 4 * (100 + 20 + 20)
+    assert total['logical_bytes'] == 4 * 2 * (100 + 20)
+
+    # setting the data makes a private copy
+    model2['net_backbone'].set_data(mx.nd.ones((10, 10)))
+    assert_almost_equal(backbone.asnumpy(), params['net_backbone'].data().asnumpy())
+    assert cache.memory_usage('model1')['unique_bytes'] == 4 * (100 + 20)
+    cache.release('model1')
+    assert cache.memory_usage()['models'] == 1
+    assertRaises(ValueError, make_params('net_').load,
+                 'test_paramdict_load_shared_tuned.params', cache=cache, model_name='model2')
+
+    # loads of the same file get their own owners, released with their parameters
+    model3 = make_params('net_')
+    model3.load('test_paramdict_load_shared.params', cache=cache)
+    model4 = make_params('net_')
+    model4.load('test_paramdict_load_shared.params', cache=cache)
+    assert cache.memory_usage()['models'] == 3
+    assert cache.memory_usage('test_paramdict_load_shared.params:1')['total_bytes'] == \
+        4 * (100 + 20)
+    del model4
+    gc.collect()
+    assert cache.memory_usage()['models'] == 2
+    model3['net_head'].cast('float64')
+    assert cache.memory_usage('test_paramdict_load_shared.params')['total_bytes'] == 4 * 100
+    model3['net_backbone'].initialize(force_reinit=True)
+    assert cache.memory_usage()['models'] == 1
+
 @with_seed()
 def test_parameter_invalid_access():
     # cannot call data on row_sparse parameters
@@ -1296,6 +1401,99 @@ def test_hybrid_static_memory_switching():
     check_hybrid_static_memory_switching(static_alloc=True)
     check_hybrid_static_memory_switching(static_alloc=True, static_shape=True)
 
+@with_seed()
+def test_hybrid_fuse():
+    class ElemwiseBlock(gluon.HybridBlock):
+        def hybrid_forward(self, F, x, y):
+            return F.relu(F.broadcast_mul(F.tanh(x + 1), y) - 0.5) * 3
+
+    net = gluon.nn.HybridSequential()
+    with net.name_scope():
+        net.add(gluon.nn.Dense(16))
+    net.initialize()
+    block = ElemwiseBlock()
+    x = mx.nd.random.uniform(shape=(8, 16))
+    y = mx.nd.random.uniform(shape=(1, 16))
+    x.attach_grad()
+    with mx.autograd.record():
+        expected = block(net(x), y)
+    expected.backward()
+    expected_grad = x.grad.asnumpy()
+
+    block.hybridize(fuse=True)
+    net.hybridize(fuse=True)
+    with mx.autograd.record():
+        out = block(net(x), y)
+    out.backward()
+    assert_almost_equal(out.asnumpy(), expected.asnumpy(), rtol=1e-5)
+    assert_almost_equal(x.grad.asnumpy(), expected_grad, rtol=1e-5, atol=1e-6)
+
+    # integer inputs are not fused
+    class IntegerBlock(gluon.HybridBlock):
+        def hybrid_forward(self, F, x, y):
+            return F.broadcast_mul(x + 1, y) - 2
+
+    block = IntegerBlock()
+    block.hybridize(fuse=True)
+    x = mx.nd.array(np.random.randint(-5, 5, size=(8, 16)), dtype='int32')
+    y = mx.nd.array(np.random.randint(-5, 5, size=(1, 16)), dtype='int32')
+    out = block(x, y)
+    assert out.dtype == np.int32
+    assert_almost_equal(out.asnumpy(), block.hybrid_forward(mx.nd, x, y).asnumpy())
+
+@with_seed()
+def test_hybrid_checkpoint():
+    def get_net():
+        net = gluon.nn.HybridSequential()
+        with net.name_scope():
+            net.add(gluon.nn.Dense(32, activation='tanh'))
+            net.add(gluon.nn.BatchNorm())
+            net.add(gluon.nn.Dense(32, activation='relu'))
+            net.add(gluon.nn.Dense(4))
+        net.initialize(mx.init.Xavier())
+        return net
+
+    x = mx.nd.random.uniform(shape=(8, 16))
+    outputs, grads = [], []
+    for checkpoint in [False, True]:
+        mx.random.seed(0)
+        net = get_net()
+        net.hybridize()
+        if checkpoint:
+            # checkpoint a child only
+            net[2].hybridize(checkpoint=True)
+        with mx.autograd.record():
+            out = net(x)
+        out.backward()
+        outputs.append(out.asnumpy())
+        grads.append([p.grad().asnumpy() for p in net.collect_params().values()
+                      if p.grad_req != 'null'])
+    assert_almost_equal(outputs[0], outputs[1], rtol=1e-5)
+    for grad, expected_grad in zip(grads[1], grads[0]):
+        assert_almost_equal(grad, expected_grad, rtol=1e-5, atol=1e-6)
+
+    net.hybridize(checkpoint=True)
+    with mx.autograd.record():
+        out = net(x)
+    out.backward()
+    params = [p for p in net.collect_params().values() if p.grad_req != 'null']
+    for param, expected_grad in zip(params, grads[0]):
+        assert_almost_equal(param.grad().asnumpy(), expected_grad, rtol=1e-5, atol=1e-6)
+    stats = net.checkpoint_stats(x)
+    assert stats['num_recomputed_ops'] > 0
+    assert stats['num_recomputed_ops'] <= stats['num_ops']
+    assert stats['saved_bytes'] == stats['storage_bytes'] - stats['checkpoint_storage_bytes']
+
+    class Noise(gluon.HybridBlock):
+        def hybrid_forward(self, F, x):
+            return F.tanh(x + F.random.uniform_like(x))
+
+    # random ops are never recomputed, as they would draw different values
+    noise = Noise()
+    noise.hybridize(checkpoint=True)
+    stats = noise.checkpoint_stats(x)
+    assert stats['num_recomputed_ops'] < stats['num_ops']
+
 @with_seed()
 def test_hook():
     global hook_call_count
@@ -280,6 +280,32 @@ def test_dataloader_context():
         assert x.context == context.cpu_pinned(custom_dev_id)
 
 
+@with_seed()
+def test_device_loader():
+    X = np.random.uniform(size=(10, 4))
+    Y = np.arange(10)
+    dataset = gluon.data.ArrayDataset(X, Y)
+    ctx_list = [context.cpu(1), context.cpu(2)]
+    for prefetch in [1, 3]:
+        loader = gluon.data.DeviceLoader(DataLoader(dataset, 4, last_batch='discard'),
+                                         ctx_list, prefetch=prefetch)
+        assert len(loader) == 2
+        batches = list(loader)
+        assert len(batches) == 2
+        for i, (x, y) in enumerate(batches):
+            assert [a.context for a in x] == ctx_list
+            assert [a.context for a in y] == ctx_list
+            assert [a.shape for a in x] == [(2, 4), (2, 4)]
+            np.testing.assert_almost_equal(nd.concat(*[a.as_in_context(context.cpu())
+                                                       for a in x], dim=0).asnumpy(),
+                                           X[i * 4:(i + 1) * 4])
+            np.testing.assert_equal(y[1].asnumpy(), Y[i * 4 + 2:(i + 1) * 4])
+
+    # uneven splits
+    loader = gluon.data.DeviceLoader(DataLoader(X, 5), ctx_list[:1] * 3, even_split=False)
+    assert [a.shape[0] for a in next(iter(loader))] == [1, 1, 3]
+
+
 if __name__ == '__main__':
     import nose
     nose.runmodule()
@@ -134,6 +134,35 @@ def test_flip_top_bottom():
     assert_almost_equal(flip_in, data_trans.asnumpy())
 
 
+@with_seed()
+def test_batched_transforms():
+    data_in = np.random.uniform(0, 255, (4, 64, 80, 3)).astype(dtype=np.uint8)
+    for hybridize in [False, True]:
+        for transform, shape in [(transforms.RandomResizedCrop(32), (4, 32, 32, 3)),
+                                 (transforms.CenterCrop((40, 24)), (4, 24, 40, 3)),
+                                 (transforms.RandomFlipLeftRight(), (4, 64, 80, 3)),
+                                 (transforms.RandomFlipTopBottom(), (4, 64, 80, 3))]:
+            if hybridize:
+                transform.hybridize()
+            out = transform(nd.array(data_in, dtype='uint8'))
+            assert out.shape == shape
+            out3d = transform(nd.array(data_in[0], dtype='uint8'))
+            assert out3d.shape == shape[1:]
+
+    # every image is either flipped or left unchanged, independently of the others
+    flip = transforms.RandomFlipLeftRight()
+    flip.hybridize()
+    out = flip(nd.array(data_in, dtype='uint8')).asnumpy()
+    for i in range(data_in.shape[0]):
+        assert (out[i] == data_in[i]).all() or (out[i] == data_in[i, :, ::-1, :]).all()
+
+    # bilinear resampling preserves a constant image
+    crop = transforms.CenterCrop((40, 32))
+    crop.hybridize()
+    out = crop(nd.ones((2, 64, 80, 3)) * 7).asnumpy()
+    assert_almost_equal(out, np.full((2, 32, 40, 3), 7, dtype=np.float32), atol=1e-4)
+
+
 @with_seed()
 def test_transformer():
     from mxnet.gluon.data.vision import transforms
@@ -156,6 +185,38 @@ def test_transformer():
     transform(mx.nd.ones((245, 480, 3), dtype='uint8')).wait_to_read()
 
 
+@with_seed()
+def test_composed_crop():
+    # single images are cropped with OpenCV also when composed with hybrid blocks
+    img = nd.array(np.random.uniform(0, 255, (64, 80, 3)).astype(np.uint8), dtype='uint8')
+    transform = transforms.Compose([transforms.CenterCrop((40, 32), interpolation=0),
+                                    transforms.RandomFlipTopBottom()])
+    transform.hybridize()
+    out = transform(img)
+    assert out.dtype == np.uint8
+    expected = mx.image.center_crop(img, (40, 32), interp=0)[0].asnumpy()
+    out = out.asnumpy()
+    assert (out == expected).all() or (out == expected[::-1]).all()
+
+    transform = transforms.Compose([transforms.RandomResizedCrop(32),
+                                    transforms.ToTensor(),
+                                    transforms.Normalize(0, 1)])
+    out = transform(img)
+    assert out.shape == (3, 32, 32) and out.dtype == np.float32
+
+    # a batch goes through crop, flip and normalization in a single graph
+    transform = transforms.Compose([transforms.RandomResizedCrop(32),
+                                    transforms.RandomFlipLeftRight(),
+                                    transforms.ToTensor(),
+                                    transforms.Normalize(0, 1)])
+    assert len(transform._batch_blocks) == 1
+    batch = nd.array(np.random.uniform(0, 255, (4, 64, 80, 3)), dtype='uint8')
+    out = transform(batch)
+    assert out.shape == (4, 3, 32, 32) and out.dtype == np.float32
+    out = transform(img)
+    assert out.shape == (3, 32, 32) and out.dtype == np.float32
+
+
 
 if __name__ == '__main__':
     import nose
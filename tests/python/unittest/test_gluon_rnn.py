@@ -662,6 +662,44 @@ def test_bidirectional_unroll_valid_length():
     assert outputs.shape == (10, 3, 200)
 
 
+
+def test_layer_valid_length():
+    batch_size, max_length, input_size = 4, 7, 5
+    valid_length = [3, 7, 1, 5]
+    for layer_class in [gluon.rnn.LSTM, gluon.rnn.GRU]:
+        for bidirectional in [False, True]:
+            layer = layer_class(8, num_layers=2, bidirectional=bidirectional,
+                                use_sequence_length=True, input_size=input_size)
+            layer.initialize()
+            data = mx.nd.random.normal(shape=(max_length, batch_size, input_size))
+            data.attach_grad()
+            with mx.autograd.record():
+                out, states = layer(data, layer.begin_state(batch_size),
+                                    valid_length=mx.nd.array(valid_length))
+            out.backward()
+            for i, length in enumerate(valid_length):
+                # the same layer on the trimmed sequence alone
+                ele_data = data[:length, i:i+1].copy()
+                ele_data.attach_grad()
+                with mx.autograd.record():
+                    ele_out, ele_states = layer(ele_data, layer.begin_state(1),
+                                                valid_length=mx.nd.array([length]))
+                ele_out.backward()
+                assert_almost_equal(out[:length, i:i+1].asnumpy(), ele_out.asnumpy(),
+                                    rtol=1e-4, atol=1e-4)
+                assert_allclose(out[length:, i].asnumpy(), 0)
+                for state, ele_state in zip(states, ele_states):
+                    assert_almost_equal(state[:, i:i+1].asnumpy(), ele_state.asnumpy(),
+                                        rtol=1e-4, atol=1e-4)
+                assert_almost_equal(data.grad[:length, i:i+1].asnumpy(),
+                                    ele_data.grad.asnumpy(), rtol=1e-4, atol=1e-4)
+                assert_allclose(data.grad[length:, i].asnumpy(), 0)
+
+            layer.hybridize()
+            out_hybrid = layer(data, valid_length=mx.nd.array(valid_length))
+            assert_almost_equal(out.asnumpy(), out_hybrid.asnumpy(), rtol=1e-4, atol=1e-4)
+
+
 if __name__ == '__main__':
     import nose
     nose.runmodule()
@@ -355,6 +355,45 @@ class TestImage(unittest.TestCase):
         for batch in det_iter:
             pass
 
+    @with_seed()
+    def test_det_augmenters_batch(self):
+        srcs = [mx.nd.array(np.random.uniform(0, 255, (h, w, 3)))
+                for h, w in [(120, 160), (200, 100), (90, 90)]]
+        labels = [np.array(_generate_objects()[2:]).reshape((-1, 5)) for _ in srcs]
+        crop_aug = mx.image.DetRandomCropAug(min_object_covered=0.1, area_range=(0.1, 1.0),
+                                             max_attempts=50)
+        out_srcs, out_labels = crop_aug.apply_batch(srcs, labels)
+        assert len(out_srcs) == len(srcs) and len(out_labels) == len(labels)
+        for src, out_src, label in zip(srcs, out_srcs, out_labels):
+            assert out_src.shape[0] <= src.shape[0] and out_src.shape[1] <= src.shape[1]
+            assert np.all(label[:, 1:5] >= 0) and np.all(label[:, 1:5] <= 1)
+            assert np.all(label[:, 3] > label[:, 1]) and np.all(label[:, 4] > label[:, 2])
+
+        pad_aug = mx.image.DetRandomPadAug(area_range=(1.5, 3.0), max_attempts=50)
+        out_srcs, out_labels = pad_aug.apply_batch(srcs, labels)
+        for src, out_src, label, out_label in zip(srcs, out_srcs, labels, out_labels):
+            assert out_src.shape[0] >= src.shape[0] and out_src.shape[1] >= src.shape[1]
+            assert out_label.shape == label.shape
+            assert np.all(out_label[:, 1:5] >= 0) and np.all(out_label[:, 1:5] <= 1)
+
+        select_aug = mx.image.DetRandomSelectAug([crop_aug, pad_aug], skip_prob=0.5)
+        out_srcs, out_labels = select_aug.apply_batch(srcs, labels)
+        assert len(out_srcs) == len(srcs) and len(out_labels) == len(labels)
+
+    def test_det_iter_custom_transform(self):
+        class CustomDetIter(mx.image.ImageDetIter):
+            calls = 0
+
+            def augmentation_transform(self, data, label):
+                CustomDetIter.calls += 1
+                return super(CustomDetIter, self).augmentation_transform(data, label)
+
+        im_list = [_generate_objects() + [x] for x in TestImage.IMAGES]
+        det_iter = CustomDetIter(2, (3, 300, 300), imglist=im_list, path_root='')
+        for _ in det_iter:
+            pass
+        assert CustomDetIter.calls >= len(im_list)
+
 if __name__ == '__main__':
     import nose
     nose.runmodule()
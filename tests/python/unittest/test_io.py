@@ -556,6 +556,47 @@ def test_ImageRecordIter_seed_augmentation():
     
     assert_dataiter_items_equals(dataiter1, dataiter2)
 
+def test_ProcessPrefetchingIter():
+    data = np.arange(40).reshape((10, 4)).astype(np.float32)
+    label = np.arange(10).astype(np.float32)
+    iter1 = mx.io.NDArrayIter(data, label, batch_size=3, last_batch_handle='discard')
+    iter2 = mx.io.NDArrayIter({'data': data * 2}, {'label2': label}, batch_size=3,
+                              last_batch_handle='discard')
+    piter = mx.io.ProcessPrefetchingIter([iter1, iter2], prefetch=2,
+                                         rename_data=[{'data': 'data1'}, {'data': 'data2'}])
+    assert [d.name for d in piter.provide_data] == ['data1', 'data2']
+    for _ in range(2):
+        batches = list(piter)
+        assert len(batches) == 3
+        for i, batch in enumerate(batches):
+            assert_almost_equal(batch.data[0].asnumpy(), data[i * 3:(i + 1) * 3])
+            assert_almost_equal(batch.data[1].asnumpy(), 2 * data[i * 3:(i + 1) * 3])
+            assert_almost_equal(batch.label[0].asnumpy(), label[i * 3:(i + 1) * 3])
+            assert_almost_equal(batch.label[1].asnumpy(), label[i * 3:(i + 1) * 3])
+        assert not piter.iter_next()
+        piter.reset()
+    # reset in the middle of an epoch
+    first = piter.next().data[0].asnumpy()
+    piter.reset()
+    assert_almost_equal(piter.next().data[0].asnumpy(), first)
+    # the batches read ahead are dropped on reset and close
+    for _ in range(3):
+        time.sleep(0.2)
+        piter.reset()
+    assert_almost_equal(piter.next().data[0].asnumpy(), first)
+    time.sleep(0.2)
+    piter.close()
+    assert piter._pending == [None, None]
+
+    class FailingIter(mx.io.NDArrayIter):
+        def next(self):
+            raise ValueError('failing iterator')
+
+    piter = mx.io.ProcessPrefetchingIter(FailingIter(data, label, batch_size=3))
+    assertRaises(RuntimeError, piter.next)
+    piter.close()
+
+
 if __name__ == "__main__":
     test_NDArrayIter()
     if h5py:
@@ -332,6 +332,59 @@ def test_module_switch_bucket():
     assert total_bytes_after == total_bytes_before
 
 
+@with_seed()
+def test_bucket_module_prebind_evict():
+    batch_size = 4
+    num_hidden = 8
+
+    def sym_gen(seq_len):
+        data = mx.sym.Variable('data')
+        label = mx.sym.Variable('softmax_label')
+        pred = mx.sym.FullyConnected(data=data, num_hidden=num_hidden, flatten=False,
+                                     name='fc')
+        pred = mx.sym.SoftmaxOutput(data=pred, label=label, preserve_shape=True,
+                                    name='softmax')
+        return pred, ('data',), ('softmax_label',)
+
+    def shapes(key):
+        return [('data', (batch_size, key, 5))], [('softmax_label', (batch_size, key))]
+
+    def batch(key):
+        data_shapes, label_shapes = shapes(key)
+        return mx.io.DataBatch([mx.nd.ones(data_shapes[0][1])],
+                               [mx.nd.zeros(label_shapes[0][1])],
+                               bucket_key=key, provide_data=data_shapes,
+                               provide_label=label_shapes)
+
+    mod = mx.mod.BucketingModule(sym_gen, default_bucket_key=10, max_buckets=3)
+    mod.bind(*shapes(10))
+    mod.init_params()
+    mod.init_optimizer()
+    mod.prebind([(key,) + shapes(key) for key in [2, 4]])
+    assert list(mod._buckets) == [2, 4, 10]
+    bound = mod._buckets[4]
+
+    report = mod.memory_report()
+    weight_bytes = 4 * num_hidden * 5
+    assert report[10]['private_bytes'] >= weight_bytes
+    assert report[10]['shared_bytes'] == 0
+    # the weight is shared with the default bucket
+    assert report[4]['shared_bytes'] >= weight_bytes
+
+    # using a new bucket releases the least recently used one
+    for key in [4, 6]:
+        mod.forward(batch(key), is_train=True)
+        mod.backward()
+        mod.update()
+    assert set(mod._buckets) == set([4, 6, 10])
+    assert mod._buckets[4] is bound
+    mod.forward(batch(2), is_train=True)
+    assert set(mod._buckets) == set([2, 6, 10])
+    mod.backward()
+    mod.update()
+    mod.get_outputs()[0].wait_to_read()
+
+
 # roywei: Getting rid of fixed seed as flakiness could not be reproduced,
 # tracked at: https://github.com/apache/incubator-mxnet/issues/11705
 @with_seed()
@@ -1410,13 +1410,37 @@ def test_ndarray_indexing():
                   (([[[[1]]]], 3, slice(0, 3), 0), False),
                   (([[[[1]]]], [[2], [12]], slice(0, 3), slice(None)), False),
                   (([1, 2], slice(3, 5), [2, 3], [3, 4]), False),
-                  (([1, 2], slice(3, 5), (2, 3), [3, 4]), False)]
+                  (([1, 2], slice(3, 5), (2, 3), [3, 4]), False),
+                  ((slice(None), [1, 4]), False), ((slice(None), slice(None), [[3], [0]]), False),
+                  (np.array([-1, 2], dtype=np.int64), False), ((Ellipsis, [2, 0]), False),
+                  ((0, Ellipsis, 1), False), ((Ellipsis, slice(1, 5, 2), 3), False),
+                  (np.array([True, False] * 4), False), ((slice(None), np.arange(16) % 3 == 0), False),
+                  ((Ellipsis, np.arange(9) > 6), False),
+                  (np.arange(8 * 16).reshape((8, 16)) % 5 == 0, False)]
     for index in index_list:
         test_getitem(np_array, index[0], index[1])
         test_setitem(np_array, index[0], index[1])
         test_getitem_autograd(np_array, index[0])
         test_setitem_autograd(np_array, index[0])
 
+    # boolean masks without True elements select no element
+    for index in [np.zeros(8, dtype=np.bool_), (slice(None), np.zeros(16, dtype=np.bool_)),
+                  (Ellipsis, np.zeros(9, dtype=np.bool_)), np.zeros((8, 16), dtype=np.bool_)]:
+        x = mx.nd.array(np_array, dtype=np_array.dtype)
+        y = x[index]
+        assert y.shape == np_array[index].shape and y.dtype == np_array.dtype
+        x[index] = 1
+        assert same(x.asnumpy(), np_array)
+
+    # out-of-range integer array indices raise instead of wrapping
+    x = mx.nd.array(np_array, dtype=np_array.dtype)
+    for index in [[0, 8], [-9], np.array([1, 20]), (slice(None), [16])]:
+        assertRaises(IndexError, x.__getitem__, index)
+        assertRaises(IndexError, x.__setitem__, index, 1)
+    assert same(x.asnumpy(), np_array)
+    assert same(x[[-1, -8]].asnumpy(), np_array[[-1, -8]])
+    assert same(x[mx.nd.array([-1, 7], dtype='int32')].asnumpy(), np_array[[-1, 7]])
+
 
 def test_assign_float_value_to_ndarray():
     """Test case from https://github.com/apache/incubator-mxnet/issues/8668"""
@@ -1578,6 +1602,63 @@ def test_dlpack():
             mx.test_utils.assert_almost_equal(a_np, d_np)
             mx.test_utils.assert_almost_equal(a_np, e_np)
 
+@with_seed()
+def test_numpy_view():
+    a = mx.nd.random.uniform(shape=(4, 5))
+    view = a.numpy_view()
+    assert not view.flags['WRITEABLE']
+    mx.test_utils.assert_almost_equal(view, a.asnumpy())
+    a += 1
+    a.wait_to_read()
+    mx.test_utils.assert_almost_equal(view, a.asnumpy())
+    # the view keeps the array alive
+    b = a[1:3]
+    view = b.numpy_view(writable=True)
+    del a, b
+    view[:] = 2
+    assert (view == 2).all()
+    assertRaises(ValueError, mx.nd.zeros((2, 2), stype='csr').numpy_view)
+    assert mx.nd.zeros((0, 3)).numpy_view().shape == (0, 3)
+
+@with_seed()
+def test_from_numpy():
+    for dtype in ['float16', 'float32', 'float64', 'uint8', 'int32', 'int64']:
+        x = (np.random.uniform(size=(3, 4)) * 10).astype(dtype)
+        y = mx.nd.from_numpy(x)
+        assert y.dtype == x.dtype
+        assert not x.flags['WRITEABLE']
+        mx.test_utils.assert_almost_equal(y.asnumpy(), x)
+        # the memory is shared both ways
+        y[:] = 1
+        y.wait_to_read()
+        assert (x == 1).all()
+        assert y.numpy_view().ctypes.data == x.ctypes.data
+    # the source is kept alive by the NDArray
+    y = mx.nd.from_numpy(np.ones((5,), dtype='float32'))
+    mx.test_utils.assert_almost_equal((y * 2).asnumpy(), np.full((5,), 2))
+    z = mx.nd.from_numpy(bytearray(b'abc'))
+    assert z.asnumpy().tolist() == [97, 98, 99]
+    assertRaises(ValueError, mx.nd.from_numpy, np.ones((4, 4))[:, ::2])
+    copy = mx.nd.from_numpy(np.ones((4, 4))[:, ::2], zero_copy=False)
+    assert copy.shape == (4, 2)
+    # read-only sources are copied
+    x = np.ones((2, 2), dtype='float32')
+    y = mx.nd.from_numpy(x)
+    z = mx.nd.from_numpy(x)
+    z[:] = 0
+    z.wait_to_read()
+    assert (x == 1).all()
+    assert mx.nd.from_numpy(memoryview(b'ab')).asnumpy().tolist() == [97, 98]
+
+@with_seed()
+def test_dlpack_protocol():
+    a = mx.nd.random.uniform(shape=(2, 3))
+    assert a.__dlpack_device__() == (1, 0)
+    b = mx.nd.from_dlpack(a)
+    mx.test_utils.assert_almost_equal(a.asnumpy(), b.asnumpy())
+    if hasattr(np, 'from_dlpack'):
+        mx.test_utils.assert_almost_equal(np.from_dlpack(a), a.asnumpy())
+
 @with_seed()
 def test_ndarray_is_inf():
     random_dimensions = np.random.randint(2, 5)
@@ -17,6 +17,7 @@
 
 import os
 import ctypes
+import json
 import mxnet as mx
 from mxnet.base import SymbolHandle, check_call, _LIB, mx_uint, c_str_array, c_str
 from mxnet.symbol import Symbol
@@ -238,6 +239,77 @@ def test_subgraph_exe():
 def test_subgraph_v2_exe():
     _test_subgraph_exe('default_v2')
 
+def test_elemwise_fusion():
+    a = mx.sym.var('a')
+    b = mx.sym.var('b')
+    c = mx.sym.var('c')
+    fc = mx.sym.FullyConnected(a, num_hidden=8, name='fc')
+    x = mx.sym.broadcast_add(fc, b)
+    x = mx.sym.Activation(x, act_type='sigmoid')
+    x = (x * 2 - 1) * c
+    x = mx.sym.relu(x)
+    sym = mx.sym.sum(x)
+    fused_sym = sym.get_backend_symbol('ELEMWISE_FUSION')
+    ops = [node['op'] for node in json.loads(fused_sym.tojson())['nodes']]
+    assert ops.count('_sg_elemwise_fused') == 1
+    assert 'Activation' not in ops and 'relu' not in ops
+    assert fused_sym.list_inputs() == sym.list_inputs()
+
+    shapes = {'a': (4, 5), 'b': (1, 8), 'c': (4, 8)}
+    exe = sym.simple_bind(ctx=mx.cpu(), **shapes)
+    fused_exe = fused_sym.simple_bind(ctx=mx.cpu(), **shapes)
+    for name, arr in exe.arg_dict.items():
+        arr[:] = mx.nd.random.uniform(-1, 1, shape=arr.shape)
+        fused_exe.arg_dict[name][:] = arr
+    exe.forward(is_train=True)
+    fused_exe.forward(is_train=True)
+    assert_almost_equal(exe.outputs[0].asnumpy(), fused_exe.outputs[0].asnumpy(), rtol=1e-5)
+    exe.backward()
+    fused_exe.backward()
+    for name in exe.grad_dict:
+        assert_almost_equal(exe.grad_dict[name].asnumpy(), fused_exe.grad_dict[name].asnumpy(),
+                            rtol=1e-5, atol=1e-6)
+
+def test_elemwise_fusion_fan_out():
+    a = mx.sym.var('a')
+    b = mx.sym.var('b')
+    # t is consumed by two chains ending in an operator that is not fused
+    t = mx.sym.relu(a * b + 1)
+    sym = mx.sym.concat(mx.sym.exp(t) * 2, mx.sym.sqrt(t) - 1, dim=1)
+    fused_sym = sym.get_backend_symbol('ELEMWISE_FUSION')
+    ops = [node['op'] for node in json.loads(fused_sym.tojson())['nodes']]
+    assert ops.count('_sg_elemwise_fused') == 3
+    assert 'relu' not in ops and 'exp' not in ops and 'sqrt' not in ops
+
+    shapes = {'a': (4, 8), 'b': (4, 8)}
+    args = {name: mx.nd.random.uniform(0, 1, shape=shape) for name, shape in shapes.items()}
+    exe = sym.bind(mx.cpu(), args=args)
+    fused_exe = fused_sym.bind(mx.cpu(), args=args)
+    assert_almost_equal(exe.forward()[0].asnumpy(), fused_exe.forward()[0].asnumpy(), rtol=1e-5)
+
+def test_elemwise_fusion_non_float():
+    a = mx.sym.var('a', dtype='int32')
+    b = mx.sym.var('b', dtype='int32')
+    c = mx.sym.var('c')
+    x = mx.sym.broadcast_add(a, b) * 2 - 1
+    y = mx.sym.relu(mx.sym.cast(x, dtype='float32') * c + 1)
+    fused_sym = mx.sym.Group([x, y]).get_backend_symbol('ELEMWISE_FUSION')
+    nodes = json.loads(fused_sym.tojson())['nodes']
+    ops = [node['op'] for node in nodes]
+    # only the float operators after the cast are fused
+    assert ops.count('_sg_elemwise_fused') == 1
+    assert 'broadcast_add' in ops and 'relu' not in ops
+
+    shapes = {'a': (4, 8), 'b': (1, 8), 'c': (4, 8)}
+    exe = fused_sym.simple_bind(ctx=mx.cpu(), grad_req='null', **shapes)
+    a_np = np.random.randint(-5, 5, size=shapes['a'])
+    b_np = np.random.randint(-5, 5, size=shapes['b'])
+    c_np = np.random.uniform(-1, 1, size=shapes['c'])
+    exe.forward(a=a_np, b=b_np, c=c_np)
+    x_np = (a_np + b_np) * 2 - 1
+    assert_almost_equal(exe.outputs[0].asnumpy(), x_np)
+    assert_almost_equal(exe.outputs[1].asnumpy(), np.maximum(x_np * c_np + 1, 0), rtol=1e-5)
+
 if __name__ == '__main__':
     import nose
     nose.runmodule()
@@ -0,0 +1,108 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Microbenchmark of the CPU reduction of the local kvstore.
+
+Pushes synthetic gradients from several CPU contexts into a 'local' kvstore and
+reports the reduction bandwidth for several settings of the reduction environment
+variables. Every setting runs in its own process, since CommCPU reads them once.
+"""
+import os, sys
+curr_path = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(curr_path, "../../python"))
+import argparse
+import json
+import logging
+import subprocess
+import time
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="benchmark CPU gradient reduction")
+    parser.add_argument('--num-devices', type=int, default=4,
+                        help='number of cpu contexts pushing gradients')
+    parser.add_argument('--num-small', type=int, default=300,
+                        help='number of small arrays, e.g. biases and batchnorm parameters')
+    parser.add_argument('--small-size', type=int, default=2048,
+                        help='number of elements of each small array')
+    parser.add_argument('--num-large', type=int, default=16,
+                        help='number of large arrays')
+    parser.add_argument('--large-size', type=int, default=2 ** 22,
+                        help='number of elements of each large array')
+    parser.add_argument('--num-batches', type=int, default=20,
+                        help='number of timed pushes after warmup')
+    parser.add_argument('--nthreads', type=str, default='0,1,4',
+                        help='values of MXNET_KVSTORE_REDUCTION_NTHREADS to try, 0 is auto tuning')
+    parser.add_argument('--batch', type=str, default='0,1',
+                        help='values of MXNET_KVSTORE_REDUCTION_BATCH to try')
+    parser.add_argument('--numa', type=str, default='0,1',
+                        help='values of MXNET_KVSTORE_REDUCTION_NUMA to try')
+    parser.add_argument('--worker', action='store_true',
+                        help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+def run_worker(args):
+    """Runs the benchmark with the current environment and prints the result as json."""
+    import mxnet as mx
+    devs = [mx.cpu(i) for i in range(args.num_devices)]
+    shapes = [(args.small_size,)] * args.num_small + [(args.large_size,)] * args.num_large
+    kv = mx.kv.create('local')
+    keys = list(range(len(shapes)))
+    kv.init(keys, [mx.nd.zeros(s) for s in shapes])
+    grads = [[mx.nd.ones(s, ctx=d) for d in devs] for s in shapes]
+    outs = [mx.nd.zeros(s) for s in shapes]
+    size = sum(s[0] for s in shapes) * 4 * len(devs) / 1e9
+
+    def step():
+        # all keys are pushed at once, so that small keys can be reduced together
+        kv.push(keys, grads)
+        kv.pull(keys, outs)
+        mx.nd.waitall()
+
+    # warmup, which also lets the number of reduction threads be tuned
+    for _ in range(max(5, args.num_batches // 2)):
+        step()
+    assert outs[0].asnumpy()[0] == len(devs)
+    tic = time.time()
+    for _ in range(args.num_batches):
+        step()
+    toc = (time.time() - tic) / args.num_batches
+    print(json.dumps({'time': toc, 'bandwidth': size / toc}))
+
+def main():
+    args = parse_args()
+    if args.worker:
+        run_worker(args)
+        return
+    logging.info(args)
+    for numa in args.numa.split(','):
+        for batch in args.batch.split(','):
+            for nthreads in args.nthreads.split(','):
+                env = dict(os.environ, MXNET_KVSTORE_REDUCTION_NTHREADS=nthreads,
+                           MXNET_KVSTORE_REDUCTION_BATCH=batch,
+                           MXNET_KVSTORE_REDUCTION_NUMA=numa)
+                out = subprocess.check_output([sys.executable, __file__, '--worker'] +
+                                              sys.argv[1:], env=env)
+                res = json.loads(out.decode().strip().splitlines()[-1])
+                logging.info('numa %s, batch %s, nthreads %-4s: %f sec, %f GB/sec reduced',
+                             numa, batch, 'auto' if nthreads == '0' else nthreads,
+                             res['time'], res['bandwidth'])
+
+if __name__ == "__main__":
+    main()